@@ -0,0 +1,320 @@
+"""
+Pomiar wydajności gorącej ścieżki symulacji z porównaniem do wzorca.
+
+Dla każdego przypadku mierzona jest przepustowość (jednostki na sekundę:
+kroki, wywołania, próbki, wykresy - najlepsza z powtórzeń) oraz szczytowa
+pamięć zaalokowana przez mierzoną operację (tracemalloc, w osobnym
+przebiegu, żeby śledzenie alokacji nie zaniżało przepustowości).
+
+Wyniki można zapisać jako wzorzec (JSON). Przy kolejnych uruchomieniach
+przypadek, którego przepustowość spadła lub pamięć wzrosła ponad próg,
+jest regresją - skrypt kończy się wtedy kodem 1.
+
+Uruchomienie:
+    python -m benchmarks.benchmark_wydajnosci --zapisz-wzorzec
+    python -m benchmarks.benchmark_wydajnosci
+    python -m benchmarks.benchmark_wydajnosci --filtr uruchom --prog 0.1
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rakieta import Rakieta
+from src.autopilot import Autopilot, RegulatorPID
+from src.naprowadzanie import AutopilotPredykcyjny
+from src.tablice_ladowania import AutopilotTabelaryczny, parametry_tablicy, zbuduj_tablice
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src import config
+
+
+KROKI_CZASOWE = (0.1, 0.01, 0.001)
+FORMATY_ZAPISU = ('npz', 'surowy', 'json')
+DOMYSLNY_WZORZEC = os.path.join(os.path.dirname(__file__), 'wzorzec_wydajnosci.json')
+PROG_REGRESJI = 0.2
+PROG_REGRESJI_PAMIECI = 0.2
+MINIMALNY_CZAS_POMIARU = 0.2
+# Różnice pamięci poniżej tej wartości [B] nie są regresją (szum alokatora)
+MINIMALNY_WZROST_PAMIECI = 64 * 1024
+
+# Nazwa przypadku -> (jednostka, funkcja przygotowania); przygotowanie nie jest mierzone
+# i zwraca funkcję, która wykonuje pomiar i zwraca liczbę wykonanych jednostek
+PRZYPADKI = {}
+
+
+def przypadek(nazwa, jednostka):
+    def rejestruj(przygotuj):
+        PRZYPADKI[nazwa] = (jednostka, przygotuj)
+        return przygotuj
+    return rejestruj
+
+
+@przypadek('rakieta.aktualizuj', 'kroki')
+def przygotuj_aktualizacje_rakiety(liczba_krokow=20_000):
+    rakieta = Rakieta(pozycja_y=1e7, predkosc_y=0.0)
+    rakieta.ustaw_cieg(0.5 * rakieta.cieg_maksymalny)
+
+    def wykonaj():
+        for _ in range(liczba_krokow):
+            rakieta.aktualizuj(0.01)
+        return liczba_krokow
+    return wykonaj
+
+
+@przypadek('autopilot.oblicz_sterowanie', 'wywołania')
+def przygotuj_autopilota(liczba_wywolan=20_000):
+    scenariusz = Scenariusz()
+    autopilot = Autopilot(Rakieta.ze_scenariusza(scenariusz), scenariusz.nastawy)
+
+    def wykonaj():
+        for _ in range(liczba_wywolan):
+            autopilot.oblicz_sterowanie(0.1)
+        return liczba_wywolan
+    return wykonaj
+
+
+@przypadek('autopilot_predykcyjny.oblicz_sterowanie', 'wywołania')
+def przygotuj_autopilota_predykcyjnego(liczba_wywolan=2_000):
+    scenariusz = Scenariusz(naprowadzanie='predykcyjne')
+    autopilot = AutopilotPredykcyjny(Rakieta.ze_scenariusza(scenariusz), scenariusz.nastawy)
+
+    def wykonaj():
+        for _ in range(liczba_wywolan):
+            # Przed zapłonem - każde wywołanie ocenia wszystkich kandydatów
+            autopilot.czy_hamowanie = False
+            autopilot.oblicz_sterowanie(0.1)
+        return liczba_wywolan
+    return wykonaj
+
+
+@przypadek('autopilot_tabelaryczny.oblicz_sterowanie', 'wywołania')
+def przygotuj_autopilota_tabelarycznego(liczba_wywolan=20_000):
+    scenariusz = Scenariusz(naprowadzanie='tabelaryczne')
+    # Mała tablica w pamięci - koszt odczytu nie zależy od liczby węzłów
+    tablica = zbuduj_tablice(parametry_tablicy(scenariusz, liczba_wezlow=(16, 16, 3)), liczba_procesow=1)
+    autopilot = AutopilotTabelaryczny(Rakieta.ze_scenariusza(scenariusz), scenariusz.nastawy, tablica=tablica)
+
+    def wykonaj():
+        for _ in range(liczba_wywolan):
+            autopilot.czy_hamowanie = False
+            autopilot.oblicz_sterowanie(0.1)
+        return liczba_wywolan
+    return wykonaj
+
+
+@przypadek('regulator_pid.oblicz_sterowanie', 'wywołania')
+def przygotuj_regulator(liczba_wywolan=100_000):
+    regulator = RegulatorPID(1.0, 0.1, 0.5, wartosc_minimalna=0, wartosc_maksymalna=1000.0)
+    bledy = np.sin(np.linspace(0.0, 100.0, liczba_wywolan)).tolist()
+
+    def wykonaj():
+        for blad in bledy:
+            regulator.oblicz_sterowanie(blad, 0.1)
+        return liczba_wywolan
+    return wykonaj
+
+
+@przypadek('symulacja.zapisz_aktualny_stan', 'próbki')
+def przygotuj_zapis_stanu(liczba_probek=20_000):
+    symulacja = Symulacja(scenariusz=Scenariusz())
+
+    def wykonaj():
+        for _ in range(liczba_probek):
+            symulacja.zapisz_aktualny_stan()
+        return liczba_probek
+    return wykonaj
+
+
+def przygotuj_przebieg(planeta, krok_czasowy, naprowadzanie='heurystyczne'):
+    def przygotuj():
+        scenariusz = Scenariusz(planeta=planeta, krok_czasowy=krok_czasowy, naprowadzanie=naprowadzanie)
+
+        def wykonaj():
+            # Pełny przebieg razem z utworzeniem symulacji (bufor historii, autopilot)
+            symulacja = Symulacja(scenariusz=scenariusz)
+            symulacja.uruchom(czy_wyswietlac_postep=False)
+            return symulacja.numer_kroku
+        return wykonaj
+    return przygotuj
+
+
+for _planeta in config.PLANETY:
+    for _krok_czasowy in KROKI_CZASOWE:
+        przypadek(f'symulacja.uruchom[{_planeta}, dt={_krok_czasowy}]', 'kroki')(
+            przygotuj_przebieg(_planeta, _krok_czasowy))
+przypadek('symulacja.uruchom[ksiezyc, dt=0.1, predykcyjne]', 'kroki')(
+    przygotuj_przebieg('ksiezyc', 0.1, 'predykcyjne'))
+
+
+_przebieg_wzorcowy = None
+
+
+def przebieg_wzorcowy():
+    """Zakończona symulacja (dt=0.01) wspólna dla przypadków zapisu i wykresów."""
+    global _przebieg_wzorcowy
+    if _przebieg_wzorcowy is None:
+        _przebieg_wzorcowy = Symulacja(scenariusz=Scenariusz(krok_czasowy=0.01))
+        _przebieg_wzorcowy.uruchom(czy_wyswietlac_postep=False)
+    return _przebieg_wzorcowy
+
+
+def przygotuj_zapis_do_pliku(format):
+    def przygotuj():
+        symulacja = przebieg_wzorcowy()
+        katalog = tempfile.mkdtemp(prefix='benchmark_')
+        sciezka = os.path.join(katalog, 'przebieg')
+
+        def wykonaj():
+            symulacja.zapisz_do_pliku(sciezka, format=format)
+            return len(symulacja.historia_danych['czas'])
+        return wykonaj
+    return przygotuj
+
+
+for _format in FORMATY_ZAPISU:
+    przypadek(f'symulacja.zapisz_do_pliku[{_format}]', 'próbki')(przygotuj_zapis_do_pliku(_format))
+
+
+@przypadek('wizualizuj_wyniki_symulacji[bez okna]', 'wykresy')
+def przygotuj_wizualizacje():
+    from src.wizualizacja import wizualizuj_wyniki_symulacji
+
+    wyniki = przebieg_wzorcowy().pobierz_wyniki()
+    sciezka = os.path.join(tempfile.mkdtemp(prefix='benchmark_'), 'wykres.png')
+
+    def wykonaj():
+        with contextlib.redirect_stdout(io.StringIO()):
+            wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=True, nazwa_pliku=sciezka, czy_pokazac=False)
+        return 1
+    return wykonaj
+
+
+def zmierz(przygotuj, powtorzenia):
+    """Przepustowość (najlepsza i mediana z powtórzeń) i szczytowa pamięć operacji."""
+    przepustowosci = []
+    for _ in range(powtorzenia):
+        # Krótkie operacje są powtarzane, aż pomiar potrwa co najmniej MINIMALNY_CZAS_POMIARU
+        jednostki = czas = 0.0
+        while czas < MINIMALNY_CZAS_POMIARU:
+            wykonaj = przygotuj()
+            start = time.perf_counter()
+            jednostki += wykonaj()
+            czas += time.perf_counter() - start
+        przepustowosci.append(jednostki / czas)
+
+    wykonaj = przygotuj()
+    tracemalloc.start()
+    try:
+        wykonaj()
+        _, pamiec_szczytowa = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'jednostki_na_sekunde': max(przepustowosci),
+        'mediana_jednostek_na_sekunde': float(np.median(przepustowosci)),
+        'pamiec_szczytowa_b': pamiec_szczytowa
+    }
+
+
+def uruchom_pomiary(filtr=None, powtorzenia=3):
+    wyniki = {}
+    for nazwa, (jednostka, przygotuj) in PRZYPADKI.items():
+        if filtr and filtr not in nazwa:
+            continue
+        wynik = zmierz(przygotuj, powtorzenia)
+        wynik['jednostka'] = jednostka
+        wyniki[nazwa] = wynik
+        print(f"{nazwa:<48} {wynik['jednostki_na_sekunde']:>14,.1f} {jednostka + '/s':<13} "
+              f"{wynik['pamiec_szczytowa_b'] / 1024:>10,.0f} KiB")
+    return wyniki
+
+
+def porownaj_z_wzorcem(wyniki, wzorzec, prog=PROG_REGRESJI, prog_pamieci=PROG_REGRESJI_PAMIECI):
+    """Lista regresji (nazwa, opis) przypadków obecnych w obu pomiarach."""
+    regresje = []
+    for nazwa, wynik in wyniki.items():
+        if nazwa not in wzorzec:
+            continue
+        poprzedni = wzorzec[nazwa]
+        zmiana = wynik['jednostki_na_sekunde'] / poprzedni['jednostki_na_sekunde'] - 1.0
+        if zmiana < -prog:
+            regresje.append((nazwa, f"przepustowość {zmiana:+.1%}"))
+        wzrost_pamieci = wynik['pamiec_szczytowa_b'] - poprzedni['pamiec_szczytowa_b']
+        if (wzrost_pamieci > MINIMALNY_WZROST_PAMIECI
+                and wzrost_pamieci > prog_pamieci * poprzedni['pamiec_szczytowa_b']):
+            regresje.append((nazwa, f"pamięć {wzrost_pamieci / poprzedni['pamiec_szczytowa_b']:+.1%}"))
+    return regresje
+
+
+def opis_srodowiska():
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platforma': platform.platform(),
+        'procesor': platform.processor() or platform.machine()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pomiar wydajności symulacji z porównaniem do wzorca')
+    parser.add_argument('--filtr', type=str, default=None, help='Tylko przypadki, których nazwa zawiera tekst')
+    parser.add_argument('--powtorzenia', type=int, default=3, help='Liczba powtórzeń pomiaru czasu')
+    parser.add_argument('--wzorzec', type=str, default=DOMYSLNY_WZORZEC, help='Plik JSON z wzorcem')
+    parser.add_argument('--zapisz-wzorzec', action='store_true', help='Zapisz wyniki jako nowy wzorzec')
+    parser.add_argument('--prog', type=float, default=PROG_REGRESJI,
+                        help=f'Dopuszczalny spadek przepustowości (domyślnie: {PROG_REGRESJI})')
+    parser.add_argument('--prog-pamieci', type=float, default=PROG_REGRESJI_PAMIECI,
+                        help=f'Dopuszczalny wzrost pamięci szczytowej (domyślnie: {PROG_REGRESJI_PAMIECI})')
+    parser.add_argument('--wyjscie', type=str, default=None, help='Zapisz wyniki pomiaru do pliku JSON')
+    argumenty = parser.parse_args()
+
+    wyniki = uruchom_pomiary(argumenty.filtr, argumenty.powtorzenia)
+    raport = {'srodowisko': opis_srodowiska(), 'wyniki': wyniki}
+
+    if argumenty.wyjscie:
+        with open(argumenty.wyjscie, 'w', encoding='utf-8') as plik:
+            json.dump(raport, plik, indent=2, ensure_ascii=False)
+
+    if argumenty.zapisz_wzorzec:
+        if os.path.exists(argumenty.wzorzec):
+            # Przypadki spoza filtra zostają z poprzedniego wzorca
+            with open(argumenty.wzorzec, encoding='utf-8') as plik:
+                raport['wyniki'] = {**json.load(plik)['wyniki'], **wyniki}
+        with open(argumenty.wzorzec, 'w', encoding='utf-8') as plik:
+            json.dump(raport, plik, indent=2, ensure_ascii=False)
+        print(f"\nWzorzec zapisany do: {argumenty.wzorzec}")
+        return 0
+
+    if not os.path.exists(argumenty.wzorzec):
+        print(f"\nBrak wzorca ({argumenty.wzorzec}) - uruchom z --zapisz-wzorzec, aby go utworzyć")
+        return 0
+
+    with open(argumenty.wzorzec, encoding='utf-8') as plik:
+        wzorzec = json.load(plik)
+    regresje = porownaj_z_wzorcem(wyniki, wzorzec['wyniki'], argumenty.prog, argumenty.prog_pamieci)
+    if not regresje:
+        print(f"\nBez regresji względem wzorca z {wzorzec['srodowisko']['data']}")
+        return 0
+    print(f"\nREGRESJE względem wzorca z {wzorzec['srodowisko']['data']}:")
+    for nazwa, opis in regresje:
+        print(f"  {nazwa}: {opis}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
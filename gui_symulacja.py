@@ -5,20 +5,21 @@ Umożliwia wybór parametrów symulacji bez znajomości programowania.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import os
 import sys
 sys.path.insert(0, '.')
 
-from src.symulacja import Symulacja
-from src.wizualizacja import wizualizuj_wyniki_symulacji
+from src.scenariusz import Scenariusz, SpecyfikacjaRakiety
+from src.wizualizacja import WidokTelemetrii, RysownikWynikow, rysuj_porownanie
+from src.menedzer_zadan import MenedzerZadan, ZAKONCZONE, TRWA
 from src import config
-import threading
 
 
 class SymulacjaGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Symulator Ladowania Rakiety")
-        self.root.geometry("900x850")
+        self.root.geometry("1400x850")
         self.root.resizable(True, True)
         
         # Relume-inspired paleta kolorow
@@ -56,9 +57,21 @@ class SymulacjaGUI:
         )
         title_label.pack()
         
-        # Glowna ramka bez scrollowania
-        main_frame = tk.Frame(root, bg=self.bg_primary)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
+        # Glowna ramka bez scrollowania, podglad na zywo po prawej
+        content_frame = tk.Frame(root, bg=self.bg_primary)
+        content_frame.pack(fill=tk.BOTH, expand=True)
+        
+        main_frame = tk.Frame(content_frame, bg=self.bg_primary)
+        main_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=15, pady=10)
+        
+        live_frame = tk.Frame(content_frame, bg=self.bg_primary)
+        live_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 15), pady=10)
+        # Symulacje w puli procesow - procesy powstaja dopiero przy pierwszym zadaniu
+        self.jobs = MenedzerZadan()
+        self.followed_job = None
+        self.refresh_scheduled = False
+        self.create_jobs_view(live_frame)
+        self.create_live_view(live_frame)
         
         # Kontener dla planet i parametrow obok siebie
         top_row = tk.Frame(main_frame, bg=self.bg_primary)
@@ -175,31 +188,13 @@ class SymulacjaGUI:
         )
         autopilot_cb.pack(anchor=tk.W)
         
-        self.verbose_var = tk.BooleanVar(value=True)
-        verbose_frame = tk.Frame(options_card, bg=self.bg_card)
-        verbose_frame.pack(fill=tk.X, padx=15, pady=8)
-        
-        verbose_cb = tk.Checkbutton(
-            verbose_frame,
-            text="Pokaż szczegółowy przebieg symulacji",
-            variable=self.verbose_var,
-            bg=self.bg_card,
-            fg=self.text_primary,
-            selectcolor=self.bg_card,
-            activebackground=self.bg_card,
-            activeforeground=self.text_primary,
-            font=("Inter", 10),
-            relief=tk.FLAT
-        )
-        verbose_cb.pack(anchor=tk.W, pady=(0, 6))
-        
         # Przycisk uruchomienia
         button_container = tk.Frame(main_frame, bg=self.bg_primary)
         button_container.pack(pady=10)
         
         self.run_button = tk.Button(
             button_container,
-            text="Uruchom Symulację",
+            text="Dodaj do kolejki",
             command=self.run_simulation,
             bg=self.accent_primary,
             fg="#ffffff",
@@ -212,7 +207,23 @@ class SymulacjaGUI:
             activebackground=self.text_primary,
             activeforeground="#ffffff"
         )
-        self.run_button.pack()
+        self.run_button.pack(side=tk.LEFT, padx=6)
+        
+        self.run_all_button = tk.Button(
+            button_container,
+            text="Wszystkie planety",
+            command=self.run_all_planets,
+            bg=self.bg_secondary,
+            fg=self.text_primary,
+            font=("Inter", 13, "bold"),
+            padx=20,
+            pady=12,
+            relief=tk.FLAT,
+            borderwidth=0,
+            cursor="hand2",
+            activebackground=self.bg_hover
+        )
+        self.run_all_button.pack(side=tk.LEFT, padx=6)
         
         # Pasek statusu
         status_container = tk.Frame(main_frame, bg=self.bg_card, relief=tk.SOLID, bd=1, highlightbackground=self.border_color)
@@ -250,6 +261,83 @@ class SymulacjaGUI:
         
         return card
     
+    def create_jobs_view(self, parent):
+        jobs_card = self.create_card(parent, "KOLEJKA ZADAŃ")
+        
+        columns = (('nazwa', "Zadanie", 160), ('stan', "Stan", 90), ('postep', "Postęp", 70),
+                   ('wynik', "Wynik", 80), ('vy', "vy [m/s]", 70), ('paliwo', "Paliwo [kg]", 80),
+                   ('czas', "Czas [s]", 70))
+        self.jobs_tree = ttk.Treeview(jobs_card, columns=[c[0] for c in columns], show='headings',
+                                      height=7, selectmode='extended')
+        for key, heading, width in columns:
+            self.jobs_tree.heading(key, text=heading)
+            self.jobs_tree.column(key, width=width, anchor=tk.W if key == 'nazwa' else tk.CENTER)
+        self.jobs_tree.pack(fill=tk.X, padx=8, pady=(0, 6))
+        self.jobs_tree.bind('<<TreeviewSelect>>', self._on_job_selected)
+        
+        buttons = tk.Frame(jobs_card, bg=self.bg_card)
+        buttons.pack(fill=tk.X, padx=8, pady=(0, 8))
+        for text, command in (("Wstrzymaj", self.pause_selected), ("Wznów", self.resume_selected),
+                              ("Anuluj", self.cancel_selected), ("Porównaj", self.compare_selected),
+                              ("Zapisz wykresy", self.save_plots_selected)):
+            tk.Button(buttons, text=text, command=command, bg=self.bg_hover, fg=self.text_primary,
+                      font=("Inter", 10), relief=tk.FLAT, padx=10, pady=4,
+                      cursor="hand2").pack(side=tk.LEFT, padx=(0, 6))
+    
+    def create_live_view(self, parent):
+        live_card = self.create_card(parent, "PODGLĄD NA ŻYWO")
+        live_card.pack(fill=tk.BOTH, expand=True)
+        
+        # Wskazniki stanu: pasek i wartosc
+        self.gauges = {}
+        for key, label_text in (('y', "Wysokość"), ('predkosc', "Prędkość"), ('masa_paliwa', "Paliwo")):
+            row = tk.Frame(live_card, bg=self.bg_card)
+            row.pack(fill=tk.X, padx=12, pady=3)
+            tk.Label(row, text=label_text, bg=self.bg_card, fg=self.text_primary, font=("Inter", 10),
+                     width=10, anchor=tk.W).pack(side=tk.LEFT)
+            bar = ttk.Progressbar(row, orient=tk.HORIZONTAL, mode='determinate', maximum=1.0)
+            bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8)
+            value_label = tk.Label(row, text="-", bg=self.bg_card, fg=self.text_secondary,
+                                   font=("Inter", 10, "bold"), width=12, anchor=tk.E)
+            value_label.pack(side=tk.LEFT)
+            self.gauges[key] = (bar, value_label)
+        
+        # Wykresy powstaja przy pierwszym uruchomieniu - start GUI nie laduje matplotlib
+        self.plot_container = tk.Frame(live_card, bg=self.bg_card)
+        self.plot_container.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self.plot_placeholder = tk.Label(
+            self.plot_container,
+            text="Wykresy pojawią się po uruchomieniu symulacji",
+            bg=self.bg_card,
+            fg=self.text_muted,
+            font=("Inter", 10)
+        )
+        self.plot_placeholder.pack(expand=True)
+        self.live_view = None
+        self.live_canvas = None
+    
+    def _ensure_live_plots(self):
+        if self.live_view is not None:
+            return
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        self.plot_placeholder.destroy()
+        figure = Figure(figsize=(6, 6), dpi=90)
+        self.live_canvas = FigureCanvasTkAgg(figure, master=self.plot_container)
+        self.live_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.live_view = WidokTelemetrii(figure)
+    
+    def _update_gauges(self, sample):
+        predkosc = (sample['vx'] ** 2 + sample['vy'] ** 2) ** 0.5
+        self.gauge_limits['predkosc'] = max(self.gauge_limits['predkosc'], predkosc)
+        values = {'y': sample['y'], 'predkosc': predkosc, 'masa_paliwa': sample['masa_paliwa']}
+        units = {'y': "m", 'predkosc': "m/s", 'masa_paliwa': "kg"}
+        for key, (bar, value_label) in self.gauges.items():
+            limit = self.gauge_limits[key]
+            bar['value'] = min(max(values[key] / limit, 0.0), 1.0) if limit > 0 else 0.0
+            value_label.config(text=f"{values[key]:.1f} {units[key]}")
+    
     def create_modern_slider(self, parent, label_text, min_val, max_val, default_val, unit):
         container = tk.Frame(parent, bg=self.bg_card)
         container.pack(fill=tk.X, padx=12, pady=6)
@@ -306,130 +394,167 @@ class SymulacjaGUI:
         info = f"{dane['opis']} | Grawitacja: {dane['grawitacja']:.2f} m/s²"
         self.planet_info_label.config(text=info)
     
-    def run_simulation(self):
-        self.run_button.config(
-            state=tk.DISABLED, 
-            text="⚡ TRWA SYMULACJA...",
-            bg=self.bg_secondary,
-            fg=self.text_muted
+    def _build_scenario(self, planeta):
+        return Scenariusz(
+            planeta=planeta,
+            wysokosc_startowa=float(self.wysokosc_slider.get()),
+            predkosc_pionowa_startowa=-float(self.predkosc_slider.get()),  # Ujemna bo w dół
+            predkosc_pozioma_startowa=float(self.predkosc_x_slider.get()),
+            rakieta=SpecyfikacjaRakiety(masa_rakiety_pusta=float(self.masa_slider.get()),
+                                        masa_paliwa=float(self.paliwo_slider.get())),
+            krok_czasowy=0.1,
+            czas_maksymalny=300,
+            czy_autopilot_wlaczony=self.autopilot_var.get()
         )
-        self.status_label.config(text="Symulacja w toku...", fg=self.accent_warning)
-        
-        thread = threading.Thread(target=self._run_simulation_thread)
-        thread.daemon = True
-        thread.start()
     
-    def _run_simulation_thread(self):
-        """Wątek wykonujący symulację"""
-        try:
-            # Pobierz parametry
-            planeta = self.planeta_var.get()
-            wysokosc = float(self.wysokosc_slider.get())
-            predkosc_y = -float(self.predkosc_slider.get())  # Ujemna bo w dół
-            predkosc_x = float(self.predkosc_x_slider.get())
-            masa_paliwa = float(self.paliwo_slider.get())
-            masa_pusta = float(self.masa_slider.get())
-            autopilot = self.autopilot_var.get()
-            verbose = self.verbose_var.get()
-            
-            # Zaktualizuj config
-            config.WYSOKOSC_STARTOWA = wysokosc
-            config.PREDKOSC_PIONOWA_STARTOWA = predkosc_y
-            config.PREDKOSC_POZIOMA_STARTOWA = predkosc_x
-            config.MASA_PALIWA_STARTOWA = masa_paliwa
-            config.MASA_RAKIETY_PUSTA = masa_pusta
-            
-            symulacja = Symulacja(
-                krok_czasowy=0.1,
-                czas_maksymalny=300,
-                czy_autopilot_wlaczony=autopilot,
-                planeta=planeta
-            )
-            
-            print("\n" + "="*60)
-            print("URUCHAMIANIE SYMULACJI")
-            print("="*60)
-            
-            wyniki = symulacja.uruchom(czy_wyswietlac_postep=verbose)
-            
-            if wyniki['sukces']:
-                status_text = "● SUKCES! Rakieta wylądowała bezpiecznie!"
-                status_color = self.accent_success
-                print(status_text)
-            else:
-                status_text = "● NIEPOWODZENIE"
-                status_color = self.accent_danger
-                print(status_text)
-            print(f"  {wyniki['komunikat']}")
-            print("="*60)
-            
-            self.root.after(0, lambda: self._update_status_and_visualize(status_text, status_color, wyniki['sukces'], wyniki))
-            
-        except Exception as e:
-            error_msg = f"● Błąd: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: self._update_status_and_visualize(error_msg, self.accent_danger, False, None))
+    def run_simulation(self):
+        self.queue_jobs([self.planeta_var.get()])
     
-    def _update_status_and_visualize(self, text, color, success, wyniki):
-        self.status_label.config(text=text, fg=color)
-        self.run_button.config(
-            state=tk.NORMAL, 
-            text="Uruchom Symulację",
-            bg=self.accent_primary,
-            fg="#ffffff"
-        )
-        
-        if success and wyniki:
-            try:
-                print("\nTworzenie wizualizacji...")
-                import matplotlib
-                matplotlib.use('TkAgg')
-                wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=True)
-                print("Wizualizacja utworzona!")
-            except Exception as e:
-                print(f"Blad wizualizacji: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        if success:
-            messagebox.showinfo(
-                "Sukces!",
-                "Gratulacje! Rakieta wylądowała bezpiecznie!\n\n"
-                "Wykresy zostały zapisane w folderze 'data'."
-            )
-        elif wyniki is not None:
-            messagebox.showwarning(
-                "Niepowodzenie",
-                f"{text}\n\n"
-                "Spróbuj dostosować parametry i spróbuj ponownie."
-            )
+    def run_all_planets(self):
+        self.queue_jobs(list(config.PLANETY.keys()))
     
-    def _update_status(self, text, color, success):
-        self.status_label.config(text=text, fg=color)
-        self.run_button.config(
-            state=tk.NORMAL, 
-            text="Uruchom Symulację",
-            bg=self.accent_primary,
-            fg="#ffffff"
+    def queue_jobs(self, planety):
+        """Dodaje scenariusze (planety x aktualne suwaki) do kolejki zadań"""
+        for planeta in planety:
+            scenariusz = self._build_scenario(planeta)
+            nazwa = (f"{config.PLANETY[planeta]['nazwa']}, h={scenariusz.wysokosc_startowa:.0f} m, "
+                     f"v={-scenariusz.predkosc_pionowa_startowa:.0f} m/s")
+            job_id = self.jobs.dodaj(scenariusz, nazwa)
+            self.jobs_tree.insert('', tk.END, iid=str(job_id), values=(nazwa, "oczekuje", "0%", "", "", "", ""))
+        
+        if self.followed_job is None or self.jobs.zadania[self.followed_job].czy_zakonczone:
+            self._follow_job(job_id)
+        self.status_label.config(text="Symulacje w toku...", fg=self.accent_warning)
+        if not self.refresh_scheduled:
+            self.refresh_scheduled = True
+            self.root.after(config.TELEMETRIA_OKRES_ODSWIEZANIA_MS, self._refresh_jobs)
+    
+    def _selected_jobs(self):
+        return [int(iid) for iid in self.jobs_tree.selection()]
+    
+    def pause_selected(self):
+        for job_id in self._selected_jobs():
+            self.jobs.wstrzymaj(job_id)
+            self._update_job_row(job_id)
+    
+    def resume_selected(self):
+        for job_id in self._selected_jobs():
+            self.jobs.wznow(job_id)
+            self._update_job_row(job_id)
+    
+    def cancel_selected(self):
+        for job_id in self._selected_jobs():
+            self.jobs.anuluj(job_id)
+            self._update_job_row(job_id)
+    
+    def _finished_jobs(self):
+        """Zakończone zadania spośród zaznaczonych (bez zaznaczenia - wszystkie)"""
+        selected = self._selected_jobs() or list(self.jobs.zadania)
+        return [self.jobs.zadania[job_id] for job_id in selected
+                if self.jobs.zadania[job_id].stan == ZAKONCZONE]
+    
+    def compare_selected(self):
+        """Okno z wykresami wybranych zakończonych zadań obok siebie"""
+        finished = self._finished_jobs()
+        if not finished:
+            messagebox.showinfo("Porównanie", "Brak zakończonych zadań do porównania.")
+            return
+        
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        window = tk.Toplevel(self.root)
+        window.title("Porównanie przebiegów")
+        figure = Figure(figsize=(12, 4), dpi=90)
+        canvas = FigureCanvasTkAgg(figure, master=window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        rysuj_porownanie(figure, [(job.nazwa, job.wyniki) for job in finished])
+        canvas.draw()
+    
+    def save_plots_selected(self):
+        """Zapisuje wykresy wybranych zakończonych zadań do plików PNG w folderze danych"""
+        finished = self._finished_jobs()
+        if not finished:
+            messagebox.showinfo("Zapis wykresów", "Brak zakończonych zadań do zapisania.")
+            return
+        
+        os.makedirs(config.KATALOG_DANYCH_WYJSCIOWYCH, exist_ok=True)
+        with RysownikWynikow() as rysownik:
+            for job in finished:
+                nazwa_pliku = f"symulacja_{job.scenariusz.planeta}_{job.identyfikator}.png"
+                rysownik.renderuj(job.wyniki, os.path.join(config.KATALOG_DANYCH_WYJSCIOWYCH, nazwa_pliku))
+        self.status_label.config(
+            text=f"Zapisano wykresy {len(finished)} zadań w folderze '{config.KATALOG_DANYCH_WYJSCIOWYCH}'",
+            fg=self.accent_success
         )
-        
-        if success:
-            messagebox.showinfo(
-                "Sukces!",
-                "Gratulacje! Rakieta wylądowała bezpiecznie!\n\n"
-                "Wykresy zostały zapisane w folderze 'data'."
-            )
-        else:
-            messagebox.showwarning(
-                "Niepowodzenie",
-                f"{text}\n\n"
-                "Spróbuj dostosować parametry i spróbuj ponownie."
-            )
+    
+    def _on_job_selected(self, event=None):
+        selected = self._selected_jobs()
+        if len(selected) == 1 and selected[0] != self.followed_job:
+            self._follow_job(selected[0])
+    
+    def _follow_job(self, job_id):
+        """Podgląd na żywo pokazuje wskazane zadanie"""
+        self._ensure_live_plots()
+        self.live_view.resetuj()
+        self.followed_job = job_id
+        self.followed_samples = 0
+        scenariusz = self.jobs.zadania[job_id].scenariusz
+        self.gauge_limits = {
+            'y': scenariusz.wysokosc_startowa,
+            'predkosc': (scenariusz.predkosc_pozioma_startowa ** 2 + scenariusz.predkosc_pionowa_startowa ** 2) ** 0.5,
+            'masa_paliwa': scenariusz.rakieta.masa_paliwa
+        }
+        self._update_live_view()
+    
+    def _update_live_view(self):
+        job = self.jobs.zadania[self.followed_job]
+        if self.live_view.dodaj(job.probki_od(self.followed_samples)):
+            self.followed_samples = job.liczba_probek
+            self._update_gauges(self.live_view.ostatnia_probka)
+        self.live_canvas.draw_idle()
+    
+    def _update_job_row(self, job_id):
+        job = self.jobs.zadania[job_id]
+        values = [job.nazwa, job.stan, f"{job.postep * 100:.0f}%", "", "", "", ""]
+        if job.stan == ZAKONCZONE:
+            stan_koncowy = job.wyniki['stan_koncowy']
+            values[3:] = ["SUKCES" if job.wyniki['sukces'] else "PORAŻKA", f"{stan_koncowy['vy']:.2f}",
+                          f"{stan_koncowy['masa_paliwa']:.1f}", f"{job.wyniki['czas_symulacji']:.1f}"]
+        elif job.blad is not None:
+            values[3] = "BŁĄD"
+        self.jobs_tree.item(str(job_id), values=values)
+    
+    def _refresh_jobs(self):
+        """Odbiera postęp zadań w stałym rytmie - symulacje liczą się w innych procesach"""
+        for job_id in self.jobs.odbierz_postep():
+            self._update_job_row(job_id)
+            if job_id == self.followed_job:
+                self._update_live_view()
+        
+        jobs = self.jobs.zadania.values()
+        running = sum(job.stan == TRWA for job in jobs)
+        finished = sum(job.czy_zakonczone for job in jobs)
+        if self.jobs.czy_wszystkie_zakonczone():
+            successes = sum(job.stan == ZAKONCZONE and job.wyniki['sukces'] for job in jobs)
+            self.status_label.config(text=f"● Zakończono {finished} zadań, udane lądowania: {successes}",
+                                     fg=self.accent_success if successes == finished else self.text_primary)
+            self.refresh_scheduled = False
+            return
+        
+        self.status_label.config(text=f"Symulacje w toku: {running} liczonych, {finished}/{len(jobs)} zakończonych",
+                                 fg=self.accent_warning)
+        self.root.after(config.TELEMETRIA_OKRES_ODSWIEZANIA_MS, self._refresh_jobs)
+    
+    def on_close(self):
+        self.jobs.zamknij()
+        self.root.destroy()
 
 
 def main():
     root = tk.Tk()
     app = SymulacjaGUI(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
 
 
@@ -1,6 +1,10 @@
 import numpy as np
-from src import config
 from src import fizyka
+from src.scenariusz import NastawyAutopilota, wczytaj_tabele_nastaw
+
+
+# Największe pochylenie, na jakie pozwala regulator pozycji poziomej [rad]
+KAT_NACHYLENIA_MAKSYMALNY = np.pi / 6
 
 
 class RegulatorPID:
@@ -21,6 +25,12 @@ class RegulatorPID:
         self.blad_poprzedni = 0.0
         self.czy_pierwszy_krok = True
         
+    def stan(self):
+        return (self.suma_calkujaca, self.blad_poprzedni, self.czy_pierwszy_krok)
+    
+    def przywroc_stan(self, stan):
+        self.suma_calkujaca, self.blad_poprzedni, self.czy_pierwszy_krok = stan
+        
     def oblicz_sterowanie(self, blad_regulacji, krok_czasowy):
         czlon_proporcjonalny = self.wspolczynnik_proporcjonalny * blad_regulacji
         
@@ -46,35 +56,50 @@ class RegulatorPID:
 
 
 class Autopilot:
-    def __init__(self, rakieta):
+    def __init__(self, rakieta, nastawy=None):
+        if nastawy is None:
+            nastawy = NastawyAutopilota()
         self.rakieta = rakieta
+        self.nastawy = nastawy
         
         self.regulator_wysokosci = RegulatorPID(
-            wspolczynnik_proporcjonalny=config.WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC,
-            wspolczynnik_calkujacy=config.WSPOLCZYNNIK_CALKUJACY_WYSOKOSC,
-            wspolczynnik_rozniczkujacy=config.WSPOLCZYNNIK_ROZNICZKUJACY_WYSOKOSC,
+            wspolczynnik_proporcjonalny=nastawy.wspolczynnik_proporcjonalny_wysokosc,
+            wspolczynnik_calkujacy=nastawy.wspolczynnik_calkujacy_wysokosc,
+            wspolczynnik_rozniczkujacy=nastawy.wspolczynnik_rozniczkujacy_wysokosc,
             wartosc_minimalna=0,
             wartosc_maksymalna=rakieta.cieg_maksymalny
         )
         
         self.regulator_pozycji_poziomej = RegulatorPID(
-            wspolczynnik_proporcjonalny=config.WSPOLCZYNNIK_PROPORCJONALNY_POZIOM,
+            wspolczynnik_proporcjonalny=nastawy.wspolczynnik_proporcjonalny_poziom,
             wspolczynnik_calkujacy=0.0,
-            wspolczynnik_rozniczkujacy=config.WSPOLCZYNNIK_ROZNICZKUJACY_POZIOM,
-            wartosc_minimalna=-np.pi/6,
-            wartosc_maksymalna=np.pi/6
+            wspolczynnik_rozniczkujacy=nastawy.wspolczynnik_rozniczkujacy_poziom,
+            wartosc_minimalna=-KAT_NACHYLENIA_MAKSYMALNY,
+            wartosc_maksymalna=KAT_NACHYLENIA_MAKSYMALNY
         )
         
         self.tryb_ladowania = "normalne"
+    
+    @classmethod
+    def z_tabeli_nastaw(cls, rakieta, planeta, tabela):
+        """
+        Tworzy autopilota z nastawami dla planety z tabeli (słownik lub ścieżka
+        do pliku JSON ze strojenia). Planety spoza tabeli dostają nastawy domyślne.
+        """
+        if isinstance(tabela, str):
+            tabela = wczytaj_tabele_nastaw(tabela)
+        return cls(rakieta, tabela.get(planeta))
         
     def oblicz_sterowanie(self, krok_czasowy):
         if self.rakieta.pozycja_y > 0.1 and self.rakieta.predkosc_y < 0:
             przyspieszenie_maksymalne = (self.rakieta.cieg_maksymalny / self.rakieta.masa_calkowita) - self.rakieta.grawitacja
             if przyspieszenie_maksymalne > 0:
-                czas_hamowania = abs(self.rakieta.predkosc_y) / przyspieszenie_maksymalne
-                droga_hamowania = abs(self.rakieta.predkosc_y) * czas_hamowania / 2
+                # Komenda obowiązuje przez cały okres sterowania - decyzja dla stanu na jego końcu
+                wysokosc, predkosc = self.stan_po_okresie_bez_ciagu(krok_czasowy)
+                czas_hamowania = abs(predkosc) / przyspieszenie_maksymalne
+                droga_hamowania = abs(predkosc) * czas_hamowania / 2
                 
-                if self.rakieta.pozycja_y < droga_hamowania * 1.8:
+                if wysokosc < droga_hamowania * self.nastawy.margines_suicide_burn:
                     self.tryb_ladowania = "suicide_burn"
                 else:
                     self.tryb_ladowania = "normalne"
@@ -83,15 +108,21 @@ class Autopilot:
         else:
             self.tryb_ladowania = "normalne"
         
+        kat_nachylenia = self.kontrola_pozycji_poziomej(krok_czasowy)
+        
         if self.tryb_ladowania == "suicide_burn":
-            cieg_zadany = self.ladowanie_suicide_burn()
+            cieg_zadany = self.ladowanie_suicide_burn(kat_nachylenia)
         else:
             cieg_zadany = self.ladowanie_normalne(krok_czasowy)
         
-        kat_nachylenia = self.kontrola_pozycji_poziomej(krok_czasowy)
-        
         return cieg_zadany, kat_nachylenia
     
+    def stan_po_okresie_bez_ciagu(self, okres):
+        """Wysokość i prędkość pionowa po okresie sterowania w locie swobodnym."""
+        grawitacja = self.rakieta.grawitacja
+        wysokosc = self.rakieta.pozycja_y + self.rakieta.predkosc_y * okres - grawitacja * okres ** 2 / 2
+        return wysokosc, self.rakieta.predkosc_y - grawitacja * okres
+    
     def ladowanie_normalne(self, krok_czasowy):
         if self.rakieta.pozycja_y > 100:
             predkosc_docelowa = -15.0
@@ -105,7 +136,7 @@ class Autopilot:
         
         return cieg_zadany
     
-    def ladowanie_suicide_burn(self):
+    def ladowanie_suicide_burn(self, kat_nachylenia=0.0):
         if self.rakieta.pozycja_y <= 0:
             return self.rakieta.cieg_maksymalny
         
@@ -115,7 +146,7 @@ class Autopilot:
             przyspieszenie_potrzebne = 0
         
         przyspieszenie_calkowite = przyspieszenie_potrzebne + self.rakieta.grawitacja
-        cieg_potrzebny = self.rakieta.masa_calkowita * przyspieszenie_calkowite
+        cieg_potrzebny = self.rakieta.masa_calkowita * przyspieszenie_calkowite / np.cos(kat_nachylenia)
         cieg_zadany = max(0, min(cieg_potrzebny, self.rakieta.cieg_maksymalny))
         
         if self.rakieta.pozycja_y < 10 and self.rakieta.predkosc_y < -3:
@@ -139,3 +170,16 @@ class Autopilot:
         self.regulator_wysokosci.resetuj()
         self.regulator_pozycji_poziomej.resetuj()
         self.tryb_ladowania = "normalne"
+    
+    def stan(self):
+        """Stan wewnętrzny (tryb i człony regulatorów) - do punktów kontrolnych."""
+        return {
+            'tryb_ladowania': self.tryb_ladowania,
+            'regulator_wysokosci': self.regulator_wysokosci.stan(),
+            'regulator_pozycji_poziomej': self.regulator_pozycji_poziomej.stan()
+        }
+    
+    def przywroc_stan(self, stan):
+        self.tryb_ladowania = stan['tryb_ladowania']
+        self.regulator_wysokosci.przywroc_stan(stan['regulator_wysokosci'])
+        self.regulator_pozycji_poziomej.przywroc_stan(stan['regulator_pozycji_poziomej'])
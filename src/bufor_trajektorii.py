@@ -0,0 +1,123 @@
+"""
+Kolumnowy bufor historii lotu.
+
+Zapisuje w każdym kroku tylko surowy stan rakiety do prealokowanej,
+powiększanej tablicy strukturalnej NumPy. Wielkości pochodne (prędkość
+całkowita, masa całkowita, energie) są liczone wektorowo dopiero przy
+odczycie.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+
+KOLUMNY_SUROWE = ('czas', 'x', 'y', 'vx', 'vy', 'masa_paliwa', 'cieg', 'kat')
+
+# Kolejność kluczy taka sama jak w dawnym słowniku list Symulacja.historia_danych
+KOLUMNY_HISTORII = ('czas', 'x', 'y', 'vx', 'vy', 'predkosc', 'masa_calkowita', 'masa_paliwa',
+                    'cieg', 'kat', 'energia_kinetyczna', 'energia_potencjalna')
+
+
+class BuforTrajektorii:
+    def __init__(self, masa_rakiety_pusta, grawitacja, pojemnosc=1024, typ_danych=np.float64):
+        self.masa_rakiety_pusta = masa_rakiety_pusta
+        self.grawitacja = grawitacja
+        self.typ_danych = np.dtype(typ_danych)
+        self.typ_wiersza = np.dtype([(nazwa, self.typ_danych) for nazwa in KOLUMNY_SUROWE])
+        self._dane = np.empty(max(1, int(pojemnosc)), dtype=self.typ_wiersza)
+        self.liczba_wierszy = 0
+
+    def __len__(self):
+        return self.liczba_wierszy
+
+    @property
+    def pojemnosc(self):
+        return len(self._dane)
+
+    @property
+    def dane(self):
+        """Zapisane wiersze jako widok tablicy strukturalnej (bez kopiowania)."""
+        return self._dane[:self.liczba_wierszy]
+
+    def _powieksz(self):
+        nowe_dane = np.empty(2 * len(self._dane), dtype=self.typ_wiersza)
+        nowe_dane[:self.liczba_wierszy] = self._dane[:self.liczba_wierszy]
+        self._dane = nowe_dane
+
+    def dodaj(self, czas, x, y, vx, vy, masa_paliwa, cieg, kat):
+        if self.liczba_wierszy == len(self._dane):
+            self._powieksz()
+        self._dane[self.liczba_wierszy] = (czas, x, y, vx, vy, masa_paliwa, cieg, kat)
+        self.liczba_wierszy += 1
+
+    def dodaj_wiele(self, czas, x, y, vx, vy, masa_paliwa, cieg, kat):
+        """Dopisuje wiele wierszy naraz; argumenty są rozgłaszane do wspólnej długości."""
+        kolumny = np.broadcast_arrays(czas, x, y, vx, vy, masa_paliwa, cieg, kat)
+        liczba = kolumny[0].size
+        while self.liczba_wierszy + liczba > len(self._dane):
+            self._powieksz()
+        wiersze = self._dane[self.liczba_wierszy:self.liczba_wierszy + liczba]
+        for nazwa, kolumna in zip(KOLUMNY_SUROWE, kolumny):
+            wiersze[nazwa] = kolumna.ravel()
+        self.liczba_wierszy += liczba
+
+    def wyczysc(self):
+        self.liczba_wierszy = 0
+
+    def kolumna(self, nazwa):
+        dane = self.dane
+        if nazwa in KOLUMNY_SUROWE:
+            return dane[nazwa]
+
+        if nazwa == 'masa_calkowita':
+            return self.masa_rakiety_pusta + dane['masa_paliwa'].astype(np.float64)
+        if nazwa == 'predkosc':
+            vx = dane['vx'].astype(np.float64)
+            vy = dane['vy'].astype(np.float64)
+            return np.sqrt(vx**2 + vy**2)
+        if nazwa == 'energia_kinetyczna':
+            return 0.5 * self.kolumna('masa_calkowita') * self.kolumna('predkosc')**2
+        if nazwa == 'energia_potencjalna':
+            return self.kolumna('masa_calkowita') * self.grawitacja * dane['y'].astype(np.float64)
+
+        raise KeyError(nazwa)
+
+    def widok(self):
+        return WidokHistorii(self)
+
+
+class WidokHistorii(Mapping):
+    """
+    Słownikowy widok na bufor, zgodny z dawnym `historia_danych`.
+
+    Kolumny pochodne są liczone przy pierwszym odczycie i zapamiętywane do
+    czasu dopisania kolejnych wierszy.
+    """
+
+    def __init__(self, bufor):
+        self._bufor = bufor
+        self._pamiec = {}
+        self._liczba_wierszy_pamieci = -1
+
+    def __getitem__(self, klucz):
+        if klucz not in KOLUMNY_HISTORII:
+            raise KeyError(klucz)
+        if klucz in KOLUMNY_SUROWE:
+            return self._bufor.kolumna(klucz)
+
+        if self._liczba_wierszy_pamieci != len(self._bufor):
+            self._pamiec = {}
+            self._liczba_wierszy_pamieci = len(self._bufor)
+        if klucz not in self._pamiec:
+            self._pamiec[klucz] = self._bufor.kolumna(klucz)
+        return self._pamiec[klucz]
+
+    def __iter__(self):
+        return iter(KOLUMNY_HISTORII)
+
+    def __len__(self):
+        return len(KOLUMNY_HISTORII)
+
+    def __repr__(self):
+        return f"WidokHistorii(wiersze={len(self._bufor)}, kolumny={list(KOLUMNY_HISTORII)})"
@@ -1,6 +1,23 @@
 KROK_CZASOWY_SYMULACJI = 0.1
 CZAS_MAKSYMALNY_SYMULACJI = 300.0
 DOKLADNOSC_WYKRYWANIA_LADOWANIA = 0.01
+DOKLADNOSC_CZASU_ZDARZENIA = 1e-9
+
+# Okres pracy autopilota (None - w każdym kroku fizyki) i opóźnienie wykonania komendy [s]
+OKRES_STEROWANIA = None
+OPOZNIENIE_STEROWANIA = 0.0
+
+# Przewijanie faz lotu bez ciągu w postaci zamkniętej zamiast krok po kroku
+PRZEWIJANIE_LOTU_SWOBODNEGO = True
+# Krótszych odcinków nie przewija się - stały koszt postaci zamkniętej i zapisu wielu próbek
+# naraz (ok. 80 us) przewyższa wtedy koszt zwykłych kroków
+PRZEWIJANIE_MINIMALNA_LICZBA_KROKOW = 40
+
+# Schemat całkowania: 'euler' (półjawny), 'rk4' lub 'dopri45' (adaptacyjny - opłaca się
+# tylko z OKRES_STEROWANIA dłuższym od kroku czasowego, inaczej rk4 liczy mniej)
+INTEGRATOR_DOMYSLNY = 'euler'
+TOLERANCJA_WZGLEDNA_INTEGRATORA = 1e-6
+TOLERANCJA_BEZWZGLEDNA_INTEGRATORA = 1e-6
 
 WYSOKOSC_STARTOWA = 1000.0
 PREDKOSC_PIONOWA_STARTOWA = -50.0
@@ -77,16 +94,90 @@ WSPOLCZYNNIK_PROPORCJONALNY_POZIOM = 0.2
 WSPOLCZYNNIK_ROZNICZKUJACY_POZIOM = 0.5
 
 PREDKOSC_LADOWANIA_MAKSYMALNA = 2.0
-MARGINES_BEZPIECZENSTWA_SUICIDE_BURN = 1.5
+# Suicide burn zaczyna się, gdy wysokość < droga_hamowania * margines
+MARGINES_BEZPIECZENSTWA_SUICIDE_BURN = 1.8
+
+# Tryb naprowadzania: 'heurystyczne' (PID i suicide burn z drogi hamowania),
+# 'predykcyjne' (wybór profilu hamowania z symulacji wielu kandydatów do przodu)
+# lub 'tabelaryczne' (profil odczytany z tablicy optymalnego lądowania)
+NAPROWADZANIE_DOMYSLNE = 'heurystyczne'
+# Naprowadzanie predykcyjne: liczba kandydatów (połowa wokół poprzedniego rozwiązania),
+# kroki propagacji fazy hamowania, największe planowane opóźnienie jako część możliwego
+# przy pełnym ciągu i największym pochyleniu (reszta to zapas na korekty) oraz docelowa i dopuszczalna
+# prędkość przyziemienia jako część prędkości maksymalnej
+NAPROWADZANIE_LICZBA_KANDYDATOW = 24
+NAPROWADZANIE_LICZBA_KROKOW_PROPAGACJI = 24
+NAPROWADZANIE_ZAPAS_CIAGU = 0.9
+NAPROWADZANIE_PREDKOSC_DOCELOWA = 0.5
+NAPROWADZANIE_PREDKOSC_DOPUSZCZALNA = 0.8
+
+# Tablice optymalnego lądowania: katalog pamięci podręcznej, zasięg osi (wysokość [m],
+# prędkość opadania [m/s], masa paliwa [kg]), liczba węzłów osi oraz liczba kandydatów
+# i kroków propagacji przy budowie
+KATALOG_TABLIC_LADOWANIA = "data/tablice_ladowania"
+TABLICE_ZASIEG_OSI = (4000.0, 150.0, 1000.0)
+TABLICE_LICZBA_WEZLOW = (96, 64, 9)
+TABLICE_LICZBA_KANDYDATOW = 64
+TABLICE_LICZBA_KROKOW_PROPAGACJI = 48
 
 KATALOG_DANYCH_WYJSCIOWYCH = "data"
 NAZWA_BAZOWA_PLIKU_DANYCH = "symulacja"
+# Format zapisu trajektorii: "npz", "surowy" (.traj, do odczytu przez np.memmap) lub "json"
+FORMAT_ZAPISU_DANYCH = "npz"
+KOMPRESJA_ZAPISU_DANYCH = False
+KATALOG_PAMIECI_WYNIKOW = "data/pamiec_wynikow"
+PLIK_TABELI_NASTAW = "data/nastawy_planet.json"
+KATALOG_MAGAZYNU_PRZEBIEGOW = "data/przebiegi"
+MAGAZYN_CZAS_OCZEKIWANIA_NA_BLOKADE = 30.0
 ZAPISYWANIE_CO_ILE_KROKOW = 1
 
 ROZMIAR_WYKRESU_CALE = (15, 10)
 ROZDZIELCZOSC_WYKRESU_DPI = 100
 STYL_WYKRESOW_MATPLOTLIB = 'seaborn-v0_8-darkgrid'
+# Redukcja punktów linii przed rysowaniem: 'min_max', 'lttb' albo None (bez redukcji)
+PROBKOWANIE_WYKRESOW = 'min_max'
 KOLOR_RAKIETY_WYKRES = 'red'
 KOLOR_TRAJEKTORII_WYKRES = 'blue'
 KOLOR_PALIWA_WYKRES = 'green'
 KOLOR_CIAGU_WYKRES = 'orange'
+
+# Podgląd na żywo w GUI: pojemność kolejki próbek i okres odświeżania widoku
+TELEMETRIA_POJEMNOSC_KOLEJKI = 10000
+TELEMETRIA_OKRES_ODSWIEZANIA_MS = 50
+
+# Kolejka zadań GUI: co ile kroków proces roboczy sprawdza zegar raportu i co ile sekund raportuje postęp
+ZADANIA_KROKI_MIEDZY_SPRAWDZENIAMI = 50
+ZADANIA_OKRES_RAPORTU_S = 0.1
+# Ile ostatnich próbek zadania pamięta proces GUI - pełna historia jest w wynikach zadania
+ZADANIA_POJEMNOSC_PROBEK = 10000
+
+# Przebieg w tempie zegara: co ile sekund zegara synchronizacja z czasem symulacji
+# i po jakim spóźnieniu [s] zegar przestaje nadrabiać zaległości
+TEMPO_OKRES_SYNCHRONIZACJI_S = 1 / 60
+TEMPO_MAKSYMALNE_OPOZNIENIE_S = 0.25
+
+# Instrumentacja: liczba pozycji w raporcie profilu i alokacji pamięci
+INSTRUMENTACJA_LICZBA_POZYCJI_RAPORTU = 20
+
+ROZMIAR_ANIMACJI_CALE = (8, 8)
+ROZDZIELCZOSC_ANIMACJI_DPI = 100
+ANIMACJA_KLATKI_NA_SEKUNDE = 30
+# Długość rakiety na animacji jako część wysokości osi
+ANIMACJA_DLUGOSC_RAKIETY = 0.06
+
+# Zakresy losowania warunków początkowych dla analizy Monte Carlo
+MONTE_CARLO_ZAKRES_WYSOKOSCI = (500.0, 3000.0)
+MONTE_CARLO_ZAKRES_PREDKOSCI_PIONOWEJ = (-100.0, -10.0)
+MONTE_CARLO_ZAKRES_PREDKOSCI_POZIOMEJ = (-20.0, 20.0)
+MONTE_CARLO_ZAKRES_MASY_PALIWA = (100.0, 1000.0)
+
+# Bufor historii lotu ('float64' lub 'float32' dla mniejszego zużycia pamięci)
+TYP_DANYCH_HISTORII = 'float64'
+MAKSYMALNA_POCZATKOWA_POJEMNOSC_HISTORII = 65536
+
+# Funkcja kosztu strojenia nastaw: zużyte paliwo (ułamek), prędkość przyziemienia
+# (względem dopuszczalnej), przesunięcie poziome [1/m] i kara za nieudane lądowanie
+STROJENIE_WAGA_PALIWA = 1.0
+STROJENIE_WAGA_PREDKOSCI = 1.0
+STROJENIE_WAGA_PRZESUNIECIA = 0.02
+STROJENIE_KARA_ZA_PORAZKE = 10.0
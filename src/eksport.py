@@ -0,0 +1,160 @@
+"""
+Binarny zapis i odczyt trajektorii lotu.
+
+Dwa formaty, oba z jedną ciągłą tablicą na kanał historii i małym
+nagłówkiem z metadanymi (wyniki bez historii, scenariusz):
+
+- 'npz' - archiwum NumPy `.npz`, opcjonalnie skompresowane,
+- 'surowy' - plik `.traj`: sygnatura, długość nagłówka, nagłówek JSON i
+  kanały wyrównane do 64 bajtów. Odczyt przez `np.memmap` nie wczytuje
+  całego pliku - strony danych są ładowane dopiero przy dostępie.
+
+JSON pozostaje dostępny w Symulacja.zapisz_do_pliku(format='json').
+"""
+
+import json
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.bufor_trajektorii import KOLUMNY_HISTORII
+
+
+SYGNATURA = b'RAKTRAJ1'
+WYROWNANIE = 64
+WERSJA_FORMATU = 1
+ROZSZERZENIA = {'npz': '.npz', 'surowy': '.traj', 'json': '.json'}
+
+
+def wartosc_json(wartosc):
+    # Skalary i tablice NumPy w metadanych (np. wyniki wsadowe)
+    if isinstance(wartosc, np.generic):
+        return wartosc.item()
+    if isinstance(wartosc, np.ndarray):
+        return wartosc.tolist()
+    raise TypeError(f"Nie można zapisać {type(wartosc).__name__} w JSON")
+
+
+def _wyrownaj(pozycja):
+    return -(-pozycja // WYROWNANIE) * WYROWNANIE
+
+
+def _rozdziel_wyniki(wyniki):
+    metadane = {klucz: wartosc for klucz, wartosc in wyniki.items() if klucz != 'historia'}
+    return metadane, wyniki['historia']
+
+
+def zapisz_npz(sciezka, wyniki, czy_kompresowac=False, typ_danych=np.float64):
+    metadane, historia = _rozdziel_wyniki(wyniki)
+    kanaly = {klucz: np.asarray(historia[klucz], dtype=typ_danych) for klucz in KOLUMNY_HISTORII}
+    zapisz = np.savez_compressed if czy_kompresowac else np.savez
+    with open(sciezka, 'wb') as plik:
+        zapisz(plik, __metadane__=np.array(json.dumps(metadane, default=wartosc_json, ensure_ascii=False)), **kanaly)
+    return sciezka
+
+
+def zapisz_surowy(sciezka, wyniki, typ_danych=np.float64):
+    metadane, historia = _rozdziel_wyniki(wyniki)
+    typ_danych = np.dtype(typ_danych).newbyteorder('<')
+    liczba_probek = len(historia['czas'])
+    rozmiar_kanalu = liczba_probek * typ_danych.itemsize
+
+    # Przesunięcia zależą od długości nagłówka, a nagłówek zawiera przesunięcia -
+    # rezerwujemy więc miejsce z zapasem, licząc nagłówek dla dużych przesunięć
+    naglowek = {
+        'wersja': WERSJA_FORMATU,
+        'typ_danych': typ_danych.str,
+        'liczba_probek': liczba_probek,
+        'kanaly': {klucz: 10**15 for klucz in KOLUMNY_HISTORII},
+        'metadane': metadane
+    }
+    dlugosc_naglowka = len(json.dumps(naglowek, default=wartosc_json, ensure_ascii=False).encode('utf-8'))
+    poczatek_danych = _wyrownaj(len(SYGNATURA) + 8 + dlugosc_naglowka)
+    naglowek['kanaly'] = {
+        klucz: poczatek_danych + indeks * _wyrownaj(rozmiar_kanalu)
+        for indeks, klucz in enumerate(KOLUMNY_HISTORII)
+    }
+    bajty_naglowka = json.dumps(naglowek, default=wartosc_json, ensure_ascii=False).encode('utf-8')
+    bajty_naglowka += b' ' * (poczatek_danych - len(SYGNATURA) - 8 - len(bajty_naglowka))
+
+    with open(sciezka, 'wb') as plik:
+        plik.write(SYGNATURA)
+        plik.write(struct.pack('<Q', len(bajty_naglowka)))
+        plik.write(bajty_naglowka)
+        for klucz in KOLUMNY_HISTORII:
+            plik.seek(naglowek['kanaly'][klucz])
+            np.asarray(historia[klucz], dtype=typ_danych).tofile(plik)
+    return sciezka
+
+
+class Trajektoria(Mapping):
+    """
+    Wczytana trajektoria: słownikowy dostęp do kanałów historii (leniwie,
+    bez wczytywania całego pliku) i metadane przebiegu.
+    """
+
+    def __init__(self, sciezka):
+        self.sciezka = sciezka
+        self._npz = None
+        self._kanaly = {}
+        with open(sciezka, 'rb') as plik:
+            czy_surowy = plik.read(len(SYGNATURA)) == SYGNATURA
+            if czy_surowy:
+                dlugosc_naglowka, = struct.unpack('<Q', plik.read(8))
+                naglowek = json.loads(plik.read(dlugosc_naglowka).decode('utf-8'))
+
+        if czy_surowy:
+            if naglowek['wersja'] > WERSJA_FORMATU:
+                raise ValueError(f"Nieobsługiwana wersja formatu trajektorii: {naglowek['wersja']}")
+            self.metadane = naglowek['metadane']
+            self._typ_danych = np.dtype(naglowek['typ_danych'])
+            self._liczba_probek = naglowek['liczba_probek']
+            self._przesuniecia = naglowek['kanaly']
+        else:
+            self._npz = np.load(sciezka)
+            self.metadane = json.loads(str(self._npz['__metadane__']))
+            self._przesuniecia = None
+
+    def __getitem__(self, klucz):
+        if klucz not in KOLUMNY_HISTORII:
+            raise KeyError(klucz)
+        if klucz not in self._kanaly:
+            if self._npz is not None:
+                self._kanaly[klucz] = self._npz[klucz]
+            elif self._liczba_probek == 0:
+                self._kanaly[klucz] = np.empty(0, dtype=self._typ_danych)
+            else:
+                self._kanaly[klucz] = np.memmap(self.sciezka, dtype=self._typ_danych, mode='r',
+                                                offset=self._przesuniecia[klucz], shape=(self._liczba_probek,))
+        return self._kanaly[klucz]
+
+    def __iter__(self):
+        return iter(KOLUMNY_HISTORII)
+
+    def __len__(self):
+        return len(KOLUMNY_HISTORII)
+
+    def wyniki(self):
+        """Słownik w układzie Symulacja.pobierz_wyniki() z historią czytaną z pliku."""
+        return {**self.metadane, 'historia': self}
+
+    def zamknij(self):
+        self._kanaly = {}
+        if self._npz is not None:
+            self._npz.close()
+            self._npz = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *wyjatek):
+        self.zamknij()
+
+    def __repr__(self):
+        return f"Trajektoria({self.sciezka!r})"
+
+
+def wczytaj_trajektorie(sciezka):
+    """Otwiera plik .npz lub .traj (format rozpoznawany po sygnaturze)."""
+    return Trajektoria(sciezka)
@@ -0,0 +1,192 @@
+"""
+Opcjonalne pomiary czasu faz symulacji i profilowanie przebiegu.
+
+Instrumentacja podmienia na jednej symulacji metody faz (fizyka, sterowanie,
+zapis stanu, ...) na wersje z licznikami czasu i wywołań. Podmieniane są
+tylko atrybuty samej symulacji - rakieta i autopilot pozostają nietknięte.
+Symulacja bez instrumentacji wykonuje dokładnie ten sam kod co wcześniej -
+pomiar nie kosztuje nic i nie dodaje warunków w pętli kroków.
+
+Opcjonalnie cały przebieg `uruchom` lub `przebieg_async` jest profilowany
+(cProfile) i śledzone są alokacje pamięci (tracemalloc). Raport w postaci
+słownika trafia do wyników symulacji pod kluczem 'instrumentacja'.
+"""
+
+import os
+import time
+import pstats
+import cProfile
+import functools
+import tracemalloc
+
+from src import config
+
+
+# Faza -> metoda symulacji (fizyka to wiązanie rakieta.aktualizuj w atrybucie symulacji)
+FAZY = {
+    'fizyka': '_aktualizuj_rakiete',
+    'sterowanie': '_oblicz_sterowanie',
+    'zapis_stanu': 'zapisz_aktualny_stan',
+    'przewijanie_lotu_swobodnego': '_przewin_lot_swobodny',
+    'warunki_zakonczenia': 'sprawdz_warunki_zakonczenia',
+    'wydruk_postepu': '_wyswietl_postep',
+}
+
+
+def _opis_funkcji(klucz):
+    plik, linia, nazwa = klucz
+    if linia == 0:
+        return nazwa
+    return f"{os.path.basename(plik)}:{linia}({nazwa})"
+
+
+class Instrumentacja:
+    def __init__(self, czy_profilowac=False, czy_sledzic_pamiec=False, liczba_pozycji=None,
+                 zegar=time.perf_counter):
+        if liczba_pozycji is None:
+            liczba_pozycji = config.INSTRUMENTACJA_LICZBA_POZYCJI_RAPORTU
+        self.czy_profilowac = czy_profilowac
+        self.czy_sledzic_pamiec = czy_sledzic_pamiec
+        self.liczba_pozycji = liczba_pozycji
+        self._zegar = zegar
+        self.czasy = {}
+        self.wywolania = {}
+        self.czas_przebiegu = 0.0
+        self.profil = None
+        self.pamiec = None
+
+    def mierz(self, faza, funkcja):
+        """Funkcja z doliczaniem czasu i liczby wywołań do fazy."""
+        czasy, wywolania, zegar = self.czasy, self.wywolania, self._zegar
+        czasy.setdefault(faza, 0.0)
+        wywolania.setdefault(faza, 0)
+
+        @functools.wraps(funkcja)
+        def funkcja_mierzona(*args, **kwargs):
+            start = zegar()
+            try:
+                return funkcja(*args, **kwargs)
+            finally:
+                czasy[faza] += zegar() - start
+                wywolania[faza] += 1
+
+        return funkcja_mierzona
+
+    def podlacz(self, symulacja):
+        """Podmienia metody faz symulacji i opakowuje `uruchom` oraz `przebieg_async`."""
+        for faza, nazwa_metody in FAZY.items():
+            setattr(symulacja, nazwa_metody, self.mierz(faza, getattr(symulacja, nazwa_metody)))
+        # Polityka zapisu wiąże zapisz_aktualny_stan przy tworzeniu symulacji
+        symulacja._zapisz_w_kroku = symulacja.polityka_zapisu.funkcja_zapisu(symulacja)
+
+        uruchom = symulacja.uruchom
+        przebieg_async = symulacja.przebieg_async
+
+        @functools.wraps(uruchom)
+        def uruchom_z_pomiarem(*args, **kwargs):
+            pomiar = self._rozpocznij_przebieg()
+            try:
+                wyniki = uruchom(*args, **kwargs)
+            finally:
+                self._zakoncz_przebieg(pomiar)
+            # Raport w wynikach z uruchom powstał przed końcem pomiaru
+            wyniki['instrumentacja'] = self.raport()
+            return wyniki
+
+        @functools.wraps(przebieg_async)
+        async def przebieg_async_z_pomiarem(*args, **kwargs):
+            # Profil obejmuje też inne korutyny pętli zdarzeń działające w czasie oczekiwania
+            pomiar = self._rozpocznij_przebieg()
+            try:
+                async for probka in przebieg_async(*args, **kwargs):
+                    yield probka
+            finally:
+                self._zakoncz_przebieg(pomiar)
+
+        # uruchom_async iteruje po symulacja.przebieg_async, więc też trafia na wersję z pomiarem
+        symulacja.uruchom = uruchom_z_pomiarem
+        symulacja.przebieg_async = przebieg_async_z_pomiarem
+
+    def _rozpocznij_przebieg(self):
+        czy_wlaczyc_tracemalloc = self.czy_sledzic_pamiec and not tracemalloc.is_tracing()
+        if czy_wlaczyc_tracemalloc:
+            tracemalloc.start()
+        elif self.czy_sledzic_pamiec:
+            tracemalloc.reset_peak()
+        profil = cProfile.Profile() if self.czy_profilowac else None
+        start = self._zegar()
+        if profil is not None:
+            profil.enable()
+        return start, profil, czy_wlaczyc_tracemalloc
+
+    def _zakoncz_przebieg(self, pomiar):
+        start, profil, czy_wlaczyc_tracemalloc = pomiar
+        if profil is not None:
+            profil.disable()
+        self.czas_przebiegu += self._zegar() - start
+        if profil is not None:
+            self.profil = self._podsumuj_profil(profil)
+        if self.czy_sledzic_pamiec:
+            self.pamiec = self._podsumuj_pamiec()
+            if czy_wlaczyc_tracemalloc:
+                tracemalloc.stop()
+
+    def _podsumuj_profil(self, profil):
+        statystyki = pstats.Stats(profil).stats
+        najdrozsze = sorted(statystyki.items(), key=lambda pozycja: pozycja[1][3], reverse=True)
+        return [{
+            'funkcja': _opis_funkcji(klucz),
+            'wywolania': liczba_wywolan,
+            'czas_wlasny_s': czas_wlasny,
+            'czas_calkowity_s': czas_calkowity
+        } for klucz, (_, liczba_wywolan, czas_wlasny, czas_calkowity, _) in najdrozsze[:self.liczba_pozycji]]
+
+    def _podsumuj_pamiec(self):
+        _, szczyt = tracemalloc.get_traced_memory()
+        migawka = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        return {
+            'szczyt_b': szczyt,
+            'najwieksze_alokacje': [{
+                'miejsce': f"{os.path.basename(statystyka.traceback[0].filename)}:{statystyka.traceback[0].lineno}",
+                'rozmiar_b': statystyka.size,
+                'liczba': statystyka.count
+            } for statystyka in migawka.statistics('lineno')[:self.liczba_pozycji]]
+        }
+
+    def raport(self):
+        """Słownik z czasami faz (oraz profilem i pamięcią, jeśli włączone)."""
+        czas_faz = sum(self.czasy.values())
+        raport = {
+            'czas_przebiegu_s': self.czas_przebiegu,
+            'czas_poza_fazami_s': max(self.czas_przebiegu - czas_faz, 0.0),
+            'fazy': {faza: {
+                'czas_s': czas,
+                'wywolania': self.wywolania[faza],
+                'sredni_czas_us': 1e6 * czas / self.wywolania[faza] if self.wywolania[faza] else 0.0,
+                'udzial': czas / self.czas_przebiegu if self.czas_przebiegu else 0.0
+            } for faza, czas in self.czasy.items()}
+        }
+        if self.profil is not None:
+            raport['profil'] = self.profil
+        if self.pamiec is not None:
+            raport['pamiec'] = self.pamiec
+        return raport
+
+
+def formatuj_raport(raport):
+    """Tekstowa tabela raportu instrumentacji."""
+    wiersze = [f"{'faza':<30} {'czas [ms]':>10} {'wywołania':>10} {'średnio [µs]':>13} {'udział':>7}"]
+    for faza, dane in sorted(raport['fazy'].items(), key=lambda pozycja: -pozycja[1]['czas_s']):
+        wiersze.append(f"{faza:<30} {1000 * dane['czas_s']:>10.2f} {dane['wywolania']:>10d} "
+                       f"{dane['sredni_czas_us']:>13.2f} {dane['udzial']:>7.1%}")
+    wiersze.append(f"{'poza fazami':<30} {1000 * raport['czas_poza_fazami_s']:>10.2f}")
+    wiersze.append(f"{'przebieg':<30} {1000 * raport['czas_przebiegu_s']:>10.2f}")
+    if 'pamiec' in raport:
+        wiersze.append(f"Szczyt pamięci: {raport['pamiec']['szczyt_b'] / 1024:.0f} KiB")
+    if 'profil' in raport:
+        wiersze.append("Najdroższe funkcje (czas całkowity):")
+        for pozycja in raport['profil'][:10]:
+            wiersze.append(f"  {1000 * pozycja['czas_calkowity_s']:>9.2f} ms {pozycja['wywolania']:>9d}x  "
+                           f"{pozycja['funkcja']}")
+    return "\n".join(wiersze)
@@ -0,0 +1,301 @@
+"""
+Wymienne schematy całkowania równań ruchu rakiety.
+
+Sterowanie (ciąg i kąt) jest stałe w obrębie wywołania `krok` - ekstrapolator
+zerowego rzędu, tak jak w rzeczywistym komputerze pokładowym. Wyczerpanie
+paliwa i przyziemienie obsługuje Rakieta.aktualizuj, więc integrator zawsze
+całkuje odcinek o gładkiej prawej stronie.
+
+Stan całkowany: (x, y, vx, vy, masa_paliwa).
+"""
+
+import math
+import operator
+
+from src import config
+from src import fizyka
+
+
+class Integrator:
+    nazwa = None
+
+    def __init__(self):
+        self.liczba_wywolan = 0
+
+    def pochodne(self, rakieta, stan, skladowa_x, skladowa_y, tempo_zuzycia):
+        self.liczba_wywolan += 1
+        _, _, predkosc_x, predkosc_y, masa_paliwa = stan
+        masa_calkowita = rakieta.masa_rakiety_pusta + masa_paliwa
+        if masa_calkowita > 0:
+            przyspieszenie_x = skladowa_x / masa_calkowita
+            przyspieszenie_y = skladowa_y / masa_calkowita - rakieta.grawitacja
+        else:
+            przyspieszenie_x = 0
+            przyspieszenie_y = -rakieta.grawitacja
+        return (predkosc_x, predkosc_y, przyspieszenie_x, przyspieszenie_y, -tempo_zuzycia)
+
+    @staticmethod
+    def _sterowanie(rakieta):
+        cieg = rakieta.cieg_aktualny
+        skladowa_x = cieg * math.sin(rakieta.kat_nachylenia)
+        skladowa_y = cieg * math.cos(rakieta.kat_nachylenia)
+        if cieg > 0 and rakieta.cieg_maksymalny > 0:
+            tempo_zuzycia = cieg / rakieta.cieg_maksymalny * rakieta.zuzycie_paliwa_na_sekunde
+        else:
+            tempo_zuzycia = 0.0
+        return skladowa_x, skladowa_y, tempo_zuzycia
+
+    @staticmethod
+    def _pobierz_stan(rakieta):
+        return (rakieta.pozycja_x, rakieta.pozycja_y, rakieta.predkosc_x,
+                rakieta.predkosc_y, rakieta.masa_paliwa_aktualna)
+
+    @staticmethod
+    def _ustaw_stan(rakieta, stan):
+        (rakieta.pozycja_x, rakieta.pozycja_y, rakieta.predkosc_x,
+         rakieta.predkosc_y, masa_paliwa) = stan
+        rakieta.masa_paliwa_aktualna = max(0, masa_paliwa)
+
+    def krok(self, rakieta, krok_czasowy):
+        raise NotImplementedError
+
+    def stan(self):
+        """Stan przechowywany między wywołaniami `krok` (liczniki, krok adaptacyjny)."""
+        return dict(vars(self))
+
+    def przywroc_stan(self, stan):
+        for nazwa, wartosc in stan.items():
+            setattr(self, nazwa, wartosc)
+
+    def lot_swobodny(self, rakieta, krok_czasowy, liczba_krokow):
+        """
+        Stan (x, y, vx, vy) po `liczba_krokow` krokach bez ciągu, w postaci
+        zamkniętej. Przyspieszenie jest wtedy stałe, więc RK4 i Dormand-Prince
+        odtwarzają dokładną parabolę. `liczba_krokow` może być tablicą.
+        """
+        czas = liczba_krokow * krok_czasowy
+        return (rakieta.pozycja_x + rakieta.predkosc_x * czas,
+                rakieta.pozycja_y + rakieta.predkosc_y * czas - 0.5 * rakieta.grawitacja * czas**2,
+                rakieta.predkosc_x + 0.0 * czas,
+                rakieta.predkosc_y - rakieta.grawitacja * czas)
+
+
+class IntegratorEuleraPolniejawny(Integrator):
+    """Półjawny schemat Eulera (najpierw prędkość, potem położenie) - dotychczasowy schemat."""
+
+    nazwa = 'euler'
+
+    def krok(self, rakieta, krok_czasowy):
+        self.liczba_wywolan += 1
+        skladowa_ciagu_x = rakieta.cieg_aktualny * math.sin(rakieta.kat_nachylenia)
+        skladowa_ciagu_y = rakieta.cieg_aktualny * math.cos(rakieta.kat_nachylenia)
+
+        if rakieta.masa_calkowita > 0:
+            przyspieszenie_x = skladowa_ciagu_x / rakieta.masa_calkowita
+            przyspieszenie_y = (skladowa_ciagu_y / rakieta.masa_calkowita) - rakieta.grawitacja
+        else:
+            przyspieszenie_x = 0
+            przyspieszenie_y = -rakieta.grawitacja
+
+        rakieta.predkosc_x += przyspieszenie_x * krok_czasowy
+        rakieta.predkosc_y += przyspieszenie_y * krok_czasowy
+
+        rakieta.pozycja_x += rakieta.predkosc_x * krok_czasowy
+        rakieta.pozycja_y += rakieta.predkosc_y * krok_czasowy
+
+        if rakieta.cieg_aktualny > 0 and rakieta.czy_ma_paliwo:
+            zuzycie = fizyka.zuzycie_paliwa_w_kroku_czasowym(
+                rakieta.cieg_aktualny, krok_czasowy, rakieta.cieg_maksymalny, rakieta.zuzycie_paliwa_na_sekunde
+            )
+            rakieta.masa_paliwa_aktualna = max(0, rakieta.masa_paliwa_aktualna - zuzycie)
+
+    def lot_swobodny(self, rakieta, krok_czasowy, liczba_krokow):
+        # Suma n kroków półjawnego Eulera: y_n = y_0 + n*dt*vy_0 - g*dt^2*n(n+1)/2
+        x, y, vx, vy = super().lot_swobodny(rakieta, krok_czasowy, liczba_krokow)
+        return x, y - 0.5 * rakieta.grawitacja * krok_czasowy**2 * liczba_krokow, vx, vy
+
+
+class IntegratorRK4(Integrator):
+    """Klasyczna metoda Rungego-Kutty czwartego rzędu."""
+
+    nazwa = 'rk4'
+
+    def krok(self, rakieta, krok_czasowy):
+        sterowanie = self._sterowanie(rakieta)
+        stan = self._pobierz_stan(rakieta)
+        h = krok_czasowy
+
+        k1 = self.pochodne(rakieta, stan, *sterowanie)
+        k2 = self.pochodne(rakieta, tuple(s + 0.5 * h * k for s, k in zip(stan, k1)), *sterowanie)
+        k3 = self.pochodne(rakieta, tuple(s + 0.5 * h * k for s, k in zip(stan, k2)), *sterowanie)
+        k4 = self.pochodne(rakieta, tuple(s + h * k for s, k in zip(stan, k3)), *sterowanie)
+
+        self._ustaw_stan(rakieta, tuple(
+            s + h / 6.0 * (a + 2 * b + 2 * c + d) for s, a, b, c, d in zip(stan, k1, k2, k3, k4)
+        ))
+
+
+class IntegratorDormandaPrince(Integrator):
+    """
+    Adaptacyjna metoda Dormanda-Prince'a 5(4) z kontrolą błędu.
+
+    Kroki wewnętrzne nie są związane z krokiem fizyki: dopóki sterowanie się
+    nie zmienia, kolejne wywołania `krok` odczytują stan z interpolacji
+    (ciągłe rozszerzenie metody, bez nowych obliczeń prawej strony), a nowy
+    krok wewnętrzny jest liczony dopiero za końcem poprzedniego. Przy długim
+    okresie sterowania jeden krok wewnętrzny obejmuje wiele kroków fizyki.
+
+    Opłaca się tylko z `okres_sterowania` dłuższym od kroku fizyki. Gdy
+    sterowanie zmienia się co krok (konfiguracja domyślna), każdy krok
+    fizyki to osobny krok wewnętrzny: 7 obliczeń prawej strony wobec 4 w RK4.
+    """
+
+    nazwa = 'dopri45'
+
+    C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+    A = (
+        (),
+        (1/5,),
+        (3/40, 9/40),
+        (44/45, -56/15, 32/9),
+        (19372/6561, -25360/2187, 64448/6561, -212/729),
+        (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+        (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+    )
+    B = (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0)
+    B_GWIAZDKA = (5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40)
+    # Ciągłe rozszerzenie 4. rzędu: b_i(theta) = sum_j P[i][j] * theta^(j+1)
+    P = (
+        (1.0, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432),
+        (0.0, 0.0, 0.0, 0.0),
+        (0.0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799),
+        (0.0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072),
+        (0.0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632),
+        (0.0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844),
+        (0.0, 40617522/29380423, -110615467/29380423, 69997945/29380423),
+    )
+
+    def __init__(self, tolerancja_wzgledna=None, tolerancja_bezwzgledna=None):
+        super().__init__()
+        if tolerancja_wzgledna is None:
+            tolerancja_wzgledna = config.TOLERANCJA_WZGLEDNA_INTEGRATORA
+        if tolerancja_bezwzgledna is None:
+            tolerancja_bezwzgledna = config.TOLERANCJA_BEZWZGLEDNA_INTEGRATORA
+        self.tolerancja_wzgledna = tolerancja_wzgledna
+        self.tolerancja_bezwzgledna = tolerancja_bezwzgledna
+        self.krok_wewnetrzny = None
+        self.liczba_krokow_odrzuconych = 0
+        # Ostatni przyjęty krok wewnętrzny: (sterowanie, początek, długość, stan i pochodna
+        # na końcu, wielomian interpolacji albo stan początkowy i etapy, z których się go liczy)
+        # - czas liczony od początku odcinka stałego sterowania
+        self._krok_przyjety = None
+        self._czas = 0.0
+        self._stan_ustawiony = None
+        # Długość poprzedniego odcinka - przewidywany koniec bieżącego, do którego docinany jest krok
+        self._dlugosc_odcinka = None
+
+    def _krok_probny(self, rakieta, stan, h, sterowanie, k1):
+        _, (a21,), (a31, a32), (a41, a42, a43), (a51, a52, a53, a54), (a61, a62, a63, a64, a65), \
+            (a71, _, a73, a74, a75, a76) = self.A
+        k2 = self.pochodne(rakieta, tuple(s + h * a21 * p1 for s, p1 in zip(stan, k1)), *sterowanie)
+        k3 = self.pochodne(rakieta, tuple(s + h * (a31 * p1 + a32 * p2)
+                                          for s, p1, p2 in zip(stan, k1, k2)), *sterowanie)
+        k4 = self.pochodne(rakieta, tuple(s + h * (a41 * p1 + a42 * p2 + a43 * p3)
+                                          for s, p1, p2, p3 in zip(stan, k1, k2, k3)), *sterowanie)
+        k5 = self.pochodne(rakieta, tuple(s + h * (a51 * p1 + a52 * p2 + a53 * p3 + a54 * p4)
+                                          for s, p1, p2, p3, p4 in zip(stan, k1, k2, k3, k4)), *sterowanie)
+        k6 = self.pochodne(rakieta, tuple(s + h * (a61 * p1 + a62 * p2 + a63 * p3 + a64 * p4 + a65 * p5)
+                                          for s, p1, p2, p3, p4, p5 in zip(stan, k1, k2, k3, k4, k5)), *sterowanie)
+        # Ostatni wiersz A to wagi B - etap 7 liczony jest w punkcie rozwiązania 5. rzędu (FSAL)
+        nowy_stan = tuple(s + h * (a71 * p1 + a73 * p3 + a74 * p4 + a75 * p5 + a76 * p6)
+                          for s, p1, p3, p4, p5, p6 in zip(stan, k1, k3, k4, k5, k6))
+        k7 = self.pochodne(rakieta, nowy_stan, *sterowanie)
+
+        e1, _, e3, e4, e5, e6, e7 = (b - bg for b, bg in zip(self.B, self.B_GWIAZDKA))
+        blad = max(
+            abs(h * (e1 * p1 + e3 * p3 + e4 * p4 + e5 * p5 + e6 * p6 + e7 * p7))
+            / (self.tolerancja_bezwzgledna + self.tolerancja_wzgledna * max(abs(s), abs(n)))
+            for s, n, p1, p3, p4, p5, p6, p7 in zip(stan, nowy_stan, k1, k3, k4, k5, k6, k7)
+        )
+        return nowy_stan, blad, (k1, k2, k3, k4, k5, k6, k7)
+
+    def _wielomian(self, stan, h, etapy):
+        """Współczynniki interpolacji w kroku: y(theta) = y0 + theta*(c1 + theta*(c2 + theta*(c3 + theta*c4)))."""
+        return tuple(
+            (s,) + tuple(h * sum(map(operator.mul, potega, kolumna)) for potega in zip(*self.P))
+            for s, kolumna in zip(stan, zip(*etapy))
+        )
+
+    def _kolejny_krok(self, rakieta, krok_czasowy):
+        """Przyjmuje kolejny krok wewnętrzny, zaczynając od końca poprzedniego."""
+        sterowanie, poczatek, dlugosc, stan, k1, _ = self._krok_przyjety
+        poczatek += dlugosc
+        h = self.krok_wewnetrzny if self.krok_wewnetrzny else krok_czasowy
+        # Krok kończy się na przewidywanej zmianie sterowania, jeśli wypada przed jego końcem,
+        # a odcinek nie trwa już dłużej niż przewidywano
+        docinany = False
+        if self._dlugosc_odcinka is not None:
+            do_konca_odcinka = self._dlugosc_odcinka - poczatek
+            docinany = (0 < do_konca_odcinka < h
+                        and self._czas <= self._dlugosc_odcinka * (1 + 1e-12))
+        while True:
+            proba = do_konca_odcinka if docinany else h
+            nowy_stan, blad, etapy = self._krok_probny(rakieta, stan, proba, sterowanie, k1)
+            wspolczynnik = 5.0 if blad == 0 else min(5.0, max(0.2, 0.9 * blad ** -0.2))
+            if blad <= 1.0:
+                break
+            self.liczba_krokow_odrzuconych += 1
+            h = proba * wspolczynnik
+            docinany = docinany and do_konca_odcinka < h
+        self._krok_przyjety = (sterowanie, poczatek, proba, nowy_stan, etapy[6], (stan, etapy))
+        if not docinany:
+            self.krok_wewnetrzny = h * wspolczynnik
+
+    def krok(self, rakieta, krok_czasowy):
+        sterowanie = self._sterowanie(rakieta)
+        stan = self._pobierz_stan(rakieta)
+        if (self._krok_przyjety is None or self._krok_przyjety[0] != sterowanie
+                or self._stan_ustawiony != stan):
+            # Nowe sterowanie albo stan zmieniony poza integratorem (zdarzenie, przewijanie) - nowy odcinek
+            if self._krok_przyjety is not None and self._stan_ustawiony == stan:
+                self._dlugosc_odcinka = self._czas
+            else:
+                # Powtórzony krok (szukanie zdarzenia) albo skok stanu - długość odcinka nieznana
+                self._dlugosc_odcinka = None
+            self._krok_przyjety = (sterowanie, 0.0, 0.0, stan, self.pochodne(rakieta, stan, *sterowanie), None)
+            self._czas = 0.0
+
+        self._czas += krok_czasowy
+        # Tolerancja zaokrągleń sumy kroków, by nie liczyć kroku wewnętrznego dla ułamka 1e-16 s
+        while self._krok_przyjety[1] + self._krok_przyjety[2] < self._czas * (1 - 1e-12):
+            self._kolejny_krok(rakieta, krok_czasowy)
+
+        sterowanie, poczatek, dlugosc, stan_koncowy, pochodna, wielomian = self._krok_przyjety
+        t = (self._czas - poczatek) / dlugosc if dlugosc else 1.0
+        if t >= 1 - 1e-12:
+            nowy_stan = stan_koncowy
+        else:
+            if len(wielomian) == 2:
+                # Wielomian liczony dopiero przy pierwszej interpolacji w kroku
+                wielomian = self._wielomian(wielomian[0], dlugosc, wielomian[1])
+                self._krok_przyjety = (sterowanie, poczatek, dlugosc, stan_koncowy, pochodna, wielomian)
+            nowy_stan = tuple(y + t * (c1 + t * (c2 + t * (c3 + t * c4))) for y, c1, c2, c3, c4 in wielomian)
+        self._ustaw_stan(rakieta, nowy_stan)
+        self._stan_ustawiony = self._pobierz_stan(rakieta)
+
+
+INTEGRATORY = {
+    IntegratorEuleraPolniejawny.nazwa: IntegratorEuleraPolniejawny,
+    IntegratorRK4.nazwa: IntegratorRK4,
+    IntegratorDormandaPrince.nazwa: IntegratorDormandaPrince,
+}
+
+
+def utworz_integrator(nazwa=None):
+    if nazwa is None:
+        nazwa = config.INTEGRATOR_DOMYSLNY
+    if isinstance(nazwa, Integrator):
+        return nazwa
+    if nazwa not in INTEGRATORY:
+        raise ValueError(f"Nieznany integrator '{nazwa}', dostępne: {sorted(INTEGRATORY)}")
+    return INTEGRATORY[nazwa]()
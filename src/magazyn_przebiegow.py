@@ -0,0 +1,216 @@
+"""
+Magazyn przebiegów symulacji - tabela podsumowań w SQLite i binarne pliki
+trajektorii.
+
+Każdy przebieg dostaje unikalny identyfikator, więc zapisy z tej samej
+sekundy ani z równoległych procesów się nie nadpisują. Tabela `przebiegi`
+ma indeksy po planecie, wyniku i czasie zapisu, a trajektorie leżą w
+plikach .traj (src.eksport) rozłożonych na podkatalogi według dwóch
+pierwszych znaków identyfikatora.
+
+Przykład:
+    with MagazynPrzebiegow() as magazyn:
+        porazki = magazyn.znajdz(planeta='mars', sukces=False, warunek='predkosc_ladowania < ?',
+                                 parametry=(-5,))
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+
+from src import config
+from src import eksport
+
+
+PLIK_BAZY = 'przebiegi.sqlite'
+KATALOG_TRAJEKTORII = 'trajektorie'
+
+# Kolumny tabeli przebiegi (poza kluczem głównym) i ich typy
+KOLUMNY_PRZEBIEGU = {
+    'identyfikator': 'TEXT NOT NULL UNIQUE',
+    'czas_zapisu': 'REAL NOT NULL',
+    'zrodlo': 'TEXT',
+    'ziarno': 'INTEGER',
+    'indeks': 'INTEGER',
+    'planeta': 'TEXT NOT NULL',
+    'sukces': 'INTEGER NOT NULL',
+    'komunikat': 'TEXT',
+    'czas_symulacji': 'REAL',
+    'predkosc_ladowania': 'REAL',
+    'predkosc_pozioma': 'REAL',
+    'paliwo_pozostale': 'REAL',
+    'paliwo_zuzyte': 'REAL',
+    'przesuniecie_x': 'REAL',
+    'wysokosc_startowa': 'REAL',
+    'predkosc_pionowa_startowa': 'REAL',
+    'predkosc_pozioma_startowa': 'REAL',
+    'krok_czasowy': 'REAL',
+    'integrator': 'TEXT',
+    'scenariusz': 'TEXT',
+    'trajektoria': 'TEXT'
+}
+
+SCHEMAT = f"""
+CREATE TABLE IF NOT EXISTS przebiegi (
+    id INTEGER PRIMARY KEY,
+    {', '.join(f'{nazwa} {typ}' for nazwa, typ in KOLUMNY_PRZEBIEGU.items())}
+);
+CREATE INDEX IF NOT EXISTS przebiegi_planeta_sukces ON przebiegi (planeta, sukces);
+CREATE INDEX IF NOT EXISTS przebiegi_sukces ON przebiegi (sukces);
+CREATE INDEX IF NOT EXISTS przebiegi_czas_zapisu ON przebiegi (czas_zapisu);
+"""
+
+
+def nowy_identyfikator():
+    return uuid.uuid4().hex
+
+
+def wiersz_przebiegu(wyniki, scenariusz, zrodlo=None, ziarno=None, indeks=None, identyfikator=None):
+    """
+    Wiersz tabeli przebiegi z wyników Symulacja.pobierz_wyniki() i scenariusza.
+    Zwykły słownik - można go zbudować w procesie roboczym i przekazać dalej.
+    """
+    stan_koncowy = wyniki['stan_koncowy']
+    return {
+        'identyfikator': identyfikator or nowy_identyfikator(),
+        'czas_zapisu': time.time(),
+        'zrodlo': zrodlo,
+        'ziarno': ziarno,
+        'indeks': indeks,
+        'planeta': scenariusz.planeta,
+        'sukces': int(bool(wyniki['sukces'])),
+        'komunikat': wyniki['komunikat'],
+        'czas_symulacji': float(wyniki['czas_symulacji']),
+        'predkosc_ladowania': float(stan_koncowy['vy']),
+        'predkosc_pozioma': float(stan_koncowy['vx']),
+        'paliwo_pozostale': float(stan_koncowy['masa_paliwa']),
+        'paliwo_zuzyte': float(scenariusz.rakieta.masa_paliwa - stan_koncowy['masa_paliwa']),
+        'przesuniecie_x': float(stan_koncowy['x']),
+        'wysokosc_startowa': scenariusz.wysokosc_startowa,
+        'predkosc_pionowa_startowa': scenariusz.predkosc_pionowa_startowa,
+        'predkosc_pozioma_startowa': scenariusz.predkosc_pozioma_startowa,
+        'krok_czasowy': scenariusz.krok_czasowy,
+        'integrator': scenariusz.integrator,
+        'scenariusz': json.dumps(scenariusz.do_slownika(), ensure_ascii=False),
+        'trajektoria': None
+    }
+
+
+class MagazynPrzebiegow:
+    """
+    Magazyn przebiegów w katalogu: baza SQLite i pliki trajektorii.
+
+    Baza działa w trybie WAL z czasem oczekiwania na blokadę, więc kilka
+    procesów może dopisywać równocześnie. Połączenie jest otwierane leniwie
+    i osobno w każdym procesie, więc obiekt można przekazać do puli procesów.
+    """
+
+    def __init__(self, katalog=None):
+        if katalog is None:
+            katalog = config.KATALOG_MAGAZYNU_PRZEBIEGOW
+        self.katalog = katalog
+        self._polaczenie = None
+        self._pid = None
+
+    @property
+    def polaczenie(self):
+        if self._polaczenie is None or self._pid != os.getpid():
+            os.makedirs(self.katalog, exist_ok=True)
+            self._polaczenie = sqlite3.connect(os.path.join(self.katalog, PLIK_BAZY),
+                                               timeout=config.MAGAZYN_CZAS_OCZEKIWANIA_NA_BLOKADE)
+            self._polaczenie.row_factory = sqlite3.Row
+            self._polaczenie.execute('PRAGMA journal_mode=WAL')
+            self._polaczenie.execute('PRAGMA synchronous=NORMAL')
+            self._polaczenie.executescript(SCHEMAT)
+            self._pid = os.getpid()
+        return self._polaczenie
+
+    def __getstate__(self):
+        return {'katalog': self.katalog}
+
+    def __setstate__(self, stan):
+        self.__init__(stan['katalog'])
+
+    def sciezka_trajektorii(self, identyfikator):
+        return os.path.join(self.katalog, KATALOG_TRAJEKTORII, identyfikator[:2], identyfikator + '.traj')
+
+    def zapisz_trajektorie(self, wyniki, scenariusz, identyfikator):
+        """Zapisuje trajektorię i zwraca ścieżkę względną do katalogu magazynu."""
+        sciezka = self.sciezka_trajektorii(identyfikator)
+        os.makedirs(os.path.dirname(sciezka), exist_ok=True)
+        sciezka_tymczasowa = f"{sciezka}.{os.getpid()}.tmp"
+        eksport.zapisz_surowy(sciezka_tymczasowa, {**wyniki, 'scenariusz': scenariusz.do_slownika()})
+        os.replace(sciezka_tymczasowa, sciezka)
+        return os.path.relpath(sciezka, self.katalog)
+
+    def dodaj(self, wyniki, scenariusz, zrodlo=None, czy_zapisac_trajektorie=True, **opcje):
+        """Dodaje jeden przebieg (z trajektorią, jeśli jest historia) i zwraca jego identyfikator."""
+        wiersz = wiersz_przebiegu(wyniki, scenariusz, zrodlo, **opcje)
+        if czy_zapisac_trajektorie and len(wyniki['historia']['czas']):
+            wiersz['trajektoria'] = self.zapisz_trajektorie(wyniki, scenariusz, wiersz['identyfikator'])
+        self.dodaj_wiele([wiersz])
+        return wiersz['identyfikator']
+
+    def dodaj_wiele(self, wiersze):
+        """Dopisuje wiersze (z wiersz_przebiegu) w jednej transakcji."""
+        kolumny = list(KOLUMNY_PRZEBIEGU)
+        zapytanie = (f"INSERT INTO przebiegi ({', '.join(kolumny)}) "
+                     f"VALUES ({', '.join('?' * len(kolumny))})")
+        with self.polaczenie:
+            self.polaczenie.executemany(zapytanie, ([wiersz.get(k) for k in kolumny] for wiersz in wiersze))
+
+    def znajdz(self, planeta=None, sukces=None, warunek=None, parametry=(), sortuj='czas_zapisu', limit=None):
+        """
+        Zwraca listę wierszy (słowników) spełniających filtry. `warunek` to
+        dodatkowy fragment WHERE w SQL z parametrami `?` podanymi w `parametry`.
+        """
+        warunki = []
+        wartosci = []
+        if planeta is not None:
+            warunki.append('planeta = ?')
+            wartosci.append(planeta)
+        if sukces is not None:
+            warunki.append('sukces = ?')
+            wartosci.append(int(bool(sukces)))
+        if warunek:
+            warunki.append(f'({warunek})')
+            wartosci.extend(parametry)
+
+        zapytanie = 'SELECT * FROM przebiegi'
+        if warunki:
+            zapytanie += ' WHERE ' + ' AND '.join(warunki)
+        if sortuj:
+            zapytanie += f' ORDER BY {sortuj}'
+        if limit is not None:
+            zapytanie += ' LIMIT ?'
+            wartosci.append(int(limit))
+        return [dict(wiersz) for wiersz in self.polaczenie.execute(zapytanie, wartosci)]
+
+    def pobierz(self, identyfikator):
+        wiersze = self.znajdz(warunek='identyfikator = ?', parametry=(identyfikator,), sortuj=None)
+        return wiersze[0] if wiersze else None
+
+    def wczytaj_trajektorie(self, identyfikator):
+        """Trajektoria przebiegu (eksport.Trajektoria) albo None, jeśli jej nie zapisano."""
+        wiersz = self.pobierz(identyfikator)
+        if wiersz is None:
+            raise KeyError(identyfikator)
+        if wiersz['trajektoria'] is None:
+            return None
+        return eksport.wczytaj_trajektorie(os.path.join(self.katalog, wiersz['trajektoria']))
+
+    def __len__(self):
+        return self.polaczenie.execute('SELECT COUNT(*) FROM przebiegi').fetchone()[0]
+
+    def zamknij(self):
+        if self._polaczenie is not None and self._pid == os.getpid():
+            self._polaczenie.close()
+        self._polaczenie = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *wyjatek):
+        self.zamknij()
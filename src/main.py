@@ -1,8 +1,16 @@
 import sys
+import os
 import argparse
-from symulacja import Symulacja
-from wizualizacja import wizualizuj_wyniki_symulacji
-import config
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src.naprowadzanie import TRYBY_NAPROWADZANIA
+from src.tablice_ladowania import przygotuj_tablice
+from src.magazyn_przebiegow import MagazynPrzebiegow
+from src.instrumentacja import Instrumentacja, formatuj_raport
+from src import config
 
 
 def main():
@@ -12,31 +20,68 @@ def main():
     parser.add_argument('--max-czas', type=float, default=config.CZAS_MAKSYMALNY_SYMULACJI,
                         help=f'Maksymalny czas symulacji [s] (domyślnie: {config.CZAS_MAKSYMALNY_SYMULACJI})')
     parser.add_argument('--no-autopilot', action='store_true', help='Wyłącz autopilota (swobodny spadek)')
+    parser.add_argument('--naprowadzanie', choices=sorted(TRYBY_NAPROWADZANIA), default=config.NAPROWADZANIE_DOMYSLNE,
+                        help=f'Tryb naprowadzania autopilota (domyślnie: {config.NAPROWADZANIE_DOMYSLNE})')
     parser.add_argument('--no-viz', action='store_true', help='Nie pokazuj wizualizacji')
+    parser.add_argument('--animacja', type=str, default=None, metavar='PLIK',
+                        help='Zapisz animację lądowania do pliku .gif lub .mp4 (mp4 wymaga ffmpeg)')
+    parser.add_argument('--bez-okna', action='store_true',
+                        help='Zapisz wykresy do PNG bez otwierania okna (backend Agg)')
     parser.add_argument('--zapisz', action='store_true', help='Zapisz dane i wykresy do pliku')
+    parser.add_argument('--format', choices=['npz', 'surowy', 'json'], default=config.FORMAT_ZAPISU_DANYCH,
+                        help=f'Format zapisu danych (domyślnie: {config.FORMAT_ZAPISU_DANYCH})')
+    parser.add_argument('--kompresja', action='store_true', help='Kompresuj zapis w formacie npz')
+    parser.add_argument('--magazyn', type=str, nargs='?', const=config.KATALOG_MAGAZYNU_PRZEBIEGOW, default=None,
+                        help=f'Dodaj przebieg do magazynu przebiegów (domyślnie: {config.KATALOG_MAGAZYNU_PRZEBIEGOW})')
     parser.add_argument('--quiet', action='store_true', help='Tryb cichy (bez komunikatów w trakcie)')
+    parser.add_argument('--profil', action='store_true',
+                        help='Zmierz czas faz symulacji, profiluj przebieg (cProfile) i śledź pamięć')
+    parser.add_argument('--tempo', type=float, default=None, metavar='PRZYSPIESZENIE',
+                        help='Symulacja w tempie zegara: 1 - czas rzeczywisty, 10 - dziesięć razy szybciej '
+                             '(domyślnie: najszybciej jak się da)')
     
     argumenty = parser.parse_args()
     
     print("\nUruchamianie symulacji ladowania rakiety...\n")
     
+    scenariusz = Scenariusz(naprowadzanie=argumenty.naprowadzanie)
+    przygotuj_tablice([scenariusz])
     symulacja = Symulacja(
+        scenariusz=scenariusz,
         krok_czasowy=argumenty.dt,
         czas_maksymalny=argumenty.max_czas,
-        czy_autopilot_wlaczony=not argumenty.no_autopilot
+        czy_autopilot_wlaczony=not argumenty.no_autopilot,
+        instrumentacja=Instrumentacja(czy_profilowac=True, czy_sledzic_pamiec=True) if argumenty.profil else None
     )
     
-    wyniki = symulacja.uruchom(czy_wyswietlac_postep=not argumenty.quiet)
+    wyniki = symulacja.uruchom(czy_wyswietlac_postep=not argumenty.quiet, przyspieszenie=argumenty.tempo)
+    
+    if argumenty.profil:
+        print("\nInstrumentacja przebiegu:")
+        print(formatuj_raport(wyniki['instrumentacja']))
     
     if argumenty.zapisz:
         print("\nZapisywanie wynikow...")
-        sciezka_json = symulacja.zapisz_do_pliku()
-        print(f"Dane zapisane do: {sciezka_json}")
+        sciezka_danych = symulacja.zapisz_do_pliku(format=argumenty.format,
+                                                   czy_kompresowac=argumenty.kompresja or None)
+        print(f"Dane zapisane do: {sciezka_danych}")
+    
+    if argumenty.magazyn:
+        with MagazynPrzebiegow(argumenty.magazyn) as magazyn:
+            identyfikator = symulacja.zapisz_do_magazynu(magazyn, zrodlo='main')
+        print(f"Przebieg {identyfikator} dodany do magazynu: {argumenty.magazyn}")
+    
+    if argumenty.animacja:
+        from src.wizualizacja import animacja_ladowania
+        print("\nZapisywanie animacji...")
+        print(f"Animacja zapisana do: {animacja_ladowania(wyniki['historia'], argumenty.animacja)}")
     
     if not argumenty.no_viz:
         print("\nTworzenie wizualizacji...")
         try:
-            wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=argumenty.zapisz, nazwa_pliku='symulacja_wykres.png')
+            from src.wizualizacja import wizualizuj_wyniki_symulacji
+            wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=argumenty.zapisz or argumenty.bez_okna,
+                                        nazwa_pliku='symulacja_wykres.png', czy_pokazac=not argumenty.bez_okna)
         except Exception as e:
             print(f"Blad podczas tworzenia wizualizacji: {e}")
             import traceback
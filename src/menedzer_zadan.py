@@ -0,0 +1,237 @@
+"""
+Kolejka zadań symulacji wykonywanych równolegle w puli procesów.
+
+Zadanie to jeden scenariusz. Procesy robocze zbierają próbkę stanu w każdym
+kroku, co ZADANIA_OKRES_RAPORTU_S sekund wysyłają postęp z porcją próbek do
+wspólnej kolejki i sprawdzają flagę sterowania zadania (wstrzymanie,
+anulowanie). Wątek interfejsu wywołuje odbierz_postep() w swoim rytmie -
+symulacje nie zajmują ani jego, ani GIL procesu głównego.
+"""
+
+import os
+import time
+import queue
+import collections
+import itertools
+import dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src.tablice_ladowania import przygotuj_tablice
+from src.telemetria import KolejkaTelemetrii
+from src import config
+
+
+# Wartości flagi sterowania zadaniem
+PRACUJ = 0
+WSTRZYMAJ = 1
+ANULUJ = 2
+
+# Stany zadania
+OCZEKUJE = 'oczekuje'
+TRWA = 'trwa'
+WSTRZYMANE = 'wstrzymane'
+ZAKONCZONE = 'zakonczone'
+ANULOWANE = 'anulowane'
+BLAD = 'blad'
+STANY_KONCOWE = (ZAKONCZONE, ANULOWANE, BLAD)
+
+
+@dataclasses.dataclass
+class Zadanie:
+    identyfikator: int
+    nazwa: str
+    scenariusz: Scenariusz
+    stan: str = OCZEKUJE
+    postep: float = 0.0
+    # Ostatnie próbki dla podglądu na żywo; liczba_probek liczy wszystkie odebrane
+    probki: collections.deque = dataclasses.field(
+        default_factory=lambda: collections.deque(maxlen=config.ZADANIA_POJEMNOSC_PROBEK), repr=False)
+    liczba_probek: int = 0
+    wyniki: Any = dataclasses.field(default=None, repr=False)
+    blad: Any = None
+    _przyszlosc: Any = dataclasses.field(default=None, repr=False)
+    _sterowanie: Any = dataclasses.field(default=None, repr=False)
+    _flaga: int = dataclasses.field(default=PRACUJ, repr=False)
+
+    @property
+    def czy_zakonczone(self):
+        return self.stan in STANY_KONCOWE
+
+    def probki_od(self, numer):
+        """Próbki o numerach od `numer` (liczonych od początku zadania), które są jeszcze w buforze."""
+        liczba_nowych = min(self.liczba_probek - numer, len(self.probki))
+        return list(itertools.islice(self.probki, len(self.probki) - liczba_nowych, None))
+
+
+def postep_symulacji(symulacja):
+    """Szacowany postęp 0..1: większy z udziału czasu i udziału pokonanej wysokości."""
+    scenariusz = symulacja.scenariusz
+    udzial_czasu = symulacja.czas_aktualny / scenariusz.czas_maksymalny
+    udzial_wysokosci = 1.0 - symulacja.rakieta.pozycja_y / max(scenariusz.wysokosc_startowa, 1e-9)
+    return float(min(max(udzial_czasu, udzial_wysokosci, 0.0), 1.0))
+
+
+def wykonaj_zadanie(identyfikator, scenariusz, sterowanie, kolejka_postepu,
+                    kroki_miedzy_sprawdzeniami=None, okres_raportu=None):
+    """
+    Funkcja procesu roboczego. Zwraca wyniki symulacji albo None, jeśli
+    zadanie anulowano. Próbki stanu z każdego kroku trafiają do bufora
+    procesu i są wysyłane porcjami razem z raportem postępu.
+    """
+    if kroki_miedzy_sprawdzeniami is None:
+        kroki_miedzy_sprawdzeniami = config.ZADANIA_KROKI_MIEDZY_SPRAWDZENIAMI
+    if okres_raportu is None:
+        okres_raportu = config.ZADANIA_OKRES_RAPORTU_S
+
+    telemetria = KolejkaTelemetrii()
+    symulacja = Symulacja(scenariusz=scenariusz, odbiornik=telemetria)
+
+    def raportuj(stan):
+        kolejka_postepu.put((identyfikator, stan, postep_symulacji(symulacja), telemetria.oproznij()))
+
+    czas_raportu = 0.0
+    czy_kontynuowac = True
+    while czy_kontynuowac:
+        czy_kontynuowac = symulacja.wykonaj_kroki(kroki_miedzy_sprawdzeniami)
+
+        teraz = time.monotonic()
+        if teraz - czas_raportu < okres_raportu and czy_kontynuowac:
+            continue
+        czas_raportu = teraz
+
+        flaga = sterowanie.value
+        if flaga == WSTRZYMAJ:
+            raportuj(WSTRZYMANE)
+            while flaga == WSTRZYMAJ:
+                time.sleep(okres_raportu)
+                flaga = sterowanie.value
+        if flaga == ANULUJ:
+            return None
+        raportuj(TRWA)
+
+    return symulacja.pobierz_wyniki()
+
+
+class MenedzerZadan:
+    """
+    Zadania w puli procesów z postępem, wstrzymywaniem i anulowaniem.
+    Metody wywołuje jeden wątek (np. pętla Tk).
+    """
+
+    def __init__(self, liczba_procesow=None):
+        if liczba_procesow is None:
+            liczba_procesow = os.cpu_count() or 1
+        self.liczba_procesow = liczba_procesow
+        self.zadania = {}
+        self._nastepny_identyfikator = 1
+        self._menedzer = None
+        self._pula = None
+        self._kolejka_postepu = None
+
+    def _uruchom_pule(self):
+        if self._pula is None:
+            self._menedzer = multiprocessing.Manager()
+            self._kolejka_postepu = self._menedzer.Queue()
+            self._pula = ProcessPoolExecutor(max_workers=self.liczba_procesow)
+
+    def dodaj(self, scenariusz, nazwa=None):
+        """Dodaje scenariusz do kolejki i zwraca identyfikator zadania."""
+        # Brakującą tablicę lądowania buduje raz proces GUI, a nie każdy proces roboczy
+        przygotuj_tablice([scenariusz])
+        self._uruchom_pule()
+        identyfikator = self._nastepny_identyfikator
+        self._nastepny_identyfikator += 1
+
+        sterowanie = self._menedzer.Value('i', PRACUJ)
+        zadanie = Zadanie(identyfikator, nazwa or f"Zadanie {identyfikator}", scenariusz)
+        zadanie._sterowanie = sterowanie
+        zadanie._przyszlosc = self._pula.submit(wykonaj_zadanie, identyfikator, scenariusz, sterowanie,
+                                                self._kolejka_postepu)
+        self.zadania[identyfikator] = zadanie
+        return identyfikator
+
+    def _ustaw_flage(self, zadanie, flaga):
+        # Lokalna kopia flagi - odczyt wartości z menedżera to komunikacja między procesami
+        zadanie._flaga = flaga
+        zadanie._sterowanie.value = flaga
+
+    def wstrzymaj(self, identyfikator):
+        zadanie = self.zadania[identyfikator]
+        if not zadanie.czy_zakonczone:
+            self._ustaw_flage(zadanie, WSTRZYMAJ)
+            zadanie.stan = WSTRZYMANE
+
+    def wznow(self, identyfikator):
+        zadanie = self.zadania[identyfikator]
+        if zadanie.stan == WSTRZYMANE:
+            self._ustaw_flage(zadanie, PRACUJ)
+            zadanie.stan = TRWA if zadanie.postep > 0 else OCZEKUJE
+
+    def anuluj(self, identyfikator):
+        zadanie = self.zadania[identyfikator]
+        if zadanie.czy_zakonczone:
+            return
+        # Zadanie jeszcze w kolejce puli znika od razu, uruchomione kończy się przy najbliższym sprawdzeniu
+        if zadanie._przyszlosc.cancel():
+            zadanie.stan = ANULOWANE
+        else:
+            self._ustaw_flage(zadanie, ANULUJ)
+
+    def odbierz_postep(self):
+        """
+        Przetwarza zebrane raporty i zakończone zadania; zwraca zbiór
+        identyfikatorów zadań, które się zmieniły.
+        """
+        zmienione = set()
+        if self._pula is None:
+            return zmienione
+
+        while True:
+            try:
+                identyfikator, stan, postep, probki = self._kolejka_postepu.get_nowait()
+            except queue.Empty:
+                break
+            zadanie = self.zadania[identyfikator]
+            if zadanie.czy_zakonczone:
+                continue
+            zadanie.postep = postep
+            zadanie.probki.extend(probki)
+            zadanie.liczba_probek += len(probki)
+            # Raport wysłany przed odebraniem nowej flagi nie zmienia stanu ustawionego lokalnie
+            if zadanie._flaga == PRACUJ:
+                zadanie.stan = stan
+            zmienione.add(identyfikator)
+
+        for identyfikator, zadanie in self.zadania.items():
+            if zadanie.czy_zakonczone or not zadanie._przyszlosc.done():
+                continue
+            if zadanie._przyszlosc.cancelled():
+                zadanie.stan = ANULOWANE
+            elif zadanie._przyszlosc.exception() is not None:
+                zadanie.stan = BLAD
+                zadanie.blad = zadanie._przyszlosc.exception()
+            elif zadanie._przyszlosc.result() is None:
+                zadanie.stan = ANULOWANE
+            else:
+                zadanie.wyniki = zadanie._przyszlosc.result()
+                zadanie.stan = ZAKONCZONE
+                zadanie.postep = 1.0
+            zmienione.add(identyfikator)
+        return zmienione
+
+    def czy_wszystkie_zakonczone(self):
+        return all(zadanie.czy_zakonczone for zadanie in self.zadania.values())
+
+    def zamknij(self):
+        """Anuluje niezakończone zadania i zamyka pulę procesów."""
+        for identyfikator in list(self.zadania):
+            self.anuluj(identyfikator)
+        if self._pula is not None:
+            self._pula.shutdown(wait=True, cancel_futures=True)
+            self._menedzer.shutdown()
+            self._pula = None
+            self._menedzer = None
@@ -0,0 +1,216 @@
+"""
+Analiza Monte Carlo lądowania - rozrzut warunków początkowych liczony
+równolegle w puli procesów.
+
+Uruchomienie:
+    python -m src.monte_carlo --liczba 1000 --ziarno 42
+"""
+
+import sys
+import os
+import json
+import argparse
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz, wczytaj_tabele_nastaw
+from src.naprowadzanie import TRYBY_NAPROWADZANIA
+from src.tablice_ladowania import przygotuj_tablice
+from src.polityka_zapisu import ZapisTylkoKoncowy
+from src.magazyn_przebiegow import MagazynPrzebiegow, wiersz_przebiegu
+from src import config
+
+
+def losuj_scenariusz(ziarno_bazowe, indeks, planety=None, scenariusz_bazowy=None, tabela_nastaw=None):
+    """
+    Losuje scenariusz jednego przebiegu.
+
+    Strumień losowy zależy tylko od (ziarno_bazowe, indeks), więc wynik nie
+    zależy od podziału na porcje ani liczby procesów. Tabela nastaw
+    {planeta: NastawyAutopilota} podmienia nastawy dla wylosowanej planety.
+    """
+    if planety is None:
+        planety = list(config.PLANETY.keys())
+    if scenariusz_bazowy is None:
+        scenariusz_bazowy = Scenariusz()
+    generator = np.random.default_rng([ziarno_bazowe, indeks])
+    planeta = planety[generator.integers(len(planety))]
+    wysokosc = generator.uniform(*config.MONTE_CARLO_ZAKRES_WYSOKOSCI)
+    predkosc_y = generator.uniform(*config.MONTE_CARLO_ZAKRES_PREDKOSCI_PIONOWEJ)
+    predkosc_x = generator.uniform(*config.MONTE_CARLO_ZAKRES_PREDKOSCI_POZIOMEJ)
+    masa_paliwa = generator.uniform(*config.MONTE_CARLO_ZAKRES_MASY_PALIWA)
+    if tabela_nastaw and planeta in tabela_nastaw:
+        scenariusz_bazowy = scenariusz_bazowy.zmien(nastawy=tabela_nastaw[planeta])
+    return scenariusz_bazowy.zmien(
+        planeta=planeta,
+        wysokosc_startowa=float(wysokosc),
+        predkosc_pionowa_startowa=float(predkosc_y),
+        predkosc_pozioma_startowa=float(predkosc_x),
+        rakieta=dataclasses.replace(scenariusz_bazowy.rakieta, masa_paliwa=float(masa_paliwa))
+    )
+
+
+def wykonaj_przebieg(ziarno_bazowe, indeks, planety=None, scenariusz_bazowy=None, tabela_nastaw=None):
+    """Odtwarza pojedynczy przebieg (np. jedno z nieudanych ziaren)."""
+    scenariusz = losuj_scenariusz(ziarno_bazowe, indeks, planety, scenariusz_bazowy, tabela_nastaw)
+    symulacja = Symulacja(scenariusz=scenariusz, polityka_zapisu=ZapisTylkoKoncowy())
+    return symulacja.uruchom(czy_wyswietlac_postep=False)
+
+
+def _wykonaj_porcje(zadanie):
+    ziarno_bazowe, poczatek, koniec, planety, scenariusz_bazowy, tabela_nastaw, czy_zbierac_wiersze = zadanie
+    liczba = koniec - poczatek
+    wiersze = []
+
+    sukces = np.zeros(liczba, dtype=bool)
+    predkosc_ladowania = np.zeros(liczba)
+    paliwo_pozostale = np.zeros(liczba)
+    przesuniecie_x = np.zeros(liczba)
+
+    for i in range(liczba):
+        scenariusz = losuj_scenariusz(ziarno_bazowe, poczatek + i, planety, scenariusz_bazowy, tabela_nastaw)
+        wyniki = Symulacja(scenariusz=scenariusz, polityka_zapisu=ZapisTylkoKoncowy()).uruchom(czy_wyswietlac_postep=False)
+        if czy_zbierac_wiersze:
+            wiersze.append(wiersz_przebiegu(wyniki, scenariusz, 'monte_carlo', ziarno_bazowe, poczatek + i))
+        stan_koncowy = wyniki['stan_koncowy']
+        sukces[i] = wyniki['sukces']
+        predkosc_ladowania[i] = stan_koncowy['vy']
+        paliwo_pozostale[i] = stan_koncowy['masa_paliwa']
+        przesuniecie_x[i] = stan_koncowy['x']
+
+    return poczatek, sukces, predkosc_ladowania, paliwo_pozostale, przesuniecie_x, wiersze
+
+
+def podsumuj_rozklad(wartosci):
+    return {
+        'srednia': float(np.mean(wartosci)),
+        'odchylenie': float(np.std(wartosci)),
+        'minimum': float(np.min(wartosci)),
+        'maksimum': float(np.max(wartosci)),
+        'percentyle': {str(p): float(np.percentile(wartosci, p)) for p in (5, 25, 50, 75, 95)}
+    }
+
+
+def uruchom_monte_carlo(liczba_przebiegow, ziarno=0, planety=None, liczba_procesow=None,
+                        rozmiar_porcji=None, scenariusz_bazowy=None, tabela_nastaw=None, magazyn=None):
+    """
+    Uruchamia przebiegi w puli procesów. Jeśli podano magazyn
+    (MagazynPrzebiegow), podsumowanie każdego przebiegu jest do niego
+    dopisywane - jedna transakcja na porcję, w procesie głównym.
+    """
+    if liczba_procesow is None:
+        liczba_procesow = os.cpu_count() or 1
+    if rozmiar_porcji is None:
+        rozmiar_porcji = max(1, -(-liczba_przebiegow // (liczba_procesow * 4)))
+
+    zadania = [
+        (ziarno, poczatek, min(poczatek + rozmiar_porcji, liczba_przebiegow),
+         planety, scenariusz_bazowy, tabela_nastaw, magazyn is not None)
+        for poczatek in range(0, liczba_przebiegow, rozmiar_porcji)
+    ]
+
+    # Tablice lądowania budowane raz tutaj - procesy robocze tylko je otwierają
+    scenariusz_tablic = scenariusz_bazowy or Scenariusz()
+    przygotuj_tablice(scenariusz_tablic.zmien(planeta=planeta) for planeta in planety or config.PLANETY)
+
+    sukces = np.zeros(liczba_przebiegow, dtype=bool)
+    predkosc_ladowania = np.zeros(liczba_przebiegow)
+    paliwo_pozostale = np.zeros(liczba_przebiegow)
+    przesuniecie_x = np.zeros(liczba_przebiegow)
+
+    def zbierz(wynik_porcji):
+        poczatek, s, v, p, x, wiersze = wynik_porcji
+        if magazyn is not None:
+            magazyn.dodaj_wiele(wiersze)
+        koniec = poczatek + len(s)
+        sukces[poczatek:koniec] = s
+        predkosc_ladowania[poczatek:koniec] = v
+        paliwo_pozostale[poczatek:koniec] = p
+        przesuniecie_x[poczatek:koniec] = x
+
+    if liczba_procesow > 1:
+        with ProcessPoolExecutor(max_workers=liczba_procesow) as pula:
+            for wynik_porcji in pula.map(_wykonaj_porcje, zadania):
+                zbierz(wynik_porcji)
+    else:
+        for zadanie in zadania:
+            zbierz(_wykonaj_porcje(zadanie))
+
+    return {
+        'liczba_przebiegow': liczba_przebiegow,
+        'ziarno': ziarno,
+        'wskaznik_sukcesu': float(sukces.mean()) if liczba_przebiegow else 0.0,
+        'rozklady': {
+            'predkosc_ladowania': predkosc_ladowania,
+            'paliwo_pozostale': paliwo_pozostale,
+            'przesuniecie_x': przesuniecie_x
+        },
+        'nieudane_ziarna': [int(i) for i in np.flatnonzero(~sukces)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analiza Monte Carlo lądowania rakiety')
+    parser.add_argument('--liczba', type=int, default=1000, help='Liczba przebiegów (domyślnie: 1000)')
+    parser.add_argument('--ziarno', type=int, default=0, help='Ziarno bazowe generatora (domyślnie: 0)')
+    parser.add_argument('--procesy', type=int, default=None, help='Liczba procesów (domyślnie: liczba rdzeni)')
+    parser.add_argument('--porcja', type=int, default=None, help='Liczba przebiegów w jednej porcji pracy')
+    parser.add_argument('--planety', nargs='+', choices=list(config.PLANETY.keys()), default=None,
+                        help='Planety do losowania (domyślnie: wszystkie)')
+    parser.add_argument('--dt', type=float, default=config.KROK_CZASOWY_SYMULACJI,
+                        help=f'Krok czasowy symulacji [s] (domyślnie: {config.KROK_CZASOWY_SYMULACJI})')
+    parser.add_argument('--naprowadzanie', choices=sorted(TRYBY_NAPROWADZANIA), default=config.NAPROWADZANIE_DOMYSLNE,
+                        help=f'Tryb naprowadzania autopilota (domyślnie: {config.NAPROWADZANIE_DOMYSLNE})')
+    parser.add_argument('--nastawy', type=str, default=None,
+                        help='Tabela nastaw autopilota dla planet (JSON z python -m src.strojenie)')
+    parser.add_argument('--wyjscie', type=str, default=None, help='Zapisz podsumowanie do pliku JSON')
+    parser.add_argument('--magazyn', type=str, nargs='?', const=config.KATALOG_MAGAZYNU_PRZEBIEGOW, default=None,
+                        help=f'Dopisz przebiegi do magazynu (domyślnie: {config.KATALOG_MAGAZYNU_PRZEBIEGOW})')
+
+    argumenty = parser.parse_args()
+
+    wyniki = uruchom_monte_carlo(
+        argumenty.liczba,
+        ziarno=argumenty.ziarno,
+        planety=argumenty.planety,
+        liczba_procesow=argumenty.procesy,
+        rozmiar_porcji=argumenty.porcja,
+        scenariusz_bazowy=Scenariusz(krok_czasowy=argumenty.dt, naprowadzanie=argumenty.naprowadzanie),
+        tabela_nastaw=wczytaj_tabele_nastaw(argumenty.nastawy) if argumenty.nastawy else None,
+        magazyn=MagazynPrzebiegow(argumenty.magazyn) if argumenty.magazyn else None
+    )
+
+    podsumowanie = {
+        'liczba_przebiegow': wyniki['liczba_przebiegow'],
+        'ziarno': wyniki['ziarno'],
+        'wskaznik_sukcesu': wyniki['wskaznik_sukcesu'],
+        'rozklady': {klucz: podsumuj_rozklad(wartosci) for klucz, wartosci in wyniki['rozklady'].items()},
+        'nieudane_ziarna': wyniki['nieudane_ziarna']
+    }
+
+    print("=" * 60)
+    print("ANALIZA MONTE CARLO")
+    print("=" * 60)
+    print(f"Przebiegi: {podsumowanie['liczba_przebiegow']} (ziarno: {podsumowanie['ziarno']})")
+    print(f"Wskaźnik sukcesu: {podsumowanie['wskaznik_sukcesu'] * 100:.1f}%")
+    for klucz, rozklad in podsumowanie['rozklady'].items():
+        print(f"  {klucz}: średnia={rozklad['srednia']:.2f}, odchylenie={rozklad['odchylenie']:.2f}, "
+              f"mediana={rozklad['percentyle']['50']:.2f}")
+    print(f"Nieudane przebiegi: {len(podsumowanie['nieudane_ziarna'])}")
+    print("=" * 60)
+
+    if argumenty.wyjscie:
+        with open(argumenty.wyjscie, 'w', encoding='utf-8') as plik:
+            json.dump(podsumowanie, plik, indent=2, ensure_ascii=False)
+        print(f"Podsumowanie zapisane do: {argumenty.wyjscie}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Tryby naprowadzania autopilota.
+
+'heurystyczne' - klasyczny Autopilot (regulator PID i suicide burn wyzwalany
+z drogi hamowania).
+
+'predykcyjne' - AutopilotPredykcyjny: przy każdym sterowaniu symuluje do
+przodu wiele kandydujących profili ciągu naraz (propagator wektorowy numpy)
+i wybiera profil o najmniejszym zużyciu paliwa, który kończy się
+przyziemieniem z dopuszczalną prędkością. Kandydatem jest opóźnienie, z jakim
+rakieta wyhamuje od chwili zapłonu do prędkości docelowej tuż nad
+powierzchnią - im większe, tym później zapłon i mniejsze straty grawitacyjne,
+ale mniejszy zapas ciągu.
+
+'tabelaryczne' - AutopilotTabelaryczny (src/tablice_ladowania.py): ten sam
+profil odczytany z tablicy zbudowanej offline.
+"""
+
+import math
+
+import numpy as np
+
+from src import config
+from src.autopilot import Autopilot
+
+
+# Poniżej tej wysokości [m] wymagane opóźnienie liczone jest jak na tej wysokości
+WYSOKOSC_MINIMALNA_PROPAGACJI = 0.5
+
+
+def propaguj_hamowanie(wysokosc, predkosc_pionowa, masa_paliwa, przyspieszenia_hamowania, *,
+                       grawitacja, masa_pusta, cieg_maksymalny, zuzycie_paliwa,
+                       predkosc_docelowa, liczba_krokow, cos_pochylenia=1.0):
+    """
+    Propaguje ruch pionowy dla wszystkich kandydatów naraz i zwraca
+    (prędkość przyziemienia, zużyte paliwo, wysokość zapłonu, czy zapłon teraz)
+    jako tablice. Stan i opóźnienia kandydatów są rozgłaszane (broadcasting),
+    więc jednym wywołaniem można ocenić kandydatów dla wielu stanów.
+
+    Lot swobodny do zapłonu liczony jest w postaci zamkniętej, hamowanie -
+    `liczba_krokow` krokami półjawnego Eulera, których długość dobrana jest
+    do szacowanego czasu hamowania każdego kandydata. Kandydat, który nie
+    przyziemił w horyzoncie, dostaje prędkość nieskończoną. Rakieta jest
+    pochylona o kąt o cosinusie `cos_pochylenia` - pionowo działa tylko ta
+    część ciągu, a paliwo zużywa cały.
+    """
+    opoznienie = np.asarray(przyspieszenia_hamowania, dtype=float)
+    wysokosc = np.asarray(wysokosc, dtype=float)
+    predkosc_pionowa = np.asarray(predkosc_pionowa, dtype=float)
+    kwadrat_docelowej = predkosc_docelowa * predkosc_docelowa
+
+    # Opóźnienie potrzebne już teraz, by osiągnąć prędkość docelową na powierzchni
+    opoznienie_teraz = np.where(
+        predkosc_pionowa < 0,
+        (predkosc_pionowa * predkosc_pionowa - kwadrat_docelowej)
+        / (2 * np.maximum(wysokosc, WYSOKOSC_MINIMALNA_PROPAGACJI)),
+        -np.inf)
+    zaplon_teraz = opoznienie <= opoznienie_teraz
+
+    # Zapłon na przecięciu paraboli lotu swobodnego z krzywą stałego opóźnienia:
+    # v^2 = v0^2 + 2 g (h0 - h) = v_docelowa^2 + 2 a h
+    energia = predkosc_pionowa * predkosc_pionowa + 2 * grawitacja * wysokosc
+    wysokosc_zaplonu = np.where(zaplon_teraz, wysokosc,
+                                (energia - kwadrat_docelowej) / (2 * (grawitacja + opoznienie)))
+    bez_hamowania = wysokosc_zaplonu <= 0
+    wysokosc_zaplonu = np.maximum(wysokosc_zaplonu, 0.0)
+    predkosc_zaplonu = np.where(zaplon_teraz, predkosc_pionowa,
+                                -np.sqrt(kwadrat_docelowej + 2 * opoznienie * wysokosc_zaplonu))
+
+    czas_hamowania = (np.abs(predkosc_zaplonu) - predkosc_docelowa) / np.maximum(opoznienie, opoznienie_teraz)
+    # Zapas 50% horyzontu na nasycenie ciągu; kandydaci bez hamowania stoją w miejscu
+    krok = np.where(bez_hamowania, 0.0, 1.5 * np.maximum(czas_hamowania, 0.1) / liczba_krokow)
+
+    y = wysokosc_zaplonu
+    v = predkosc_zaplonu
+    paliwo = np.zeros(krok.shape) + masa_paliwa
+    cieg_pionowy_maksymalny = cieg_maksymalny * cos_pochylenia
+    zuzycie_na_niuton = zuzycie_paliwa / cieg_pionowy_maksymalny
+    for _ in range(liczba_krokow):
+        masa = masa_pusta + paliwo
+        potrzebne = (v * v - kwadrat_docelowej) / (2 * np.maximum(y, WYSOKOSC_MINIMALNA_PROPAGACJI))
+        cieg = np.where(paliwo > 0, np.clip(masa * (grawitacja + potrzebne), 0.0, cieg_pionowy_maksymalny), 0.0)
+        paliwo = np.maximum(paliwo - cieg * zuzycie_na_niuton * krok, 0.0)
+        v = v + (cieg / masa - grawitacja) * krok
+        y = y + v * krok
+        # Kandydaci po przyziemieniu zostają zamrożeni z prędkością z ostatniego odcinka
+        krok = np.where(y <= 0, 0.0, krok)
+
+    predkosc_przyziemienia = np.where(
+        bez_hamowania, -np.sqrt(energia), np.where(y <= 0, v, -np.inf))
+    return np.abs(predkosc_przyziemienia), masa_paliwa - paliwo, wysokosc_zaplonu, zaplon_teraz
+
+
+def wybierz_kandydata(predkosc_przyziemienia, zuzycie_paliwa, predkosc_dopuszczalna):
+    """
+    Indeks najlepszego kandydata wzdłuż ostatniej osi: najmniejsze zużycie
+    paliwa wśród przyziemiających z dopuszczalną prędkością, a gdy takich
+    nie ma - najmniejsza prędkość przyziemienia. Przy równym zużyciu wygrywa
+    pierwszy kandydat, więc kandydaci powinni być uporządkowani od
+    najmniejszego opóźnienia (największego zapasu).
+    """
+    dopuszczalni = predkosc_przyziemienia <= predkosc_dopuszczalna
+    koszt = np.where(dopuszczalni, zuzycie_paliwa, np.inf)
+    return np.where(dopuszczalni.any(axis=-1), np.argmin(koszt, axis=-1),
+                    np.argmin(predkosc_przyziemienia, axis=-1))
+
+
+class AutopilotPredykcyjny(Autopilot):
+    """
+    Autopilot wybierający profil hamowania z symulacji kandydatów do przodu.
+
+    Kandydaci to ułamki opóźnienia planowanego, najwyżej `zapas_ciagu`
+    opóźnienia możliwego przy pełnym ciągu i największym pochyleniu, na jakie
+    pozwala regulator pozycji poziomej - reszta zostaje na korekty. Połowa
+    siatki pokrywa cały zakres, połowa zagęszcza się wokół rozwiązania
+    z poprzedniego sterowania. Po zapłonie rakieta hamuje do prędkości
+    docelowej przy powierzchni i profil już się nie zmienia.
+    """
+
+    def __init__(self, rakieta, nastawy=None, predkosc_ladowania_maksymalna=None,
+                 liczba_kandydatow=None, liczba_krokow=None, zapas_ciagu=None):
+        super().__init__(rakieta, nastawy)
+        if predkosc_ladowania_maksymalna is None:
+            predkosc_ladowania_maksymalna = config.PREDKOSC_LADOWANIA_MAKSYMALNA
+        if liczba_kandydatow is None:
+            liczba_kandydatow = config.NAPROWADZANIE_LICZBA_KANDYDATOW
+        if liczba_krokow is None:
+            liczba_krokow = config.NAPROWADZANIE_LICZBA_KROKOW_PROPAGACJI
+        if zapas_ciagu is None:
+            zapas_ciagu = config.NAPROWADZANIE_ZAPAS_CIAGU
+        if liczba_kandydatow < 2:
+            raise ValueError("Naprowadzanie predykcyjne wymaga co najmniej 2 kandydatów")
+
+        self.predkosc_docelowa = predkosc_ladowania_maksymalna * config.NAPROWADZANIE_PREDKOSC_DOCELOWA
+        self.predkosc_dopuszczalna = predkosc_ladowania_maksymalna * config.NAPROWADZANIE_PREDKOSC_DOPUSZCZALNA
+        self.liczba_krokow = liczba_krokow
+        self.zapas_ciagu = zapas_ciagu
+        self._cos_pochylenia = math.cos(self.regulator_pozycji_poziomej.wartosc_maksymalna)
+
+        liczba_globalnych = liczba_kandydatow // 2
+        self._siatka_globalna = np.linspace(0.05, 0.95, liczba_globalnych)
+        self._siatka_lokalna = np.linspace(-0.5, 0.5, liczba_kandydatow - liczba_globalnych) / liczba_globalnych
+
+        self.tryb_ladowania = "lot_swobodny"
+        self.ulamek_opoznienia = 0.5
+        self.czy_hamowanie = False
+        self.przewidywana_predkosc_przyziemienia = None
+        self.przewidywane_zuzycie_paliwa = None
+
+    def kandydaci(self):
+        """Ułamki opóźnienia (rosnąco): siatka globalna i lokalna wokół poprzedniego rozwiązania."""
+        lokalni = np.clip(self.ulamek_opoznienia + self._siatka_lokalna, 0.01, 0.99)
+        return np.sort(np.concatenate((self._siatka_globalna, lokalni)))
+
+    def oblicz_sterowanie(self, krok_czasowy):
+        kat_nachylenia = self.kontrola_pozycji_poziomej(krok_czasowy)
+        return self.oblicz_ciag(), kat_nachylenia
+
+    def oblicz_ciag(self):
+        rakieta = self.rakieta
+        wysokosc, predkosc = rakieta.pozycja_y, rakieta.predkosc_y
+        if predkosc >= 0:
+            self.czy_hamowanie = False
+            self.tryb_ladowania = "lot_swobodny"
+            return 0.0
+
+        grawitacja = rakieta.grawitacja
+        masa = rakieta.masa_calkowita
+        opoznienie_maksymalne = self._cos_pochylenia * rakieta.cieg_maksymalny / masa - grawitacja
+        if opoznienie_maksymalne <= 0:
+            # Nawet zawis nie jest możliwy - zostaje hamowanie z pełną mocą heurystyki
+            self.tryb_ladowania = "suicide_burn"
+            return self.ladowanie_suicide_burn()
+
+        opoznienie_teraz = ((predkosc * predkosc - self.predkosc_docelowa ** 2)
+                            / (2 * max(wysokosc, WYSOKOSC_MINIMALNA_PROPAGACJI)))
+        if not self.czy_hamowanie:
+            self.czy_hamowanie = self._wybierz_profil(self.zapas_ciagu * opoznienie_maksymalne)
+        if not self.czy_hamowanie:
+            self.tryb_ladowania = "lot_swobodny"
+            return 0.0
+
+        self.tryb_ladowania = "hamowanie"
+        # Ciąg pionowy równy potrzebnemu mimo pochylenia rakiety
+        cieg = masa * (grawitacja + opoznienie_teraz) / math.cos(rakieta.kat_nachylenia)
+        return max(0.0, min(cieg, rakieta.cieg_maksymalny))
+
+    def _wybierz_profil(self, opoznienie_planowane):
+        """Ocenia kandydatów i zapamiętuje najlepszego; zwraca True, gdy czas na zapłon."""
+        rakieta = self.rakieta
+        ulamki = self.kandydaci()
+        predkosc, paliwo, _, zaplon_teraz = propaguj_hamowanie(
+            rakieta.pozycja_y, rakieta.predkosc_y, rakieta.masa_paliwa_aktualna,
+            ulamki * opoznienie_planowane,
+            grawitacja=rakieta.grawitacja,
+            masa_pusta=rakieta.masa_rakiety_pusta,
+            cieg_maksymalny=rakieta.cieg_maksymalny,
+            zuzycie_paliwa=rakieta.zuzycie_paliwa_na_sekunde,
+            predkosc_docelowa=self.predkosc_docelowa,
+            liczba_krokow=self.liczba_krokow,
+            cos_pochylenia=self._cos_pochylenia
+        )
+        indeks = wybierz_kandydata(predkosc, paliwo, self.predkosc_dopuszczalna)
+
+        self.ulamek_opoznienia = float(ulamki[indeks])
+        self.przewidywana_predkosc_przyziemienia = float(predkosc[indeks])
+        self.przewidywane_zuzycie_paliwa = float(paliwo[indeks])
+        return bool(zaplon_teraz[indeks])
+
+    def resetuj(self):
+        super().resetuj()
+        self.tryb_ladowania = "lot_swobodny"
+        self.ulamek_opoznienia = 0.5
+        self.czy_hamowanie = False
+
+    def stan(self):
+        stan = super().stan()
+        stan['ulamek_opoznienia'] = self.ulamek_opoznienia
+        stan['czy_hamowanie'] = self.czy_hamowanie
+        return stan
+
+    def przywroc_stan(self, stan):
+        super().przywroc_stan(stan)
+        self.ulamek_opoznienia = stan['ulamek_opoznienia']
+        self.czy_hamowanie = stan['czy_hamowanie']
+
+
+def _autopilot_tabelaryczny(rakieta, scenariusz):
+    # Import na miejscu - tablice_ladowania korzysta z propagatora z tego modułu
+    from src.tablice_ladowania import AutopilotTabelaryczny, pobierz_tablice
+    return AutopilotTabelaryczny(rakieta, scenariusz.nastawy, scenariusz.predkosc_ladowania_maksymalna,
+                                 pobierz_tablice(scenariusz))
+
+
+TRYBY_NAPROWADZANIA = {
+    'heurystyczne': lambda rakieta, scenariusz: Autopilot(rakieta, scenariusz.nastawy),
+    'predykcyjne': lambda rakieta, scenariusz: AutopilotPredykcyjny(
+        rakieta, scenariusz.nastawy, scenariusz.predkosc_ladowania_maksymalna),
+    'tabelaryczne': _autopilot_tabelaryczny,
+}
+
+
+def utworz_autopilota(rakieta, scenariusz):
+    """Autopilot w trybie naprowadzania wskazanym w scenariuszu."""
+    if scenariusz.naprowadzanie not in TRYBY_NAPROWADZANIA:
+        raise ValueError(f"Nieznany tryb naprowadzania '{scenariusz.naprowadzanie}', "
+                         f"dostępne: {sorted(TRYBY_NAPROWADZANIA)}")
+    return TRYBY_NAPROWADZANIA[scenariusz.naprowadzanie](rakieta, scenariusz)
@@ -0,0 +1,191 @@
+"""
+Polityki zapisu historii lotu.
+
+Polityka decyduje, w których krokach Symulacja zapisuje stan rakiety.
+Stan końcowy jest zapisywany zawsze, niezależnie od polityki.
+"""
+
+import math
+
+import numpy as np
+
+
+class PolitykaZapisu:
+    """Klasa bazowa - zapis w każdym kroku."""
+
+    def resetuj(self):
+        pass
+
+    def czy_zapisac(self, symulacja):
+        return True
+
+    def szacowana_liczba_probek(self, liczba_krokow, krok_czasowy):
+        return liczba_krokow
+
+    def kroki_do_zapisu(self, symulacja, liczba_krokow):
+        """
+        Przesunięcia (0 .. liczba_krokow-1) kroków, które należy zapisać, gdy
+        Symulacja przewija lot swobodny bez wykonywania kroków. Zwraca None,
+        jeśli polityka nie umie tego przewidzieć - przewijanie jest wtedy pomijane.
+        """
+        return None
+
+    def funkcja_zapisu(self, symulacja):
+        """
+        Zwraca funkcję wywoływaną raz na krok symulacji. Podklasy mogą zwrócić
+        bezpośrednio `zapisz_aktualny_stan` albo funkcję pustą, żeby pętla
+        główna nie sprawdzała polityki w każdym kroku.
+        """
+        self.resetuj()
+        zapisz = symulacja.zapisz_aktualny_stan
+        czy_zapisac = self.czy_zapisac
+
+        def zapisz_warunkowo():
+            if czy_zapisac(symulacja):
+                zapisz()
+
+        return zapisz_warunkowo
+
+
+class ZapisCoNKrokow(PolitykaZapisu):
+    def __init__(self, co_ile_krokow=1):
+        if co_ile_krokow < 1:
+            raise ValueError("co_ile_krokow musi być >= 1")
+        self.co_ile_krokow = int(co_ile_krokow)
+
+    def czy_zapisac(self, symulacja):
+        return symulacja.numer_kroku % self.co_ile_krokow == 0
+
+    def szacowana_liczba_probek(self, liczba_krokow, krok_czasowy):
+        return liczba_krokow // self.co_ile_krokow + 1
+
+    def kroki_do_zapisu(self, symulacja, liczba_krokow):
+        pierwszy = -symulacja.numer_kroku % self.co_ile_krokow
+        return np.arange(pierwszy, liczba_krokow, self.co_ile_krokow)
+
+    def funkcja_zapisu(self, symulacja):
+        if self.co_ile_krokow == 1:
+            return symulacja.zapisz_aktualny_stan
+        return super().funkcja_zapisu(symulacja)
+
+
+class ZapisCoInterwalCzasu(PolitykaZapisu):
+    def __init__(self, interwal):
+        if interwal <= 0:
+            raise ValueError("interwal musi być dodatni")
+        self.interwal = interwal
+        self.czas_nastepnego_zapisu = 0.0
+
+    def resetuj(self):
+        self.czas_nastepnego_zapisu = 0.0
+
+    def czy_zapisac(self, symulacja):
+        # Tolerancja chroni przed pominięciem próbki przez sumowanie błędów zaokrągleń czasu
+        if symulacja.czas_aktualny + 1e-9 >= self.czas_nastepnego_zapisu:
+            liczba_interwalow = math.floor((symulacja.czas_aktualny + 1e-9) / self.interwal) + 1
+            self.czas_nastepnego_zapisu = liczba_interwalow * self.interwal
+            return True
+        return False
+
+    def szacowana_liczba_probek(self, liczba_krokow, krok_czasowy):
+        return min(liczba_krokow, int(liczba_krokow * krok_czasowy / self.interwal) + 2)
+
+    def kroki_do_zapisu(self, symulacja, liczba_krokow):
+        krok_czasowy = symulacja.krok_czasowy
+        czas_poczatkowy = symulacja.numer_kroku * krok_czasowy
+        kroki = []
+        # Pierwszy krok, w którym czas osiąga termin następnego zapisu (jak w czy_zapisac)
+        przesuniecie = max(0, math.ceil((self.czas_nastepnego_zapisu - 1e-9 - czas_poczatkowy) / krok_czasowy))
+        while przesuniecie < liczba_krokow:
+            czas = czas_poczatkowy + przesuniecie * krok_czasowy
+            if czas + 1e-9 < self.czas_nastepnego_zapisu:
+                przesuniecie += 1
+                continue
+            kroki.append(przesuniecie)
+            self.czas_nastepnego_zapisu = (math.floor((czas + 1e-9) / self.interwal) + 1) * self.interwal
+            przesuniecie = max(przesuniecie + 1,
+                               math.ceil((self.czas_nastepnego_zapisu - 1e-9 - czas_poczatkowy) / krok_czasowy))
+        return np.array(kroki, dtype=np.int64)
+
+
+class ZapisAdaptacyjny(PolitykaZapisu):
+    """
+    Zapisuje stan, gdy którakolwiek wielkość zmieniła się od ostatniego zapisu
+    o więcej niż zadany próg (lub minął maksymalny odstęp czasu).
+    """
+
+    ATRYBUTY_RAKIETY = {
+        'x': 'pozycja_x',
+        'y': 'pozycja_y',
+        'vx': 'predkosc_x',
+        'vy': 'predkosc_y',
+        'masa_paliwa': 'masa_paliwa_aktualna',
+        'cieg': 'cieg_aktualny',
+        'kat': 'kat_nachylenia'
+    }
+
+    def __init__(self, progi=None, maksymalny_odstep=None):
+        if progi is None:
+            progi = {'y': 1.0, 'vy': 0.5, 'x': 1.0, 'cieg': 100.0}
+        nieznane = set(progi) - set(self.ATRYBUTY_RAKIETY)
+        if nieznane:
+            raise ValueError(f"Nieznane wielkości w progach: {sorted(nieznane)}")
+        self.progi = [(self.ATRYBUTY_RAKIETY[klucz], prog) for klucz, prog in progi.items()]
+        self.maksymalny_odstep = maksymalny_odstep
+        self.ostatnie_wartosci = None
+        self.czas_ostatniego_zapisu = None
+
+    def resetuj(self):
+        self.ostatnie_wartosci = None
+        self.czas_ostatniego_zapisu = None
+
+    def czy_zapisac(self, symulacja):
+        rakieta = symulacja.rakieta
+        wartosci = [getattr(rakieta, atrybut) for atrybut, _ in self.progi]
+
+        czy_zapisac = self.ostatnie_wartosci is None
+        if not czy_zapisac and self.maksymalny_odstep is not None:
+            czy_zapisac = symulacja.czas_aktualny - self.czas_ostatniego_zapisu >= self.maksymalny_odstep
+        if not czy_zapisac:
+            for wartosc, ostatnia, (_, prog) in zip(wartosci, self.ostatnie_wartosci, self.progi):
+                if abs(wartosc - ostatnia) > prog:
+                    czy_zapisac = True
+                    break
+
+        if czy_zapisac:
+            self.ostatnie_wartosci = wartosci
+            self.czas_ostatniego_zapisu = symulacja.czas_aktualny
+        return czy_zapisac
+
+
+class ZapisTylkoKoncowy(PolitykaZapisu):
+    def czy_zapisac(self, symulacja):
+        return False
+
+    def szacowana_liczba_probek(self, liczba_krokow, krok_czasowy):
+        return 1
+
+    def kroki_do_zapisu(self, symulacja, liczba_krokow):
+        return np.empty(0, dtype=np.int64)
+
+    def funkcja_zapisu(self, symulacja):
+        return _nic_nie_rob
+
+
+def _nic_nie_rob():
+    pass
+
+
+def przygotuj_odbiornik(odbiornik):
+    """
+    Zamienia odbiornik próbek na funkcję jednego argumentu.
+
+    Odbiornik może być dowolną funkcją albo generatorem-korutyną przyjmującą
+    próbki przez `send()` (jest wtedy automatycznie uruchamiany).
+    """
+    if odbiornik is None:
+        return None
+    if hasattr(odbiornik, 'send'):
+        next(odbiornik)
+        return odbiornik.send
+    return odbiornik
@@ -0,0 +1,95 @@
+"""
+Redukcja liczby punktów linii przed rysowaniem.
+
+Długie przebiegi z małym krokiem mają setki tysięcy próbek na kanał, a
+wykres ma kilkaset pikseli szerokości. Dwie metody:
+
+- 'min_max' - w każdym przedziale (ok. jeden na piksel) zostaje próbka
+  minimalna i maksymalna; szczyty (np. maksymalny ciąg) są zachowane,
+  w pełni wektorowo,
+- 'lttb' - Largest-Triangle-Three-Buckets: jeden punkt na przedział,
+  wybierany tak, by trójkąt z sąsiednimi punktami miał największe pole.
+
+Pierwsza i ostatnia próbka (start i przyziemienie) są zawsze zachowane.
+"""
+
+import numpy as np
+
+
+METODY_PROBKOWANIA = ('min_max', 'lttb')
+
+
+def indeksy_min_max(kanaly, liczba_przedzialow):
+    """
+    Posortowane indeksy próbek: minimum i maksimum każdego kanału w każdym
+    z `liczba_przedzialow` równych przedziałów, plus pierwsza i ostatnia.
+    """
+    kanaly = [np.asarray(kanal, dtype=np.float64) for kanal in kanaly]
+    liczba_probek = len(kanaly[0])
+    if liczba_przedzialow <= 0 or liczba_probek <= 2 * liczba_przedzialow:
+        return np.arange(liczba_probek)
+
+    rozmiar = -(-liczba_probek // liczba_przedzialow)
+    liczba_przedzialow = -(-liczba_probek // rozmiar)
+    poczatki = np.arange(liczba_przedzialow) * rozmiar
+    # Dopełnienie ostatnią wartością - przy remisie argmin/argmax wskazuje wcześniejszą, prawdziwą próbkę
+    dopelnienie = liczba_przedzialow * rozmiar - liczba_probek
+
+    indeksy = [np.array([0, liczba_probek - 1])]
+    for kanal in kanaly:
+        tablica = np.pad(kanal, (0, dopelnienie), mode='edge').reshape(liczba_przedzialow, rozmiar)
+        indeksy.append(poczatki + tablica.argmin(axis=1))
+        indeksy.append(poczatki + tablica.argmax(axis=1))
+    return np.unique(np.concatenate(indeksy))
+
+
+def indeksy_lttb(x, y, liczba_punktow):
+    """Indeksy `liczba_punktow` próbek wybranych algorytmem LTTB."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    liczba_probek = len(x)
+    if liczba_punktow >= liczba_probek or liczba_punktow < 3:
+        return np.arange(liczba_probek)
+
+    # Przedziały dla punktów wewnętrznych (bez pierwszej i ostatniej próbki)
+    krawedzie = np.linspace(1, liczba_probek - 1, liczba_punktow - 1).astype(np.int64)
+    suma_x = np.concatenate(([0.0], np.cumsum(x)))
+    suma_y = np.concatenate(([0.0], np.cumsum(y)))
+    liczebnosci = krawedzie[1:] - krawedzie[:-1]
+    srednie_x = (suma_x[krawedzie[1:]] - suma_x[krawedzie[:-1]]) / liczebnosci
+    srednie_y = (suma_y[krawedzie[1:]] - suma_y[krawedzie[:-1]]) / liczebnosci
+    # Dla ostatniego przedziału "następnym" jest ostatnia próbka
+    srednie_x = np.append(srednie_x[1:], x[-1])
+    srednie_y = np.append(srednie_y[1:], y[-1])
+
+    indeksy = np.empty(liczba_punktow, dtype=np.int64)
+    indeksy[0] = 0
+    indeksy[-1] = liczba_probek - 1
+    wybrany = 0
+    for numer in range(liczba_punktow - 2):
+        poczatek, koniec = krawedzie[numer], krawedzie[numer + 1]
+        pola = np.abs((x[wybrany] - srednie_x[numer]) * (y[poczatek:koniec] - y[wybrany])
+                      - (x[wybrany] - x[poczatek:koniec]) * (srednie_y[numer] - y[wybrany]))
+        wybrany = poczatek + int(pola.argmax())
+        indeksy[numer + 1] = wybrany
+    return indeksy
+
+
+def indeksy_probkowania(x, y, liczba_przedzialow, metoda='min_max'):
+    """Indeksy próbek linii (x, y) zostających po redukcji do ok. `liczba_przedzialow` przedziałów."""
+    if metoda == 'min_max':
+        return indeksy_min_max([x, y], liczba_przedzialow)
+    if metoda == 'lttb':
+        return indeksy_lttb(x, y, 2 * liczba_przedzialow)
+    raise ValueError(f"Nieznana metoda próbkowania: {metoda} (dostępne: {', '.join(METODY_PROBKOWANIA)})")
+
+
+def probkuj_linie(x, y, liczba_przedzialow, metoda='min_max'):
+    """
+    Zredukowana linia (x, y) dla wykresu szerokiego na ok. `liczba_przedzialow`
+    pikseli. Krótkie linie są zwracane bez zmian.
+    """
+    indeksy = indeksy_probkowania(x, y, liczba_przedzialow, metoda)
+    if len(indeksy) == len(x):
+        return x, y
+    return np.asarray(x)[indeksy], np.asarray(y)[indeksy]
@@ -0,0 +1,266 @@
+"""
+Przeszukiwanie siatki parametrów z trwałą pamięcią wyników.
+
+Każda komórka siatki to jeden Scenariusz. Wynik komórki jest zapisywany na
+dysku pod kluczem będącym skrótem SHA-256 scenariusza (warunki początkowe,
+rakieta, nastawy) i wersji kodu, więc ponowne uruchomienie przeszukiwania
+z dodatkową wartością na jednej osi liczy tylko nowe komórki.
+
+Uruchomienie:
+    python -m src.przeszukiwanie --os WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC=2.0,2.5,3.0 \\
+        --os planeta=wszystkie --wyjscie data/przeszukiwanie.csv
+"""
+
+import sys
+import os
+import csv
+import json
+import glob
+import hashlib
+import argparse
+import itertools
+import dataclasses
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src.polityka_zapisu import ZapisTylkoKoncowy
+from src.tablice_ladowania import przygotuj_tablice
+from src import config
+
+
+# Nazwy stałych z config odpowiadające polom scenariusza
+ALIASY_PARAMETROW = {
+    'WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC': 'nastawy.wspolczynnik_proporcjonalny_wysokosc',
+    'WSPOLCZYNNIK_CALKUJACY_WYSOKOSC': 'nastawy.wspolczynnik_calkujacy_wysokosc',
+    'WSPOLCZYNNIK_ROZNICZKUJACY_WYSOKOSC': 'nastawy.wspolczynnik_rozniczkujacy_wysokosc',
+    'WSPOLCZYNNIK_PROPORCJONALNY_POZIOM': 'nastawy.wspolczynnik_proporcjonalny_poziom',
+    'WSPOLCZYNNIK_ROZNICZKUJACY_POZIOM': 'nastawy.wspolczynnik_rozniczkujacy_poziom',
+    'MARGINES_BEZPIECZENSTWA_SUICIDE_BURN': 'nastawy.margines_suicide_burn',
+    'WYSOKOSC_STARTOWA': 'wysokosc_startowa',
+    'PREDKOSC_PIONOWA_STARTOWA': 'predkosc_pionowa_startowa',
+    'PREDKOSC_POZIOMA_STARTOWA': 'predkosc_pozioma_startowa',
+    'POZYCJA_POZIOMA_STARTOWA': 'pozycja_pozioma_startowa',
+    'MASA_PALIWA_STARTOWA': 'rakieta.masa_paliwa',
+    'KROK_CZASOWY_SYMULACJI': 'krok_czasowy',
+}
+
+KOLUMNY_WYNIKU = ('sukces', 'komunikat', 'czas_symulacji', 'predkosc_ladowania',
+                  'predkosc_pozioma', 'paliwo_pozostale', 'przesuniecie_x')
+
+
+def sciezka_parametru(nazwa):
+    """Zamienia nazwę z config (np. WSPOLCZYNNIK_...) na ścieżkę pola scenariusza."""
+    return ALIASY_PARAMETROW.get(nazwa, nazwa)
+
+
+def zastosuj_parametry(scenariusz, parametry):
+    """Zwraca kopię scenariusza z podmienionymi polami (także zagnieżdżonymi, np. 'nastawy.x')."""
+    zmiany = {}
+    zmiany_zagniezdzone = {}
+    for nazwa, wartosc in parametry.items():
+        sciezka = sciezka_parametru(nazwa)
+        if '.' in sciezka:
+            pole, podpole = sciezka.split('.', 1)
+            zmiany_zagniezdzone.setdefault(pole, {})[podpole] = wartosc
+        else:
+            zmiany[sciezka] = wartosc
+    for pole, podzmiany in zmiany_zagniezdzone.items():
+        zmiany[pole] = dataclasses.replace(getattr(scenariusz, pole), **podzmiany)
+    return scenariusz.zmien(**zmiany)
+
+
+def siatka_parametrow(osie):
+    """Iloczyn kartezjański osi: {'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]."""
+    nazwy = list(osie)
+    for wartosci in itertools.product(*(osie[nazwa] for nazwa in nazwy)):
+        yield dict(zip(nazwy, wartosci))
+
+
+@functools.lru_cache(maxsize=None)
+def wersja_kodu():
+    """Skrót treści modułów src/*.py - zmiana kodu unieważnia pamięć wyników."""
+    skrot = hashlib.sha256()
+    katalog = os.path.dirname(os.path.abspath(__file__))
+    for sciezka in sorted(glob.glob(os.path.join(katalog, '*.py'))):
+        skrot.update(os.path.basename(sciezka).encode('utf-8'))
+        with open(sciezka, 'rb') as plik:
+            skrot.update(plik.read())
+    return skrot.hexdigest()[:16]
+
+
+def klucz_scenariusza(scenariusz):
+    tresc = json.dumps({'scenariusz': scenariusz.do_slownika(), 'wersja_kodu': wersja_kodu()},
+                       sort_keys=True)
+    return hashlib.sha256(tresc.encode('utf-8')).hexdigest()
+
+
+class PamiecWynikow:
+    """
+    Wyniki komórek na dysku - jeden mały plik JSON na klucz, rozłożony na
+    podkatalogi według dwóch pierwszych znaków klucza.
+    """
+
+    def __init__(self, katalog=None):
+        if katalog is None:
+            katalog = config.KATALOG_PAMIECI_WYNIKOW
+        self.katalog = katalog
+
+    def _sciezka(self, klucz):
+        return os.path.join(self.katalog, klucz[:2], klucz + '.json')
+
+    def pobierz(self, klucz):
+        try:
+            with open(self._sciezka(klucz), 'r', encoding='utf-8') as plik:
+                return json.load(plik)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def zapisz(self, klucz, wynik):
+        sciezka = self._sciezka(klucz)
+        os.makedirs(os.path.dirname(sciezka), exist_ok=True)
+        # Zapis do pliku tymczasowego i podmiana - przerwany zapis nie zostawia uszkodzonego wpisu
+        sciezka_tymczasowa = f"{sciezka}.{os.getpid()}.tmp"
+        with open(sciezka_tymczasowa, 'w', encoding='utf-8') as plik:
+            json.dump(wynik, plik)
+        os.replace(sciezka_tymczasowa, sciezka)
+
+
+def oblicz_komorke(scenariusz):
+    wyniki = Symulacja(scenariusz=scenariusz, polityka_zapisu=ZapisTylkoKoncowy(),
+                       czy_zachowac_historie=False).uruchom(czy_wyswietlac_postep=False)
+    stan_koncowy = wyniki['stan_koncowy']
+    return {
+        'sukces': bool(wyniki['sukces']),
+        'komunikat': wyniki['komunikat'],
+        'czas_symulacji': float(wyniki['czas_symulacji']),
+        'predkosc_ladowania': float(stan_koncowy['vy']),
+        'predkosc_pozioma': float(stan_koncowy['vx']),
+        'paliwo_pozostale': float(stan_koncowy['masa_paliwa']),
+        'przesuniecie_x': float(stan_koncowy['x'])
+    }
+
+
+def przeszukaj(osie, scenariusz_bazowy=None, pamiec=None, liczba_procesow=None, rozmiar_porcji=None):
+    """
+    Generator wierszy tabeli wyników (jeden słownik na komórkę siatki).
+
+    Wiersz zawiera wartości parametrów, kolumny KOLUMNY_WYNIKU i 'z_pamieci'.
+    Komórki z pamięci są zwracane od razu, brakujące są liczone w puli
+    procesów i zapisywane do pamięci w miarę napływu wyników.
+    `pamiec=False` wyłącza pamięć wyników.
+    """
+    if scenariusz_bazowy is None:
+        scenariusz_bazowy = Scenariusz()
+    if pamiec is None:
+        pamiec = PamiecWynikow()
+    if liczba_procesow is None:
+        liczba_procesow = os.cpu_count() or 1
+
+    do_policzenia = []
+    for parametry in siatka_parametrow(osie):
+        scenariusz = zastosuj_parametry(scenariusz_bazowy, parametry)
+        klucz = klucz_scenariusza(scenariusz)
+        wynik = pamiec.pobierz(klucz) if pamiec else None
+        if wynik is not None:
+            yield {**parametry, **wynik, 'z_pamieci': True}
+        else:
+            do_policzenia.append((parametry, scenariusz, klucz))
+
+    if not do_policzenia:
+        return
+    if rozmiar_porcji is None:
+        rozmiar_porcji = max(1, -(-len(do_policzenia) // (liczba_procesow * 4)))
+
+    scenariusze = [scenariusz for _, scenariusz, _ in do_policzenia]
+    # Tablice lądowania budowane raz tutaj - procesy robocze tylko je otwierają
+    przygotuj_tablice(scenariusze)
+    if liczba_procesow > 1:
+        with ProcessPoolExecutor(max_workers=liczba_procesow) as pula:
+            wyniki = pula.map(oblicz_komorke, scenariusze, chunksize=rozmiar_porcji)
+            yield from _zbierz(do_policzenia, wyniki, pamiec)
+    else:
+        yield from _zbierz(do_policzenia, map(oblicz_komorke, scenariusze), pamiec)
+
+
+def _zbierz(do_policzenia, wyniki, pamiec):
+    for (parametry, _, klucz), wynik in zip(do_policzenia, wyniki):
+        if pamiec:
+            pamiec.zapisz(klucz, wynik)
+        yield {**parametry, **wynik, 'z_pamieci': False}
+
+
+def zapisz_tabele_csv(wiersze, sciezka):
+    """Zapisuje wiersze strumieniowo do CSV (plik rośnie w trakcie przeszukiwania)."""
+    liczba_wierszy = 0
+    with open(sciezka, 'w', newline='', encoding='utf-8') as plik:
+        zapisujacy = None
+        for wiersz in wiersze:
+            if zapisujacy is None:
+                zapisujacy = csv.DictWriter(plik, fieldnames=list(wiersz))
+                zapisujacy.writeheader()
+            zapisujacy.writerow(wiersz)
+            plik.flush()
+            liczba_wierszy += 1
+    return liczba_wierszy
+
+
+def _wartosc_osi(tekst):
+    """Liczba, jeśli tekst da się tak odczytać, inaczej nazwa (np. integrator)."""
+    try:
+        return float(tekst)
+    except ValueError:
+        return tekst
+
+
+def _wczytaj_os(tekst):
+    nazwa, _, wartosci = tekst.partition('=')
+    if not wartosci:
+        raise argparse.ArgumentTypeError(f"Oś musi mieć postać NAZWA=w1,w2,...: '{tekst}'")
+    if nazwa == 'planeta':
+        if wartosci == 'wszystkie':
+            return nazwa, list(config.PLANETY.keys())
+        return nazwa, wartosci.split(',')
+    return nazwa, [_wartosc_osi(wartosc) for wartosc in wartosci.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Przeszukiwanie siatki parametrów lądowania')
+    parser.add_argument('--os', type=_wczytaj_os, action='append', required=True, dest='osie',
+                        help="Oś siatki NAZWA=w1,w2,... (nazwa pola scenariusza lub stałej z config; "
+                             "'planeta=wszystkie' - wszystkie planety)")
+    parser.add_argument('--procesy', type=int, default=None, help='Liczba procesów (domyślnie: liczba rdzeni)')
+    parser.add_argument('--pamiec', type=str, default=config.KATALOG_PAMIECI_WYNIKOW,
+                        help=f'Katalog pamięci wyników (domyślnie: {config.KATALOG_PAMIECI_WYNIKOW})')
+    parser.add_argument('--bez-pamieci', action='store_true', help='Nie używaj pamięci wyników')
+    parser.add_argument('--wyjscie', type=str, default=None, help='Zapisz tabelę wyników do pliku CSV')
+
+    argumenty = parser.parse_args()
+    pamiec = False if argumenty.bez_pamieci else PamiecWynikow(argumenty.pamiec)
+    wiersze = przeszukaj(dict(argumenty.osie), pamiec=pamiec, liczba_procesow=argumenty.procesy)
+
+    liczba_z_pamieci = 0
+    def licz(wiersze):
+        nonlocal liczba_z_pamieci
+        for wiersz in wiersze:
+            liczba_z_pamieci += wiersz['z_pamieci']
+            yield wiersz
+
+    if argumenty.wyjscie:
+        liczba = zapisz_tabele_csv(licz(wiersze), argumenty.wyjscie)
+        print(f"Tabela wyników zapisana do: {argumenty.wyjscie}")
+    else:
+        liczba = 0
+        for wiersz in licz(wiersze):
+            liczba += 1
+            print(', '.join(f"{klucz}={wartosc}" for klucz, wartosc in wiersz.items()))
+
+    print(f"Komórki: {liczba} (z pamięci: {liczba_z_pamieci}, policzone: {liczba - liczba_z_pamieci})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
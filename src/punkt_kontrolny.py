@@ -0,0 +1,82 @@
+"""
+Punkt kontrolny symulacji - stan w chwili przerwania lotu.
+
+Zawiera wszystko, co decyduje o dalszym przebiegu: scenariusz, migawkę stanu
+rakiety, stan wewnętrzny integratora, regulatorów PID i trybu autopilota,
+czas, numer kroku i komendy czekające na wykonanie. Nie zawiera historii
+lotu - symulacja odtworzona z punktu kontrolnego zapisuje historię od chwili
+jego utworzenia.
+
+Punkt kontrolny można zapisać do pliku JSON (atomowo) i wczytać po awarii
+długiego przebiegu.
+"""
+
+import os
+import json
+import dataclasses
+from typing import Optional
+
+from src.scenariusz import Scenariusz
+from src import eksport
+
+
+WERSJA_PUNKTU_KONTROLNEGO = 1
+
+
+def jako_krotki(wartosc):
+    """Listy (np. po odczycie z JSON) zamienione rekurencyjnie na krotki."""
+    if isinstance(wartosc, (list, tuple)):
+        return tuple(jako_krotki(element) for element in wartosc)
+    return wartosc
+
+
+@dataclasses.dataclass(frozen=True)
+class PunktKontrolny:
+    scenariusz: Scenariusz
+    rakieta: tuple
+    integrator: dict
+    autopilot: Optional[dict]
+    czas_aktualny: float
+    numer_kroku: int
+    kolejka_sterowania: tuple = ()
+    czy_zakonczona: bool = False
+    czy_sukces: bool = False
+    komunikat_koncowy: str = ""
+    czy_przewijac_lot_swobodny: bool = True
+
+    def do_slownika(self):
+        dane = {pole.name: getattr(self, pole.name) for pole in dataclasses.fields(self)}
+        dane['scenariusz'] = self.scenariusz.do_slownika()
+        dane['wersja'] = WERSJA_PUNKTU_KONTROLNEGO
+        return dane
+
+    @classmethod
+    def ze_slownika(cls, dane):
+        dane = dict(dane)
+        wersja = dane.pop('wersja', WERSJA_PUNKTU_KONTROLNEGO)
+        if wersja != WERSJA_PUNKTU_KONTROLNEGO:
+            raise ValueError(f"Nieobsługiwana wersja punktu kontrolnego: {wersja}")
+        dane['scenariusz'] = Scenariusz.ze_slownika(dane['scenariusz'])
+        dane['rakieta'] = jako_krotki(dane['rakieta'])
+        dane['kolejka_sterowania'] = jako_krotki(dane['kolejka_sterowania'])
+        # Krotki w stanie integratora (pamięć FSAL) i regulatorów wracają z JSON jako listy
+        dane['integrator'] = {nazwa: jako_krotki(wartosc) for nazwa, wartosc in dane['integrator'].items()}
+        if dane['autopilot'] is not None:
+            dane['autopilot'] = {nazwa: jako_krotki(wartosc) for nazwa, wartosc in dane['autopilot'].items()}
+        return cls(**dane)
+
+    def zapisz(self, sciezka):
+        """Zapisuje punkt kontrolny do pliku JSON; przerwany zapis nie psuje poprzedniej wersji."""
+        katalog = os.path.dirname(sciezka)
+        if katalog:
+            os.makedirs(katalog, exist_ok=True)
+        sciezka_tymczasowa = f"{sciezka}.{os.getpid()}.tmp"
+        with open(sciezka_tymczasowa, 'w', encoding='utf-8') as plik:
+            json.dump(self.do_slownika(), plik, ensure_ascii=False, default=eksport.wartosc_json)
+        os.replace(sciezka_tymczasowa, sciezka)
+        return sciezka
+
+    @classmethod
+    def wczytaj(cls, sciezka):
+        with open(sciezka, encoding='utf-8') as plik:
+            return cls.ze_slownika(json.load(plik))
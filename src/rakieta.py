@@ -1,105 +1,241 @@
+import math
+
 import numpy as np
 from src import fizyka
 from src import config
+from src.integratory import utworz_integrator
+
+
+# Pola stanu zmiennego w czasie lotu - kolejność elementów migawki
+POLA_STANU = ('pozycja_x', 'pozycja_y', 'predkosc_x', 'predkosc_y',
+              'masa_paliwa_aktualna', 'cieg_aktualny', 'kat_nachylenia')
+ROZMIAR_STANU = len(POLA_STANU)
 
 
 class Rakieta:
+    # Bez słownika atrybutów: mniejszy obiekt i szybszy dostęp do pól w pętli kroków.
+    # Położenie i prędkość poza krokiem zmienia się przez ustaw_ruch albo przywroc,
+    # które unieważniają stan z wielkościami pochodnymi (_stan)
+    __slots__ = ('pozycja_x', 'pozycja_y', 'predkosc_x', 'predkosc_y', 'cieg_aktualny', 'kat_nachylenia',
+                 '_masa_paliwa', '_masa_pusta', 'masa_calkowita', 'cieg_maksymalny',
+                 'zuzycie_paliwa_na_sekunde', 'grawitacja', 'integrator', '_stan')
+    
     def __init__(self, 
-                 pozycja_x=config.POZYCJA_POZIOMA_STARTOWA,
-                 pozycja_y=config.WYSOKOSC_STARTOWA,
-                 predkosc_x=config.PREDKOSC_POZIOMA_STARTOWA,
-                 predkosc_y=config.PREDKOSC_PIONOWA_STARTOWA,
-                 masa_rakiety_pusta=config.MASA_RAKIETY_PUSTA,
-                 masa_paliwa_aktualna=config.MASA_PALIWA_STARTOWA,
-                 cieg_maksymalny=config.CIEG_MAKSYMALNY_SILNIKA,
-                 zuzycie_paliwa=config.ZUZYCIE_PALIWA_NA_SEKUNDE,
-                 grawitacja=config.GRAWITACJA_DOMYSLNA):
-        self.pozycja_x = pozycja_x
-        self.pozycja_y = pozycja_y
-        self.predkosc_x = predkosc_x
-        self.predkosc_y = predkosc_y
-        self.masa_rakiety_pusta = masa_rakiety_pusta
-        self.masa_paliwa_aktualna = masa_paliwa_aktualna
-        self.cieg_maksymalny = cieg_maksymalny
-        self.zuzycie_paliwa_na_sekunde = zuzycie_paliwa
-        self.grawitacja = grawitacja
+                 pozycja_x=None,
+                 pozycja_y=None,
+                 predkosc_x=None,
+                 predkosc_y=None,
+                 masa_rakiety_pusta=None,
+                 masa_paliwa_aktualna=None,
+                 cieg_maksymalny=None,
+                 zuzycie_paliwa=None,
+                 grawitacja=None,
+                 integrator=None):
+        self._stan = None
+        # Brakujące wartości są brane z config w chwili wywołania, a nie przy imporcie
+        self.pozycja_x = config.POZYCJA_POZIOMA_STARTOWA if pozycja_x is None else pozycja_x
+        self.pozycja_y = config.WYSOKOSC_STARTOWA if pozycja_y is None else pozycja_y
+        self.predkosc_x = config.PREDKOSC_POZIOMA_STARTOWA if predkosc_x is None else predkosc_x
+        self.predkosc_y = config.PREDKOSC_PIONOWA_STARTOWA if predkosc_y is None else predkosc_y
+        self.masa_rakiety_pusta = config.MASA_RAKIETY_PUSTA if masa_rakiety_pusta is None else masa_rakiety_pusta
+        self.masa_paliwa_aktualna = config.MASA_PALIWA_STARTOWA if masa_paliwa_aktualna is None else masa_paliwa_aktualna
+        self.cieg_maksymalny = config.CIEG_MAKSYMALNY_SILNIKA if cieg_maksymalny is None else cieg_maksymalny
+        self.zuzycie_paliwa_na_sekunde = config.ZUZYCIE_PALIWA_NA_SEKUNDE if zuzycie_paliwa is None else zuzycie_paliwa
+        self.grawitacja = config.GRAWITACJA_DOMYSLNA if grawitacja is None else grawitacja
         self.cieg_aktualny = 0.0
         self.kat_nachylenia = 0.0
+        self.integrator = utworz_integrator(integrator)
+
+    @classmethod
+    def ze_scenariusza(cls, scenariusz):
+        specyfikacja = scenariusz.rakieta
+        return cls(
+            pozycja_x=scenariusz.pozycja_pozioma_startowa,
+            pozycja_y=scenariusz.wysokosc_startowa,
+            predkosc_x=scenariusz.predkosc_pozioma_startowa,
+            predkosc_y=scenariusz.predkosc_pionowa_startowa,
+            masa_rakiety_pusta=specyfikacja.masa_rakiety_pusta,
+            masa_paliwa_aktualna=specyfikacja.masa_paliwa,
+            cieg_maksymalny=specyfikacja.cieg_maksymalny,
+            zuzycie_paliwa=specyfikacja.zuzycie_paliwa,
+            grawitacja=scenariusz.grawitacja,
+            integrator=scenariusz.integrator
+        )
 
+    # Masa całkowita jest przeliczana przy zmianie masy paliwa lub rakiety, a nie przy
+    # każdym odczycie - integrator i autopilot czytają ją kilka razy w każdym kroku
     @property
-    def masa_calkowita(self):
-        return self.masa_rakiety_pusta + self.masa_paliwa_aktualna
+    def masa_paliwa_aktualna(self):
+        return self._masa_paliwa
+    
+    @masa_paliwa_aktualna.setter
+    def masa_paliwa_aktualna(self, masa):
+        self._masa_paliwa = masa
+        self.masa_calkowita = self._masa_pusta + masa
+        self._stan = None
+    
+    @property
+    def masa_rakiety_pusta(self):
+        return self._masa_pusta
+    
+    @masa_rakiety_pusta.setter
+    def masa_rakiety_pusta(self, masa):
+        self._masa_pusta = masa
+        self.masa_calkowita = masa + getattr(self, '_masa_paliwa', 0.0)
+        self._stan = None
     
     @property
     def czy_ma_paliwo(self):
-        return self.masa_paliwa_aktualna > 0
+        return self._masa_paliwa > 0
     
+    # Wielkości pochodne pochodzą ze stanu liczonego raz na krok (pobierz_stan)
     @property
     def predkosc_calkowita(self):
-        return np.sqrt(self.predkosc_x**2 + self.predkosc_y**2)
+        return self.pobierz_stan()['predkosc']
     
     @property
     def energia_kinetyczna(self):
-        return fizyka.energia_kinetyczna(self.masa_calkowita, self.predkosc_calkowita)
+        return self.pobierz_stan()['energia_kinetyczna']
     
     @property
     def energia_potencjalna(self):
-        return fizyka.energia_potencjalna(self.masa_calkowita, self.pozycja_y, self.grawitacja)
+        return self.pobierz_stan()['energia_potencjalna']
+    
+    def migawka(self, cel=None):
+        """
+        Stan lotu (POLA_STANU) jako wektor float64. Z `cel` - zapis do gotowej
+        tablicy (np. wiersza tablicy migawek) bez nowej alokacji.
+        """
+        if cel is None:
+            cel = np.empty(ROZMIAR_STANU)
+        cel[:] = (self.pozycja_x, self.pozycja_y, self.predkosc_x, self.predkosc_y,
+                  self._masa_paliwa, self.cieg_aktualny, self.kat_nachylenia)
+        return cel
+    
+    def przywroc(self, stan):
+        """Przywraca stan lotu z migawki (wektora lub sekwencji w kolejności POLA_STANU)."""
+        if isinstance(stan, np.ndarray):
+            stan = stan.tolist()
+        (self.pozycja_x, self.pozycja_y, self.predkosc_x, self.predkosc_y,
+         self.masa_paliwa_aktualna, self.cieg_aktualny, self.kat_nachylenia) = stan
+        self._stan = None
+    
+    def ustaw_ruch(self, pozycja_x, pozycja_y, predkosc_x, predkosc_y):
+        """Ustawia położenie i prędkość poza krokiem (np. przewinięcie lotu swobodnego)."""
+        self.pozycja_x, self.pozycja_y, self.predkosc_x, self.predkosc_y = pozycja_x, pozycja_y, predkosc_x, predkosc_y
+        self._stan = None
     
     def ustaw_cieg(self, cieg_zadany):
         cieg_zadany = max(0, min(cieg_zadany, self.cieg_maksymalny))
         if not self.czy_ma_paliwo:
             cieg_zadany = 0.0
         self.cieg_aktualny = cieg_zadany
+        self._stan = None
     
     def ustaw_kat(self, kat):
         self.kat_nachylenia = kat
+        self._stan = None
     
-    def aktualizuj(self, krok_czasowy):
-        skladowa_ciagu_x = self.cieg_aktualny * np.sin(self.kat_nachylenia)
-        skladowa_ciagu_y = self.cieg_aktualny * np.cos(self.kat_nachylenia)
+    def _krok_ruchu(self, krok_czasowy):
+        self.integrator.krok(self, krok_czasowy)
+    
+    def _przesun_do_zdarzenia(self, krok_czasowy):
+        """
+        Wykonuje krok i, jeśli rakieta przecięła w nim powierzchnię, cofa się
+        do dokładnej chwili przyziemienia (metoda Illinois po długości kroku).
+        Zwraca czas faktycznie przebyty.
+        """
+        stan_poczatkowy = (self.pozycja_x, self.pozycja_y, self.predkosc_x,
+                           self.predkosc_y, self.masa_paliwa_aktualna)
+        self._krok_ruchu(krok_czasowy)
         
-        if self.masa_calkowita > 0:
-            przyspieszenie_x = skladowa_ciagu_x / self.masa_calkowita
-            przyspieszenie_y = (skladowa_ciagu_y / self.masa_calkowita) - self.grawitacja
-        else:
-            przyspieszenie_x = 0
-            przyspieszenie_y = -self.grawitacja
+        if self.pozycja_y >= 0 or stan_poczatkowy[1] <= 0:
+            if self.pozycja_y < 0:
+                self.pozycja_y = 0
+            return krok_czasowy
         
-        self.predkosc_x += przyspieszenie_x * krok_czasowy
-        self.predkosc_y += przyspieszenie_y * krok_czasowy
+        # Regula falsi z modyfikacją Illinois - wysokość w obrębie kroku jest prawie
+        # kwadratowa w czasie, więc zbieżność jest znacznie szybsza niż bisekcji,
+        # a każda iteracja to pełny krok integratora.
+        czas_przed, wysokosc_przed = 0.0, stan_poczatkowy[1]
+        czas_po, wysokosc_po = krok_czasowy, self.pozycja_y
+        strona = 0
+        while czas_po - czas_przed > config.DOKLADNOSC_CZASU_ZDARZENIA:
+            czas_probny = czas_po - wysokosc_po * (czas_po - czas_przed) / (wysokosc_po - wysokosc_przed)
+            if not czas_przed < czas_probny < czas_po:
+                czas_probny = 0.5 * (czas_przed + czas_po)
+            self._przywroc_stan_ruchu(stan_poczatkowy)
+            self._krok_ruchu(czas_probny)
+            if self.pozycja_y > 0:
+                czas_przed, wysokosc_przed = czas_probny, self.pozycja_y
+                if strona == 1:
+                    wysokosc_po *= 0.5
+                strona = 1
+            else:
+                czas_po, wysokosc_po = czas_probny, self.pozycja_y
+                if strona == -1:
+                    wysokosc_przed *= 0.5
+                strona = -1
+                if self.pozycja_y == 0:
+                    break
         
-        self.pozycja_x += self.predkosc_x * krok_czasowy
-        self.pozycja_y += self.predkosc_y * krok_czasowy
+        self._przywroc_stan_ruchu(stan_poczatkowy)
+        self._krok_ruchu(czas_po)
+        self.pozycja_y = 0
+        return czas_po
+    
+    def _przywroc_stan_ruchu(self, stan):
+        (self.pozycja_x, self.pozycja_y, self.predkosc_x,
+         self.predkosc_y, self.masa_paliwa_aktualna) = stan
+    
+    def aktualizuj(self, krok_czasowy):
+        """
+        Przesuwa stan rakiety o krok czasowy. Wyczerpanie paliwa i przyziemienie
+        są wykrywane wewnątrz kroku - zwracany jest czas faktycznie przebyty,
+        krótszy od kroku, jeśli rakieta dotknęła powierzchni.
+        """
+        czas_przebyty = 0.0
+        self._stan = None
         
         if self.cieg_aktualny > 0 and self.czy_ma_paliwo:
             zuzycie = fizyka.zuzycie_paliwa_w_kroku_czasowym(
                 self.cieg_aktualny, krok_czasowy, self.cieg_maksymalny, self.zuzycie_paliwa_na_sekunde
             )
-            self.masa_paliwa_aktualna = max(0, self.masa_paliwa_aktualna - zuzycie)
-            if self.masa_paliwa_aktualna <= 0:
+            if zuzycie >= self.masa_paliwa_aktualna:
+                czas_do_wyczerpania = krok_czasowy * self.masa_paliwa_aktualna / zuzycie
+                czas_przebyty = self._przesun_do_zdarzenia(czas_do_wyczerpania)
+                if czas_przebyty < czas_do_wyczerpania:
+                    return czas_przebyty
+                self.masa_paliwa_aktualna = 0.0
                 self.cieg_aktualny = 0.0
+                krok_czasowy -= czas_do_wyczerpania
         
-        if self.pozycja_y < 0:
-            self.pozycja_y = 0
+        return czas_przebyty + self._przesun_do_zdarzenia(krok_czasowy)
     
     def czy_wyladowal(self):
         return self.pozycja_y <= config.DOKLADNOSC_WYKRYWANIA_LADOWANIA
     
     def pobierz_stan(self):
-        return {
-            'x': self.pozycja_x,
-            'y': self.pozycja_y,
-            'vx': self.predkosc_x,
-            'vy': self.predkosc_y,
-            'predkosc': self.predkosc_calkowita,
-            'masa_calkowita': self.masa_calkowita,
-            'masa_paliwa': self.masa_paliwa_aktualna,
-            'cieg': self.cieg_aktualny,
-            'kat': self.kat_nachylenia,
-            'energia_kinetyczna': self.energia_kinetyczna,
-            'energia_potencjalna': self.energia_potencjalna
-        }
+        """
+        Stan z wielkościami pochodnymi, liczony raz na krok: kolejne odczyty do
+        następnej zmiany stanu zwracają ten sam słownik (tylko do odczytu).
+        """
+        if self._stan is None:
+            predkosc = math.sqrt(self.predkosc_x**2 + self.predkosc_y**2)
+            self._stan = {
+                'x': self.pozycja_x,
+                'y': self.pozycja_y,
+                'vx': self.predkosc_x,
+                'vy': self.predkosc_y,
+                'predkosc': predkosc,
+                'masa_calkowita': self.masa_calkowita,
+                'masa_paliwa': self.masa_paliwa_aktualna,
+                'cieg': self.cieg_aktualny,
+                'kat': self.kat_nachylenia,
+                'energia_kinetyczna': fizyka.energia_kinetyczna(self.masa_calkowita, predkosc),
+                'energia_potencjalna': fizyka.energia_potencjalna(self.masa_calkowita, self.pozycja_y, self.grawitacja)
+            }
+        return self._stan
     
     def __str__(self):
         return (f"Rakieta(y={self.pozycja_y:.1f}m, vy={self.predkosc_y:.1f}m/s, "
@@ -0,0 +1,112 @@
+"""
+Niezmienne opisy scenariusza symulacji.
+
+Zamiast modyfikować globalne wartości w `config`, parametry przebiegu są
+przekazywane jawnie jako zamrożone obiekty. Są one hashowalne, więc mogą
+służyć jako klucz pamięci podręcznej, i bezpieczne przy uruchamianiu wielu
+symulacji w wątkach lub procesach.
+"""
+
+import json
+import dataclasses
+from dataclasses import dataclass, field
+
+from src import config
+
+
+def _z_konfiguracji(nazwa):
+    # Wartość domyślna jest odczytywana z config w chwili tworzenia obiektu,
+    # a nie raz przy imporcie modułu.
+    return field(default_factory=lambda: getattr(config, nazwa))
+
+
+def kroki_w_okresie(okres, krok_czasowy, nazwa='okres'):
+    """Liczba kroków fizyki w okresie; okres musi być wielokrotnością kroku."""
+    liczba_krokow = round(okres / krok_czasowy)
+    if liczba_krokow < 0 or abs(liczba_krokow * krok_czasowy - okres) > 1e-9 * max(1.0, okres):
+        raise ValueError(f"{nazwa} ({okres} s) musi być nieujemną wielokrotnością kroku czasowego ({krok_czasowy} s)")
+    return liczba_krokow
+
+
+@dataclass(frozen=True)
+class SpecyfikacjaRakiety:
+    masa_rakiety_pusta: float = _z_konfiguracji('MASA_RAKIETY_PUSTA')
+    masa_paliwa: float = _z_konfiguracji('MASA_PALIWA_STARTOWA')
+    cieg_maksymalny: float = _z_konfiguracji('CIEG_MAKSYMALNY_SILNIKA')
+    zuzycie_paliwa: float = _z_konfiguracji('ZUZYCIE_PALIWA_NA_SEKUNDE')
+
+
+@dataclass(frozen=True)
+class NastawyAutopilota:
+    wspolczynnik_proporcjonalny_wysokosc: float = _z_konfiguracji('WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC')
+    wspolczynnik_calkujacy_wysokosc: float = _z_konfiguracji('WSPOLCZYNNIK_CALKUJACY_WYSOKOSC')
+    wspolczynnik_rozniczkujacy_wysokosc: float = _z_konfiguracji('WSPOLCZYNNIK_ROZNICZKUJACY_WYSOKOSC')
+    wspolczynnik_proporcjonalny_poziom: float = _z_konfiguracji('WSPOLCZYNNIK_PROPORCJONALNY_POZIOM')
+    wspolczynnik_rozniczkujacy_poziom: float = _z_konfiguracji('WSPOLCZYNNIK_ROZNICZKUJACY_POZIOM')
+    margines_suicide_burn: float = _z_konfiguracji('MARGINES_BEZPIECZENSTWA_SUICIDE_BURN')
+
+
+def wczytaj_tabele_nastaw(sciezka):
+    """Wczytuje tabelę nastaw {planeta: NastawyAutopilota} zapisaną przez zapisz_tabele_nastaw."""
+    with open(sciezka, 'r', encoding='utf-8') as plik:
+        dane = json.load(plik)
+    return {planeta: NastawyAutopilota(**nastawy) for planeta, nastawy in dane['nastawy'].items()}
+
+
+def zapisz_tabele_nastaw(tabela, sciezka, metadane=None):
+    dane = {
+        'nastawy': {planeta: dataclasses.asdict(nastawy) for planeta, nastawy in tabela.items()},
+        'metadane': metadane or {}
+    }
+    with open(sciezka, 'w', encoding='utf-8') as plik:
+        json.dump(dane, plik, indent=2, ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class Scenariusz:
+    planeta: str = 'ksiezyc'
+    wysokosc_startowa: float = _z_konfiguracji('WYSOKOSC_STARTOWA')
+    predkosc_pionowa_startowa: float = _z_konfiguracji('PREDKOSC_PIONOWA_STARTOWA')
+    pozycja_pozioma_startowa: float = _z_konfiguracji('POZYCJA_POZIOMA_STARTOWA')
+    predkosc_pozioma_startowa: float = _z_konfiguracji('PREDKOSC_POZIOMA_STARTOWA')
+    rakieta: SpecyfikacjaRakiety = field(default_factory=SpecyfikacjaRakiety)
+    nastawy: NastawyAutopilota = field(default_factory=NastawyAutopilota)
+    krok_czasowy: float = _z_konfiguracji('KROK_CZASOWY_SYMULACJI')
+    czas_maksymalny: float = _z_konfiguracji('CZAS_MAKSYMALNY_SYMULACJI')
+    czy_autopilot_wlaczony: bool = True
+    naprowadzanie: str = _z_konfiguracji('NAPROWADZANIE_DOMYSLNE')
+    integrator: str = _z_konfiguracji('INTEGRATOR_DOMYSLNY')
+    okres_sterowania: float = _z_konfiguracji('OKRES_STEROWANIA')
+    opoznienie_sterowania: float = _z_konfiguracji('OPOZNIENIE_STEROWANIA')
+    predkosc_ladowania_maksymalna: float = _z_konfiguracji('PREDKOSC_LADOWANIA_MAKSYMALNA')
+
+    @property
+    def dane_planety(self):
+        return config.PLANETY[self.planeta]
+
+    @property
+    def grawitacja(self):
+        return self.dane_planety['grawitacja']
+
+    def harmonogram_sterowania(self):
+        """Zwraca (kroki fizyki na okres sterowania, kroki fizyki opóźnienia komendy)."""
+        okres = self.krok_czasowy if self.okres_sterowania is None else self.okres_sterowania
+        kroki_na_sterowanie = kroki_w_okresie(okres, self.krok_czasowy, 'okres_sterowania')
+        if kroki_na_sterowanie < 1:
+            raise ValueError("okres_sterowania nie może być krótszy od kroku czasowego")
+        kroki_opoznienia = kroki_w_okresie(self.opoznienie_sterowania, self.krok_czasowy, 'opoznienie_sterowania')
+        return kroki_na_sterowanie, kroki_opoznienia
+
+    def zmien(self, **zmiany):
+        """Zwraca kopię scenariusza z podmienionymi polami."""
+        return dataclasses.replace(self, **zmiany)
+
+    def do_slownika(self):
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def ze_slownika(cls, dane):
+        dane = dict(dane)
+        dane['rakieta'] = SpecyfikacjaRakiety(**dane.get('rakieta', {}))
+        dane['nastawy'] = NastawyAutopilota(**dane.get('nastawy', {}))
+        return cls(**dane)
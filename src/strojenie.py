@@ -0,0 +1,200 @@
+"""
+Automatyczne strojenie nastaw autopilota dla każdej planety.
+
+Kandydaci (zestawy NastawyAutopilota) są oceniani na paczce losowych
+scenariuszy (jak w analizie Monte Carlo) za pomocą symulacji wsadowej.
+Przeszukiwanie to losowanie w skali logarytmicznej wokół najlepszego
+dotychczas zestawu, a odrzucanie słabych kandydatów - kolejne połowienie
+(successive halving): wszyscy są oceniani na małej części scenariuszy, a na
+większej tylko najlepsza część z nich.
+
+Uruchomienie:
+    python -m src.strojenie --planety ziemia wenus --wyjscie data/nastawy_planet.json
+"""
+
+import sys
+import os
+import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja_wsadowa import SymulacjaWsadowa
+from src.scenariusz import NastawyAutopilota, zapisz_tabele_nastaw
+from src.monte_carlo import losuj_scenariusz
+from src import config
+
+
+# Zakresy losowania nastaw (skala logarytmiczna)
+ZAKRESY_NASTAW = {
+    'wspolczynnik_proporcjonalny_wysokosc': (0.1, 20.0),
+    'wspolczynnik_calkujacy_wysokosc': (0.001, 1.0),
+    'wspolczynnik_rozniczkujacy_wysokosc': (0.05, 20.0),
+    'wspolczynnik_proporcjonalny_poziom': (0.01, 2.0),
+    'wspolczynnik_rozniczkujacy_poziom': (0.05, 5.0),
+    'margines_suicide_burn': (1.0, 3.0),
+}
+
+
+def paczka_scenariuszy(planeta, liczba_scenariuszy, ziarno=0, scenariusz_bazowy=None):
+    return [losuj_scenariusz(ziarno, indeks, [planeta], scenariusz_bazowy)
+            for indeks in range(liczba_scenariuszy)]
+
+
+def ocen_nastawy(nastawy, scenariusze):
+    """
+    Średni koszt nastaw na paczce scenariuszy (im mniej, tym lepiej) i
+    wskaźnik udanych lądowań.
+    """
+    scenariusze = [scenariusz.zmien(nastawy=nastawy) for scenariusz in scenariusze]
+    wyniki = SymulacjaWsadowa.ze_scenariuszy(scenariusze).uruchom()
+    stan_koncowy = wyniki['stan_koncowy']
+
+    paliwo_poczatkowe = np.array([scenariusz.rakieta.masa_paliwa for scenariusz in scenariusze])
+    predkosc_maksymalna = scenariusze[0].predkosc_ladowania_maksymalna
+    koszt = (
+        config.STROJENIE_WAGA_PALIWA * (paliwo_poczatkowe - stan_koncowy['masa_paliwa']) / paliwo_poczatkowe
+        + config.STROJENIE_WAGA_PREDKOSCI * np.abs(stan_koncowy['vy']) / predkosc_maksymalna
+        + config.STROJENIE_WAGA_PRZESUNIECIA * np.abs(stan_koncowy['x'])
+        + config.STROJENIE_KARA_ZA_PORAZKE * ~wyniki['sukces']
+    )
+    return {'koszt': float(koszt.mean()), 'wskaznik_sukcesu': float(wyniki['sukces'].mean())}
+
+
+def _ocen_kandydata(zadanie):
+    nastawy, planeta, liczba_scenariuszy, ziarno, scenariusz_bazowy = zadanie
+    return ocen_nastawy(nastawy, paczka_scenariuszy(planeta, liczba_scenariuszy, ziarno, scenariusz_bazowy))
+
+
+def losuj_nastawy(generator, wokol=None, rozrzut=1.0):
+    """
+    Losuje nastawy: w całym zakresie (wokol=None) albo log-normalnie wokół
+    podanych nastaw z odchyleniem `rozrzut` w skali logarytmu naturalnego.
+    """
+    wartosci = {}
+    for nazwa, (minimum, maksimum) in ZAKRESY_NASTAW.items():
+        if wokol is None:
+            logarytm = generator.uniform(math.log(minimum), math.log(maksimum))
+        else:
+            logarytm = math.log(max(getattr(wokol, nazwa), minimum)) + generator.normal(0.0, rozrzut)
+        wartosci[nazwa] = float(min(max(math.exp(logarytm), minimum), maksimum))
+    return NastawyAutopilota(**wartosci)
+
+
+def rozmiary_etapow(liczba_kandydatow, liczba_scenariuszy, eta):
+    liczba_etapow = max(1, math.ceil(math.log(liczba_kandydatow, eta)))
+    return [max(1, liczba_scenariuszy // eta**(liczba_etapow - 1 - etap)) for etap in range(liczba_etapow)]
+
+
+def stroj_planete(planeta, liczba_kandydatow=24, liczba_rund=3, liczba_scenariuszy=48, eta=3,
+                  ziarno=0, nastawy_startowe=None, scenariusz_bazowy=None, mapuj=map):
+    """
+    Stroi nastawy dla jednej planety. `mapuj` to funkcja map (np. pula.map)
+    używana do równoległej oceny kandydatów jednego etapu.
+
+    Zwraca (najlepsze nastawy, ich ocena na pełnej paczce, ocena nastaw
+    startowych, liczba ocen kandydatów).
+    """
+    if nastawy_startowe is None:
+        nastawy_startowe = NastawyAutopilota()
+    generator = np.random.default_rng([ziarno, list(config.PLANETY).index(planeta)])
+    rozmiary = rozmiary_etapow(liczba_kandydatow, liczba_scenariuszy, eta)
+
+    def ocen(kandydaci, liczba):
+        zadania = [(nastawy, planeta, liczba, ziarno, scenariusz_bazowy) for nastawy in kandydaci]
+        return list(mapuj(_ocen_kandydata, zadania))
+
+    najlepsze = nastawy_startowe
+    najlepsza_ocena = ocena_startowa = ocen([najlepsze], liczba_scenariuszy)[0]
+    liczba_ocen = 1
+
+    for runda in range(liczba_rund):
+        # Pierwsza runda przeszukuje cały zakres, kolejne coraz węższe otoczenie najlepszych nastaw
+        if runda == 0:
+            kandydaci = [losuj_nastawy(generator) for _ in range(liczba_kandydatow)]
+        else:
+            rozrzut = 0.5 / runda
+            kandydaci = [losuj_nastawy(generator, najlepsze, rozrzut) for _ in range(liczba_kandydatow)]
+
+        for numer_etapu, rozmiar in enumerate(rozmiary):
+            oceny = ocen(kandydaci, rozmiar)
+            liczba_ocen += len(kandydaci)
+            kolejnosc = np.argsort([ocena['koszt'] for ocena in oceny], kind='stable')
+            if numer_etapu < len(rozmiary) - 1:
+                kandydaci = [kandydaci[i] for i in kolejnosc[:max(1, len(kandydaci) // eta)]]
+            else:
+                najlepszy_w_rundzie = kolejnosc[0]
+
+        if oceny[najlepszy_w_rundzie]['koszt'] < najlepsza_ocena['koszt']:
+            najlepsze = kandydaci[najlepszy_w_rundzie]
+            najlepsza_ocena = oceny[najlepszy_w_rundzie]
+
+    return najlepsze, najlepsza_ocena, ocena_startowa, liczba_ocen
+
+
+def stroj(planety=None, liczba_procesow=None, plik_wyjsciowy=None, czy_wyswietlac_postep=True, **opcje):
+    """
+    Stroi nastawy dla listy planet i zwraca tabelę {planeta: NastawyAutopilota}.
+    Jeśli podano plik_wyjsciowy, tabela (z ocenami) jest zapisywana do JSON
+    w formacie wczytywanym przez Autopilot.z_tabeli_nastaw.
+    """
+    if planety is None:
+        planety = list(config.PLANETY.keys())
+    if liczba_procesow is None:
+        liczba_procesow = os.cpu_count() or 1
+
+    tabela = {}
+    metadane = {}
+    pula = ProcessPoolExecutor(max_workers=liczba_procesow) if liczba_procesow > 1 else None
+    try:
+        mapuj = pula.map if pula else map
+        for planeta in planety:
+            nastawy, ocena, ocena_startowa, liczba_ocen = stroj_planete(planeta, mapuj=mapuj, **opcje)
+            tabela[planeta] = nastawy
+            metadane[planeta] = {'ocena': ocena, 'ocena_startowa': ocena_startowa, 'liczba_ocen': liczba_ocen}
+            if czy_wyswietlac_postep:
+                print(f"{config.PLANETY[planeta]['nazwa']}: koszt {ocena_startowa['koszt']:.2f} -> "
+                      f"{ocena['koszt']:.2f}, sukces {ocena_startowa['wskaznik_sukcesu'] * 100:.0f}% -> "
+                      f"{ocena['wskaznik_sukcesu'] * 100:.0f}% ({liczba_ocen} ocen)")
+    finally:
+        if pula:
+            pula.shutdown()
+
+    if plik_wyjsciowy:
+        os.makedirs(os.path.dirname(plik_wyjsciowy) or '.', exist_ok=True)
+        zapisz_tabele_nastaw(tabela, plik_wyjsciowy, metadane)
+    return tabela
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strojenie nastaw autopilota dla planet')
+    parser.add_argument('--planety', nargs='+', choices=list(config.PLANETY.keys()), default=None,
+                        help='Planety do strojenia (domyślnie: wszystkie)')
+    parser.add_argument('--kandydaci', type=int, default=24, help='Liczba kandydatów w rundzie (domyślnie: 24)')
+    parser.add_argument('--rundy', type=int, default=3, help='Liczba rund przeszukiwania (domyślnie: 3)')
+    parser.add_argument('--scenariusze', type=int, default=48,
+                        help='Liczba scenariuszy w pełnej ocenie (domyślnie: 48)')
+    parser.add_argument('--ziarno', type=int, default=0, help='Ziarno losowania (domyślnie: 0)')
+    parser.add_argument('--procesy', type=int, default=None, help='Liczba procesów (domyślnie: liczba rdzeni)')
+    parser.add_argument('--wyjscie', type=str, default=config.PLIK_TABELI_NASTAW,
+                        help=f'Plik tabeli nastaw (domyślnie: {config.PLIK_TABELI_NASTAW})')
+
+    argumenty = parser.parse_args()
+    stroj(
+        planety=argumenty.planety,
+        liczba_procesow=argumenty.procesy,
+        plik_wyjsciowy=argumenty.wyjscie,
+        liczba_kandydatow=argumenty.kandydaci,
+        liczba_rund=argumenty.rundy,
+        liczba_scenariuszy=argumenty.scenariusze,
+        ziarno=argumenty.ziarno
+    )
+    print(f"Tabela nastaw zapisana do: {argumenty.wyjscie}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,107 @@
 import numpy as np
 import os
+import copy
 import json
+import uuid
+from collections import deque
 from datetime import datetime
 from src.rakieta import Rakieta
-from src.autopilot import Autopilot
+from src.naprowadzanie import utworz_autopilota
+from src.scenariusz import Scenariusz
+from src.bufor_trajektorii import BuforTrajektorii
+from src.polityka_zapisu import ZapisCoNKrokow, przygotuj_odbiornik
+from src.tempo import ZegarTempa
+from src.instrumentacja import Instrumentacja
+from src.punkt_kontrolny import PunktKontrolny
 from src import config
+from src import fizyka
+from src import eksport
 
 
 class Symulacja:
     def __init__(self, 
-                 krok_czasowy=config.KROK_CZASOWY_SYMULACJI,
-                 czas_maksymalny=config.CZAS_MAKSYMALNY_SYMULACJI,
-                 czy_autopilot_wlaczony=True,
-                 planeta='ksiezyc'):
-        self.krok_czasowy = krok_czasowy
-        self.czas_maksymalny = czas_maksymalny
-        self.czy_autopilot_wlaczony = czy_autopilot_wlaczony
+                 krok_czasowy=None,
+                 czas_maksymalny=None,
+                 czy_autopilot_wlaczony=None,
+                 planeta=None,
+                 scenariusz=None,
+                 typ_danych_historii=None,
+                 polityka_zapisu=None,
+                 odbiornik=None,
+                 czy_zachowac_historie=True,
+                 czy_przewijac_lot_swobodny=None,
+                 instrumentacja=None):
+        if scenariusz is None:
+            scenariusz = Scenariusz()
         
+        # Jawnie podane argumenty nadpisują pola scenariusza
+        zmiany = {}
+        if krok_czasowy is not None:
+            zmiany['krok_czasowy'] = krok_czasowy
+        if czas_maksymalny is not None:
+            zmiany['czas_maksymalny'] = czas_maksymalny
+        if czy_autopilot_wlaczony is not None:
+            zmiany['czy_autopilot_wlaczony'] = czy_autopilot_wlaczony
+        if planeta is not None:
+            zmiany['planeta'] = planeta
+        
+        planeta = zmiany.get('planeta', scenariusz.planeta)
         if planeta not in config.PLANETY:
             print(f"Nieznana planeta '{planeta}', uzywam Ksiezyca")
-            planeta = 'ksiezyc'
+            zmiany['planeta'] = 'ksiezyc'
+        if zmiany:
+            scenariusz = scenariusz.zmien(**zmiany)
+        
+        self.scenariusz = scenariusz
+        self.krok_czasowy = scenariusz.krok_czasowy
+        self.czas_maksymalny = scenariusz.czas_maksymalny
+        self.czy_autopilot_wlaczony = scenariusz.czy_autopilot_wlaczony
         
-        self.klucz_planety = planeta
-        self.dane_planety = config.PLANETY[planeta]
-        self.grawitacja = self.dane_planety['grawitacja']
+        self.klucz_planety = scenariusz.planeta
+        self.dane_planety = scenariusz.dane_planety
+        self.grawitacja = scenariusz.grawitacja
         
-        self.rakieta = Rakieta(grawitacja=self.grawitacja)
+        self.rakieta = Rakieta.ze_scenariusza(scenariusz)
         
-        if czy_autopilot_wlaczony:
-            self.autopilot = Autopilot(self.rakieta)
+        if self.czy_autopilot_wlaczony:
+            self.autopilot = utworz_autopilota(self.rakieta, scenariusz)
         else:
             self.autopilot = None
         
-        self.historia_danych = {
-            'czas': [],
-            'x': [],
-            'y': [],
-            'vx': [],
-            'vy': [],
-            'predkosc': [],
-            'masa_calkowita': [],
-            'masa_paliwa': [],
-            'cieg': [],
-            'kat': [],
-            'energia_kinetyczna': [],
-            'energia_potencjalna': []
-        }
+        # Krok fizyki wołany przez atrybut symulacji - instrumentacja podmienia go tutaj, nie na rakiecie
+        self._aktualizuj_rakiete = self.rakieta.aktualizuj
+        
+        # Autopilot pracuje co `kroki_na_sterowanie` kroków fizyki, a jego komenda
+        # trafia do silnika po `kroki_opoznienia` krokach
+        self.kroki_na_sterowanie, self.kroki_opoznienia = scenariusz.harmonogram_sterowania()
+        self.okres_sterowania = self.kroki_na_sterowanie * self.krok_czasowy
+        self.kolejka_sterowania = deque()
+        
+        if typ_danych_historii is None:
+            typ_danych_historii = config.TYP_DANYCH_HISTORII
+        if polityka_zapisu is None:
+            polityka_zapisu = ZapisCoNKrokow(config.ZAPISYWANIE_CO_ILE_KROKOW)
+        self.polityka_zapisu = polityka_zapisu
+        self.czy_zachowac_historie = czy_zachowac_historie
+        self.odbiornik = przygotuj_odbiornik(odbiornik)
+        
+        liczba_krokow = int(np.ceil(self.czas_maksymalny / self.krok_czasowy)) + 2
+        liczba_probek = polityka_zapisu.szacowana_liczba_probek(liczba_krokow, self.krok_czasowy) + 1
+        if not czy_zachowac_historie:
+            liczba_probek = 1
+        self.bufor_historii = BuforTrajektorii(
+            masa_rakiety_pusta=self.rakieta.masa_rakiety_pusta,
+            grawitacja=self.grawitacja,
+            pojemnosc=min(liczba_probek, config.MAKSYMALNA_POCZATKOWA_POJEMNOSC_HISTORII),
+            typ_danych=typ_danych_historii
+        )
+        self._widok_historii = self.bufor_historii.widok()
+        
+        if czy_przewijac_lot_swobodny is None:
+            czy_przewijac_lot_swobodny = config.PRZEWIJANIE_LOTU_SWOBODNEGO
+        self.czy_przewijac_lot_swobodny = czy_przewijac_lot_swobodny
+        # Numer kroku najbliższego zdarzenia bieżącego lotu swobodnego (None - nieznany)
+        self._krok_zdarzenia_przewijania = None
         
         self.czas_aktualny = 0.0
         self.numer_kroku = 0
@@ -53,28 +109,161 @@ class Symulacja:
         self.czy_sukces = False
         self.komunikat_koncowy = ""
         
+        self._zapisz_w_kroku = polityka_zapisu.funkcja_zapisu(self)
+        
+        # Pomiary faz podmieniają atrybuty tylko tej symulacji - bez instrumentacji pętla jest niezmieniona
+        if instrumentacja is True:
+            instrumentacja = Instrumentacja()
+        self.instrumentacja = instrumentacja
+        if instrumentacja is not None:
+            instrumentacja.podlacz(self)
+        
+    @property
+    def historia_danych(self):
+        return self._widok_historii
+    
+    def pobierz_probke(self):
+        rakieta = self.rakieta
+        return {
+            'czas': self.czas_aktualny,
+            'x': rakieta.pozycja_x,
+            'y': rakieta.pozycja_y,
+            'vx': rakieta.predkosc_x,
+            'vy': rakieta.predkosc_y,
+            'masa_paliwa': rakieta.masa_paliwa_aktualna,
+            'cieg': rakieta.cieg_aktualny,
+            'kat': rakieta.kat_nachylenia
+        }
+    
     def zapisz_aktualny_stan(self):
-        stan = self.rakieta.pobierz_stan()
-        self.historia_danych['czas'].append(self.czas_aktualny)
-        for klucz, wartosc in stan.items():
-            if klucz in self.historia_danych:
-                self.historia_danych[klucz].append(wartosc)
+        rakieta = self.rakieta
+        if self.czy_zachowac_historie:
+            self.bufor_historii.dodaj(
+                self.czas_aktualny,
+                rakieta.pozycja_x,
+                rakieta.pozycja_y,
+                rakieta.predkosc_x,
+                rakieta.predkosc_y,
+                rakieta.masa_paliwa_aktualna,
+                rakieta.cieg_aktualny,
+                rakieta.kat_nachylenia
+            )
+        if self.odbiornik is not None:
+            self.odbiornik(self.pobierz_probke())
+    
+    def _krok_zdarzenia_lotu_swobodnego(self, liczba_krokow):
+        """
+        Numer (1..liczba_krokow) pierwszego kroku lotu swobodnego, po którym rakieta
+        wyląduje lub opuści strefę, albo liczba_krokow + 1, jeśli nic się nie stanie.
+        """
+        rakieta = self.rakieta
+        krok_czasowy = self.krok_czasowy
+        prog_ladowania = config.DOKLADNOSC_WYKRYWANIA_LADOWANIA
+        granica_strefy = self.scenariusz.wysokosc_startowa * 2
+        y, vy, g = rakieta.pozycja_y, rakieta.predkosc_y, rakieta.grawitacja
+        
+        # Chwile zdarzeń z ciągłej paraboli; integrator może się od niej różnić o ułamek kroku
+        czasy = [fizyka.czas_do_ladowania(y - prog_ladowania, vy, g)]
+        if vy > 0:
+            delta = vy**2 - 2 * g * (granica_strefy - y)
+            if delta >= 0:
+                czasy.append((vy - np.sqrt(delta)) / g)
+        czasy = [czas for czas in czasy if czas is not None]
+        if not czasy:
+            return liczba_krokow + 1
+        numer = min(liczba_krokow + 1, max(1, int(np.ceil(min(czasy) / krok_czasowy))))
+        
+        def czy_zdarzenie(liczba):
+            wysokosc = rakieta.integrator.lot_swobodny(rakieta, krok_czasowy, liczba)[1]
+            return wysokosc <= prog_ladowania or wysokosc > granica_strefy
+        
+        while numer > 1 and czy_zdarzenie(numer - 1):
+            numer -= 1
+        return numer
+    
+    def _przewin_lot_swobodny(self):
+        """
+        Przeskakuje kroki bez ciągu w postaci zamkniętej aż do kroku, w którym może
+        zajść zdarzenie: przyziemienie, wyjście ze strefy, praca autopilota lub
+        koniec czasu. Próbki historii są uzupełniane tylko tam, gdzie wymaga tego
+        polityka zapisu.
+        """
+        rakieta = self.rakieta
+        if rakieta.cieg_aktualny != 0:
+            self._krok_zdarzenia_przewijania = None
+            return
+        
+        minimum = max(2, config.PRZEWIJANIE_MINIMALNA_LICZBA_KROKOW)
+        liczba_krokow = int((self.czas_maksymalny - self.czas_aktualny) / self.krok_czasowy) - 1
+        if self.czy_autopilot_wlaczony and self.autopilot:
+            # Przewijanie kończy się na najbliższym kroku pracy autopilota lub wykonania komendy
+            liczba_krokow = min(liczba_krokow, -self.numer_kroku % self.kroki_na_sterowanie)
+            if self.kolejka_sterowania:
+                liczba_krokow = min(liczba_krokow, self.kolejka_sterowania[0][0] - self.numer_kroku)
+        if self._krok_zdarzenia_przewijania is not None:
+            # Zdarzenie tego samego lotu swobodnego wyznaczone przy wcześniejszej próbie
+            liczba_krokow = min(liczba_krokow, self._krok_zdarzenia_przewijania - self.numer_kroku - 1)
+        if liczba_krokow < minimum:
+            return
+        numer = self._krok_zdarzenia_lotu_swobodnego(liczba_krokow)
+        if numer <= liczba_krokow:
+            self._krok_zdarzenia_przewijania = self.numer_kroku + numer
+        liczba_krokow = min(liczba_krokow, numer - 1)
+        if liczba_krokow < minimum:
+            return
+        
+        kroki = self.polityka_zapisu.kroki_do_zapisu(self, liczba_krokow)
+        if kroki is None:
+            # Polityka nie przewiduje zapisów - do końca przebiegu krok po kroku
+            self.czy_przewijac_lot_swobodny = False
+            return
+        
+        integrator = rakieta.integrator
+        if len(kroki):
+            x, y, vx, vy = integrator.lot_swobodny(rakieta, self.krok_czasowy, kroki)
+            czas = (self.numer_kroku + kroki) * self.krok_czasowy
+            if self.czy_zachowac_historie:
+                self.bufor_historii.dodaj_wiele(czas, x, y, vx, vy, rakieta.masa_paliwa_aktualna,
+                                                rakieta.cieg_aktualny, rakieta.kat_nachylenia)
+            if self.odbiornik is not None:
+                for indeks in range(len(kroki)):
+                    self.odbiornik({
+                        'czas': float(czas[indeks]), 'x': float(x[indeks]), 'y': float(y[indeks]),
+                        'vx': float(vx[indeks]), 'vy': float(vy[indeks]),
+                        'masa_paliwa': rakieta.masa_paliwa_aktualna,
+                        'cieg': rakieta.cieg_aktualny, 'kat': rakieta.kat_nachylenia
+                    })
+        
+        rakieta.ustaw_ruch(*integrator.lot_swobodny(rakieta, self.krok_czasowy, liczba_krokow))
+        self.numer_kroku += liczba_krokow
+        self.czas_aktualny = self.numer_kroku * self.krok_czasowy
     
     def wykonaj_krok_symulacji(self):
-        self.zapisz_aktualny_stan()
+        if self.czy_przewijac_lot_swobodny:
+            self._przewin_lot_swobodny()
+        
+        self._zapisz_w_kroku()
         
         if self.czy_autopilot_wlaczony and self.autopilot:
-            cieg_zadany, kat_nachylenia = self.autopilot.oblicz_sterowanie(self.krok_czasowy)
-            self.rakieta.ustaw_cieg(cieg_zadany)
-            self.rakieta.ustaw_kat(kat_nachylenia)
+            if self.numer_kroku % self.kroki_na_sterowanie == 0:
+                cieg_zadany, kat_nachylenia = self._oblicz_sterowanie()
+                self.kolejka_sterowania.append((self.numer_kroku + self.kroki_opoznienia, cieg_zadany, kat_nachylenia))
+            if self.kolejka_sterowania and self.kolejka_sterowania[0][0] <= self.numer_kroku:
+                _, cieg_zadany, kat_nachylenia = self.kolejka_sterowania.popleft()
+                self.rakieta.ustaw_cieg(cieg_zadany)
+                self.rakieta.ustaw_kat(kat_nachylenia)
         
-        self.rakieta.aktualizuj(self.krok_czasowy)
+        czas_kroku = self._aktualizuj_rakiete(self.krok_czasowy)
         
-        self.czas_aktualny += self.krok_czasowy
+        # Czas liczony z numeru kroku, a nie sumowany - bez narastania błędów zaokrągleń
+        self.czas_aktualny = self.numer_kroku * self.krok_czasowy + czas_kroku
         self.numer_kroku += 1
         
         return self.sprawdz_warunki_zakonczenia()
     
+    def _oblicz_sterowanie(self):
+        return self.autopilot.oblicz_sterowanie(self.okres_sterowania)
+    
     def sprawdz_warunki_zakonczenia(self):
         if self.czas_aktualny >= self.czas_maksymalny:
             self.czy_zakonczona = True
@@ -86,7 +275,7 @@ class Symulacja:
             self.czy_zakonczona = True
             predkosc_przy_ladowaniu = abs(self.rakieta.predkosc_y)
             
-            if predkosc_przy_ladowaniu <= config.PREDKOSC_LADOWANIA_MAKSYMALNA:
+            if predkosc_przy_ladowaniu <= self.scenariusz.predkosc_ladowania_maksymalna:
                 self.czy_sukces = True
                 self.komunikat_koncowy = (f"Udane lądowanie! Prędkość: {predkosc_przy_ladowaniu:.2f} m/s, "
                                 f"Pozycja: x={self.rakieta.pozycja_x:.1f}m")
@@ -96,7 +285,7 @@ class Symulacja:
                                 f"{predkosc_przy_ladowaniu:.2f} m/s")
             return False
         
-        if self.rakieta.pozycja_y > config.WYSOKOSC_STARTOWA * 2:
+        if self.rakieta.pozycja_y > self.scenariusz.wysokosc_startowa * 2:
             self.czy_zakonczona = True
             self.czy_sukces = False
             self.komunikat_koncowy = "Rakieta opuściła strefę symulacji"
@@ -104,52 +293,186 @@ class Symulacja:
         
         return True
     
-    def uruchom(self, czy_wyswietlac_postep=True):
-        if czy_wyswietlac_postep:
-            print("=" * 60)
-            print("SYMULACJA LĄDOWANIA RAKIETY")
-            print("=" * 60)
-            print(f"Planeta: {self.dane_planety['nazwa']}")
-            print(f"Grawitacja: {self.grawitacja:.2f} m/s²")
-            print(f"Warunki początkowe:")
-            print(f"  Wysokość: {self.rakieta.pozycja_y:.1f} m")
-            print(f"  Prędkość pionowa: {self.rakieta.predkosc_y:.1f} m/s")
-            print(f"  Prędkość pozioma: {self.rakieta.predkosc_x:.1f} m/s")
-            print(f"  Masa całkowita: {self.rakieta.masa_calkowita:.1f} kg")
-            print(f"  Paliwo: {self.rakieta.masa_paliwa_aktualna:.1f} kg")
-            print(f"  Autopilot: {'TAK' if self.czy_autopilot_wlaczony else 'NIE'}")
-            print("=" * 60)
-            print()
+    def wykonaj_kroki(self, liczba_krokow):
+        """
+        Wykonuje do `liczba_krokow` kroków; zwraca False, gdy symulacja się
+        zakończyła (stan końcowy jest wtedy zapisany jak w uruchom).
+        """
+        for _ in range(liczba_krokow):
+            if not self.wykonaj_krok_symulacji():
+                self.zapisz_aktualny_stan()
+                return False
+        return True
+    
+    def punkt_kontrolny(self):
+        """
+        Stan symulacji w bieżącej chwili (bez kopiowania historii). Można go
+        zapisać do pliku albo odtworzyć przez z_punktu_kontrolnego/rozgalez.
+        """
+        return PunktKontrolny(
+            scenariusz=self.scenariusz,
+            rakieta=tuple(self.rakieta.migawka().tolist()),
+            integrator=self.rakieta.integrator.stan(),
+            autopilot=self.autopilot.stan() if self.autopilot else None,
+            czas_aktualny=self.czas_aktualny,
+            numer_kroku=self.numer_kroku,
+            kolejka_sterowania=tuple(self.kolejka_sterowania),
+            czy_zakonczona=self.czy_zakonczona,
+            czy_sukces=self.czy_sukces,
+            komunikat_koncowy=self.komunikat_koncowy,
+            czy_przewijac_lot_swobodny=self.czy_przewijac_lot_swobodny
+        )
+    
+    @classmethod
+    def z_punktu_kontrolnego(cls, punkt, scenariusz=None, **argumenty):
+        """
+        Symulacja kontynuowana od punktu kontrolnego (np. wczytanego po awarii).
+        `scenariusz` pozwala zmienić dalszy przebieg, np. nastawy autopilota;
+        pozostałe argumenty trafiają do konstruktora (polityka zapisu, odbiornik...).
+        """
+        if scenariusz is None:
+            scenariusz = punkt.scenariusz
+        symulacja = cls(scenariusz=scenariusz, **argumenty)
+        if symulacja.krok_czasowy != punkt.scenariusz.krok_czasowy:
+            # Czas symulacji liczony jest z numeru kroku
+            raise ValueError("Punktu kontrolnego nie można kontynuować z innym krokiem czasowym")
         
+        symulacja.rakieta.przywroc(punkt.rakieta)
+        if symulacja.scenariusz.integrator == punkt.scenariusz.integrator:
+            symulacja.rakieta.integrator.przywroc_stan(punkt.integrator)
+        if symulacja.autopilot and punkt.autopilot:
+            symulacja.autopilot.przywroc_stan(punkt.autopilot)
+        symulacja.czas_aktualny = punkt.czas_aktualny
+        symulacja.numer_kroku = punkt.numer_kroku
+        symulacja.kolejka_sterowania.extend(punkt.kolejka_sterowania)
+        symulacja.czy_zakonczona = punkt.czy_zakonczona
+        symulacja.czy_sukces = punkt.czy_sukces
+        symulacja.komunikat_koncowy = punkt.komunikat_koncowy
+        symulacja.czy_przewijac_lot_swobodny = symulacja.czy_przewijac_lot_swobodny and punkt.czy_przewijac_lot_swobodny
+        return symulacja
+    
+    def rozgalez(self, polityka_zapisu=None, odbiornik=None, **zmiany):
+        """
+        Niezależna kopia symulacji od bieżącej chwili, z opcjonalnie zmienionymi
+        polami scenariusza (np. nastawy=...) - do analiz "co jeśli" bez
+        ponownego liczenia lotu od początku. Historia kopii zaczyna się teraz.
+        """
+        if polityka_zapisu is None:
+            polityka_zapisu = copy.copy(self.polityka_zapisu)
+        return Symulacja.z_punktu_kontrolnego(
+            self.punkt_kontrolny(), scenariusz=self.scenariusz.zmien(**zmiany),
+            polityka_zapisu=polityka_zapisu, odbiornik=odbiornik,
+            czy_zachowac_historie=self.czy_zachowac_historie)
+    
+    def _wyswietl_naglowek(self):
+        print("=" * 60)
+        print("SYMULACJA LĄDOWANIA RAKIETY")
+        print("=" * 60)
+        print(f"Planeta: {self.dane_planety['nazwa']}")
+        print(f"Grawitacja: {self.grawitacja:.2f} m/s²")
+        print(f"Warunki początkowe:")
+        print(f"  Wysokość: {self.rakieta.pozycja_y:.1f} m")
+        print(f"  Prędkość pionowa: {self.rakieta.predkosc_y:.1f} m/s")
+        print(f"  Prędkość pozioma: {self.rakieta.predkosc_x:.1f} m/s")
+        print(f"  Masa całkowita: {self.rakieta.masa_calkowita:.1f} kg")
+        print(f"  Paliwo: {self.rakieta.masa_paliwa_aktualna:.1f} kg")
+        print(f"  Autopilot: {'TAK' if self.czy_autopilot_wlaczony else 'NIE'}")
+        if self.czy_autopilot_wlaczony:
+            print(f"  Naprowadzanie: {self.scenariusz.naprowadzanie}")
+        print("=" * 60)
+        print()
+    
+    def _wyswietl_postep(self):
+        print(f"t={self.czas_aktualny:6.1f}s | "
+              f"y={self.rakieta.pozycja_y:7.1f}m | "
+              f"vy={self.rakieta.predkosc_y:6.1f}m/s | "
+              f"paliwo={self.rakieta.masa_paliwa_aktualna:5.1f}kg | "
+              f"ciąg={self.rakieta.cieg_aktualny:6.0f}N")
+    
+    def _wyswietl_podsumowanie(self):
+        print()
+        print("=" * 60)
+        print("KONIEC SYMULACJI")
+        print("=" * 60)
+        print(f"Status: {self.komunikat_koncowy}")
+        print(f"Czas symulacji: {self.czas_aktualny:.2f} s")
+        print(f"Końcowa wysokość: {self.rakieta.pozycja_y:.2f} m")
+        print(f"Końcowa prędkość: {self.rakieta.predkosc_calkowita:.2f} m/s")
+        print(f"Pozostałe paliwo: {self.rakieta.masa_paliwa_aktualna:.2f} kg")
+        print("=" * 60)
+    
+    def _przygotuj_tempo(self, przyspieszenie):
+        """Zegar tempa i liczba kroków fizyki między kolejnymi synchronizacjami z zegarem."""
+        # Przewijanie przeskakuje całe sekundy lotu w jednym kroku - w tempie zegara rakieta by skakała
+        self.czy_przewijac_lot_swobodny = False
+        kroki = max(1, round(config.TEMPO_OKRES_SYNCHRONIZACJI_S * przyspieszenie / self.krok_czasowy))
+        zegar = ZegarTempa(przyspieszenie)
+        zegar.start(self.czas_aktualny)
+        return zegar, kroki
+    
+    def _uruchom_w_tempie(self, przyspieszenie, czy_wyswietlac_postep):
+        zegar, kroki = self._przygotuj_tempo(przyspieszenie)
+        czas_wydruku = self.czas_aktualny + 1.0
         czy_kontynuowac = True
         while czy_kontynuowac:
-            czy_kontynuowac = self.wykonaj_krok_symulacji()
-            
-            if czy_wyswietlac_postep and self.numer_kroku % int(1.0 / self.krok_czasowy) == 0:
-                print(f"t={self.czas_aktualny:6.1f}s | "
-                      f"y={self.rakieta.pozycja_y:7.1f}m | "
-                      f"vy={self.rakieta.predkosc_y:6.1f}m/s | "
-                      f"paliwo={self.rakieta.masa_paliwa_aktualna:5.1f}kg | "
-                      f"ciąg={self.rakieta.cieg_aktualny:6.0f}N")
+            czy_kontynuowac = self.wykonaj_kroki(kroki)
+            if czy_wyswietlac_postep and czy_kontynuowac and self.czas_aktualny >= czas_wydruku:
+                self._wyswietl_postep()
+                czas_wydruku += 1.0
+            zegar.czekaj(self.czas_aktualny)
+    
+    def uruchom(self, czy_wyswietlac_postep=True, przyspieszenie=None):
+        """
+        Wykonuje symulację do końca i zwraca wyniki.
         
-        self.zapisz_aktualny_stan()
+        Bez `przyspieszenie` symulacja liczy się najszybciej, jak to możliwe;
+        z czy_wyswietlac_postep=False nie wykonuje wtedy żadnego wejścia/wyjścia
+        (tryb wsadowy). Z `przyspieszenie` postępuje w tempie zegara: 1.0 to
+        czas rzeczywisty, 10.0 - dziesięć razy szybciej.
+        """
+        if czy_wyswietlac_postep:
+            self._wyswietl_naglowek()
+        
+        if przyspieszenie is not None:
+            self._uruchom_w_tempie(przyspieszenie, czy_wyswietlac_postep)
+        elif czy_wyswietlac_postep:
+            kroki_na_wydruk = max(1, int(1.0 / self.krok_czasowy))
+            czy_kontynuowac = True
+            while czy_kontynuowac:
+                czy_kontynuowac = self.wykonaj_krok_symulacji()
+                if self.numer_kroku % kroki_na_wydruk == 0:
+                    self._wyswietl_postep()
+            self.zapisz_aktualny_stan()
+        else:
+            while self.wykonaj_krok_symulacji():
+                pass
+            self.zapisz_aktualny_stan()
         
         if czy_wyswietlac_postep:
-            print()
-            print("=" * 60)
-            print("KONIEC SYMULACJI")
-            print("=" * 60)
-            print(f"Status: {self.komunikat_koncowy}")
-            print(f"Czas symulacji: {self.czas_aktualny:.2f} s")
-            print(f"Końcowa wysokość: {self.rakieta.pozycja_y:.2f} m")
-            print(f"Końcowa prędkość: {self.rakieta.predkosc_calkowita:.2f} m/s")
-            print(f"Pozostałe paliwo: {self.rakieta.masa_paliwa_aktualna:.2f} kg")
-            print("=" * 60)
+            self._wyswietl_podsumowanie()
         
         return self.pobierz_wyniki()
     
+    async def przebieg_async(self, przyspieszenie=1.0):
+        """
+        Asynchroniczny przebieg w tempie zegara - generator zwracający próbkę
+        stanu po każdej synchronizacji. Oczekiwanie oddaje pętlę zdarzeń, więc
+        wiele symulacji może postępować równocześnie w jednej pętli asyncio.
+        """
+        zegar, kroki = self._przygotuj_tempo(przyspieszenie)
+        czy_kontynuowac = True
+        while czy_kontynuowac:
+            czy_kontynuowac = self.wykonaj_kroki(kroki)
+            await zegar.czekaj_async(self.czas_aktualny)
+            yield self.pobierz_probke()
+    
+    async def uruchom_async(self, przyspieszenie=1.0):
+        async for _ in self.przebieg_async(przyspieszenie):
+            pass
+        return self.pobierz_wyniki()
+    
     def pobierz_wyniki(self):
-        return {
+        wyniki = {
             'sukces': self.czy_sukces,
             'komunikat': self.komunikat_koncowy,
             'czas_symulacji': self.czas_aktualny,
@@ -164,29 +487,51 @@ class Symulacja:
             'parametry': {
                 'dt': self.krok_czasowy,
                 'autopilot': self.czy_autopilot_wlaczony,
-                'wysokosc_poczatkowa': config.WYSOKOSC_STARTOWA,
-                'predkosc_poczatkowa': config.PREDKOSC_PIONOWA_STARTOWA
+                'integrator': self.scenariusz.integrator,
+                'okres_sterowania': self.okres_sterowania,
+                'opoznienie_sterowania': self.kroki_opoznienia * self.krok_czasowy,
+                'wysokosc_poczatkowa': self.scenariusz.wysokosc_startowa,
+                'predkosc_poczatkowa': self.scenariusz.predkosc_pionowa_startowa
             }
         }
+        if self.instrumentacja is not None:
+            wyniki['instrumentacja'] = self.instrumentacja.raport()
+        return wyniki
     
-    def zapisz_do_pliku(self, nazwa_pliku=None):
+    def zapisz_do_pliku(self, nazwa_pliku=None, format=None, czy_kompresowac=None):
+        if format is None:
+            format = config.FORMAT_ZAPISU_DANYCH
+        if format not in eksport.ROZSZERZENIA:
+            raise ValueError(f"Nieznany format zapisu: {format} (dostępne: {', '.join(eksport.ROZSZERZENIA)})")
+        if czy_kompresowac is None:
+            czy_kompresowac = config.KOMPRESJA_ZAPISU_DANYCH
+
         os.makedirs(config.KATALOG_DANYCH_WYJSCIOWYCH, exist_ok=True)
         
         if nazwa_pliku is None:
+            # Przyrostek z identyfikatora - dwa zapisy w tej samej sekundzie się nie nadpisują
             znacznik_czasu = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nazwa_pliku = f"{config.NAZWA_BAZOWA_PLIKU_DANYCH}_{znacznik_czasu}.json"
+            nazwa_pliku = (f"{config.NAZWA_BAZOWA_PLIKU_DANYCH}_{znacznik_czasu}_{uuid.uuid4().hex[:8]}"
+                           f"{eksport.ROZSZERZENIA[format]}")
         
         sciezka_pliku = os.path.join(config.KATALOG_DANYCH_WYJSCIOWYCH, nazwa_pliku)
         
         wyniki = self.pobierz_wyniki()
-        for klucz in wyniki['historia']:
-            if isinstance(wyniki['historia'][klucz], np.ndarray):
-                wyniki['historia'][klucz] = wyniki['historia'][klucz].tolist()
-            elif isinstance(wyniki['historia'][klucz], list):
-                wyniki['historia'][klucz] = [float(x) if isinstance(x, (np.floating, np.integer)) 
-                                             else x for x in wyniki['historia'][klucz]]
+        wyniki['scenariusz'] = self.scenariusz.do_slownika()
         
-        with open(sciezka_pliku, 'w', encoding='utf-8') as plik:
-            json.dump(wyniki, plik, indent=2, ensure_ascii=False)
+        if format == 'npz':
+            eksport.zapisz_npz(sciezka_pliku, wyniki, czy_kompresowac=czy_kompresowac)
+        elif format == 'surowy':
+            eksport.zapisz_surowy(sciezka_pliku, wyniki)
+        else:
+            wyniki['historia'] = {klucz: np.asarray(wartosci, dtype=np.float64).tolist()
+                                  for klucz, wartosci in wyniki['historia'].items()}
+            with open(sciezka_pliku, 'w', encoding='utf-8') as plik:
+                json.dump(wyniki, plik, ensure_ascii=False, default=eksport.wartosc_json)
         
         return sciezka_pliku
+
+    def zapisz_do_magazynu(self, magazyn, zrodlo='symulacja', czy_zapisac_trajektorie=True):
+        """Dodaje przebieg do magazynu (MagazynPrzebiegow) i zwraca jego identyfikator."""
+        return magazyn.dodaj(self.pobierz_wyniki(), self.scenariusz, zrodlo=zrodlo,
+                             czy_zapisac_trajektorie=czy_zapisac_trajektorie)
@@ -0,0 +1,487 @@
+from collections import deque
+
+import numpy as np
+from src import config
+from src.scenariusz import NastawyAutopilota, kroki_w_okresie
+
+
+KOD_W_TOKU = 0
+KOD_WYLADOWAL = 1
+KOD_PRZEKROCZONY_CZAS = 2
+KOD_OPUSZCZENIE_STREFY = 3
+
+
+class RegulatorPIDWsadowy:
+    """Wektorowa wersja RegulatorPID - osobny stan regulatora dla każdej rakiety."""
+
+    def __init__(self, liczba_rakiet, wspolczynnik_proporcjonalny, wspolczynnik_calkujacy,
+                 wspolczynnik_rozniczkujacy, wartosc_minimalna=0, wartosc_maksymalna=None):
+        self.wspolczynnik_proporcjonalny = wspolczynnik_proporcjonalny
+        self.wspolczynnik_calkujacy = wspolczynnik_calkujacy
+        self.wspolczynnik_rozniczkujacy = wspolczynnik_rozniczkujacy
+        self.wartosc_minimalna = wartosc_minimalna
+        self.wartosc_maksymalna = wartosc_maksymalna
+
+        self.suma_calkujaca = np.zeros(liczba_rakiet)
+        self.blad_poprzedni = np.zeros(liczba_rakiet)
+        self.czy_pierwszy_krok = np.ones(liczba_rakiet, dtype=bool)
+
+    def oblicz_sterowanie(self, blad_regulacji, krok_czasowy, maska):
+        """
+        Liczy wyjście regulatora dla wszystkich rakiet, ale stan aktualizuje
+        tylko tam, gdzie maska jest prawdziwa (odpowiednik wywołania skalarnego).
+        """
+        czlon_proporcjonalny = self.wspolczynnik_proporcjonalny * blad_regulacji
+
+        suma_calkujaca = self.suma_calkujaca + blad_regulacji * krok_czasowy
+        czlon_calkujacy = self.wspolczynnik_calkujacy * suma_calkujaca
+
+        czlon_rozniczkujacy = np.where(
+            self.czy_pierwszy_krok,
+            0.0,
+            self.wspolczynnik_rozniczkujacy * (blad_regulacji - self.blad_poprzedni) / krok_czasowy
+        )
+
+        self.suma_calkujaca = np.where(maska, suma_calkujaca, self.suma_calkujaca)
+        self.blad_poprzedni = np.where(maska, blad_regulacji, self.blad_poprzedni)
+        self.czy_pierwszy_krok = self.czy_pierwszy_krok & ~maska
+
+        wartosc_wyjsciowa = czlon_proporcjonalny + czlon_calkujacy + czlon_rozniczkujacy
+
+        if self.wartosc_maksymalna is not None:
+            wartosc_wyjsciowa = np.minimum(wartosc_wyjsciowa, self.wartosc_maksymalna)
+        if self.wartosc_minimalna is not None:
+            wartosc_wyjsciowa = np.maximum(wartosc_wyjsciowa, self.wartosc_minimalna)
+
+        return wartosc_wyjsciowa
+
+
+class SymulacjaWsadowa:
+    """
+    Symulacja wielu rakiet jednocześnie na tablicach NumPy.
+
+    Odwzorowuje krok po kroku logikę Symulacja/Rakieta/Autopilot, więc wynik
+    każdej rakiety odpowiada przebiegowi skalarnemu dla tych samych danych.
+    Rakiety, które zakończyły lot, są maskowane (ich stan zostaje zamrożony).
+    """
+
+    def __init__(self,
+                 pozycja_x=None,
+                 pozycja_y=None,
+                 predkosc_x=None,
+                 predkosc_y=None,
+                 masa_rakiety_pusta=None,
+                 masa_paliwa=None,
+                 cieg_maksymalny=None,
+                 zuzycie_paliwa=None,
+                 planeta='ksiezyc',
+                 liczba_rakiet=None,
+                 krok_czasowy=None,
+                 czas_maksymalny=None,
+                 czy_autopilot_wlaczony=True,
+                 nastawy=None,
+                 predkosc_ladowania_maksymalna=None,
+                 okres_sterowania=None,
+                 opoznienie_sterowania=None):
+        # Brakujące wartości są brane z config w chwili wywołania, a nie przy imporcie
+        def domyslna(wartosc, nazwa):
+            return getattr(config, nazwa) if wartosc is None else wartosc
+
+        pozycja_x = domyslna(pozycja_x, 'POZYCJA_POZIOMA_STARTOWA')
+        pozycja_y = domyslna(pozycja_y, 'WYSOKOSC_STARTOWA')
+        predkosc_x = domyslna(predkosc_x, 'PREDKOSC_POZIOMA_STARTOWA')
+        predkosc_y = domyslna(predkosc_y, 'PREDKOSC_PIONOWA_STARTOWA')
+        masa_rakiety_pusta = domyslna(masa_rakiety_pusta, 'MASA_RAKIETY_PUSTA')
+        masa_paliwa = domyslna(masa_paliwa, 'MASA_PALIWA_STARTOWA')
+        cieg_maksymalny = domyslna(cieg_maksymalny, 'CIEG_MAKSYMALNY_SILNIKA')
+        zuzycie_paliwa = domyslna(zuzycie_paliwa, 'ZUZYCIE_PALIWA_NA_SEKUNDE')
+        krok_czasowy = domyslna(krok_czasowy, 'KROK_CZASOWY_SYMULACJI')
+        czas_maksymalny = domyslna(czas_maksymalny, 'CZAS_MAKSYMALNY_SYMULACJI')
+        predkosc_ladowania_maksymalna = domyslna(predkosc_ladowania_maksymalna, 'PREDKOSC_LADOWANIA_MAKSYMALNA')
+        okres_sterowania = domyslna(okres_sterowania, 'OKRES_STEROWANIA')
+        opoznienie_sterowania = domyslna(opoznienie_sterowania, 'OPOZNIENIE_STEROWANIA')
+        if nastawy is None:
+            nastawy = NastawyAutopilota()
+
+        if isinstance(planeta, str):
+            planeta = [planeta]
+        klucze_planet = [p if p in config.PLANETY else 'ksiezyc' for p in planeta]
+        grawitacja = np.array([config.PLANETY[p]['grawitacja'] for p in klucze_planet])
+
+        if liczba_rakiet is None:
+            liczba_rakiet = np.broadcast(
+                np.atleast_1d(pozycja_x), np.atleast_1d(pozycja_y),
+                np.atleast_1d(predkosc_x), np.atleast_1d(predkosc_y),
+                np.atleast_1d(masa_rakiety_pusta), np.atleast_1d(masa_paliwa),
+                np.atleast_1d(cieg_maksymalny), np.atleast_1d(zuzycie_paliwa), grawitacja
+            ).size
+
+        def tablica(wartosc):
+            return np.array(np.broadcast_to(np.asarray(wartosc, dtype=np.float64), (liczba_rakiet,)))
+
+        self.liczba_rakiet = liczba_rakiet
+        self.krok_czasowy = krok_czasowy
+        self.czas_maksymalny = czas_maksymalny
+        self.czy_autopilot_wlaczony = czy_autopilot_wlaczony
+        self.nastawy = nastawy
+        self.predkosc_ladowania_maksymalna = predkosc_ladowania_maksymalna
+
+        if okres_sterowania is None:
+            okres_sterowania = krok_czasowy
+        self.kroki_na_sterowanie = kroki_w_okresie(okres_sterowania, krok_czasowy, 'okres_sterowania')
+        if self.kroki_na_sterowanie < 1:
+            raise ValueError("okres_sterowania nie może być krótszy od kroku czasowego")
+        self.kroki_opoznienia = kroki_w_okresie(opoznienie_sterowania, krok_czasowy, 'opoznienie_sterowania')
+        self.okres_sterowania = self.kroki_na_sterowanie * krok_czasowy
+        self.kolejka_sterowania = deque()
+
+        self.klucze_planet = np.array(np.broadcast_to(np.array(klucze_planet), (liczba_rakiet,)))
+        self.grawitacja = tablica(grawitacja)
+
+        self.pozycja_x = tablica(pozycja_x)
+        self.pozycja_y = tablica(pozycja_y)
+        self.predkosc_x = tablica(predkosc_x)
+        self.predkosc_y = tablica(predkosc_y)
+        self.masa_rakiety_pusta = tablica(masa_rakiety_pusta)
+        self.masa_paliwa_aktualna = tablica(masa_paliwa)
+        self.cieg_maksymalny = tablica(cieg_maksymalny)
+        self.zuzycie_paliwa_na_sekunde = tablica(zuzycie_paliwa)
+        self.cieg_aktualny = np.zeros(liczba_rakiet)
+        self.kat_nachylenia = np.zeros(liczba_rakiet)
+
+        self.wysokosc_startowa = self.pozycja_y.copy()
+
+        self.regulator_wysokosci = RegulatorPIDWsadowy(
+            liczba_rakiet,
+            wspolczynnik_proporcjonalny=nastawy.wspolczynnik_proporcjonalny_wysokosc,
+            wspolczynnik_calkujacy=nastawy.wspolczynnik_calkujacy_wysokosc,
+            wspolczynnik_rozniczkujacy=nastawy.wspolczynnik_rozniczkujacy_wysokosc,
+            wartosc_minimalna=0,
+            wartosc_maksymalna=self.cieg_maksymalny
+        )
+        self.regulator_pozycji_poziomej = RegulatorPIDWsadowy(
+            liczba_rakiet,
+            wspolczynnik_proporcjonalny=nastawy.wspolczynnik_proporcjonalny_poziom,
+            wspolczynnik_calkujacy=0.0,
+            wspolczynnik_rozniczkujacy=nastawy.wspolczynnik_rozniczkujacy_poziom,
+            wartosc_minimalna=-np.pi/6,
+            wartosc_maksymalna=np.pi/6
+        )
+        self.czy_suicide_burn = np.zeros(liczba_rakiet, dtype=bool)
+
+        self.aktywne = np.ones(liczba_rakiet, dtype=bool)
+        self.kod_zakonczenia = np.full(liczba_rakiet, KOD_W_TOKU, dtype=np.int8)
+        self.czas_zakonczenia = np.zeros(liczba_rakiet)
+
+        self.czas_aktualny = 0.0
+        self.numer_kroku = 0
+
+    @classmethod
+    def ze_scenariuszy(cls, scenariusze):
+        """
+        Tworzy paczkę z listy scenariuszy. Krok czasowy, czas maksymalny,
+        autopilot i nastawy muszą być wspólne dla całej paczki, integratorem
+        musi być półjawny schemat Eulera, a naprowadzanie - heurystyczne.
+        """
+        pierwszy = scenariusze[0]
+        for scenariusz in scenariusze:
+            if (scenariusz.krok_czasowy, scenariusz.czas_maksymalny, scenariusz.czy_autopilot_wlaczony,
+                    scenariusz.nastawy, scenariusz.predkosc_ladowania_maksymalna,
+                    scenariusz.okres_sterowania, scenariusz.opoznienie_sterowania) != (
+                    pierwszy.krok_czasowy, pierwszy.czas_maksymalny, pierwszy.czy_autopilot_wlaczony,
+                    pierwszy.nastawy, pierwszy.predkosc_ladowania_maksymalna,
+                    pierwszy.okres_sterowania, pierwszy.opoznienie_sterowania):
+                raise ValueError("Scenariusze w jednej paczce muszą mieć wspólne parametry symulacji i nastawy")
+            if scenariusz.integrator != 'euler':
+                raise ValueError("Symulacja wsadowa obsługuje tylko półjawny schemat Eulera")
+            if scenariusz.naprowadzanie != 'heurystyczne':
+                raise ValueError("Symulacja wsadowa obsługuje tylko naprowadzanie heurystyczne")
+
+        return cls(
+            pozycja_x=[s.pozycja_pozioma_startowa for s in scenariusze],
+            pozycja_y=[s.wysokosc_startowa for s in scenariusze],
+            predkosc_x=[s.predkosc_pozioma_startowa for s in scenariusze],
+            predkosc_y=[s.predkosc_pionowa_startowa for s in scenariusze],
+            masa_rakiety_pusta=[s.rakieta.masa_rakiety_pusta for s in scenariusze],
+            masa_paliwa=[s.rakieta.masa_paliwa for s in scenariusze],
+            cieg_maksymalny=[s.rakieta.cieg_maksymalny for s in scenariusze],
+            zuzycie_paliwa=[s.rakieta.zuzycie_paliwa for s in scenariusze],
+            planeta=[s.planeta for s in scenariusze],
+            krok_czasowy=pierwszy.krok_czasowy,
+            czas_maksymalny=pierwszy.czas_maksymalny,
+            czy_autopilot_wlaczony=pierwszy.czy_autopilot_wlaczony,
+            nastawy=pierwszy.nastawy,
+            predkosc_ladowania_maksymalna=pierwszy.predkosc_ladowania_maksymalna,
+            okres_sterowania=pierwszy.okres_sterowania,
+            opoznienie_sterowania=pierwszy.opoznienie_sterowania
+        )
+
+    @property
+    def masa_calkowita(self):
+        return self.masa_rakiety_pusta + self.masa_paliwa_aktualna
+
+    @property
+    def predkosc_calkowita(self):
+        return np.sqrt(self.predkosc_x**2 + self.predkosc_y**2)
+
+    def oblicz_sterowanie(self, maska):
+        dt = self.okres_sterowania
+        y = self.pozycja_y
+        vy = self.predkosc_y
+        masa = self.masa_calkowita
+
+        # Komenda obowiązuje przez cały okres sterowania - decyzja dla stanu na jego końcu
+        wysokosc = y + vy * dt - self.grawitacja * dt ** 2 / 2
+        predkosc = vy - self.grawitacja * dt
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            przyspieszenie_maksymalne = (self.cieg_maksymalny / masa) - self.grawitacja
+            czas_hamowania = np.abs(predkosc) / przyspieszenie_maksymalne
+            droga_hamowania = np.abs(predkosc) * czas_hamowania / 2
+        opadanie = (y > 0.1) & (vy < 0)
+        self.czy_suicide_burn = opadanie & (
+            (przyspieszenie_maksymalne <= 0) | (wysokosc < droga_hamowania * self.nastawy.margines_suicide_burn)
+        )
+
+        kat_nachylenia = self.kontrola_pozycji_poziomej(dt, maska)
+
+        cieg_suicide_burn = self.ladowanie_suicide_burn(kat_nachylenia)
+        cieg_normalny = self.ladowanie_normalne(dt, maska & ~self.czy_suicide_burn)
+        cieg_zadany = np.where(self.czy_suicide_burn, cieg_suicide_burn, cieg_normalny)
+
+        return cieg_zadany, kat_nachylenia
+
+    def ladowanie_normalne(self, krok_czasowy, maska):
+        y = self.pozycja_y
+        predkosc_docelowa = np.where(y > 100, -15.0, np.where(y > 20, -5.0, -1.5))
+        blad_predkosci = predkosc_docelowa - self.predkosc_y
+        return self.regulator_wysokosci.oblicz_sterowanie(blad_predkosci, krok_czasowy, maska)
+
+    def ladowanie_suicide_burn(self, kat_nachylenia):
+        y = self.pozycja_y
+        vy = self.predkosc_y
+        cieg_maksymalny = self.cieg_maksymalny
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            przyspieszenie_potrzebne = np.where(y > 0.1, np.abs(vy ** 2) / (2 * y), 0.0)
+
+        przyspieszenie_calkowite = przyspieszenie_potrzebne + self.grawitacja
+        cieg_potrzebny = self.masa_calkowita * przyspieszenie_calkowite / np.cos(kat_nachylenia)
+        cieg_zadany = np.maximum(0, np.minimum(cieg_potrzebny, cieg_maksymalny))
+
+        cieg_zadany = np.where(
+            (y < 10) & (vy < -3),
+            cieg_maksymalny,
+            np.where((y < 50) & (vy < -10), np.minimum(cieg_zadany * 1.5, cieg_maksymalny), cieg_zadany)
+        )
+        return np.where(y <= 0, cieg_maksymalny, cieg_zadany)
+
+    def kontrola_pozycji_poziomej(self, krok_czasowy, maska):
+        blad_pozycji = -self.pozycja_x - 2.0 * self.predkosc_x
+        kat_nachylenia = self.regulator_pozycji_poziomej.oblicz_sterowanie(blad_pozycji, krok_czasowy, maska)
+
+        kat_maksymalny = np.pi / 12
+        return np.where(
+            self.pozycja_y < 20,
+            np.maximum(-kat_maksymalny, np.minimum(kat_nachylenia, kat_maksymalny)),
+            kat_nachylenia
+        )
+
+    def ustaw_sterowanie(self, cieg_zadany, kat_nachylenia, maska):
+        cieg_zadany = np.maximum(0, np.minimum(cieg_zadany, self.cieg_maksymalny))
+        cieg_zadany = np.where(self.masa_paliwa_aktualna > 0, cieg_zadany, 0.0)
+        self.cieg_aktualny = np.where(maska, cieg_zadany, self.cieg_aktualny)
+        self.kat_nachylenia = np.where(maska, kat_nachylenia, self.kat_nachylenia)
+
+    def _ruch(self, stan, cieg, czas):
+        pozycja_x, pozycja_y, predkosc_x, predkosc_y, masa_paliwa = stan
+        masa = self.masa_rakiety_pusta + masa_paliwa
+
+        skladowa_ciagu_x = cieg * np.sin(self.kat_nachylenia)
+        skladowa_ciagu_y = cieg * np.cos(self.kat_nachylenia)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            przyspieszenie_x = np.where(masa > 0, skladowa_ciagu_x / masa, 0.0)
+            przyspieszenie_y = np.where(masa > 0, (skladowa_ciagu_y / masa) - self.grawitacja, -self.grawitacja)
+
+        predkosc_x = predkosc_x + przyspieszenie_x * czas
+        predkosc_y = predkosc_y + przyspieszenie_y * czas
+        pozycja_x = pozycja_x + predkosc_x * czas
+        pozycja_y = pozycja_y + predkosc_y * czas
+
+        czy_spala = (cieg > 0) & (masa_paliwa > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zuzycie = np.where(
+                czy_spala & (self.cieg_maksymalny > 0),
+                cieg / self.cieg_maksymalny * self.zuzycie_paliwa_na_sekunde * czas,
+                0.0
+            )
+        masa_paliwa = np.where(czy_spala, np.maximum(0, masa_paliwa - zuzycie), masa_paliwa)
+
+        return (pozycja_x, pozycja_y, predkosc_x, predkosc_y, masa_paliwa), przyspieszenie_y
+
+    def _przesun_do_zdarzenia(self, stan, cieg, czas):
+        """
+        Odpowiednik Rakieta._przesun_do_zdarzenia. Dla schematu Eulera
+        półjawnego wysokość w funkcji długości kroku jest kwadratowa, więc
+        chwilę przyziemienia liczymy wprost z równania kwadratowego.
+        """
+        nowy_stan, przyspieszenie_y = self._ruch(stan, cieg, czas)
+        wysokosc_poczatkowa = stan[1]
+        predkosc_poczatkowa = stan[3]
+        przeciecie = (nowy_stan[1] < 0) & (wysokosc_poczatkowa > 0)
+
+        if przeciecie.any():
+            # a*t^2 + v0*t + y0 = 0, stabilna numerycznie postać pierwiastków
+            with np.errstate(divide='ignore', invalid='ignore'):
+                delta = np.maximum(predkosc_poczatkowa**2 - 4 * przyspieszenie_y * wysokosc_poczatkowa, 0.0)
+                q = -0.5 * (predkosc_poczatkowa + np.copysign(np.sqrt(delta), predkosc_poczatkowa))
+                pierwiastek_1 = np.where(przyspieszenie_y != 0, q / przyspieszenie_y, np.inf)
+                pierwiastek_2 = np.where(q != 0, wysokosc_poczatkowa / q, np.inf)
+            pierwiastek_1 = np.where((pierwiastek_1 > 0) & (pierwiastek_1 <= czas), pierwiastek_1, np.inf)
+            pierwiastek_2 = np.where((pierwiastek_2 > 0) & (pierwiastek_2 <= czas), pierwiastek_2, np.inf)
+            czas_przeciecia = np.minimum(np.minimum(pierwiastek_1, pierwiastek_2), czas)
+
+            czas = np.where(przeciecie, czas_przeciecia, czas)
+            nowy_stan, _ = self._ruch(stan, cieg, czas)
+
+        pozycja_y = np.where(przeciecie | (nowy_stan[1] < 0), 0.0, nowy_stan[1])
+        return (nowy_stan[0], pozycja_y) + nowy_stan[2:], czas, przeciecie
+
+    def aktualizuj(self, maska):
+        """Zwraca tablicę czasów faktycznie przebytych w kroku (jak Rakieta.aktualizuj)."""
+        dt = np.full(self.liczba_rakiet, self.krok_czasowy)
+        cieg = self.cieg_aktualny
+        stan = (self.pozycja_x, self.pozycja_y, self.predkosc_x, self.predkosc_y, self.masa_paliwa_aktualna)
+
+        czy_spala = (cieg > 0) & (self.masa_paliwa_aktualna > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zuzycie = np.where(
+                czy_spala & (self.cieg_maksymalny > 0),
+                cieg / self.cieg_maksymalny * self.zuzycie_paliwa_na_sekunde * dt,
+                0.0
+            )
+            wyczerpanie = czy_spala & (zuzycie >= self.masa_paliwa_aktualna)
+            czas_do_wyczerpania = np.where(wyczerpanie, dt * self.masa_paliwa_aktualna / zuzycie, dt)
+
+        stan, czas_1, przeciecie = self._przesun_do_zdarzenia(stan, cieg, czas_do_wyczerpania)
+
+        po_wyczerpaniu = wyczerpanie & ~przeciecie
+        masa_paliwa = np.where(po_wyczerpaniu, 0.0, stan[4])
+        cieg = np.where(po_wyczerpaniu, 0.0, cieg)
+        czas_pozostaly = np.where(po_wyczerpaniu, dt - czas_do_wyczerpania, 0.0)
+
+        stan, czas_2, _ = self._przesun_do_zdarzenia(stan[:4] + (masa_paliwa,), cieg, czas_pozostaly)
+        czas_kroku = czas_1 + czas_2
+
+        self.pozycja_x = np.where(maska, stan[0], self.pozycja_x)
+        self.pozycja_y = np.where(maska, stan[1], self.pozycja_y)
+        self.predkosc_x = np.where(maska, stan[2], self.predkosc_x)
+        self.predkosc_y = np.where(maska, stan[3], self.predkosc_y)
+        self.masa_paliwa_aktualna = np.where(maska, stan[4], self.masa_paliwa_aktualna)
+        self.cieg_aktualny = np.where(maska, cieg, self.cieg_aktualny)
+
+        return czas_kroku
+
+    def wykonaj_krok_symulacji(self):
+        maska = self.aktywne
+
+        if self.czy_autopilot_wlaczony:
+            if self.numer_kroku % self.kroki_na_sterowanie == 0:
+                cieg_zadany, kat_nachylenia = self.oblicz_sterowanie(maska)
+                self.kolejka_sterowania.append((self.numer_kroku + self.kroki_opoznienia, cieg_zadany, kat_nachylenia))
+            if self.kolejka_sterowania and self.kolejka_sterowania[0][0] <= self.numer_kroku:
+                _, cieg_zadany, kat_nachylenia = self.kolejka_sterowania.popleft()
+                self.ustaw_sterowanie(cieg_zadany, kat_nachylenia, maska)
+
+        czas_kroku = self.aktualizuj(maska)
+        czas_rakiet = self.numer_kroku * self.krok_czasowy + czas_kroku
+
+        self.numer_kroku += 1
+        self.czas_aktualny = self.numer_kroku * self.krok_czasowy
+
+        return self.sprawdz_warunki_zakonczenia(czas_rakiet)
+
+    def sprawdz_warunki_zakonczenia(self, czas_rakiet):
+        przekroczony_czas = self.aktywne & (czas_rakiet >= self.czas_maksymalny)
+
+        wyladowal = self.aktywne & ~przekroczony_czas & (self.pozycja_y <= config.DOKLADNOSC_WYKRYWANIA_LADOWANIA)
+        poza_strefa = (self.aktywne & ~przekroczony_czas & ~wyladowal
+                       & (self.pozycja_y > self.wysokosc_startowa * 2))
+
+        self.kod_zakonczenia[przekroczony_czas] = KOD_PRZEKROCZONY_CZAS
+        self.kod_zakonczenia[wyladowal] = KOD_WYLADOWAL
+        self.kod_zakonczenia[poza_strefa] = KOD_OPUSZCZENIE_STREFY
+
+        zakonczone = przekroczony_czas | wyladowal | poza_strefa
+        self.czas_zakonczenia[zakonczone] = czas_rakiet[zakonczone]
+        self.aktywne = self.aktywne & ~zakonczone
+
+        return bool(self.aktywne.any())
+
+    def uruchom(self):
+        czy_kontynuowac = bool(self.aktywne.any())
+        while czy_kontynuowac:
+            czy_kontynuowac = self.wykonaj_krok_symulacji()
+        return self.pobierz_wyniki()
+
+    @property
+    def czy_sukces(self):
+        return ((self.kod_zakonczenia == KOD_WYLADOWAL)
+                & (np.abs(self.predkosc_y) <= self.predkosc_ladowania_maksymalna))
+
+    def komunikat(self, indeks):
+        kod = self.kod_zakonczenia[indeks]
+        if kod == KOD_PRZEKROCZONY_CZAS:
+            return "Przekroczono maksymalny czas symulacji"
+        if kod == KOD_OPUSZCZENIE_STREFY:
+            return "Rakieta opuściła strefę symulacji"
+        if kod == KOD_WYLADOWAL:
+            predkosc_przy_ladowaniu = abs(self.predkosc_y[indeks])
+            if predkosc_przy_ladowaniu <= self.predkosc_ladowania_maksymalna:
+                return (f"Udane lądowanie! Prędkość: {predkosc_przy_ladowaniu:.2f} m/s, "
+                        f"Pozycja: x={self.pozycja_x[indeks]:.1f}m")
+            return (f"Katastrofa! Zbyt duża prędkość lądowania: "
+                    f"{predkosc_przy_ladowaniu:.2f} m/s")
+        return ""
+
+    def pobierz_stan(self):
+        return {
+            'x': self.pozycja_x,
+            'y': self.pozycja_y,
+            'vx': self.predkosc_x,
+            'vy': self.predkosc_y,
+            'predkosc': self.predkosc_calkowita,
+            'masa_calkowita': self.masa_calkowita,
+            'masa_paliwa': self.masa_paliwa_aktualna,
+            'cieg': self.cieg_aktualny,
+            'kat': self.kat_nachylenia,
+            'energia_kinetyczna': 0.5 * self.masa_calkowita * self.predkosc_calkowita**2,
+            'energia_potencjalna': self.masa_calkowita * self.grawitacja * self.pozycja_y
+        }
+
+    def pobierz_wyniki(self):
+        return {
+            'sukces': self.czy_sukces,
+            'kod_zakonczenia': self.kod_zakonczenia,
+            'czas_symulacji': self.czas_zakonczenia,
+            'stan_koncowy': self.pobierz_stan(),
+            'planeta': self.klucze_planet,
+            'parametry': {
+                'dt': self.krok_czasowy,
+                'okres_sterowania': self.okres_sterowania,
+                'opoznienie_sterowania': self.kroki_opoznienia * self.krok_czasowy,
+                'autopilot': self.czy_autopilot_wlaczony,
+                'liczba_rakiet': self.liczba_rakiet
+            }
+        }
+
+    def pobierz_wynik(self, indeks):
+        """Wynik pojedynczej rakiety w formacie zbliżonym do Symulacja.pobierz_wyniki()."""
+        return {
+            'sukces': bool(self.czy_sukces[indeks]),
+            'komunikat': self.komunikat(indeks),
+            'czas_symulacji': float(self.czas_zakonczenia[indeks]),
+            'stan_koncowy': {klucz: float(wartosc[indeks]) for klucz, wartosc in self.pobierz_stan().items()},
+            'planeta': str(self.klucze_planet[indeks])
+        }
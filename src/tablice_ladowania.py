@@ -0,0 +1,297 @@
+"""
+Tablice optymalnego lądowania - naprowadzanie tabelaryczne.
+
+Dla planety i rakiety (masa pusta, ciąg, zużycie paliwa) w węzłach siatki
+(wysokość, prędkość pionowa, masa paliwa) wyznaczany jest offline profil
+hamowania naprowadzania predykcyjnego, z gęstszą siatką kandydatów i
+dokładniejszą propagacją: planowane opóźnienie (ciąg m (g + a)), wysokość
+zapłonu, przewidywana prędkość przyziemienia i zużycie paliwa.
+
+Budowa dzieli siatkę na warstwy masy paliwa liczone w puli procesów. Gotowa
+tablica trafia do pamięci podręcznej na dysku (.npy i opis .json) pod
+kluczem ze skrótu parametrów i jest otwierana przez np.load(mmap_mode='r'),
+więc wiele symulacji i procesów dzieli te same strony pamięci.
+Symulacja tablicę tylko otwiera - brakującą buduje wcześniej polecenie
+poniżej albo `przygotuj_tablice` w procesie głównym (main, Monte Carlo,
+przeszukiwanie, kolejka zadań GUI), nigdy proces roboczy.
+
+AutopilotTabelaryczny zamiast oceniać kandydatów przy każdym sterowaniu
+interpoluje tablicę trójliniowo; poza zasięgiem tablicy wraca do oceny
+kandydatów jak AutopilotPredykcyjny.
+
+Uruchomienie (budowa tablic z wyprzedzeniem):
+    python -m src.tablice_ladowania --planety ksiezyc europa tytan --procesy 4
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import bisect
+import hashlib
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.autopilot import KAT_NACHYLENIA_MAKSYMALNY
+from src.naprowadzanie import (AutopilotPredykcyjny, propaguj_hamowanie, wybierz_kandydata,
+                               WYSOKOSC_MINIMALNA_PROPAGACJI)
+from src.scenariusz import Scenariusz
+from src import config
+
+
+# Zmiana sposobu budowy tablic unieważnia tablice zapisane na dysku
+WERSJA_TABLIC = 1
+KANALY = ('opoznienie', 'wysokosc_zaplonu', 'predkosc_przyziemienia', 'zuzycie_paliwa')
+
+
+def osie_tablicy(zasieg_osi, liczba_wezlow):
+    """Węzły osi (wysokość, prędkość pionowa, masa paliwa)."""
+    wysokosc_maksymalna, predkosc_maksymalna, paliwo_maksymalne = zasieg_osi
+    if min(liczba_wezlow) < 2:
+        raise ValueError(f"Każda oś tablicy musi mieć co najmniej 2 węzły, otrzymano: {liczba_wezlow}")
+    liczba_wysokosci, liczba_predkosci, liczba_mas = liczba_wezlow
+    # Węzły wysokości zagęszczone przy powierzchni, gdzie potrzebne opóźnienie zmienia się najszybciej
+    return (wysokosc_maksymalna * np.linspace(0.0, 1.0, liczba_wysokosci) ** 2,
+            np.linspace(-predkosc_maksymalna, 0.0, liczba_predkosci),
+            np.linspace(0.0, paliwo_maksymalne, liczba_mas))
+
+
+def oblicz_warstwe(masa_paliwa, *, wysokosci, predkosci, grawitacja, masa_pusta, cieg_maksymalny,
+                   zuzycie_paliwa, predkosc_ladowania_maksymalna, liczba_kandydatow, liczba_krokow):
+    """Kanały tablicy dla jednej masy paliwa - tablica (wysokości, prędkości, KANALY)."""
+    cos_pochylenia = math.cos(KAT_NACHYLENIA_MAKSYMALNY)
+    opoznienie_planowane = config.NAPROWADZANIE_ZAPAS_CIAGU * (
+        cos_pochylenia * cieg_maksymalny / (masa_pusta + masa_paliwa) - grawitacja)
+    warstwa = np.full((len(wysokosci), len(predkosci), len(KANALY)), np.nan)
+    if opoznienie_planowane <= 0:
+        # Rakieta nie utrzyma się w zawisie - tablica nie ma tu rozwiązania
+        return warstwa
+
+    ulamki = np.linspace(0.01, 0.99, liczba_kandydatow)
+    wysokosc, predkosc = np.meshgrid(wysokosci, predkosci, indexing='ij')
+    predkosc_przyziemienia, zuzycie, wysokosc_zaplonu, _ = propaguj_hamowanie(
+        wysokosc.reshape(-1, 1), predkosc.reshape(-1, 1), masa_paliwa, ulamki * opoznienie_planowane,
+        grawitacja=grawitacja,
+        masa_pusta=masa_pusta,
+        cieg_maksymalny=cieg_maksymalny,
+        zuzycie_paliwa=zuzycie_paliwa,
+        predkosc_docelowa=predkosc_ladowania_maksymalna * config.NAPROWADZANIE_PREDKOSC_DOCELOWA,
+        liczba_krokow=liczba_krokow,
+        cos_pochylenia=cos_pochylenia
+    )
+    indeks = wybierz_kandydata(predkosc_przyziemienia, zuzycie,
+                               predkosc_ladowania_maksymalna * config.NAPROWADZANIE_PREDKOSC_DOPUSZCZALNA)
+    wybrany = indeks[:, None]
+    kanaly = (ulamki[indeks] * opoznienie_planowane,
+              np.take_along_axis(wysokosc_zaplonu, wybrany, axis=1)[:, 0],
+              np.take_along_axis(predkosc_przyziemienia, wybrany, axis=1)[:, 0],
+              np.take_along_axis(zuzycie, wybrany, axis=1)[:, 0])
+    for numer, kanal in enumerate(kanaly):
+        # Brak przyziemienia w horyzoncie (prędkość nieskończona) zapisywany jako NaN
+        warstwa[:, :, numer] = np.where(np.isfinite(kanal), kanal, np.nan).reshape(wysokosc.shape)
+    return warstwa
+
+
+class TablicaLadowania:
+    def __init__(self, osie, dane, metadane=None, sciezka=None):
+        self.osie = tuple(np.asarray(os_, dtype=float) for os_ in osie)
+        # Węzły jako krotki - bisect na krotce jest szybszy od searchsorted dla pojedynczej wartości
+        self._wezly = tuple(tuple(os_.tolist()) for os_ in self.osie)
+        self.dane = dane
+        self.metadane = metadane or {}
+        self.sciezka = sciezka
+
+    def interpoluj(self, wysokosc, predkosc_pionowa, masa_paliwa):
+        """Kanały tablicy w punkcie (interpolacja trójliniowa) albo None poza zasięgiem."""
+        indeksy = []
+        wagi = []
+        for wezly, wartosc in zip(self._wezly, (wysokosc, predkosc_pionowa, masa_paliwa)):
+            if not wezly[0] <= wartosc <= wezly[-1]:
+                return None
+            indeks = min(bisect.bisect_right(wezly, wartosc) - 1, len(wezly) - 2)
+            indeksy.append(indeks)
+            wagi.append((wartosc - wezly[indeks]) / (wezly[indeks + 1] - wezly[indeks]))
+        i, j, k = indeksy
+        kostka = self.dane[i:i + 2, j:j + 2, k:k + 2]
+        for waga in wagi:
+            kostka = kostka[0] + waga * (kostka[1] - kostka[0])
+        return kostka
+
+    def zapisz(self, sciezka):
+        """Zapisuje tablicę jako `sciezka`.npy i opis `sciezka`.json (atomowo)."""
+        katalog = os.path.dirname(sciezka)
+        if katalog:
+            os.makedirs(katalog, exist_ok=True)
+        sufiks = f".{os.getpid()}.tmp"
+        with open(sciezka + '.npy' + sufiks, 'wb') as plik:
+            np.save(plik, np.ascontiguousarray(self.dane))
+        os.replace(sciezka + '.npy' + sufiks, sciezka + '.npy')
+        # Opis zapisywany na końcu - jego obecność oznacza kompletną tablicę
+        with open(sciezka + '.json' + sufiks, 'w', encoding='utf-8') as plik:
+            json.dump({'osie': [os_.tolist() for os_ in self.osie], 'kanaly': list(KANALY),
+                       'metadane': self.metadane}, plik, ensure_ascii=False)
+        os.replace(sciezka + '.json' + sufiks, sciezka + '.json')
+        self.sciezka = sciezka
+        return sciezka
+
+    @classmethod
+    def wczytaj(cls, sciezka):
+        """Otwiera tablicę zapisaną przez `zapisz`; dane są mapowane z pliku, a nie kopiowane."""
+        with open(sciezka + '.json', encoding='utf-8') as plik:
+            opis = json.load(plik)
+        if opis['kanaly'] != list(KANALY):
+            raise ValueError(f"Nieobsługiwane kanały tablicy lądowania: {opis['kanaly']}")
+        dane = np.load(sciezka + '.npy', mmap_mode='r')
+        return cls(opis['osie'], dane, opis['metadane'], sciezka)
+
+
+def parametry_tablicy(scenariusz, zasieg_osi=None, liczba_wezlow=None, liczba_kandydatow=None,
+                      liczba_krokow=None):
+    """Wszystko, od czego zależy tablica - wspólne dla scenariuszy różniących się np. masą paliwa."""
+    return {
+        'grawitacja': scenariusz.grawitacja,
+        'masa_pusta': scenariusz.rakieta.masa_rakiety_pusta,
+        'cieg_maksymalny': scenariusz.rakieta.cieg_maksymalny,
+        'zuzycie_paliwa': scenariusz.rakieta.zuzycie_paliwa,
+        'predkosc_ladowania_maksymalna': scenariusz.predkosc_ladowania_maksymalna,
+        'zasieg_osi': list(zasieg_osi if zasieg_osi is not None else config.TABLICE_ZASIEG_OSI),
+        'liczba_wezlow': list(liczba_wezlow if liczba_wezlow is not None else config.TABLICE_LICZBA_WEZLOW),
+        'liczba_kandydatow': liczba_kandydatow if liczba_kandydatow is not None else config.TABLICE_LICZBA_KANDYDATOW,
+        'liczba_krokow': liczba_krokow if liczba_krokow is not None else config.TABLICE_LICZBA_KROKOW_PROPAGACJI,
+        'zapas_ciagu': config.NAPROWADZANIE_ZAPAS_CIAGU,
+        'predkosc_docelowa': config.NAPROWADZANIE_PREDKOSC_DOCELOWA,
+        'predkosc_dopuszczalna': config.NAPROWADZANIE_PREDKOSC_DOPUSZCZALNA,
+        'wersja': WERSJA_TABLIC
+    }
+
+
+def klucz_tablicy(parametry):
+    tresc = json.dumps(parametry, sort_keys=True)
+    return hashlib.sha256(tresc.encode('utf-8')).hexdigest()
+
+
+def zbuduj_tablice(parametry, liczba_procesow=None):
+    """Buduje tablicę w pamięci; warstwy masy paliwa są liczone równolegle."""
+    if liczba_procesow is None:
+        liczba_procesow = os.cpu_count() or 1
+    wysokosci, predkosci, paliwa = osie_tablicy(parametry['zasieg_osi'], parametry['liczba_wezlow'])
+    oblicz = functools.partial(
+        oblicz_warstwe, wysokosci=wysokosci, predkosci=predkosci,
+        grawitacja=parametry['grawitacja'],
+        masa_pusta=parametry['masa_pusta'],
+        cieg_maksymalny=parametry['cieg_maksymalny'],
+        zuzycie_paliwa=parametry['zuzycie_paliwa'],
+        predkosc_ladowania_maksymalna=parametry['predkosc_ladowania_maksymalna'],
+        liczba_kandydatow=parametry['liczba_kandydatow'],
+        liczba_krokow=parametry['liczba_krokow']
+    )
+    if liczba_procesow > 1:
+        with ProcessPoolExecutor(max_workers=min(liczba_procesow, len(paliwa))) as pula:
+            warstwy = list(pula.map(oblicz, paliwa.tolist()))
+    else:
+        warstwy = [oblicz(masa_paliwa) for masa_paliwa in paliwa.tolist()]
+    return TablicaLadowania((wysokosci, predkosci, paliwa), np.stack(warstwy, axis=2), parametry)
+
+
+@functools.lru_cache(maxsize=None)
+def _otworz_tablice(sciezka):
+    # Jedno mapowanie pliku na proces, niezależnie od liczby symulacji
+    return TablicaLadowania.wczytaj(sciezka)
+
+
+def sciezka_tablicy(scenariusz, katalog=None, **parametry_osi):
+    """Parametry tablicy scenariusza i ścieżka jej plików (bez rozszerzenia) w pamięci podręcznej."""
+    if katalog is None:
+        katalog = config.KATALOG_TABLIC_LADOWANIA
+    parametry = parametry_tablicy(scenariusz, **parametry_osi)
+    return parametry, os.path.join(katalog, f"{scenariusz.planeta}_{klucz_tablicy(parametry)[:16]}")
+
+
+def pobierz_tablice(scenariusz, katalog=None, **parametry_osi):
+    """
+    Otwiera tablicę dla planety i rakiety scenariusza z pamięci podręcznej
+    na dysku. Nie buduje jej - budowa należy do `przygotuj_tablice`
+    albo `python -m src.tablice_ladowania`. `parametry_osi` to zasieg_osi,
+    liczba_wezlow, liczba_kandydatow i liczba_krokow.
+    """
+    _, sciezka = sciezka_tablicy(scenariusz, katalog, **parametry_osi)
+    if not os.path.exists(sciezka + '.json'):
+        raise FileNotFoundError(
+            f"Brak tablicy lądowania {sciezka}.json - zbuduj ją przed uruchomieniem: "
+            f"python -m src.tablice_ladowania --planety {scenariusz.planeta}")
+    return _otworz_tablice(sciezka)
+
+
+def przygotuj_tablice(scenariusze, katalog=None, liczba_procesow=None, **parametry_osi):
+    """
+    Buduje brakujące tablice dla scenariuszy z naprowadzaniem tabelarycznym.
+    Wywoływana w procesie głównym przed rozesłaniem pracy, żeby procesy
+    robocze tylko otwierały gotowe pliki. Zwraca ścieżki zbudowanych tablic.
+    """
+    zbudowane = []
+    for scenariusz in scenariusze:
+        if scenariusz.naprowadzanie != 'tabelaryczne':
+            continue
+        parametry, sciezka = sciezka_tablicy(scenariusz, katalog, **parametry_osi)
+        if not os.path.exists(sciezka + '.json'):
+            zbuduj_tablice(parametry, liczba_procesow).zapisz(sciezka)
+            zbudowane.append(sciezka)
+    return zbudowane
+
+
+class AutopilotTabelaryczny(AutopilotPredykcyjny):
+    """
+    Autopilot predykcyjny, który profil hamowania odczytuje z tablicy
+    zamiast oceniać kandydatów. Zapłon następuje, gdy opóźnienie potrzebne
+    do przyziemienia z prędkością docelową osiągnie opóźnienie z tablicy.
+    """
+
+    def __init__(self, rakieta, nastawy=None, predkosc_ladowania_maksymalna=None, tablica=None):
+        super().__init__(rakieta, nastawy, predkosc_ladowania_maksymalna)
+        self.tablica = tablica
+        self.przewidywana_wysokosc_zaplonu = None
+
+    def _wybierz_profil(self, opoznienie_planowane):
+        rakieta = self.rakieta
+        wysokosc, predkosc = rakieta.pozycja_y, rakieta.predkosc_y
+        wartosci = self.tablica.interpoluj(wysokosc, predkosc, rakieta.masa_paliwa_aktualna)
+        if wartosci is None or math.isnan(wartosci[0]):
+            # Poza zasięgiem tablicy - ocena kandydatów jak w naprowadzaniu predykcyjnym
+            return super()._wybierz_profil(opoznienie_planowane)
+
+        opoznienie, wysokosc_zaplonu, predkosc_przyziemienia, zuzycie = wartosci.tolist()
+        self.ulamek_opoznienia = min(max(opoznienie / opoznienie_planowane, 0.01), 0.99)
+        self.przewidywana_wysokosc_zaplonu = wysokosc_zaplonu
+        self.przewidywana_predkosc_przyziemienia = predkosc_przyziemienia
+        self.przewidywane_zuzycie_paliwa = zuzycie
+        opoznienie_teraz = ((predkosc * predkosc - self.predkosc_docelowa ** 2)
+                            / (2 * max(wysokosc, WYSOKOSC_MINIMALNA_PROPAGACJI)))
+        return opoznienie_teraz >= opoznienie
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Budowa tablic optymalnego lądowania')
+    parser.add_argument('--planety', nargs='+', choices=list(config.PLANETY.keys()),
+                        default=list(config.PLANETY.keys()), help='Planety (domyślnie: wszystkie)')
+    parser.add_argument('--procesy', type=int, default=None, help='Liczba procesów (domyślnie: liczba rdzeni)')
+    parser.add_argument('--katalog', type=str, default=config.KATALOG_TABLIC_LADOWANIA,
+                        help=f'Katalog tablic (domyślnie: {config.KATALOG_TABLIC_LADOWANIA})')
+    argumenty = parser.parse_args()
+
+    for planeta in argumenty.planety:
+        start = time.perf_counter()
+        scenariusz = Scenariusz(planeta=planeta, naprowadzanie='tabelaryczne')
+        przygotuj_tablice([scenariusz], argumenty.katalog, argumenty.procesy)
+        tablica = pobierz_tablice(scenariusz, argumenty.katalog)
+        print(f"{planeta:<10} {tablica.sciezka}.npy  {tablica.dane.nbytes / 1024:.0f} KiB  "
+              f"{time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Ograniczona kolejka próbek stanu między wątkiem symulacji a interfejsem.
+
+KolejkaTelemetrii jest odbiornikiem próbek Symulacji (argument `odbiornik`):
+symulacja dopisuje próbki bez blokowania, a odbiorca co pewien czas zabiera
+wszystkie zebrane - np. proces roboczy kolejki zadań GUI przy każdym
+raporcie postępu (src.menedzer_zadan). Gdy kolejka jest pełna, najstarsza
+próbka jest odrzucana - wolny interfejs nie spowalnia symulacji.
+"""
+
+import threading
+from collections import deque
+
+from src import config
+
+
+class KolejkaTelemetrii:
+    def __init__(self, pojemnosc=None):
+        if pojemnosc is None:
+            pojemnosc = config.TELEMETRIA_POJEMNOSC_KOLEJKI
+        self._probki = deque(maxlen=pojemnosc)
+        self._blokada = threading.Lock()
+        self._zakonczenie = threading.Event()
+        self.liczba_odrzuconych = 0
+        self.wyniki = None
+
+    @property
+    def pojemnosc(self):
+        return self._probki.maxlen
+
+    def __call__(self, probka):
+        with self._blokada:
+            if len(self._probki) == self._probki.maxlen:
+                self.liczba_odrzuconych += 1
+            self._probki.append(probka)
+
+    def __len__(self):
+        return len(self._probki)
+
+    def oproznij(self):
+        """Zabiera i zwraca wszystkie próbki czekające w kolejce (najstarsze pierwsze)."""
+        with self._blokada:
+            probki = list(self._probki)
+            self._probki.clear()
+        return probki
+
+    def zakoncz(self, wyniki=None):
+        """Oznacza koniec przebiegu; wyniki (lub wyjątek) są dostępne w `wyniki`."""
+        self.wyniki = wyniki
+        self._zakonczenie.set()
+
+    @property
+    def czy_zakonczona(self):
+        return self._zakonczenie.is_set()
+
+    def czekaj_na_koniec(self, limit_czasu=None):
+        return self._zakonczenie.wait(limit_czasu)
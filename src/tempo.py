@@ -0,0 +1,52 @@
+"""
+Wiązanie czasu symulacji z czasem rzeczywistym (zegarem ściennym).
+
+ZegarTempa wyznacza chwilę zegara, w której powinien nastąpić dany moment
+symulacji: start + czas_symulacji / przyspieszenie. Każde oczekiwanie
+liczone jest od tego samego punktu odniesienia, więc spóźnienia pojedynczych
+uśpień się nie sumują (korekcja dryfu). Gdy symulacja nie nadąża o więcej
+niż `maksymalne_opoznienie`, punkt odniesienia jest przesuwany zamiast
+nadrabiania zaległości seriami kroków bez przerw.
+"""
+
+import time
+import asyncio
+
+from src import config
+
+
+class ZegarTempa:
+    def __init__(self, przyspieszenie=1.0, maksymalne_opoznienie=None, zegar=time.perf_counter):
+        if przyspieszenie <= 0:
+            raise ValueError(f"Przyspieszenie musi być dodatnie, otrzymano: {przyspieszenie}")
+        if maksymalne_opoznienie is None:
+            maksymalne_opoznienie = config.TEMPO_MAKSYMALNE_OPOZNIENIE_S
+        self.przyspieszenie = przyspieszenie
+        self.maksymalne_opoznienie = maksymalne_opoznienie
+        self._zegar = zegar
+        self.liczba_poslizgow = 0
+        self.start()
+
+    def start(self, czas_symulacji=0.0):
+        """Ustala punkt odniesienia: `czas_symulacji` odpowiada bieżącej chwili zegara."""
+        self._start_zegara = self._zegar()
+        self._start_symulacji = czas_symulacji
+
+    def pozostalo(self, czas_symulacji):
+        """Ile sekund zegara zostało do chwili przypisanej `czas_symulacji` (co najmniej 0)."""
+        termin = self._start_zegara + (czas_symulacji - self._start_symulacji) / self.przyspieszenie
+        teraz = self._zegar()
+        if teraz - termin > self.maksymalne_opoznienie:
+            self.liczba_poslizgow += 1
+            self.start(czas_symulacji)
+            return 0.0
+        return max(termin - teraz, 0.0)
+
+    def czekaj(self, czas_symulacji):
+        czas_oczekiwania = self.pozostalo(czas_symulacji)
+        if czas_oczekiwania > 0:
+            time.sleep(czas_oczekiwania)
+
+    async def czekaj_async(self, czas_symulacji):
+        # sleep(0) oddaje pętlę zdarzeń innym zadaniom także wtedy, gdy symulacja jest spóźniona
+        await asyncio.sleep(self.pozostalo(czas_symulacji))
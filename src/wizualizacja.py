@@ -1,27 +1,56 @@
-import matplotlib.pyplot as plt
+"""
+Wykresy wyników symulacji.
+
+matplotlib jest importowany dopiero przy pierwszym rysowaniu, więc import
+modułu (np. przez GUI czy main.py z --no-viz) nie kosztuje startu
+matplotlib. Długie linie są przed rysowaniem redukowane (src.probkowanie).
+RysownikWynikow rysuje bez okna (Agg) i używa ponownie jednej
+figury, a renderuj_wiele rozkłada rysowanie wielu przebiegów na procesy.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 from src import config
+from src.eksport import wczytaj_trajektorie
+from src.probkowanie import probkuj_linie, indeksy_probkowania
+from src.bufor_trajektorii import BuforTrajektorii, KOLUMNY_SUROWE
+
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _probkuj(ax, x, y):
+    # Około jednego przedziału na piksel szerokości osi
+    if not config.PROBKOWANIE_WYKRESOW:
+        return x, y
+    szerokosc = int(ax.get_window_extent().width)
+    return probkuj_linie(x, y, szerokosc, config.PROBKOWANIE_WYKRESOW)
 
 
 def ustaw_styl_wykresow():
+    import matplotlib.style
     try:
-        plt.style.use(config.STYL_WYKRESOW_MATPLOTLIB)
-    except:
-        plt.style.use('default')
+        matplotlib.style.use(config.STYL_WYKRESOW_MATPLOTLIB)
+    except (OSError, ValueError):
+        matplotlib.style.use('default')
 
 
 def wykres_trajektorii(historia_danych, ax=None):
     if ax is None:
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig, ax = _pyplot().subplots(figsize=(8, 8))
     
     pozycje_x = historia_danych['x']
     pozycje_y = historia_danych['y']
     
-    ax.plot(pozycje_x, pozycje_y, color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2, label='Trajektoria')
+    ax.plot(*_probkuj(ax, pozycje_x, pozycje_y), color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2, label='Trajektoria')
     ax.plot(pozycje_x[0], pozycje_y[0], 'go', markersize=10, label='Start')
     ax.plot(pozycje_x[-1], pozycje_y[-1], 'ro', markersize=10, label='Lądowanie')
     ax.axhline(y=0, color='brown', linewidth=3, label='Powierzchnia')
-    ax.fill_between([min(pozycje_x)-100, max(pozycje_x)+100], -50, 0, color='brown', alpha=0.3)
+    ax.axhspan(-50, 0, color='brown', alpha=0.3)
     
     ax.set_xlabel('Pozycja pozioma [m]', fontsize=12)
     ax.set_ylabel('Wysokość [m]', fontsize=12)
@@ -35,12 +64,12 @@ def wykres_trajektorii(historia_danych, ax=None):
 
 def wykres_wysokosci_w_czasie(historia_danych, ax=None):
     if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _pyplot().subplots(figsize=(10, 6))
     
     czas = historia_danych['czas']
     wysokosci = historia_danych['y']
     
-    ax.plot(czas, wysokosci, color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2)
+    ax.plot(*_probkuj(ax, czas, wysokosci), color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2)
     ax.axhline(y=0, color='red', linestyle='--', alpha=0.5, label='Powierzchnia')
     
     ax.set_xlabel('Czas [s]', fontsize=12)
@@ -54,16 +83,16 @@ def wykres_wysokosci_w_czasie(historia_danych, ax=None):
 
 def wykres_predkosci_w_czasie(historia_danych, ax=None):
     if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _pyplot().subplots(figsize=(10, 6))
     
     czas = historia_danych['czas']
     predkosc_pionowa = historia_danych['vy']
     predkosc_pozioma = historia_danych['vx']
     predkosc_calkowita = historia_danych['predkosc']
     
-    ax.plot(czas, predkosc_pionowa, label='Prędkość pionowa', linewidth=2)
-    ax.plot(czas, predkosc_pozioma, label='Prędkość pozioma', linewidth=2)
-    ax.plot(czas, predkosc_calkowita, label='Prędkość całkowita', linewidth=2, linestyle='--')
+    ax.plot(*_probkuj(ax, czas, predkosc_pionowa), label='Prędkość pionowa', linewidth=2)
+    ax.plot(*_probkuj(ax, czas, predkosc_pozioma), label='Prędkość pozioma', linewidth=2)
+    ax.plot(*_probkuj(ax, czas, predkosc_calkowita), label='Prędkość całkowita', linewidth=2, linestyle='--')
     ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
     ax.axhline(y=-config.PREDKOSC_LADOWANIA_MAKSYMALNA, color='red', linestyle='--', 
                alpha=0.5, label='Maks. bezpieczna prędkość')
@@ -89,14 +118,14 @@ def wykres_masa_czas(historia, ax=None):
         Obiekt Axes
     """
     if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _pyplot().subplots(figsize=(10, 6))
     
     czas = historia['czas']
     masa_calkowita = historia['masa_calkowita']
     masa_paliwa = historia['masa_paliwa']
     
-    ax.plot(czas, masa_calkowita, label='Masa całkowita', linewidth=2)
-    ax.plot(czas, masa_paliwa, label='Masa paliwa', 
+    ax.plot(*_probkuj(ax, czas, masa_calkowita), label='Masa całkowita', linewidth=2)
+    ax.plot(*_probkuj(ax, czas, masa_paliwa), label='Masa paliwa', 
             linewidth=2, color=config.KOLOR_PALIWA_WYKRES)
     
     ax.set_xlabel('Czas [s]', fontsize=12)
@@ -120,12 +149,12 @@ def wykres_cieg_czas(historia, ax=None):
         Obiekt Axes
     """
     if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _pyplot().subplots(figsize=(10, 6))
     
     czas = historia['czas']
     cieg = historia['cieg']
     
-    ax.plot(czas, cieg, color=config.KOLOR_CIAGU_WYKRES, linewidth=2)
+    ax.plot(*_probkuj(ax, czas, cieg), color=config.KOLOR_CIAGU_WYKRES, linewidth=2)
     ax.axhline(y=config.CIEG_MAKSYMALNY_SILNIKA, color='red', linestyle='--', 
                alpha=0.5, label='Maksymalny ciąg')
     
@@ -140,16 +169,16 @@ def wykres_cieg_czas(historia, ax=None):
 
 def wykres_energii_w_czasie(historia_danych, ax=None):
     if ax is None:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _pyplot().subplots(figsize=(10, 6))
     
     czas = historia_danych['czas']
     energia_kinetyczna = np.array(historia_danych['energia_kinetyczna'])
     energia_potencjalna = np.array(historia_danych['energia_potencjalna'])
     energia_calkowita = energia_kinetyczna + energia_potencjalna
     
-    ax.plot(czas, energia_kinetyczna / 1000, label='Energia kinetyczna', linewidth=2)
-    ax.plot(czas, energia_potencjalna / 1000, label='Energia potencjalna', linewidth=2)
-    ax.plot(czas, energia_calkowita / 1000, label='Energia całkowita', 
+    ax.plot(*_probkuj(ax, czas, energia_kinetyczna / 1000), label='Energia kinetyczna', linewidth=2)
+    ax.plot(*_probkuj(ax, czas, energia_potencjalna / 1000), label='Energia potencjalna', linewidth=2)
+    ax.plot(*_probkuj(ax, czas, energia_calkowita / 1000), label='Energia całkowita', 
             linewidth=2, linestyle='--', color='black')
     
     ax.set_xlabel('Czas [s]', fontsize=12)
@@ -161,32 +190,7 @@ def wykres_energii_w_czasie(historia_danych, ax=None):
     return ax
 
 
-def wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=False, nazwa_pliku='symulacja.png'):
-    ustaw_styl_wykresow()
-
-    
-    historia_danych = wyniki['historia']
-    
-    figura = plt.figure(figsize=config.ROZMIAR_WYKRESU_CALE)
-    
-    wykres1 = plt.subplot(3, 2, 1)
-    wykres_trajektorii(historia_danych, wykres1)
-    
-    wykres2 = plt.subplot(3, 2, 2)
-    wykres_wysokosci_w_czasie(historia_danych, wykres2)
-    
-    wykres3 = plt.subplot(3, 2, 3)
-    wykres_predkosci_w_czasie(historia_danych, wykres3)
-    
-    wykres4 = plt.subplot(3, 2, 4)
-    wykres_cieg_czas(historia_danych, wykres4)
-    
-    wykres5 = plt.subplot(3, 2, 5)
-    wykres_masa_czas(historia_danych, wykres5)
-    
-    wykres6 = plt.subplot(3, 2, 6)
-    wykres_energii_w_czasie(historia_danych, wykres6)
-    
+def _tytul_wynikow(wyniki):
     status_tekst = "SUKCES" if wyniki['sukces'] else "NIEPOWODZENIE"
     kolor_statusu = 'green' if wyniki['sukces'] else 'red'
     
@@ -194,21 +198,513 @@ def wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=False, nazwa_pliku='symulacj
     if 'planeta' in wyniki:
         informacja_o_planecie = f" na planecie {wyniki['planeta']['nazwa']} (g={wyniki['planeta']['grawitacja']:.2f} m/s²)"
     
-    figura.suptitle(f'Symulacja lądowania rakiety{informacja_o_planecie} - {status_tekst}\n{wyniki["komunikat"]}',
-                 fontsize=16, fontweight='bold', color=kolor_statusu)
+    return f'Symulacja lądowania rakiety{informacja_o_planecie} - {status_tekst}\n{wyniki["komunikat"]}', kolor_statusu
+
+
+def _serie_trajektorii(historia):
+    x, y = historia['x'], historia['y']
+    return [(x, y), (x[:1], y[:1]), (x[-1:], y[-1:])]
+
+
+def _serie_energii(historia):
+    energia_kinetyczna = np.asarray(historia['energia_kinetyczna']) / 1000
+    energia_potencjalna = np.asarray(historia['energia_potencjalna']) / 1000
+    czas = historia['czas']
+    return [(czas, energia_kinetyczna), (czas, energia_potencjalna),
+            (czas, energia_kinetyczna + energia_potencjalna)]
+
+
+# Panele figury wyników: funkcja rysująca i serie danych jej linii, w kolejności
+# rysowania (linie danych są rysowane przed liniami pomocniczymi)
+PANELE = [
+    (wykres_trajektorii, _serie_trajektorii),
+    (wykres_wysokosci_w_czasie, lambda h: [(h['czas'], h['y'])]),
+    (wykres_predkosci_w_czasie, lambda h: [(h['czas'], h['vy']), (h['czas'], h['vx']), (h['czas'], h['predkosc'])]),
+    (wykres_cieg_czas, lambda h: [(h['czas'], h['cieg'])]),
+    (wykres_masa_czas, lambda h: [(h['czas'], h['masa_calkowita']), (h['czas'], h['masa_paliwa'])]),
+    (wykres_energii_w_czasie, _serie_energii),
+]
+
+
+def _sciezka_wykresu(nazwa_pliku):
+    os.makedirs(config.KATALOG_DANYCH_WYJSCIOWYCH, exist_ok=True)
+    return os.path.join(config.KATALOG_DANYCH_WYJSCIOWYCH, nazwa_pliku)
+
+
+class RysownikWynikow:
+    """
+    Rysowanie wyników bez okna (backend Agg, bez pyplot). Figura i sześć osi
+    powstają raz; kolejne przebiegi tylko podmieniają dane linii, więc
+    seria tysięcy wykresów nie tworzy nowych figur.
+    """
+
+    def __init__(self, rozmiar=None, dpi=None):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        ustaw_styl_wykresow()
+        self.figura = Figure(figsize=rozmiar or config.ROZMIAR_WYKRESU_CALE)
+        FigureCanvasAgg(self.figura)
+        self.dpi = dpi or config.ROZDZIELCZOSC_WYKRESU_DPI
+        self.osie = [self.figura.add_subplot(3, 2, numer) for numer in range(1, len(PANELE) + 1)]
+        self.linie = None
+        self.tytul = None
+
+    def rysuj(self, wyniki):
+        historia = wyniki['historia']
+        if self.linie is None:
+            self.linie = []
+            for os_wykresu, (rysuj_panel, serie) in zip(self.osie, PANELE):
+                rysuj_panel(historia, os_wykresu)
+                self.linie.append(os_wykresu.lines[:len(serie(historia))])
+            self.tytul = self.figura.suptitle('', fontsize=16, fontweight='bold')
+            czy_uklad = True
+        else:
+            for os_wykresu, linie, (_, serie) in zip(self.osie, self.linie, PANELE):
+                for linia, (x, y) in zip(linie, serie(historia)):
+                    linia.set_data(*_probkuj(os_wykresu, x, y))
+                os_wykresu.relim()
+                os_wykresu.set_autoscale_on(True)
+                os_wykresu.autoscale_view()
+            self.osie[0].set_ylim(bottom=-10)
+            czy_uklad = False
+
+        tekst, kolor = _tytul_wynikow(wyniki)
+        self.tytul.set_text(tekst)
+        self.tytul.set_color(kolor)
+        if czy_uklad:
+            self.figura.tight_layout(rect=[0, 0, 1, 0.96])
+        return self.figura
+
+    def zapisz(self, sciezka_pliku):
+        self.figura.savefig(sciezka_pliku, dpi=self.dpi)
+        return sciezka_pliku
+
+    def renderuj(self, wyniki, sciezka_pliku):
+        self.rysuj(wyniki)
+        return self.zapisz(sciezka_pliku)
+
+    def zamknij(self):
+        self.figura.clear()
+        self.osie = []
+        self.linie = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *wyjatek):
+        self.zamknij()
+
+
+_rysownik_procesu = None
+
+
+def _renderuj_zadanie(zadanie, rysownik=None):
+    global _rysownik_procesu
+    zrodlo, sciezka_pliku = zadanie
+    if rysownik is None:
+        # Jeden rysownik na proces roboczy, używany dla wszystkich jego zadań
+        if _rysownik_procesu is None:
+            _rysownik_procesu = RysownikWynikow()
+        rysownik = _rysownik_procesu
+
+    if isinstance(zrodlo, (str, os.PathLike)):
+        with wczytaj_trajektorie(zrodlo) as trajektoria:
+            return rysownik.renderuj(trajektoria.wyniki(), sciezka_pliku)
+    return rysownik.renderuj(zrodlo, sciezka_pliku)
+
+
+def renderuj_wiele(zadania, liczba_procesow=None):
+    """
+    Rysuje wiele przebiegów do plików PNG. Zadanie to para (źródło, ścieżka
+    PNG), gdzie źródło to słownik wyników albo ścieżka pliku .traj/.npz
+    (src.eksport) - ścieżki są tańsze do przekazania procesom niż historia.
+    Zwraca listę ścieżek zapisanych wykresów.
+    """
+    zadania = list(zadania)
+    if liczba_procesow is None:
+        liczba_procesow = os.cpu_count() or 1
+
+    if liczba_procesow > 1 and len(zadania) > 1:
+        rozmiar_porcji = max(1, len(zadania) // (liczba_procesow * 4))
+        with ProcessPoolExecutor(max_workers=liczba_procesow) as pula:
+            return list(pula.map(_renderuj_zadanie, zadania, chunksize=rozmiar_porcji))
+
+    with RysownikWynikow() as rysownik:
+        return [_renderuj_zadanie(zadanie, rysownik) for zadanie in zadania]
+
+
+def wizualizuj_wyniki_symulacji(wyniki, czy_zapisac=False, nazwa_pliku='symulacja.png', czy_pokazac=True):
+    if not czy_pokazac:
+        # Bez okna - nie ładujemy pyplot ani backendu interaktywnego
+        if czy_zapisac:
+            with RysownikWynikow() as rysownik:
+                sciezka_pliku = rysownik.renderuj(wyniki, _sciezka_wykresu(nazwa_pliku))
+            print(f"Wykres zapisany do: {sciezka_pliku}")
+        return
+
+    plt = _pyplot()
+    ustaw_styl_wykresow()
+    
+    historia_danych = wyniki['historia']
+    
+    figura = plt.figure(figsize=config.ROZMIAR_WYKRESU_CALE)
+    
+    for numer, (rysuj_panel, _) in enumerate(PANELE, 1):
+        rysuj_panel(historia_danych, figura.add_subplot(3, 2, numer))
+    
+    tekst, kolor_statusu = _tytul_wynikow(wyniki)
+    figura.suptitle(tekst, fontsize=16, fontweight='bold', color=kolor_statusu)
     
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    figura.tight_layout(rect=[0, 0, 1, 0.96])
     
     if czy_zapisac:
-        import os
-        os.makedirs(config.KATALOG_DANYCH_WYJSCIOWYCH, exist_ok=True)
-        sciezka_pliku = os.path.join(config.KATALOG_DANYCH_WYJSCIOWYCH, nazwa_pliku)
-        plt.savefig(sciezka_pliku, dpi=config.ROZDZIELCZOSC_WYKRESU_DPI, bbox_inches='tight')
+        sciezka_pliku = _sciezka_wykresu(nazwa_pliku)
+        figura.savefig(sciezka_pliku, dpi=config.ROZDZIELCZOSC_WYKRESU_DPI, bbox_inches='tight')
         print(f"Wykres zapisany do: {sciezka_pliku}")
     
     plt.show()
+    plt.close(figura)
 
 
-def animacja_ladowania(historia_danych):
-    print("Animacja nie jest jeszcze zaimplementowana.")
-    pass
+class _LiniaPrzyrostowa:
+    """
+    Linia podglądu na żywo redukowana przyrostowo. Próbki są dzielone na
+    przedziały stałego rozmiaru; każdy pełny przedział jest redukowany raz,
+    a niepełna końcówka rysowana bez zmian. Całość jest przeliczana tylko
+    wtedy, gdy przedziałów jest za dużo na szerokość osi - rozmiar
+    przedziału rośnie wtedy dwukrotnie, więc koszt na próbkę jest stały.
+    """
+
+    def __init__(self, linia, os_wykresu, kanal_x, kanal_y):
+        self.linia = linia
+        self.os_wykresu = os_wykresu
+        self.kanal_x = kanal_x
+        self.kanal_y = kanal_y
+        self.resetuj()
+
+    def resetuj(self):
+        self.rozmiar_przedzialu = 1
+        self._indeksy = np.empty(0, dtype=np.int64)
+        self._liczba_zredukowanych = 0
+        self.linia.set_data([], [])
+
+    def odswiez(self, dane):
+        x, y = dane[self.kanal_x], dane[self.kanal_y]
+        metoda = config.PROBKOWANIE_WYKRESOW
+        if not metoda:
+            self.linia.set_data(x, y)
+            return
+
+        liczba_probek = len(x)
+        szerokosc = max(1, int(self.os_wykresu.get_window_extent().width))
+        if liczba_probek > 2 * szerokosc * self.rozmiar_przedzialu:
+            while liczba_probek > 2 * szerokosc * self.rozmiar_przedzialu:
+                self.rozmiar_przedzialu *= 2
+            self._indeksy = np.empty(0, dtype=np.int64)
+            self._liczba_zredukowanych = 0
+
+        poczatek = self._liczba_zredukowanych
+        liczba_przedzialow = (liczba_probek - poczatek) // self.rozmiar_przedzialu
+        if liczba_przedzialow:
+            koniec = poczatek + liczba_przedzialow * self.rozmiar_przedzialu
+            nowe = indeksy_probkowania(x[poczatek:koniec], y[poczatek:koniec], liczba_przedzialow, metoda)
+            self._indeksy = np.concatenate((self._indeksy, poczatek + nowe))
+            self._liczba_zredukowanych = koniec
+        indeksy = np.concatenate((self._indeksy, np.arange(self._liczba_zredukowanych, liczba_probek)))
+        self.linia.set_data(x[indeksy], y[indeksy])
+
+
+class WidokTelemetrii:
+    """
+    Wykresy podglądu na żywo (trajektoria, wysokość i prędkość w czasie)
+    dopisywane przyrostowo z próbek telemetrii. Próbki trafiają do
+    powiększanego bufora NumPy, a linie są redukowane przyrostowo
+    (_LiniaPrzyrostowa). Figura jest podawana z zewnątrz, np. osadzona
+    w oknie Tk przez FigureCanvasTkAgg.
+    """
+
+    KANALY = ('czas', 'x', 'y', 'vx', 'vy', 'masa_paliwa', 'cieg')
+
+    def __init__(self, figura):
+        self.figura = figura
+        self.os_trajektorii, self.os_wysokosci, self.os_predkosci = (
+            figura.add_subplot(3, 1, numer) for numer in (1, 2, 3)
+        )
+        self.linia_trajektorii, = self.os_trajektorii.plot([], [], color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2)
+        self.punkt_rakiety, = self.os_trajektorii.plot([], [], 'o', color=config.KOLOR_RAKIETY_WYKRES)
+        self.linia_wysokosci, = self.os_wysokosci.plot([], [], color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2)
+        self.linia_predkosci, = self.os_predkosci.plot([], [], label='Prędkość pionowa', linewidth=2)
+        self.os_trajektorii.axhline(y=0, color='brown', linewidth=3)
+        self.os_predkosci.axhline(y=-config.PREDKOSC_LADOWANIA_MAKSYMALNA, color='red', linestyle='--', alpha=0.5)
+
+        self.os_trajektorii.set_ylabel('Wysokość [m]')
+        self.os_trajektorii.set_xlabel('Pozycja pozioma [m]')
+        self.os_wysokosci.set_ylabel('Wysokość [m]')
+        self.os_predkosci.set_ylabel('vy [m/s]')
+        self.os_predkosci.set_xlabel('Czas [s]')
+        figura.tight_layout()
+        # Masa pusta i grawitacja są potrzebne tylko kolumnom pochodnym, których widok nie czyta
+        self.bufor = BuforTrajektorii(0.0, 0.0)
+        self.linie = (_LiniaPrzyrostowa(self.linia_trajektorii, self.os_trajektorii, 'x', 'y'),
+                      _LiniaPrzyrostowa(self.linia_wysokosci, self.os_wysokosci, 'czas', 'y'),
+                      _LiniaPrzyrostowa(self.linia_predkosci, self.os_predkosci, 'czas', 'vy'))
+        self.resetuj()
+
+    def resetuj(self):
+        self.bufor.wyczysc()
+        for linia in self.linie:
+            linia.resetuj()
+        self.punkt_rakiety.set_data([], [])
+
+    def __len__(self):
+        return len(self.bufor)
+
+    @property
+    def ostatnia_probka(self):
+        if not len(self.bufor):
+            return None
+        ostatni = self.bufor.dane[-1]
+        return {kanal: float(ostatni[kanal]) for kanal in self.KANALY}
+
+    def dodaj(self, probki):
+        """Dopisuje próbki i odświeża dane linii; zwraca True, jeśli coś się zmieniło."""
+        if not probki:
+            return False
+        self.bufor.dodaj_wiele(*([probka[kanal] for probka in probki] for kanal in KOLUMNY_SUROWE))
+
+        dane = self.bufor.dane
+        for linia in self.linie:
+            linia.odswiez(dane)
+        self.punkt_rakiety.set_data(dane['x'][-1:], dane['y'][-1:])
+        for os_wykresu in (self.os_trajektorii, self.os_wysokosci, self.os_predkosci):
+            os_wykresu.relim()
+            os_wykresu.autoscale_view()
+        return True
+
+
+def rysuj_porownanie(figura, przebiegi):
+    """
+    Porównanie przebiegów obok siebie na jednej figurze: wysokość, prędkość
+    pionowa i paliwo w czasie. `przebiegi` to lista par (etykieta, wyniki).
+    """
+    figura.clear()
+    osie = [figura.add_subplot(1, 3, numer) for numer in (1, 2, 3)]
+    kanaly = (('y', 'Wysokość [m]'), ('vy', 'Prędkość pionowa [m/s]'), ('masa_paliwa', 'Paliwo [kg]'))
+    for etykieta, wyniki in przebiegi:
+        historia = wyniki['historia']
+        for os_wykresu, (kanal, _) in zip(osie, kanaly):
+            os_wykresu.plot(*_probkuj(os_wykresu, historia['czas'], historia[kanal]), linewidth=2, label=etykieta)
+    for os_wykresu, (_, opis) in zip(osie, kanaly):
+        os_wykresu.set_xlabel('Czas [s]')
+        os_wykresu.set_ylabel(opis)
+        os_wykresu.grid(True, alpha=0.3)
+    osie[1].axhline(y=-config.PREDKOSC_LADOWANIA_MAKSYMALNA, color='red', linestyle='--', alpha=0.5)
+    if przebiegi:
+        osie[0].legend(fontsize=8)
+    figura.tight_layout()
+    return figura
+
+
+def klatki_animacji(historia_danych, klatki_na_sekunde=None, predkosc_odtwarzania=1.0):
+    """
+    Historia przepróbkowana do równych odstępów czasu klatek, tak by
+    odtwarzanie trwało (czas lotu / predkosc_odtwarzania) niezależnie od dt.
+    """
+    if klatki_na_sekunde is None:
+        klatki_na_sekunde = config.ANIMACJA_KLATKI_NA_SEKUNDE
+    czas = np.asarray(historia_danych['czas'], dtype=np.float64)
+    czas_klatek = np.arange(czas[0], czas[-1], predkosc_odtwarzania / klatki_na_sekunde)
+    czas_klatek = np.append(czas_klatek, czas[-1])
+    klatki = {klucz: np.interp(czas_klatek, czas, np.asarray(historia_danych[klucz], dtype=np.float64))
+              for klucz in ('x', 'y', 'vy', 'kat', 'cieg')}
+    klatki['czas'] = czas_klatek
+    return klatki
+
+
+class ScenaAnimacji:
+    """
+    Figura animacji lądowania. Tło (pełna trajektoria, powierzchnia, osie)
+    jest rysowane raz; w każdej klatce zmieniają się tylko artyści animowani:
+    ślad, rakieta nachylona o kąt `kat`, płomień o długości zależnej od ciągu
+    i opis stanu. Rakieta ma stały rozmiar w pikselach.
+    """
+
+    def __init__(self, klatki, figura, cieg_maksymalny=None):
+        from matplotlib.patches import Polygon
+        from matplotlib.transforms import IdentityTransform
+
+        self.klatki = klatki
+        self.figura = figura
+        self.cieg_maksymalny = cieg_maksymalny or config.CIEG_MAKSYMALNY_SILNIKA
+        self.ax = ax = figura.add_subplot(1, 1, 1)
+
+        x, y = klatki['x'], klatki['y']
+        margines_x = max(50.0, 0.1 * (x.max() - x.min()))
+        ax.set_xlim(x.min() - margines_x, x.max() + margines_x)
+        ax.set_ylim(-0.05 * max(y.max(), 10.0), 1.1 * max(y.max(), 10.0))
+        ax.plot(*_probkuj(ax, x, y), color=config.KOLOR_TRAJEKTORII_WYKRES, alpha=0.2, linewidth=1)
+        ax.axhspan(-1e9, 0, color='brown', alpha=0.3)
+        ax.axhline(y=0, color='brown', linewidth=3)
+        ax.set_xlabel('Pozycja pozioma [m]', fontsize=12)
+        ax.set_ylabel('Wysokość [m]', fontsize=12)
+        ax.set_title('Animacja lądowania', fontsize=14, fontweight='bold')
+
+        tozsamosc = IdentityTransform()
+        self.slad, = ax.plot([], [], color=config.KOLOR_TRAJEKTORII_WYKRES, linewidth=2, animated=True)
+        self.plomien = ax.add_patch(Polygon(np.zeros((3, 2)), closed=True, color=config.KOLOR_CIAGU_WYKRES,
+                                            transform=tozsamosc, animated=True))
+        self.rakieta = ax.add_patch(Polygon(np.zeros((5, 2)), closed=True, color=config.KOLOR_RAKIETY_WYKRES,
+                                            transform=tozsamosc, animated=True))
+        self.opis = ax.text(0.02, 0.97, '', transform=ax.transAxes, va='top', family='monospace',
+                            animated=True)
+        self.artysci = (self.slad, self.plomien, self.rakieta, self.opis)
+
+    def __len__(self):
+        return len(self.klatki['czas'])
+
+    def _wierzcholki(self, lokalne, srodek, kat):
+        # Oś rakiety (lokalne y) wzdłuż kierunku ciągu (sin kat, cos kat) w pikselach
+        cos_kata, sin_kata = np.cos(kat), np.sin(kat)
+        obrot = np.array([[cos_kata, -sin_kata], [sin_kata, cos_kata]])
+        return lokalne @ obrot + srodek
+
+    def aktualizuj(self, numer):
+        klatki = self.klatki
+        self.slad.set_data(klatki['x'][:numer + 1], klatki['y'][:numer + 1])
+
+        srodek = self.ax.transData.transform((klatki['x'][numer], klatki['y'][numer]))
+        dlugosc = config.ANIMACJA_DLUGOSC_RAKIETY * self.ax.bbox.height
+        szerokosc = 0.3 * dlugosc
+        kat = klatki['kat'][numer]
+        self.rakieta.set_xy(self._wierzcholki(np.array([
+            [-szerokosc / 2, -dlugosc / 2], [szerokosc / 2, -dlugosc / 2], [szerokosc / 2, dlugosc / 4],
+            [0.0, dlugosc / 2], [-szerokosc / 2, dlugosc / 4]
+        ]), srodek, kat))
+        udzial_ciagu = min(max(klatki['cieg'][numer] / self.cieg_maksymalny, 0.0), 1.0)
+        self.plomien.set_xy(self._wierzcholki(np.array([
+            [-szerokosc / 3, -dlugosc / 2], [szerokosc / 3, -dlugosc / 2],
+            [0.0, -dlugosc / 2 - 1.2 * dlugosc * udzial_ciagu]
+        ]), srodek, kat))
+        self.plomien.set_visible(udzial_ciagu > 0)
+
+        self.opis.set_text(f"t = {klatki['czas'][numer]:6.1f} s\n"
+                           f"h = {klatki['y'][numer]:7.1f} m\n"
+                           f"vy = {klatki['vy'][numer]:6.1f} m/s\n"
+                           f"ciąg = {klatki['cieg'][numer]:5.0f} N")
+        return self.artysci
+
+    def klatki_obrazu(self):
+        """
+        Generator klatek RGB (tablice uint8) dla eksportu: tło jest rysowane
+        raz i przywracane z bufora, a w klatce rysowani są tylko artyści animowani.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        plotno = FigureCanvasAgg(self.figura)
+        plotno.draw()
+        tlo = plotno.copy_from_bbox(self.figura.bbox)
+        for numer in range(len(self)):
+            plotno.restore_region(tlo)
+            for artysta in self.aktualizuj(numer):
+                self.figura.draw_artist(artysta)
+            yield np.asarray(plotno.buffer_rgba())[..., :3]
+
+
+def _zapisz_gif(klatki_obrazu, sciezka_pliku, klatki_na_sekunde):
+    """
+    Zapis GIF klatka po klatce: każda klatka trafia do pliku zaraz po
+    kwantyzacji, więc w pamięci jest tylko bieżąca klatka.
+    """
+    from PIL import Image, GifImagePlugin
+    from matplotlib.colors import to_rgb
+
+    czas_klatki = round(1000 / klatki_na_sekunde)
+    paleta = None
+    with open(sciezka_pliku, 'wb') as plik:
+        for klatka in klatki_obrazu:
+            if paleta is None:
+                # Jedna paleta dla wszystkich klatek: z pierwszej klatki i kolorów artystów animowanych
+                kolory = [to_rgb(kolor) for kolor in (config.KOLOR_RAKIETY_WYKRES, config.KOLOR_CIAGU_WYKRES,
+                                                      config.KOLOR_TRAJEKTORII_WYKRES)]
+                pasek = np.zeros((8, klatka.shape[1], 3), dtype=np.uint8)
+                for numer, kolor in enumerate(np.array(kolory) * 255):
+                    pasek[:, numer::len(kolory)] = kolor
+                wzorzec = np.concatenate([klatka, pasek])
+                paleta = Image.fromarray(wzorzec).quantize(colors=255, method=Image.Quantize.FASTOCTREE)
+                obraz = Image.fromarray(klatka).quantize(palette=paleta, dither=Image.Dither.NONE)
+                naglowek, _ = GifImagePlugin.getheader(obraz, info={'loop': 0, 'duration': czas_klatki,
+                                                                    'optimize': False})
+                plik.writelines(naglowek)
+            else:
+                obraz = Image.fromarray(klatka).quantize(palette=paleta, dither=Image.Dither.NONE)
+            plik.writelines(GifImagePlugin.getdata(obraz, duration=czas_klatki))
+        plik.write(b';')
+
+
+def _zapisz_wideo(klatki_obrazu, sciezka_pliku, klatki_na_sekunde):
+    import shutil
+    import subprocess
+    import matplotlib
+
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if ffmpeg is None:
+        raise RuntimeError("Eksport wideo wymaga programu ffmpeg (użyj rozszerzenia .gif, by zapisać bez niego)")
+
+    proces = None
+    try:
+        for klatka in klatki_obrazu:
+            # yuv420p wymaga parzystych wymiarów
+            klatka = klatka[:klatka.shape[0] // 2 * 2, :klatka.shape[1] // 2 * 2]
+            if proces is None:
+                proces = subprocess.Popen(
+                    [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                     '-s', f'{klatka.shape[1]}x{klatka.shape[0]}', '-r', str(klatki_na_sekunde), '-i', '-',
+                     '-pix_fmt', 'yuv420p', '-vcodec', 'libx264', sciezka_pliku],
+                    stdin=subprocess.PIPE
+                )
+            proces.stdin.write(np.ascontiguousarray(klatka).tobytes())
+    finally:
+        if proces is not None:
+            proces.stdin.close()
+            if proces.wait() != 0:
+                raise RuntimeError(f"ffmpeg zakończył się kodem {proces.returncode}")
+
+
+def animacja_ladowania(historia_danych, sciezka_pliku=None, klatki_na_sekunde=None, predkosc_odtwarzania=1.0,
+                       cieg_maksymalny=None):
+    """
+    Animacja lądowania. Bez `sciezka_pliku` otwiera okno z FuncAnimation
+    (z blittingiem) i zwraca animację. Ze ścieżką zapisuje animację bez okna
+    (.gif przez Pillow, inne rozszerzenia, np. .mp4, przez ffmpeg) i zwraca ścieżkę.
+    """
+    if klatki_na_sekunde is None:
+        klatki_na_sekunde = config.ANIMACJA_KLATKI_NA_SEKUNDE
+    klatki = klatki_animacji(historia_danych, klatki_na_sekunde, predkosc_odtwarzania)
+
+    if sciezka_pliku is not None:
+        from matplotlib.figure import Figure
+
+        ustaw_styl_wykresow()
+        figura = Figure(figsize=config.ROZMIAR_ANIMACJI_CALE, dpi=config.ROZDZIELCZOSC_ANIMACJI_DPI)
+        scena = ScenaAnimacji(klatki, figura, cieg_maksymalny)
+        katalog = os.path.dirname(sciezka_pliku)
+        if katalog:
+            os.makedirs(katalog, exist_ok=True)
+        if sciezka_pliku.lower().endswith('.gif'):
+            _zapisz_gif(scena.klatki_obrazu(), sciezka_pliku, klatki_na_sekunde)
+        else:
+            _zapisz_wideo(scena.klatki_obrazu(), sciezka_pliku, klatki_na_sekunde)
+        figura.clear()
+        return sciezka_pliku
+
+    from matplotlib.animation import FuncAnimation
+
+    plt = _pyplot()
+    ustaw_styl_wykresow()
+    figura = plt.figure(figsize=config.ROZMIAR_ANIMACJI_CALE)
+    scena = ScenaAnimacji(klatki, figura, cieg_maksymalny)
+    animacja = FuncAnimation(figura, scena.aktualizuj, frames=len(scena), init_func=lambda: scena.artysci,
+                             interval=1000 / klatki_na_sekunde, blit=True, repeat=False)
+    plt.show()
+    return animacja
@@ -0,0 +1,73 @@
+"""
+Testy jednostkowe dla kolumnowego bufora historii lotu.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bufor_trajektorii import BuforTrajektorii, KOLUMNY_HISTORII
+from src.rakieta import Rakieta
+from src.symulacja import Symulacja
+
+
+class TestBuforTrajektorii(unittest.TestCase):
+    """Testy zapisu i widoku historii."""
+
+    def test_powiekszanie(self):
+        """Bufor rośnie po przekroczeniu pojemności i zachowuje dane."""
+        bufor = BuforTrajektorii(masa_rakiety_pusta=1000, grawitacja=1.62, pojemnosc=2)
+        for i in range(5):
+            bufor.dodaj(i * 0.1, i, 100 - i, 0, -1, 500, 0, 0)
+
+        self.assertEqual(len(bufor), 5)
+        self.assertGreaterEqual(bufor.pojemnosc, 5)
+        np.testing.assert_allclose(bufor.kolumna('y'), [100, 99, 98, 97, 96])
+
+    def test_dodaj_wiele(self):
+        """Dopisanie wielu wierszy naraz z rozgłaszaniem wartości stałych."""
+        bufor = BuforTrajektorii(masa_rakiety_pusta=1000, grawitacja=1.62, pojemnosc=2)
+        bufor.dodaj(0.0, 0, 100, 0, -1, 500, 0, 0)
+        bufor.dodaj_wiele(np.arange(1, 6) * 0.1, 0, 100 - np.arange(1, 6), 0, -1, 500, 0, 0)
+
+        self.assertEqual(len(bufor), 6)
+        np.testing.assert_allclose(bufor.kolumna('y'), [100, 99, 98, 97, 96, 95])
+        np.testing.assert_allclose(bufor.kolumna('masa_paliwa'), 500)
+
+    def test_kolumny_pochodne(self):
+        """Kolumny pochodne odpowiadają Rakieta.pobierz_stan()."""
+        rakieta = Rakieta(pozycja_x=3, pozycja_y=120, predkosc_x=4, predkosc_y=-7,
+                          masa_paliwa_aktualna=321, grawitacja=3.71)
+        bufor = BuforTrajektorii(masa_rakiety_pusta=rakieta.masa_rakiety_pusta, grawitacja=3.71)
+        bufor.dodaj(0.0, rakieta.pozycja_x, rakieta.pozycja_y, rakieta.predkosc_x, rakieta.predkosc_y,
+                    rakieta.masa_paliwa_aktualna, rakieta.cieg_aktualny, rakieta.kat_nachylenia)
+
+        widok = bufor.widok()
+        for klucz, wartosc in rakieta.pobierz_stan().items():
+            self.assertAlmostEqual(widok[klucz][0], wartosc)
+
+    def test_widok_historii_symulacji(self):
+        """Historia symulacji ma dawne klucze i jednakową długość kolumn."""
+        wyniki = Symulacja().uruchom(czy_wyswietlac_postep=False)
+        historia = wyniki['historia']
+
+        self.assertEqual(list(historia.keys()), list(KOLUMNY_HISTORII))
+        dlugosci = {len(historia[klucz]) for klucz in historia}
+        self.assertEqual(len(dlugosci), 1)
+        self.assertEqual(historia['y'][-1], wyniki['stan_koncowy']['y'])
+
+    def test_float32(self):
+        """Historię można trzymać w pojedynczej precyzji."""
+        symulacja = Symulacja(typ_danych_historii=np.float32)
+        symulacja.uruchom(czy_wyswietlac_postep=False)
+        self.assertEqual(symulacja.historia_danych['x'].dtype, np.float32)
+        self.assertEqual(symulacja.historia_danych['energia_kinetyczna'].dtype, np.float64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Testy jednostkowe dla binarnego zapisu trajektorii.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bufor_trajektorii import KOLUMNY_HISTORII
+from src.eksport import wczytaj_trajektorie
+from src.symulacja import Symulacja
+from src import config
+
+
+class TestEksport(unittest.TestCase):
+    """Testy zapisu i odczytu w formatach npz, surowym i JSON."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.symulacja = Symulacja(krok_czasowy=0.1, czas_maksymalny=30)
+        cls.symulacja.uruchom(czy_wyswietlac_postep=False)
+        cls.wyniki = cls.symulacja.pobierz_wyniki()
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+        self.poprzedni_katalog = config.KATALOG_DANYCH_WYJSCIOWYCH
+        config.KATALOG_DANYCH_WYJSCIOWYCH = self.katalog.name
+
+    def tearDown(self):
+        config.KATALOG_DANYCH_WYJSCIOWYCH = self.poprzedni_katalog
+        self.katalog.cleanup()
+
+    def sprawdz_zgodnosc(self, trajektoria):
+        self.assertEqual(set(trajektoria), set(KOLUMNY_HISTORII))
+        for klucz in KOLUMNY_HISTORII:
+            np.testing.assert_array_equal(trajektoria[klucz], self.wyniki['historia'][klucz])
+        self.assertEqual(trajektoria.metadane['komunikat'], self.wyniki['komunikat'])
+        self.assertEqual(trajektoria.metadane['scenariusz']['planeta'], self.symulacja.scenariusz.planeta)
+
+    def test_npz(self):
+        """Zapis npz (z kompresją i bez) odtwarza historię i metadane."""
+        for czy_kompresowac in (False, True):
+            sciezka = self.symulacja.zapisz_do_pliku(f'lot_{czy_kompresowac}.npz', format='npz',
+                                                     czy_kompresowac=czy_kompresowac)
+            with wczytaj_trajektorie(sciezka) as trajektoria:
+                self.sprawdz_zgodnosc(trajektoria)
+
+    def test_surowy_memmap(self):
+        """Format surowy jest czytany przez np.memmap z wyrównanych kanałów."""
+        sciezka = self.symulacja.zapisz_do_pliku('lot.traj', format='surowy')
+        with wczytaj_trajektorie(sciezka) as trajektoria:
+            self.sprawdz_zgodnosc(trajektoria)
+            kanal = trajektoria['y']
+            self.assertIsInstance(kanal, np.memmap)
+            self.assertEqual(kanal.offset % 64, 0)
+            self.assertEqual(trajektoria.wyniki()['sukces'], self.wyniki['sukces'])
+
+    def test_pusta_historia(self):
+        """Zapis przebiegu bez próbek daje puste kanały."""
+        symulacja = Symulacja(krok_czasowy=0.1, czas_maksymalny=1)
+        symulacja.bufor_historii.wyczysc()
+        sciezka = symulacja.zapisz_do_pliku('pusty.traj', format='surowy')
+        with wczytaj_trajektorie(sciezka) as trajektoria:
+            self.assertEqual(len(trajektoria['czas']), 0)
+
+    def test_json_na_zadanie(self):
+        """JSON pozostaje dostępny jako format opcjonalny."""
+        sciezka = self.symulacja.zapisz_do_pliku(format='json')
+        self.assertTrue(sciezka.endswith('.json'))
+        with open(sciezka, encoding='utf-8') as plik:
+            dane = json.load(plik)
+        np.testing.assert_allclose(dane['historia']['y'], self.wyniki['historia']['y'])
+
+    def test_nieznany_format(self):
+        with self.assertRaises(ValueError):
+            self.symulacja.zapisz_do_pliku(format='csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
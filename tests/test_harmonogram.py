@@ -0,0 +1,89 @@
+"""
+Testy jednostkowe dla harmonogramu wielu częstotliwości (fizyka / sterowanie / opóźnienie).
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.symulacja_wsadowa import SymulacjaWsadowa
+from src.scenariusz import Scenariusz
+
+
+class LicznikAutopilota:
+    """Opakowanie autopilota zliczające wywołania i zapamiętujące krok czasowy."""
+
+    def __init__(self, autopilot):
+        self.autopilot = autopilot
+        self.liczba_wywolan = 0
+        self.kroki_czasowe = set()
+
+    def oblicz_sterowanie(self, krok_czasowy):
+        self.liczba_wywolan += 1
+        self.kroki_czasowe.add(krok_czasowy)
+        return self.autopilot.oblicz_sterowanie(krok_czasowy)
+
+
+class TestHarmonogram(unittest.TestCase):
+    """Testy rozdzielenia częstotliwości fizyki i sterowania."""
+
+    def test_autopilot_z_nizsza_czestotliwoscia(self):
+        """Fizyka co 1 ms, autopilot co 100 ms."""
+        symulacja = Symulacja(scenariusz=Scenariusz(krok_czasowy=0.001, okres_sterowania=0.1))
+        licznik = LicznikAutopilota(symulacja.autopilot)
+        symulacja.autopilot = licznik
+        for _ in range(1000):
+            symulacja.wykonaj_krok_symulacji()
+
+        self.assertEqual(licznik.liczba_wywolan, 10)
+        self.assertEqual(licznik.kroki_czasowe, {symulacja.okres_sterowania})
+
+    def test_domyslnie_sterowanie_w_kazdym_kroku(self):
+        symulacja = Symulacja(scenariusz=Scenariusz())
+        self.assertEqual((symulacja.kroki_na_sterowanie, symulacja.kroki_opoznienia), (1, 0))
+
+    def test_opoznienie_komendy(self):
+        """Komenda autopilota trafia do silnika dopiero po zadanym opóźnieniu."""
+        symulacja = Symulacja(scenariusz=Scenariusz(krok_czasowy=0.01, okres_sterowania=0.1,
+                                                    opoznienie_sterowania=0.05))
+        while symulacja.rakieta.cieg_aktualny == 0.0:
+            symulacja.wykonaj_krok_symulacji()
+        # Komenda z kroku 0 działa od kroku 5, czyli po wykonaniu kroków 0..5
+        self.assertEqual(symulacja.numer_kroku, 6)
+
+    def test_niepoprawny_okres(self):
+        with self.assertRaises(ValueError):
+            Symulacja(scenariusz=Scenariusz(krok_czasowy=0.1, okres_sterowania=0.25))
+        with self.assertRaises(ValueError):
+            Symulacja(scenariusz=Scenariusz(krok_czasowy=0.1, okres_sterowania=0.05))
+
+    def test_ladowanie_wysokiej_wiernosci(self):
+        """Lądowanie z fizyką 1 kHz i autopilotem 10 Hz kończy się sukcesem."""
+        scenariusz = Scenariusz(krok_czasowy=0.001, okres_sterowania=0.1, opoznienie_sterowania=0.02)
+        wyniki = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+        self.assertTrue(wyniki['sukces'], wyniki['komunikat'])
+
+    def test_zgodnosc_wsadowa(self):
+        """Ścieżka wsadowa stosuje ten sam harmonogram co skalarna."""
+        scenariusze = [
+            Scenariusz(planeta=planeta, krok_czasowy=0.02, okres_sterowania=0.1, opoznienie_sterowania=0.04)
+            for planeta in ('ksiezyc', 'mars')
+        ]
+        wsadowa = SymulacjaWsadowa.ze_scenariuszy(scenariusze)
+        wsadowa.uruchom()
+        for indeks, scenariusz in enumerate(scenariusze):
+            wyniki = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+            wynik_wsadowy = wsadowa.pobierz_wynik(indeks)
+            self.assertEqual(wyniki['komunikat'], wynik_wsadowy['komunikat'])
+            for klucz, wartosc in wynik_wsadowy['stan_koncowy'].items():
+                np.testing.assert_allclose(wyniki['stan_koncowy'][klucz], wartosc, rtol=1e-7, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Testy jednostkowe dla pomiarów czasu faz i profilowania symulacji.
+"""
+
+import unittest
+import sys
+import os
+import json
+import pickle
+import asyncio
+import tempfile
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.rakieta import Rakieta
+from src.instrumentacja import Instrumentacja, FAZY, formatuj_raport
+from src import eksport
+
+
+class TestInstrumentacja(unittest.TestCase):
+    """Testy raportu instrumentacji."""
+
+    def test_bez_instrumentacji_nic_nie_jest_podmieniane(self):
+        symulacja = Symulacja(scenariusz=Scenariusz())
+        wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+
+        self.assertNotIn('instrumentacja', wyniki)
+        self.assertIs(type(symulacja.rakieta), Rakieta)
+        self.assertNotIn('oblicz_sterowanie', vars(symulacja.autopilot))
+        self.assertNotIn('uruchom', vars(symulacja))
+
+    def test_rakieta_i_autopilot_nietkniete(self):
+        symulacja = Symulacja(scenariusz=Scenariusz(), instrumentacja=True)
+        symulacja.uruchom(czy_wyswietlac_postep=False)
+
+        self.assertIs(type(symulacja.rakieta), Rakieta)
+        self.assertNotIn('oblicz_sterowanie', vars(symulacja.autopilot))
+        kopia = pickle.loads(pickle.dumps(symulacja.rakieta))
+        self.assertEqual(kopia.pobierz_stan(), symulacja.rakieta.pobierz_stan())
+
+    def test_czasy_faz(self):
+        oczekiwane = Symulacja(scenariusz=Scenariusz()).uruchom(czy_wyswietlac_postep=False)
+        symulacja = Symulacja(scenariusz=Scenariusz(), instrumentacja=True)
+        wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+        raport = wyniki['instrumentacja']
+
+        self.assertEqual(wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+        self.assertEqual(set(raport['fazy']), set(FAZY))
+        # Każdy krok pętli (po przewinięciu lotu swobodnego) to jedno wywołanie fizyki i sprawdzenia warunków
+        self.assertEqual(raport['fazy']['fizyka']['wywolania'], raport['fazy']['warunki_zakonczenia']['wywolania'])
+        self.assertGreater(raport['fazy']['sterowanie']['wywolania'], 0)
+        self.assertEqual(raport['fazy']['zapis_stanu']['wywolania'], len(wyniki['historia']['czas']))
+        self.assertLessEqual(sum(faza['czas_s'] for faza in raport['fazy'].values()), raport['czas_przebiegu_s'])
+        self.assertNotIn('profil', raport)
+        self.assertNotIn('pamiec', raport)
+        # Raport pobrany później zawiera te same dane
+        self.assertEqual(symulacja.pobierz_wyniki()['instrumentacja'], raport)
+
+    def test_profil_i_pamiec(self):
+        instrumentacja = Instrumentacja(czy_profilowac=True, czy_sledzic_pamiec=True, liczba_pozycji=8)
+        wyniki = Symulacja(scenariusz=Scenariusz(), instrumentacja=instrumentacja).uruchom(czy_wyswietlac_postep=False)
+        raport = wyniki['instrumentacja']
+
+        self.assertEqual(len(raport['profil']), 8)
+        self.assertTrue(any('aktualizuj' in pozycja['funkcja'] for pozycja in raport['profil']))
+        self.assertGreater(raport['pamiec']['szczyt_b'], 0)
+        self.assertIn('Najdroższe funkcje', formatuj_raport(raport))
+        json.dumps(raport)
+
+    def test_przebieg_async(self):
+        oczekiwane = Symulacja(scenariusz=Scenariusz()).uruchom(czy_wyswietlac_postep=False)
+        instrumentacja = Instrumentacja(czy_profilowac=True)
+        symulacja = Symulacja(scenariusz=Scenariusz(), instrumentacja=instrumentacja)
+        wyniki = asyncio.run(symulacja.uruchom_async(przyspieszenie=1e6))
+        raport = wyniki['instrumentacja']
+
+        self.assertEqual(wyniki['sukces'], oczekiwane['sukces'])
+        self.assertGreater(raport['czas_przebiegu_s'], 0.0)
+        self.assertGreater(raport['fazy']['fizyka']['wywolania'], 0)
+        self.assertTrue(any('aktualizuj' in pozycja['funkcja'] for pozycja in raport['profil']))
+
+    def test_zapis_wynikow_z_raportem(self):
+        symulacja = Symulacja(scenariusz=Scenariusz(), instrumentacja=True)
+        symulacja.uruchom(czy_wyswietlac_postep=False)
+        with tempfile.TemporaryDirectory() as katalog:
+            sciezka = os.path.join(katalog, 'przebieg.npz')
+            eksport.zapisz_npz(sciezka, symulacja.pobierz_wyniki())
+            with eksport.wczytaj_trajektorie(sciezka) as trajektoria:
+                self.assertIn('fizyka', trajektoria.metadane['instrumentacja']['fazy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
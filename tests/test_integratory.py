@@ -0,0 +1,123 @@
+"""
+Testy jednostkowe dla wymiennych schematów całkowania.
+"""
+
+import unittest
+import sys
+import os
+import math
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rakieta import Rakieta
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src.polityka_zapisu import ZapisTylkoKoncowy
+from src.integratory import (IntegratorEuleraPolniejawny, IntegratorRK4,
+                             IntegratorDormandaPrince, utworz_integrator)
+
+
+def rakieta_z_ciagiem(integrator, cieg=3000.0):
+    rakieta = Rakieta(pozycja_y=1000.0, predkosc_y=-20.0, masa_rakiety_pusta=1000.0, masa_paliwa_aktualna=500.0,
+                      cieg_maksymalny=4000.0, zuzycie_paliwa=5.0, grawitacja=1.62,
+                      integrator=integrator)
+    rakieta.cieg_aktualny = cieg
+    return rakieta
+
+
+def rozwiazanie_dokladne(czas, cieg=3000.0):
+    """Pionowy lot ze stałym ciągiem i liniowo malejącą masą (równanie Ciołkowskiego)."""
+    masa_poczatkowa = 1500.0
+    tempo = cieg / 4000.0 * 5.0
+    predkosc_wylotowa = cieg / tempo
+    masa = masa_poczatkowa - tempo * czas
+    vy = -20.0 + predkosc_wylotowa * math.log(masa_poczatkowa / masa) - 1.62 * czas
+    y = (1000.0 - 20.0 * czas - 0.5 * 1.62 * czas**2
+         + predkosc_wylotowa * (czas - masa / tempo * math.log(masa_poczatkowa / masa)))
+    return y, vy
+
+
+class TestIntegratory(unittest.TestCase):
+    """Testy dokładności i kosztu integratorów."""
+
+    def test_fabryka(self):
+        self.assertIsInstance(utworz_integrator('euler'), IntegratorEuleraPolniejawny)
+        self.assertIsInstance(utworz_integrator('rk4'), IntegratorRK4)
+        self.assertIsInstance(utworz_integrator('dopri45'), IntegratorDormandaPrince)
+        with self.assertRaises(ValueError):
+            utworz_integrator('nieznany')
+
+    def test_rzad_dokladnosci(self):
+        """RK4 i Dormand-Prince są znacznie dokładniejsze od Eulera przy tym samym kroku."""
+        y_dokladne, vy_dokladne = rozwiazanie_dokladne(10.0)
+        bledy = {}
+        for nazwa in ('euler', 'rk4', 'dopri45'):
+            rakieta = rakieta_z_ciagiem(nazwa)
+            for _ in range(10):
+                rakieta.aktualizuj(1.0)
+            bledy[nazwa] = abs(rakieta.pozycja_y - y_dokladne) + abs(rakieta.predkosc_y - vy_dokladne)
+
+        self.assertLess(bledy['rk4'], 1e-6)
+        self.assertLess(bledy['dopri45'], 1e-4)
+        self.assertGreater(bledy['euler'], 1.0)
+
+    def test_mniej_obliczen_niz_rk4_przy_tym_samym_bledzie(self):
+        """Krok wewnętrzny obejmuje wiele kroków fizyki w okresie sterowania - ta sama dokładność taniej."""
+        scenariusz = Scenariusz(krok_czasowy=0.01, okres_sterowania=0.1)
+
+        def ladowanie(integrator):
+            symulacja = Symulacja(scenariusz=scenariusz, polityka_zapisu=ZapisTylkoKoncowy())
+            symulacja.rakieta.integrator = integrator
+            wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+            self.assertTrue(wyniki['sukces'])
+            return wyniki['stan_koncowy']['vy'], integrator.liczba_wywolan
+
+        wzorzec, _ = ladowanie(IntegratorDormandaPrince(1e-14, 1e-14))
+        predkosc_rk4, obliczenia_rk4 = ladowanie(IntegratorRK4())
+        predkosc_dopri, obliczenia_dopri = ladowanie(IntegratorDormandaPrince(1e-13, 1e-13))
+
+        self.assertLess(abs(predkosc_rk4 - wzorzec), 1e-10)
+        self.assertLess(abs(predkosc_dopri - wzorzec), 1e-10)
+        self.assertLess(3 * obliczenia_dopri, obliczenia_rk4)
+
+    def test_interpolacja_miedzy_krokami_wewnetrznymi(self):
+        """Przy stałym ciągu kroki fizyki są odczytywane z interpolacji, bez nowych obliczeń."""
+        integrator = IntegratorDormandaPrince()
+        rakieta = rakieta_z_ciagiem(integrator)
+        for _ in range(100):
+            rakieta.aktualizuj(0.01)
+        y_dokladne, vy_dokladne = rozwiazanie_dokladne(1.0)
+
+        self.assertGreater(integrator.krok_wewnetrzny, 0.1)
+        self.assertLess(integrator.liczba_wywolan, 50)
+        self.assertAlmostEqual(rakieta.pozycja_y, y_dokladne, places=6)
+        self.assertAlmostEqual(rakieta.predkosc_y, vy_dokladne, places=6)
+
+    def test_przewidywany_koniec_odcinka_po_powtorzonym_kroku(self):
+        """Powtórzenie kroku z cofniętego stanu (szukanie zdarzenia) nie jest brane za koniec odcinka."""
+        integrator = IntegratorDormandaPrince()
+        rakieta = rakieta_z_ciagiem(integrator)
+        for numer in range(9):
+            if numer % 3 == 0:
+                rakieta.cieg_aktualny = 3000.0 if rakieta.cieg_aktualny != 3000.0 else 2500.0
+            rakieta.aktualizuj(0.01)
+        self.assertAlmostEqual(integrator._dlugosc_odcinka, 0.03)
+
+        stan = rakieta.migawka()
+        rakieta.aktualizuj(0.01)
+        rakieta.przywroc(stan)
+        rakieta.aktualizuj(0.005)
+
+        self.assertIsNone(integrator._dlugosc_odcinka)
+
+    def test_ladowanie_z_roznymi_integratorami(self):
+        """Pełna symulacja z autopilotem kończy się lądowaniem dla każdego integratora."""
+        for nazwa in ('euler', 'rk4', 'dopri45'):
+            wyniki = Symulacja(scenariusz=Scenariusz(integrator=nazwa)).uruchom(czy_wyswietlac_postep=False)
+            self.assertTrue(wyniki['sukces'], nazwa)
+            self.assertEqual(wyniki['parametry']['integrator'], nazwa)
+
+
+if __name__ == '__main__':
+    unittest.main()
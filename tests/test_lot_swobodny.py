@@ -0,0 +1,91 @@
+"""
+Testy jednostkowe dla przewijania lotu swobodnego w postaci zamkniętej.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.scenariusz import Scenariusz
+from src.polityka_zapisu import ZapisCoNKrokow, ZapisCoInterwalCzasu, ZapisTylkoKoncowy, ZapisAdaptacyjny
+
+
+def uruchom_pare(scenariusz, utworz_polityke):
+    wyniki = []
+    for czy_przewijac in (False, True):
+        symulacja = Symulacja(scenariusz=scenariusz, polityka_zapisu=utworz_polityke(),
+                              czy_przewijac_lot_swobodny=czy_przewijac)
+        wyniki.append(symulacja.uruchom(czy_wyswietlac_postep=False))
+    return wyniki
+
+
+class TestLotSwobodny(unittest.TestCase):
+    """Przewijanie daje ten sam wynik i te same próbki historii co krok po kroku."""
+
+    def porownaj(self, krokowo, przewiniete):
+        self.assertEqual(krokowo['komunikat'], przewiniete['komunikat'])
+        self.assertEqual(len(krokowo['historia']['czas']), len(przewiniete['historia']['czas']))
+        for klucz in ('czas', 'x', 'y', 'vx', 'vy'):
+            np.testing.assert_allclose(krokowo['historia'][klucz], przewiniete['historia'][klucz], atol=1e-9)
+        for klucz, wartosc in krokowo['stan_koncowy'].items():
+            self.assertAlmostEqual(wartosc, przewiniete['stan_koncowy'][klucz], places=6)
+
+    def test_bez_autopilota(self):
+        for integrator in ('euler', 'rk4'):
+            scenariusz = Scenariusz(czy_autopilot_wlaczony=False, integrator=integrator, krok_czasowy=0.01)
+            for utworz_polityke in (ZapisCoNKrokow, lambda: ZapisCoNKrokow(7),
+                                    lambda: ZapisCoInterwalCzasu(0.5), ZapisTylkoKoncowy):
+                self.porownaj(*uruchom_pare(scenariusz, utworz_polityke))
+
+    def test_wyjscie_ze_strefy(self):
+        scenariusz = Scenariusz(czy_autopilot_wlaczony=False, wysokosc_startowa=100.0,
+                                predkosc_pionowa_startowa=30.0)
+        self.porownaj(*uruchom_pare(scenariusz, ZapisCoNKrokow))
+
+    def test_koniec_czasu(self):
+        scenariusz = Scenariusz(czy_autopilot_wlaczony=False, czas_maksymalny=5.0)
+        self.porownaj(*uruchom_pare(scenariusz, lambda: ZapisCoInterwalCzasu(1.0)))
+
+    def test_stala_liczba_krokow_petli(self):
+        """Lot bez autopilota to kilka wywołań kroku niezależnie od dt."""
+        scenariusz = Scenariusz(czy_autopilot_wlaczony=False, krok_czasowy=0.0001)
+        symulacja = Symulacja(scenariusz=scenariusz, polityka_zapisu=ZapisTylkoKoncowy())
+        liczba_wywolan = 0
+        while symulacja.wykonaj_krok_symulacji():
+            liczba_wywolan += 1
+        self.assertLess(liczba_wywolan, 5)
+        self.assertGreater(symulacja.numer_kroku, 100000)
+
+    def test_krotkie_przerwy_bez_proby_przewijania(self):
+        """Gdy autopilot budzi się częściej niż co minimalny odcinek, lot idzie krok po kroku."""
+        scenariusz = Scenariusz(krok_czasowy=0.1, okres_sterowania=0.5)
+        symulacja = Symulacja(scenariusz=scenariusz)
+        liczba_prob = 0
+        szukaj_zdarzenia = symulacja._krok_zdarzenia_lotu_swobodnego
+
+        def zlicz(liczba_krokow):
+            nonlocal liczba_prob
+            liczba_prob += 1
+            return szukaj_zdarzenia(liczba_krokow)
+
+        symulacja._krok_zdarzenia_lotu_swobodnego = zlicz
+        wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+
+        self.assertEqual(liczba_prob, 0)
+        self.porownaj(*uruchom_pare(scenariusz, ZapisCoNKrokow))
+        self.assertTrue(wyniki['sukces'])
+
+    def test_polityka_nieprzewidywalna(self):
+        """Polityka adaptacyjna wyłącza przewijanie, wynik pozostaje ten sam."""
+        scenariusz = Scenariusz(czy_autopilot_wlaczony=False)
+        self.porownaj(*uruchom_pare(scenariusz, ZapisAdaptacyjny))
+
+
+if __name__ == '__main__':
+    unittest.main()
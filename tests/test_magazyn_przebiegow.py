@@ -0,0 +1,72 @@
+"""
+Testy jednostkowe dla magazynu przebiegów (SQLite + pliki trajektorii).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.magazyn_przebiegow import MagazynPrzebiegow
+from src.monte_carlo import uruchom_monte_carlo
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+
+
+class TestMagazynPrzebiegow(unittest.TestCase):
+    """Testy zapisu, wyszukiwania i odczytu trajektorii."""
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+        self.magazyn = MagazynPrzebiegow(self.katalog.name)
+
+    def tearDown(self):
+        self.magazyn.zamknij()
+        self.katalog.cleanup()
+
+    def test_zapis_przebiegu_z_trajektoria(self):
+        """Przebieg trafia do tabeli, a trajektoria do pliku .traj."""
+        symulacja = Symulacja(scenariusz=Scenariusz(planeta='mars', krok_czasowy=0.1, czas_maksymalny=60))
+        wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+        identyfikatory = {symulacja.zapisz_do_magazynu(self.magazyn) for _ in range(2)}
+
+        self.assertEqual(len(identyfikatory), 2)
+        self.assertEqual(len(self.magazyn), 2)
+        wiersz = self.magazyn.pobierz(identyfikatory.pop())
+        self.assertEqual(wiersz['planeta'], 'mars')
+        self.assertEqual(wiersz['komunikat'], wyniki['komunikat'])
+        self.assertAlmostEqual(wiersz['predkosc_ladowania'], wyniki['stan_koncowy']['vy'])
+
+        with self.magazyn.wczytaj_trajektorie(wiersz['identyfikator']) as trajektoria:
+            np.testing.assert_array_equal(trajektoria['y'], wyniki['historia']['y'])
+            self.assertEqual(trajektoria.metadane['scenariusz']['planeta'], 'mars')
+
+    def test_monte_carlo_do_magazynu(self):
+        """Monte Carlo dopisuje hurtowo wszystkie przebiegi; zapytania filtrują wyniki."""
+        wyniki = uruchom_monte_carlo(12, ziarno=3, planety=['ksiezyc', 'mars'], liczba_procesow=1,
+                                     rozmiar_porcji=5, scenariusz_bazowy=Scenariusz(krok_czasowy=0.1),
+                                     magazyn=self.magazyn)
+
+        self.assertEqual(len(self.magazyn), 12)
+        porazki = self.magazyn.znajdz(sukces=False, sortuj='indeks')
+        self.assertEqual([wiersz['indeks'] for wiersz in porazki], wyniki['nieudane_ziarna'])
+        self.assertTrue(all(wiersz['trajektoria'] is None for wiersz in porazki))
+
+        szybkie = self.magazyn.znajdz(planeta='mars', warunek='predkosc_ladowania < ?', parametry=(-5,))
+        self.assertTrue(all(w['planeta'] == 'mars' and w['predkosc_ladowania'] < -5 for w in szybkie))
+        self.assertEqual(len(self.magazyn.znajdz(limit=4)), 4)
+
+    def test_indeksy_uzyte_w_zapytaniu(self):
+        plan = self.magazyn.polaczenie.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM przebiegi WHERE planeta = ? AND sukces = ?', ('mars', 0)
+        ).fetchall()
+        self.assertIn('przebiegi_planeta_sukces', ' '.join(str(tuple(w)) for w in plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
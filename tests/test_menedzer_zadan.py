@@ -0,0 +1,103 @@
+"""
+Testy jednostkowe dla kolejki zadań w puli procesów.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.menedzer_zadan import MenedzerZadan, ZAKONCZONE, ANULOWANE, WSTRZYMANE, TRWA
+from src import config
+
+
+def czekaj(menedzer, warunek, limit_czasu=60.0):
+    koniec = time.monotonic() + limit_czasu
+    while not warunek():
+        if time.monotonic() > koniec:
+            raise AssertionError("Przekroczono czas oczekiwania na zadania")
+        menedzer.odbierz_postep()
+        time.sleep(0.01)
+
+
+class TestMenedzerZadan(unittest.TestCase):
+    """Testy wykonywania, wstrzymywania i anulowania zadań."""
+
+    def setUp(self):
+        self.menedzer = MenedzerZadan(liczba_procesow=2)
+
+    def tearDown(self):
+        self.menedzer.zamknij()
+
+    def test_wyniki_jak_w_procesie_glownym(self):
+        scenariusze = [Scenariusz(planeta=planeta) for planeta in ('ziemia', 'mars', 'ksiezyc')]
+        identyfikatory = [self.menedzer.dodaj(scenariusz) for scenariusz in scenariusze]
+        czekaj(self.menedzer, self.menedzer.czy_wszystkie_zakonczone)
+
+        for identyfikator, scenariusz in zip(identyfikatory, scenariusze):
+            zadanie = self.menedzer.zadania[identyfikator]
+            oczekiwane = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+            self.assertEqual(zadanie.stan, ZAKONCZONE)
+            self.assertEqual(zadanie.postep, 1.0)
+            self.assertEqual(zadanie.wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+            self.assertEqual(zadanie.probki[-1]['y'], oczekiwane['stan_koncowy']['y'])
+            # Próbka z każdego kroku, a nie tylko z chwil sprawdzania flagi
+            self.assertEqual([probka['czas'] for probka in zadanie.probki], list(oczekiwane['historia']['czas']))
+
+    def test_ograniczona_liczba_probek(self):
+        poprzednia = config.ZADANIA_POJEMNOSC_PROBEK
+        config.ZADANIA_POJEMNOSC_PROBEK = 50
+        try:
+            identyfikator = self.menedzer.dodaj(Scenariusz())
+        finally:
+            config.ZADANIA_POJEMNOSC_PROBEK = poprzednia
+        zadanie = self.menedzer.zadania[identyfikator]
+        czekaj(self.menedzer, self.menedzer.czy_wszystkie_zakonczone)
+
+        czasy = list(zadanie.wyniki['historia']['czas'])
+        self.assertEqual(zadanie.liczba_probek, len(czasy))
+        self.assertEqual(len(zadanie.probki), 50)
+        self.assertEqual([probka['czas'] for probka in zadanie.probki_od(0)], czasy[-50:])
+        self.assertEqual([probka['czas'] for probka in zadanie.probki_od(len(czasy) - 10)], czasy[-10:])
+        self.assertEqual(zadanie.probki_od(len(czasy)), [])
+
+    def test_wstrzymanie_i_wznowienie(self):
+        identyfikator = self.menedzer.dodaj(Scenariusz(krok_czasowy=0.0002))
+        zadanie = self.menedzer.zadania[identyfikator]
+        czekaj(self.menedzer, lambda: zadanie.stan == TRWA)
+
+        self.menedzer.wstrzymaj(identyfikator)
+        time.sleep(0.3)
+        self.menedzer.odbierz_postep()
+        postep = zadanie.postep
+        time.sleep(0.3)
+        self.menedzer.odbierz_postep()
+        self.assertEqual(zadanie.stan, WSTRZYMANE)
+        self.assertEqual(zadanie.postep, postep)
+
+        self.menedzer.wznow(identyfikator)
+        czekaj(self.menedzer, lambda: zadanie.czy_zakonczone)
+        self.assertEqual(zadanie.stan, ZAKONCZONE)
+        self.assertTrue(zadanie.wyniki['sukces'])
+
+    def test_anulowanie(self):
+        """Anulowane jest zarówno zadanie uruchomione, jak i czekające w kolejce puli."""
+        identyfikatory = [self.menedzer.dodaj(Scenariusz(krok_czasowy=0.0002)) for _ in range(3)]
+        czekaj(self.menedzer, lambda: self.menedzer.zadania[identyfikatory[0]].stan == TRWA)
+
+        for identyfikator in identyfikatory:
+            self.menedzer.anuluj(identyfikator)
+        czekaj(self.menedzer, self.menedzer.czy_wszystkie_zakonczone)
+
+        for identyfikator in identyfikatory:
+            self.assertEqual(self.menedzer.zadania[identyfikator].stan, ANULOWANE)
+            self.assertIsNone(self.menedzer.zadania[identyfikator].wyniki)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Testy jednostkowe dla analizy Monte Carlo.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.monte_carlo import uruchom_monte_carlo, wykonaj_przebieg, losuj_scenariusz
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Testy powtarzalności i agregacji wyników."""
+
+    def test_powtarzalnosc_niezalezna_od_porcji(self):
+        """Wynik nie zależy od rozmiaru porcji pracy."""
+        wyniki_1 = uruchom_monte_carlo(12, ziarno=5, liczba_procesow=1, rozmiar_porcji=12)
+        wyniki_2 = uruchom_monte_carlo(12, ziarno=5, liczba_procesow=1, rozmiar_porcji=5)
+
+        self.assertEqual(wyniki_1['wskaznik_sukcesu'], wyniki_2['wskaznik_sukcesu'])
+        self.assertEqual(wyniki_1['nieudane_ziarna'], wyniki_2['nieudane_ziarna'])
+        for klucz in wyniki_1['rozklady']:
+            np.testing.assert_array_equal(wyniki_1['rozklady'][klucz], wyniki_2['rozklady'][klucz])
+
+    def test_rownolegle_jak_sekwencyjnie(self):
+        """Wynik z puli procesów jest identyczny z przebiegiem sekwencyjnym."""
+        sekwencyjnie = uruchom_monte_carlo(8, ziarno=7, liczba_procesow=1, rozmiar_porcji=3)
+        rownolegle = uruchom_monte_carlo(8, ziarno=7, liczba_procesow=2, rozmiar_porcji=3)
+
+        self.assertEqual(rownolegle['wskaznik_sukcesu'], sekwencyjnie['wskaznik_sukcesu'])
+        self.assertEqual(rownolegle['nieudane_ziarna'], sekwencyjnie['nieudane_ziarna'])
+        for klucz in sekwencyjnie['rozklady']:
+            np.testing.assert_array_equal(rownolegle['rozklady'][klucz], sekwencyjnie['rozklady'][klucz])
+
+    def test_odtworzenie_przebiegu(self):
+        """Pojedynczy przebieg da się odtworzyć z ziarna i indeksu."""
+        wyniki = uruchom_monte_carlo(6, ziarno=11, liczba_procesow=1)
+        indeks = 3
+        pojedynczy = wykonaj_przebieg(11, indeks)
+
+        self.assertEqual(pojedynczy['stan_koncowy']['vy'], wyniki['rozklady']['predkosc_ladowania'][indeks])
+        self.assertEqual(not pojedynczy['sukces'], indeks in wyniki['nieudane_ziarna'])
+
+    def test_rozne_ziarna(self):
+        """Różne indeksy dają różne warunki początkowe."""
+        self.assertNotEqual(losuj_scenariusz(0, 0), losuj_scenariusz(0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Testy jednostkowe dla trybów naprowadzania i autopilota predykcyjnego.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.autopilot import Autopilot
+from src.rakieta import Rakieta
+from src.scenariusz import Scenariusz, SpecyfikacjaRakiety
+from src.symulacja import Symulacja
+from src.symulacja_wsadowa import SymulacjaWsadowa
+from src.naprowadzanie import AutopilotPredykcyjny, propaguj_hamowanie, wybierz_kandydata, utworz_autopilota
+
+
+class TestPropagujHamowanie(unittest.TestCase):
+    """Testy wektorowego propagatora kandydatów."""
+
+    PARAMETRY = dict(grawitacja=1.62, masa_pusta=1000.0, cieg_maksymalny=8000.0,
+                     zuzycie_paliwa=0.5, predkosc_docelowa=1.0, liczba_krokow=24)
+
+    def test_pozniejszy_zaplon_zuzywa_mniej_paliwa(self):
+        predkosc, paliwo, _, zaplon_teraz = propaguj_hamowanie(
+            1000.0, -50.0, 500.0, np.array([1.5, 2.0, 3.0]), **self.PARAMETRY)
+
+        self.assertTrue(np.all(predkosc < 2.0))
+        self.assertTrue(np.all(np.diff(paliwo) < 0))
+        self.assertFalse(zaplon_teraz.any())
+
+    def test_zbyt_duze_opoznienie_nie_wyhamowuje(self):
+        predkosc, _, _, _ = propaguj_hamowanie(1000.0, -50.0, 500.0, np.array([1.5, 20.0]), **self.PARAMETRY)
+
+        self.assertLess(predkosc[0], 2.0)
+        self.assertGreater(predkosc[1], 2.0)
+
+    def test_zaplon_teraz_gdy_potrzebne_opoznienie_juz_wieksze(self):
+        # v^2 / 2h = 2.5 m/s^2 potrzebne już teraz
+        _, _, wysokosc_zaplonu, zaplon_teraz = propaguj_hamowanie(500.0, -50.0, 500.0, np.array([1.0, 3.0]), **self.PARAMETRY)
+
+        self.assertTrue(zaplon_teraz[0])
+        self.assertFalse(zaplon_teraz[1])
+        self.assertEqual(wysokosc_zaplonu[0], 500.0)
+        self.assertLess(wysokosc_zaplonu[1], 500.0)
+
+    def test_wiele_stanow_naraz(self):
+        opoznienia = np.array([1.5, 2.0, 3.0])
+        wysokosci = np.array([[1000.0], [600.0]])
+        predkosc, paliwo, _, _ = propaguj_hamowanie(wysokosci, -50.0, 500.0, opoznienia, **self.PARAMETRY)
+
+        self.assertEqual(predkosc.shape, (2, 3))
+        for indeks, wysokosc in enumerate(wysokosci[:, 0]):
+            pojedynczy, zuzycie, _, _ = propaguj_hamowanie(wysokosc, -50.0, 500.0, opoznienia, **self.PARAMETRY)
+            np.testing.assert_array_equal(predkosc[indeks], pojedynczy)
+            np.testing.assert_array_equal(paliwo[indeks], zuzycie)
+
+    def test_wybor_kandydata(self):
+        predkosc = np.array([[0.5, 1.0, 3.0], [3.0, 4.0, 5.0]])
+        zuzycie = np.array([[9.0, 8.0, 1.0], [9.0, 8.0, 1.0]])
+
+        np.testing.assert_array_equal(wybierz_kandydata(predkosc, zuzycie, 1.6), [1, 0])
+
+    def test_wolny_spadek_tuz_nad_powierzchnia_bez_paliwa(self):
+        predkosc, paliwo, _, _ = propaguj_hamowanie(0.1, -0.5, 500.0, np.array([1.0, 2.0]), **self.PARAMETRY)
+
+        np.testing.assert_allclose(paliwo, 0.0)
+        np.testing.assert_allclose(predkosc, np.sqrt(0.25 + 2 * 1.62 * 0.1))
+
+
+class TestAutopilotPredykcyjny(unittest.TestCase):
+    """Testy autopilota predykcyjnego w symulacji."""
+
+    def test_tryb_ze_scenariusza(self):
+        rakieta = Rakieta()
+        self.assertIs(type(utworz_autopilota(rakieta, Scenariusz())), Autopilot)
+        self.assertIsInstance(utworz_autopilota(rakieta, Scenariusz(naprowadzanie='predykcyjne')),
+                              AutopilotPredykcyjny)
+        with self.assertRaises(ValueError):
+            utworz_autopilota(rakieta, Scenariusz(naprowadzanie='nieznane'))
+
+    def test_udane_ladowanie(self):
+        for planeta in ('ksiezyc', 'europa', 'tytan'):
+            with self.subTest(planeta=planeta):
+                symulacja = Symulacja(scenariusz=Scenariusz(planeta=planeta, naprowadzanie='predykcyjne'))
+                wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+
+                self.assertTrue(wyniki['sukces'], wyniki['komunikat'])
+
+    def test_laduje_tam_gdzie_heurystyka_sie_rozbija(self):
+        # Paliwa starcza tylko przy oszczędnym profilu hamowania
+        scenariusz = Scenariusz(wysokosc_startowa=1500.0, predkosc_pionowa_startowa=-70.0,
+                                rakieta=SpecyfikacjaRakiety(masa_paliwa=8.0))
+        heurystyczne = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+        predykcyjne = Symulacja(scenariusz=scenariusz.zmien(naprowadzanie='predykcyjne')).uruchom(
+            czy_wyswietlac_postep=False)
+
+        self.assertFalse(heurystyczne['sukces'])
+        self.assertTrue(predykcyjne['sukces'], predykcyjne['komunikat'])
+
+    def test_lot_swobodny_do_zaplonu(self):
+        symulacja = Symulacja(scenariusz=Scenariusz(naprowadzanie='predykcyjne'))
+        symulacja.wykonaj_kroki(10)
+
+        self.assertEqual(symulacja.autopilot.tryb_ladowania, 'lot_swobodny')
+        self.assertEqual(symulacja.rakieta.cieg_aktualny, 0.0)
+        self.assertLessEqual(symulacja.autopilot.przewidywana_predkosc_przyziemienia,
+                             symulacja.autopilot.predkosc_dopuszczalna)
+
+    def test_kandydaci_wokol_poprzedniego_rozwiazania(self):
+        autopilot = AutopilotPredykcyjny(Rakieta(), liczba_kandydatow=10)
+        autopilot.ulamek_opoznienia = 0.3
+
+        kandydaci = autopilot.kandydaci()
+
+        self.assertEqual(len(kandydaci), 10)
+        self.assertTrue(np.all(np.diff(kandydaci) >= 0))
+        self.assertGreaterEqual(np.sum(np.abs(kandydaci - 0.3) <= 0.1 + 1e-12), 5)
+
+    def test_ograniczony_czas_sterowania(self):
+        autopilot = AutopilotPredykcyjny(Rakieta())
+        liczba_wywolan = 200
+        start = time.perf_counter()
+        for _ in range(liczba_wywolan):
+            autopilot.czy_hamowanie = False
+            autopilot.oblicz_sterowanie(0.1)
+        czas_sterowania = (time.perf_counter() - start) / liczba_wywolan
+
+        # Budżet 1 ms z zapasem na obciążoną maszynę testową
+        self.assertLess(czas_sterowania, 5e-3)
+
+    def test_stan_punktu_kontrolnego(self):
+        scenariusz = Scenariusz(naprowadzanie='predykcyjne')
+        oczekiwane = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+        symulacja = Symulacja(scenariusz=scenariusz)
+        symulacja.wykonaj_kroki(150)
+
+        wyniki = symulacja.rozgalez().uruchom(czy_wyswietlac_postep=False)
+
+        self.assertEqual(wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+
+    def test_symulacja_wsadowa_tylko_heurystyczna(self):
+        with self.assertRaises(ValueError):
+            SymulacjaWsadowa.ze_scenariuszy([Scenariusz(naprowadzanie='predykcyjne')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Testy jednostkowe dla polityk zapisu historii i odbiorników próbek.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.polityka_zapisu import (ZapisCoNKrokow, ZapisCoInterwalCzasu,
+                                 ZapisAdaptacyjny, ZapisTylkoKoncowy)
+
+
+class TestPolitykaZapisu(unittest.TestCase):
+    """Testy decymacji historii."""
+
+    def setUp(self):
+        self.pelna = Symulacja().uruchom(czy_wyswietlac_postep=False)
+
+    def test_co_n_krokow(self):
+        """Co N-ty krok daje podzbiór pełnej historii plus stan końcowy."""
+        wyniki = Symulacja(polityka_zapisu=ZapisCoNKrokow(10)).uruchom(czy_wyswietlac_postep=False)
+        np.testing.assert_array_equal(wyniki['historia']['y'][:-1], self.pelna['historia']['y'][:-1:10])
+        self.assertEqual(wyniki['historia']['y'][-1], self.pelna['historia']['y'][-1])
+        self.assertEqual(wyniki['stan_koncowy'], self.pelna['stan_koncowy'])
+
+    def test_interwal_czasu(self):
+        """Próbki są odległe o zadany interwał."""
+        wyniki = Symulacja(polityka_zapisu=ZapisCoInterwalCzasu(1.0)).uruchom(czy_wyswietlac_postep=False)
+        odstepy = np.diff(wyniki['historia']['czas'][:-1])
+        np.testing.assert_allclose(odstepy, 1.0, atol=1e-6)
+
+    def test_adaptacyjny(self):
+        """Zapis adaptacyjny pomija kroki bez istotnych zmian."""
+        wyniki = Symulacja(polityka_zapisu=ZapisAdaptacyjny({'y': 10.0})).uruchom(czy_wyswietlac_postep=False)
+        liczba_probek = len(wyniki['historia']['czas'])
+        self.assertLess(liczba_probek, len(self.pelna['historia']['czas']) / 2)
+        self.assertTrue(np.all(np.abs(np.diff(wyniki['historia']['y'][:-1])) > 10.0))
+
+    def test_tylko_koncowy(self):
+        """Przy zapisie tylko stanu końcowego historia ma jeden wiersz."""
+        wyniki = Symulacja(polityka_zapisu=ZapisTylkoKoncowy()).uruchom(czy_wyswietlac_postep=False)
+        self.assertEqual(len(wyniki['historia']['czas']), 1)
+        self.assertEqual(wyniki['komunikat'], self.pelna['komunikat'])
+
+    def test_odbiornik_funkcja(self):
+        """Próbki trafiają do odbiornika bez przechowywania w pamięci."""
+        probki = []
+        symulacja = Symulacja(odbiornik=probki.append, czy_zachowac_historie=False)
+        symulacja.uruchom(czy_wyswietlac_postep=False)
+        self.assertEqual(len(probki), len(self.pelna['historia']['czas']))
+        self.assertEqual(len(symulacja.historia_danych['czas']), 0)
+        self.assertEqual(probki[-1]['y'], self.pelna['stan_koncowy']['y'])
+
+    def test_odbiornik_generator(self):
+        """Odbiornikiem może być generator przyjmujący próbki przez send()."""
+        maksymalna_predkosc = [0.0]
+
+        def sledz_predkosc():
+            while True:
+                probka = yield
+                maksymalna_predkosc[0] = max(maksymalna_predkosc[0], abs(probka['vy']))
+
+        Symulacja(odbiornik=sledz_predkosc(), polityka_zapisu=ZapisTylkoKoncowy()).uruchom(
+            czy_wyswietlac_postep=False)
+        self.assertEqual(maksymalna_predkosc[0], abs(self.pelna['stan_koncowy']['vy']))
+
+
+if __name__ == '__main__':
+    unittest.main()
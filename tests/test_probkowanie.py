@@ -0,0 +1,58 @@
+"""
+Testy jednostkowe dla redukcji punktów linii przed rysowaniem.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.probkowanie import indeksy_min_max, indeksy_lttb, probkuj_linie
+
+
+class TestProbkowanie(unittest.TestCase):
+    """Testy metod min/max i LTTB."""
+
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        self.czas = np.linspace(0.0, 100.0, 100_003)
+        self.sygnal = np.sin(self.czas) + 0.1 * generator.standard_normal(len(self.czas))
+        self.sygnal[54_321] = 25.0
+
+    def test_min_max_zachowuje_szczyty_i_konce(self):
+        indeksy = indeksy_min_max([self.sygnal], 500)
+
+        self.assertLessEqual(len(indeksy), 2 * 500 + 2)
+        self.assertTrue(np.all(np.diff(indeksy) > 0))
+        self.assertIn(0, indeksy)
+        self.assertIn(len(self.sygnal) - 1, indeksy)
+        self.assertIn(int(self.sygnal.argmax()), indeksy)
+        self.assertIn(int(self.sygnal.argmin()), indeksy)
+
+    def test_lttb(self):
+        indeksy = indeksy_lttb(self.czas, self.sygnal, 400)
+
+        self.assertEqual(len(indeksy), 400)
+        self.assertTrue(np.all(np.diff(indeksy) > 0))
+        self.assertEqual((indeksy[0], indeksy[-1]), (0, len(self.czas) - 1))
+        self.assertIn(54_321, indeksy)
+
+    def test_krotka_linia_bez_zmian(self):
+        """Linie krótsze niż budżet punktów nie są kopiowane ani zmieniane."""
+        x, y = np.arange(50.0), np.arange(50.0) ** 2
+        for metoda in ('min_max', 'lttb'):
+            wynik_x, wynik_y = probkuj_linie(x, y, 100, metoda)
+            self.assertIs(wynik_x, x)
+            self.assertIs(wynik_y, y)
+
+    def test_nieznana_metoda(self):
+        with self.assertRaises(ValueError):
+            probkuj_linie(self.czas, self.sygnal, 100, 'co_n')
+
+
+if __name__ == '__main__':
+    unittest.main()
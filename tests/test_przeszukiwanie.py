@@ -0,0 +1,88 @@
+"""
+Testy jednostkowe dla przeszukiwania siatki parametrów z pamięcią wyników.
+"""
+
+import unittest
+import sys
+import os
+import csv
+import tempfile
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.przeszukiwanie import (przeszukaj, zastosuj_parametry, klucz_scenariusza,
+                                PamiecWynikow, zapisz_tabele_csv, _wczytaj_os)
+from src.scenariusz import Scenariusz
+
+
+class TestPrzeszukiwanie(unittest.TestCase):
+    """Testy siatki, kluczy i pamięci wyników."""
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+        self.pamiec = PamiecWynikow(self.katalog.name)
+        self.bazowy = Scenariusz(wysokosc_startowa=300.0, predkosc_pionowa_startowa=-10.0)
+
+    def tearDown(self):
+        self.katalog.cleanup()
+
+    def test_aliasy_parametrow(self):
+        scenariusz = zastosuj_parametry(self.bazowy, {
+            'WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC': 3.0,
+            'MARGINES_BEZPIECZENSTWA_SUICIDE_BURN': 2.0,
+            'planeta': 'mars',
+            'rakieta.masa_paliwa': 200.0
+        })
+        self.assertEqual(scenariusz.nastawy.wspolczynnik_proporcjonalny_wysokosc, 3.0)
+        self.assertEqual(scenariusz.nastawy.margines_suicide_burn, 2.0)
+        self.assertEqual(scenariusz.planeta, 'mars')
+        self.assertEqual(scenariusz.rakieta.masa_paliwa, 200.0)
+
+    def test_klucz_zalezy_od_nastaw(self):
+        inny = zastosuj_parametry(self.bazowy, {'WSPOLCZYNNIK_ROZNICZKUJACY_WYSOKOSC': 2.0})
+        self.assertEqual(klucz_scenariusza(self.bazowy), klucz_scenariusza(Scenariusz(**{
+            'wysokosc_startowa': 300.0, 'predkosc_pionowa_startowa': -10.0})))
+        self.assertNotEqual(klucz_scenariusza(self.bazowy), klucz_scenariusza(inny))
+
+    def test_dodatkowa_wartosc_liczy_tylko_nowe_komorki(self):
+        osie = {'planeta': ['ksiezyc', 'mars'], 'WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC': [2.0, 2.5]}
+        pierwsze = list(przeszukaj(osie, self.bazowy, self.pamiec, liczba_procesow=1))
+        self.assertEqual(len(pierwsze), 4)
+        self.assertFalse(any(wiersz['z_pamieci'] for wiersz in pierwsze))
+
+        osie['WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC'].append(3.0)
+        drugie = list(przeszukaj(osie, self.bazowy, self.pamiec, liczba_procesow=1))
+        self.assertEqual(len(drugie), 6)
+        self.assertEqual(sum(not wiersz['z_pamieci'] for wiersz in drugie), 2)
+
+        wynik_pierwszy = {(w['planeta'], w['WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC']): w['predkosc_ladowania']
+                          for w in pierwsze}
+        for wiersz in drugie:
+            klucz = (wiersz['planeta'], wiersz['WSPOLCZYNNIK_PROPORCJONALNY_WYSOKOSC'])
+            if klucz in wynik_pierwszy:
+                self.assertEqual(wiersz['predkosc_ladowania'], wynik_pierwszy[klucz])
+
+    def test_tabela_csv(self):
+        sciezka = os.path.join(self.katalog.name, 'tabela.csv')
+        liczba = zapisz_tabele_csv(przeszukaj({'planeta': ['ksiezyc', 'mars']}, self.bazowy,
+                                              pamiec=False, liczba_procesow=1), sciezka)
+        with open(sciezka, newline='', encoding='utf-8') as plik:
+            wiersze = list(csv.DictReader(plik))
+        self.assertEqual(liczba, 2)
+        self.assertEqual([wiersz['planeta'] for wiersz in wiersze], ['ksiezyc', 'mars'])
+        self.assertIn('predkosc_ladowania', wiersze[0])
+
+    def test_osie_tekstowe_z_wiersza_polecen(self):
+        self.assertEqual(_wczytaj_os('wysokosc_startowa=100,2e2'), ('wysokosc_startowa', [100.0, 200.0]))
+        self.assertEqual(_wczytaj_os('integrator=euler,rk4'), ('integrator', ['euler', 'rk4']))
+
+        wiersze = list(przeszukaj(dict([_wczytaj_os('integrator=euler,rk4')]), self.bazowy,
+                                  pamiec=False, liczba_procesow=1))
+
+        self.assertEqual([wiersz['integrator'] for wiersz in wiersze], ['euler', 'rk4'])
+        self.assertNotEqual(wiersze[0]['predkosc_ladowania'], wiersze[1]['predkosc_ladowania'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Testy jednostkowe dla punktów kontrolnych i rozgałęziania symulacji.
+"""
+
+import unittest
+import sys
+import os
+import dataclasses
+import tempfile
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.punkt_kontrolny import PunktKontrolny
+
+
+class TestPunktKontrolny(unittest.TestCase):
+    """Testy wznawiania przebiegu od punktu kontrolnego."""
+
+    SCENARIUSZE = (
+        Scenariusz(),
+        Scenariusz(planeta='mars', integrator='dopri45'),
+        Scenariusz(integrator='rk4', okres_sterowania=0.2, opoznienie_sterowania=0.1),
+    )
+
+    def przebieg_do_polowy(self, scenariusz):
+        symulacja = Symulacja(scenariusz=scenariusz)
+        symulacja.wykonaj_kroki(60)
+        return symulacja
+
+    def test_kontynuacja_identyczna_z_pelnym_przebiegiem(self):
+        for scenariusz in self.SCENARIUSZE:
+            with self.subTest(scenariusz=scenariusz):
+                oczekiwane = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+                kopia = self.przebieg_do_polowy(scenariusz).rozgalez()
+                wyniki = kopia.uruchom(czy_wyswietlac_postep=False)
+
+                self.assertEqual(wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+                self.assertEqual(wyniki['czas_symulacji'], oczekiwane['czas_symulacji'])
+                self.assertEqual(wyniki['historia']['czas'][-1], oczekiwane['historia']['czas'][-1])
+                self.assertLess(len(wyniki['historia']['czas']), len(oczekiwane['historia']['czas']))
+
+    def test_zapis_i_wznowienie_z_pliku(self):
+        scenariusz = self.SCENARIUSZE[1]
+        oczekiwane = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+        punkt = self.przebieg_do_polowy(scenariusz).punkt_kontrolny()
+
+        with tempfile.TemporaryDirectory() as katalog:
+            sciezka = punkt.zapisz(os.path.join(katalog, 'przebieg', 'punkt.json'))
+            wczytany = PunktKontrolny.wczytaj(sciezka)
+
+        self.assertEqual(wczytany, punkt)
+        wyniki = Symulacja.z_punktu_kontrolnego(wczytany).uruchom(czy_wyswietlac_postep=False)
+        self.assertEqual(wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+
+    def test_rozgalezienie_co_jesli(self):
+        """Zmienione nastawy działają tylko w kopii; oryginał kończy lot bez zmian."""
+        scenariusz = Scenariusz()
+        oczekiwane = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+        symulacja = self.przebieg_do_polowy(scenariusz)
+        czas_rozgalezienia = symulacja.czas_aktualny
+
+        nastawy = dataclasses.replace(scenariusz.nastawy, margines_suicide_burn=3.0)
+        kopia = symulacja.rozgalez(nastawy=nastawy)
+        wyniki_kopii = kopia.uruchom(czy_wyswietlac_postep=False)
+        wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+
+        self.assertEqual(wyniki['stan_koncowy'], oczekiwane['stan_koncowy'])
+        self.assertNotEqual(wyniki_kopii['stan_koncowy'], oczekiwane['stan_koncowy'])
+        self.assertGreaterEqual(wyniki_kopii['historia']['czas'][0], czas_rozgalezienia)
+
+    def test_inny_krok_czasowy(self):
+        symulacja = self.przebieg_do_polowy(Scenariusz())
+        with self.assertRaises(ValueError):
+            symulacja.rozgalez(krok_czasowy=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
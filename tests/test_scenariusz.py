@@ -0,0 +1,74 @@
+"""
+Testy jednostkowe dla niezmiennych scenariuszy symulacji.
+"""
+
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz, SpecyfikacjaRakiety, NastawyAutopilota
+from src.symulacja import Symulacja
+from src import config
+
+
+class TestScenariusz(unittest.TestCase):
+    """Testy scenariusza jako jawnego, niezmiennego opisu przebiegu."""
+
+    def test_niezmiennosc_i_hashowanie(self):
+        """Scenariusz jest zamrożony i może być kluczem słownika."""
+        scenariusz = Scenariusz(planeta='mars', wysokosc_startowa=1500.0)
+        with self.assertRaises(Exception):
+            scenariusz.wysokosc_startowa = 10.0
+
+        pamiec = {scenariusz: 1}
+        self.assertEqual(pamiec[Scenariusz(planeta='mars', wysokosc_startowa=1500.0)], 1)
+        self.assertNotEqual(hash(scenariusz), hash(scenariusz.zmien(planeta='ksiezyc')))
+
+    def test_wartosci_domyslne_z_config(self):
+        """Domyślne wartości są czytane z config w chwili tworzenia."""
+        poprzednia = config.WYSOKOSC_STARTOWA
+        try:
+            config.WYSOKOSC_STARTOWA = 1234.0
+            self.assertEqual(Scenariusz().wysokosc_startowa, 1234.0)
+        finally:
+            config.WYSOKOSC_STARTOWA = poprzednia
+
+    def test_slownik(self):
+        """Scenariusz przechodzi przez słownik bez zmian."""
+        scenariusz = Scenariusz(rakieta=SpecyfikacjaRakiety(masa_paliwa=321.0),
+                                nastawy=NastawyAutopilota(wspolczynnik_proporcjonalny_wysokosc=1.0))
+        self.assertEqual(Scenariusz.ze_slownika(scenariusz.do_slownika()), scenariusz)
+
+    def test_symulacja_uzywa_scenariusza(self):
+        """Symulacja bierze warunki początkowe ze scenariusza."""
+        scenariusz = Scenariusz(wysokosc_startowa=800.0, predkosc_pionowa_startowa=-20.0,
+                                rakieta=SpecyfikacjaRakiety(masa_paliwa=250.0))
+        symulacja = Symulacja(scenariusz=scenariusz)
+        self.assertEqual(symulacja.rakieta.pozycja_y, 800.0)
+        self.assertEqual(symulacja.rakieta.predkosc_y, -20.0)
+        self.assertEqual(symulacja.rakieta.masa_paliwa_aktualna, 250.0)
+
+    def test_rownolegle_scenariusze(self):
+        """Symulacje w wątkach nie współdzielą parametrów."""
+        scenariusze = [Scenariusz(wysokosc_startowa=float(h)) for h in (600, 900, 1200, 1500)]
+
+        def uruchom(scenariusz):
+            return Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+
+        with ThreadPoolExecutor(max_workers=4) as pula:
+            wyniki_rownolegle = list(pula.map(uruchom, scenariusze))
+
+        for scenariusz, wyniki in zip(scenariusze, wyniki_rownolegle):
+            self.assertEqual(wyniki['parametry']['wysokosc_poczatkowa'], scenariusz.wysokosc_startowa)
+            self.assertEqual(wyniki['historia']['y'][0], scenariusz.wysokosc_startowa)
+            wyniki_sekwencyjne = uruchom(scenariusz)
+            self.assertEqual(wyniki['komunikat'], wyniki_sekwencyjne['komunikat'])
+            self.assertEqual(wyniki['stan_koncowy'], wyniki_sekwencyjne['stan_koncowy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
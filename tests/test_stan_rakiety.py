@@ -0,0 +1,83 @@
+"""
+Testy jednostkowe dla zwartego stanu rakiety i migawek.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rakieta import Rakieta, POLA_STANU, ROZMIAR_STANU
+
+
+class TestStanRakiety(unittest.TestCase):
+    """Testy migawek stanu i wielkości pochodnych."""
+
+    def setUp(self):
+        self.rakieta = Rakieta(pozycja_y=1000.0, predkosc_x=3.0, predkosc_y=-40.0, masa_rakiety_pusta=1000.0,
+                               masa_paliwa_aktualna=500.0, grawitacja=1.62)
+        self.rakieta.ustaw_cieg(4000.0)
+        self.rakieta.ustaw_kat(0.1)
+
+    def test_brak_slownika_atrybutow(self):
+        self.assertFalse(hasattr(self.rakieta, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.rakieta.nieznane_pole = 1.0
+
+    def test_masa_calkowita_nadaza_za_paliwem(self):
+        self.assertEqual(self.rakieta.masa_calkowita, 1500.0)
+        self.rakieta.aktualizuj(1.0)
+        self.assertEqual(self.rakieta.masa_calkowita, 1000.0 + self.rakieta.masa_paliwa_aktualna)
+        self.rakieta.masa_paliwa_aktualna = 0.0
+        self.rakieta.masa_rakiety_pusta = 900.0
+        self.assertEqual(self.rakieta.masa_calkowita, 900.0)
+        self.assertFalse(self.rakieta.czy_ma_paliwo)
+
+    def test_wielkosci_pochodne_raz_na_krok(self):
+        stan = self.rakieta.pobierz_stan()
+        self.assertIs(self.rakieta.pobierz_stan(), stan)
+        self.assertEqual(self.rakieta.predkosc_calkowita, stan['predkosc'])
+
+        self.rakieta.aktualizuj(0.1)
+        nowy = self.rakieta.pobierz_stan()
+        self.assertIsNot(nowy, stan)
+        self.assertEqual(nowy['y'], self.rakieta.pozycja_y)
+        self.assertAlmostEqual(nowy['energia_kinetyczna'], 0.5 * self.rakieta.masa_calkowita * (
+            self.rakieta.predkosc_x**2 + self.rakieta.predkosc_y**2))
+
+        self.rakieta.ustaw_ruch(0.0, 10.0, 0.0, -3.0)
+        self.assertEqual(self.rakieta.predkosc_calkowita, 3.0)
+        self.assertAlmostEqual(self.rakieta.energia_potencjalna, self.rakieta.masa_calkowita * 1.62 * 10.0)
+
+    def test_migawka_do_gotowej_tablicy(self):
+        migawki = np.zeros((3, ROZMIAR_STANU))
+        wynik = self.rakieta.migawka(migawki[1])
+
+        self.assertTrue(np.shares_memory(wynik, migawki))
+        self.assertEqual(migawki[1, POLA_STANU.index('pozycja_y')], 1000.0)
+        self.assertEqual(migawki[1, POLA_STANU.index('cieg_aktualny')], 4000.0)
+        self.assertTrue(np.all(migawki[0] == 0))
+
+    def test_przywrocenie_odtwarza_lot(self):
+        """Lot od przywróconej migawki jest identyczny z lotem od oryginalnego stanu."""
+        self.rakieta.aktualizuj(0.5)
+        migawka = self.rakieta.migawka()
+        for _ in range(20):
+            self.rakieta.aktualizuj(0.1)
+        oczekiwany = self.rakieta.pobierz_stan()
+
+        self.rakieta.ustaw_cieg(0.0)
+        self.rakieta.aktualizuj(3.0)
+        self.rakieta.przywroc(migawka)
+        self.assertIsInstance(self.rakieta.pozycja_y, float)
+        for _ in range(20):
+            self.rakieta.aktualizuj(0.1)
+        self.assertEqual(self.rakieta.pobierz_stan(), oczekiwany)
+
+
+if __name__ == '__main__':
+    unittest.main()
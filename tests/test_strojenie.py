@@ -0,0 +1,55 @@
+"""
+Testy jednostkowe dla strojenia nastaw autopilota.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.strojenie import stroj_planete, stroj, losuj_nastawy, rozmiary_etapow, ZAKRESY_NASTAW
+from src.scenariusz import NastawyAutopilota, wczytaj_tabele_nastaw
+from src.autopilot import Autopilot
+from src.rakieta import Rakieta
+
+
+class TestStrojenie(unittest.TestCase):
+    """Testy przeszukiwania nastaw i tabeli nastaw."""
+
+    def test_rozmiary_etapow(self):
+        self.assertEqual(rozmiary_etapow(24, 48, 3), [5, 16, 48])
+        self.assertEqual(rozmiary_etapow(1, 48, 3), [48])
+
+    def test_losowanie_w_zakresie(self):
+        generator = np.random.default_rng(0)
+        for wokol in (None, NastawyAutopilota()):
+            nastawy = losuj_nastawy(generator, wokol, rozrzut=3.0)
+            for nazwa, (minimum, maksimum) in ZAKRESY_NASTAW.items():
+                self.assertTrue(minimum <= getattr(nastawy, nazwa) <= maksimum)
+
+    def test_strojenie_nie_pogarsza(self):
+        """Wynik strojenia nie jest gorszy od nastaw startowych na tej samej paczce."""
+        nastawy, ocena, ocena_startowa, liczba_ocen = stroj_planete(
+            'ksiezyc', liczba_kandydatow=4, liczba_rund=1, liczba_scenariuszy=6, eta=2)
+        self.assertLessEqual(ocena['koszt'], ocena_startowa['koszt'])
+        self.assertEqual(liczba_ocen, 1 + 4 + 2)
+
+    def test_tabela_dla_autopilota(self):
+        with tempfile.TemporaryDirectory() as katalog:
+            sciezka = os.path.join(katalog, 'nastawy.json')
+            tabela = stroj(['mars'], liczba_procesow=1, plik_wyjsciowy=sciezka, czy_wyswietlac_postep=False,
+                           liczba_kandydatow=2, liczba_rund=1, liczba_scenariuszy=2)
+            self.assertEqual(wczytaj_tabele_nastaw(sciezka), tabela)
+
+            autopilot = Autopilot.z_tabeli_nastaw(Rakieta(), 'mars', sciezka)
+            self.assertEqual(autopilot.nastawy, tabela['mars'])
+            self.assertEqual(Autopilot.z_tabeli_nastaw(Rakieta(), 'ziemia', tabela).nastawy, NastawyAutopilota())
+
+
+if __name__ == '__main__':
+    unittest.main()
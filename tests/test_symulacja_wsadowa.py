@@ -0,0 +1,74 @@
+"""
+Testy jednostkowe dla wsadowej (wektorowej) symulacji wielu rakiet.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.symulacja import Symulacja
+from src.symulacja_wsadowa import SymulacjaWsadowa, KOD_WYLADOWAL, KOD_W_TOKU
+from src.scenariusz import Scenariusz, SpecyfikacjaRakiety
+from src import config
+
+
+class TestSymulacjaWsadowa(unittest.TestCase):
+    """Testy zgodności ścieżki wsadowej ze skalarną."""
+
+    def test_zgodnosc_ze_sciezka_skalarna(self):
+        """Każda rakieta w paczce daje ten sam wynik co Symulacja."""
+        generator = np.random.default_rng(7)
+        scenariusze = [
+            Scenariusz(
+                planeta=str(generator.choice(['ksiezyc', 'mars', 'ziemia', 'europa'])),
+                wysokosc_startowa=float(generator.uniform(500, 3000)),
+                predkosc_pionowa_startowa=float(generator.uniform(-90, -10)),
+                predkosc_pozioma_startowa=float(generator.uniform(-20, 20)),
+                rakieta=SpecyfikacjaRakiety(masa_paliwa=float(generator.uniform(100, 800)))
+            )
+            for _ in range(12)
+        ]
+
+        wsadowa = SymulacjaWsadowa.ze_scenariuszy(scenariusze)
+        wsadowa.uruchom()
+
+        for indeks, scenariusz in enumerate(scenariusze):
+            wyniki = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+
+            wynik_wsadowy = wsadowa.pobierz_wynik(indeks)
+            self.assertEqual(wyniki['sukces'], wynik_wsadowy['sukces'])
+            self.assertEqual(wyniki['komunikat'], wynik_wsadowy['komunikat'])
+            self.assertAlmostEqual(wyniki['czas_symulacji'], wynik_wsadowy['czas_symulacji'])
+            for klucz, wartosc in wynik_wsadowy['stan_koncowy'].items():
+                np.testing.assert_allclose(wyniki['stan_koncowy'][klucz], wartosc, rtol=1e-7, atol=1e-6)
+
+    def test_maskowanie_zakonczonych(self):
+        """Rakieta po lądowaniu nie zmienia już stanu."""
+        wsadowa = SymulacjaWsadowa(pozycja_y=[5.0, 2000.0], predkosc_y=[-1.0, -10.0])
+        while wsadowa.aktywne[1]:
+            wsadowa.wykonaj_krok_symulacji()
+            if not wsadowa.aktywne[0]:
+                stan = (wsadowa.pozycja_x[0], wsadowa.pozycja_y[0], wsadowa.predkosc_y[0])
+                break
+
+        self.assertEqual(wsadowa.kod_zakonczenia[0], KOD_WYLADOWAL)
+        self.assertEqual(wsadowa.kod_zakonczenia[1], KOD_W_TOKU)
+        wsadowa.uruchom()
+        self.assertEqual((wsadowa.pozycja_x[0], wsadowa.pozycja_y[0], wsadowa.predkosc_y[0]), stan)
+
+    def test_bez_autopilota(self):
+        """Bez autopilota ciąg pozostaje zerowy."""
+        wsadowa = SymulacjaWsadowa(liczba_rakiet=3, czy_autopilot_wlaczony=False)
+        wyniki = wsadowa.uruchom()
+        self.assertTrue(np.all(wyniki['stan_koncowy']['cieg'] == 0))
+        self.assertTrue(np.all(wyniki['stan_koncowy']['masa_paliwa'] == config.MASA_PALIWA_STARTOWA))
+        self.assertFalse(wyniki['sukces'].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
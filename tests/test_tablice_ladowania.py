@@ -0,0 +1,172 @@
+"""
+Testy jednostkowe dla tablic optymalnego lądowania i naprowadzania tabelarycznego.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz, SpecyfikacjaRakiety
+from src.symulacja import Symulacja
+from src.tablice_ladowania import (TablicaLadowania, AutopilotTabelaryczny, KANALY, osie_tablicy,
+                                   parametry_tablicy, klucz_tablicy, zbuduj_tablice, pobierz_tablice,
+                                   przygotuj_tablice)
+from src import config
+
+
+MALA_SIATKA = dict(liczba_wezlow=(32, 24, 3), liczba_kandydatow=24, liczba_krokow=24)
+
+
+class TestTablicaLadowania(unittest.TestCase):
+    """Testy interpolacji, zapisu i pamięci podręcznej tablic."""
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.katalog.cleanup()
+
+    def tablica_liniowa(self):
+        osie = osie_tablicy((100.0, 50.0, 10.0), (5, 4, 3))
+        wysokosc, predkosc, paliwo = np.meshgrid(*osie, indexing='ij')
+        dane = np.stack([wysokosc + 2 * predkosc + 3 * paliwo] * len(KANALY), axis=-1)
+        return TablicaLadowania(osie, dane)
+
+    def test_interpolacja_funkcji_liniowej_dokladna(self):
+        tablica = self.tablica_liniowa()
+        for punkt in ((0.0, -50.0, 0.0), (100.0, 0.0, 10.0), (37.5, -12.3, 4.2), (6.25, -25.0, 5.0)):
+            with self.subTest(punkt=punkt):
+                wysokosc, predkosc, paliwo = punkt
+                np.testing.assert_allclose(tablica.interpoluj(*punkt),
+                                           wysokosc + 2 * predkosc + 3 * paliwo, atol=1e-9)
+
+    def test_poza_zasiegiem(self):
+        tablica = self.tablica_liniowa()
+        self.assertIsNone(tablica.interpoluj(101.0, -10.0, 5.0))
+        self.assertIsNone(tablica.interpoluj(50.0, 1.0, 5.0))
+        self.assertIsNone(tablica.interpoluj(50.0, -10.0, 11.0))
+
+    def test_za_malo_wezlow(self):
+        with self.assertRaises(ValueError):
+            osie_tablicy((100.0, 50.0, 10.0), (5, 4, 1))
+
+    def test_zapis_i_odczyt_przez_mapowanie(self):
+        tablica = self.tablica_liniowa()
+        sciezka = tablica.zapisz(os.path.join(self.katalog.name, 'tablica'))
+
+        wczytana = TablicaLadowania.wczytaj(sciezka)
+
+        self.assertIsInstance(wczytana.dane, np.memmap)
+        np.testing.assert_array_equal(wczytana.dane, tablica.dane)
+        np.testing.assert_allclose(wczytana.interpoluj(37.5, -12.3, 4.2), tablica.interpoluj(37.5, -12.3, 4.2))
+
+    def test_klucz_zalezy_od_rakiety_a_nie_od_paliwa(self):
+        scenariusz = Scenariusz()
+        klucz = klucz_tablicy(parametry_tablicy(scenariusz))
+
+        self.assertEqual(klucz, klucz_tablicy(parametry_tablicy(
+            scenariusz.zmien(rakieta=SpecyfikacjaRakiety(masa_paliwa=123.0)))))
+        self.assertNotEqual(klucz, klucz_tablicy(parametry_tablicy(
+            scenariusz.zmien(rakieta=SpecyfikacjaRakiety(cieg_maksymalny=9000.0)))))
+        self.assertNotEqual(klucz, klucz_tablicy(parametry_tablicy(scenariusz.zmien(planeta='europa'))))
+
+    def test_budowa_rownolegla_jak_sekwencyjna(self):
+        parametry = parametry_tablicy(Scenariusz(), liczba_wezlow=(12, 8, 3), liczba_kandydatow=8, liczba_krokow=8)
+
+        sekwencyjnie = zbuduj_tablice(parametry, liczba_procesow=1)
+        rownolegle = zbuduj_tablice(parametry, liczba_procesow=2)
+
+        np.testing.assert_array_equal(rownolegle.dane, sekwencyjnie.dane)
+
+    def test_pamiec_podreczna_na_dysku(self):
+        scenariusz = Scenariusz(naprowadzanie='tabelaryczne')
+        zbudowane = przygotuj_tablice([scenariusz], self.katalog.name, liczba_procesow=1, **MALA_SIATKA)
+        tablica = pobierz_tablice(scenariusz, self.katalog.name, **MALA_SIATKA)
+        czas_zapisu = os.path.getmtime(tablica.sciezka + '.npy')
+
+        inna_masa_paliwa = scenariusz.zmien(rakieta=SpecyfikacjaRakiety(masa_paliwa=200.0))
+        self.assertEqual(przygotuj_tablice([inna_masa_paliwa], self.katalog.name, liczba_procesow=1,
+                                           **MALA_SIATKA), [])
+        ponownie = pobierz_tablice(inna_masa_paliwa, self.katalog.name, **MALA_SIATKA)
+
+        self.assertEqual(zbudowane, [tablica.sciezka])
+        self.assertIs(ponownie, tablica)
+        self.assertEqual(os.path.getmtime(tablica.sciezka + '.npy'), czas_zapisu)
+        self.assertEqual(len(os.listdir(self.katalog.name)), 2)
+
+    def test_pobranie_nie_buduje_tablicy(self):
+        with self.assertRaises(FileNotFoundError):
+            pobierz_tablice(Scenariusz(naprowadzanie='tabelaryczne'), self.katalog.name, **MALA_SIATKA)
+        self.assertEqual(os.listdir(self.katalog.name), [])
+
+    def test_przygotowanie_tylko_dla_naprowadzania_tabelarycznego(self):
+        self.assertEqual(przygotuj_tablice([Scenariusz()], self.katalog.name, liczba_procesow=1, **MALA_SIATKA), [])
+        self.assertEqual(os.listdir(self.katalog.name), [])
+
+    def test_brak_rozwiazania_gdy_zawis_niemozliwy(self):
+        tablica = zbuduj_tablice(parametry_tablicy(Scenariusz(planeta='ziemia'), liczba_wezlow=(4, 4, 2),
+                                                   liczba_kandydatow=4, liczba_krokow=4), liczba_procesow=1)
+
+        self.assertTrue(np.isnan(tablica.dane[..., 0]).all())
+
+
+class TestAutopilotTabelaryczny(unittest.TestCase):
+    """Testy naprowadzania tabelarycznego w symulacji."""
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+        self.poprzednie = (config.KATALOG_TABLIC_LADOWANIA, config.TABLICE_LICZBA_WEZLOW,
+                           config.TABLICE_LICZBA_KANDYDATOW, config.TABLICE_LICZBA_KROKOW_PROPAGACJI)
+        config.KATALOG_TABLIC_LADOWANIA = self.katalog.name
+        config.TABLICE_LICZBA_WEZLOW = MALA_SIATKA['liczba_wezlow']
+        config.TABLICE_LICZBA_KANDYDATOW = MALA_SIATKA['liczba_kandydatow']
+        config.TABLICE_LICZBA_KROKOW_PROPAGACJI = MALA_SIATKA['liczba_krokow']
+        przygotuj_tablice([Scenariusz(naprowadzanie='tabelaryczne')], liczba_procesow=1)
+
+    def tearDown(self):
+        (config.KATALOG_TABLIC_LADOWANIA, config.TABLICE_LICZBA_WEZLOW,
+         config.TABLICE_LICZBA_KANDYDATOW, config.TABLICE_LICZBA_KROKOW_PROPAGACJI) = self.poprzednie
+        self.katalog.cleanup()
+
+    def test_udane_ladowanie(self):
+        for scenariusz in (Scenariusz(naprowadzanie='tabelaryczne'),
+                           Scenariusz(naprowadzanie='tabelaryczne', wysokosc_startowa=2000.0,
+                                      predkosc_pionowa_startowa=-60.0)):
+            with self.subTest(scenariusz=scenariusz):
+                symulacja = Symulacja(scenariusz=scenariusz)
+                wyniki = symulacja.uruchom(czy_wyswietlac_postep=False)
+
+                self.assertIsInstance(symulacja.autopilot, AutopilotTabelaryczny)
+                self.assertTrue(wyniki['sukces'], wyniki['komunikat'])
+
+    def test_brak_tablicy_bez_budowy(self):
+        with self.assertRaises(FileNotFoundError):
+            Symulacja(scenariusz=Scenariusz(naprowadzanie='tabelaryczne', planeta='europa'))
+
+    def test_prognoza_z_tablicy(self):
+        symulacja = Symulacja(scenariusz=Scenariusz(naprowadzanie='tabelaryczne'))
+        symulacja.wykonaj_kroki(10)
+        autopilot = symulacja.autopilot
+
+        self.assertEqual(autopilot.tryb_ladowania, 'lot_swobodny')
+        self.assertGreater(autopilot.przewidywana_wysokosc_zaplonu, 0.0)
+        self.assertLess(autopilot.przewidywana_wysokosc_zaplonu, symulacja.rakieta.pozycja_y)
+
+    def test_poza_zasiegiem_ocena_kandydatow(self):
+        # Start powyżej zasięgu osi wysokości - pierwsze sterowania jak w trybie predykcyjnym
+        scenariusz = Scenariusz(naprowadzanie='tabelaryczne', wysokosc_startowa=5000.0)
+        symulacja = Symulacja(scenariusz=scenariusz)
+        symulacja.wykonaj_kroki(1)
+
+        self.assertIsNone(symulacja.autopilot.przewidywana_wysokosc_zaplonu)
+        self.assertIsNotNone(symulacja.autopilot.przewidywana_predkosc_przyziemienia)
+
+
+if __name__ == '__main__':
+    unittest.main()
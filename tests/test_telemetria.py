@@ -0,0 +1,98 @@
+"""
+Testy jednostkowe dla kolejki telemetrii i podglądu na żywo.
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.telemetria import KolejkaTelemetrii
+from src.wizualizacja import WidokTelemetrii
+
+
+class TestKolejkaTelemetrii(unittest.TestCase):
+    """Testy ograniczonej kolejki próbek."""
+
+    def test_odrzucanie_najstarszych(self):
+        kolejka = KolejkaTelemetrii(pojemnosc=3)
+        for numer in range(5):
+            kolejka({'czas': numer})
+
+        self.assertEqual(kolejka.liczba_odrzuconych, 2)
+        self.assertEqual([probka['czas'] for probka in kolejka.oproznij()], [2, 3, 4])
+        self.assertEqual(len(kolejka), 0)
+
+    def test_symulacja_w_watku(self):
+        """Symulacja w osobnym wątku przekazuje wszystkie próbki i wyniki."""
+        kolejka = KolejkaTelemetrii()
+        symulacja = Symulacja(scenariusz=Scenariusz(krok_czasowy=0.1), odbiornik=kolejka)
+        watek = threading.Thread(target=lambda: kolejka.zakoncz(symulacja.uruchom(czy_wyswietlac_postep=False)))
+        watek.start()
+
+        probki = []
+        while not kolejka.czy_zakonczona:
+            probki.extend(kolejka.oproznij())
+            kolejka.czekaj_na_koniec(0.001)
+        probki.extend(kolejka.oproznij())
+        watek.join()
+
+        self.assertEqual(kolejka.liczba_odrzuconych, 0)
+        self.assertEqual(len(probki), len(kolejka.wyniki['historia']['czas']))
+        self.assertEqual(probki[-1]['y'], kolejka.wyniki['stan_koncowy']['y'])
+
+
+class TestWidokTelemetrii(unittest.TestCase):
+    """Testy przyrostowego dopisywania próbek do wykresów."""
+
+    def test_dopisywanie_przyrostowe(self):
+        from matplotlib.figure import Figure
+
+        kolejka = KolejkaTelemetrii()
+        Symulacja(scenariusz=Scenariusz(krok_czasowy=0.1), odbiornik=kolejka).uruchom(czy_wyswietlac_postep=False)
+        probki = kolejka.oproznij()
+        widok = WidokTelemetrii(Figure())
+
+        self.assertFalse(widok.dodaj([]))
+        polowa = len(probki) // 2
+        self.assertTrue(widok.dodaj(probki[:polowa]))
+        self.assertEqual(widok.linia_wysokosci.get_xdata()[-1], probki[polowa - 1]['czas'])
+        widok.dodaj(probki[polowa:])
+
+        self.assertEqual(len(widok), len(probki))
+        self.assertEqual(widok.ostatnia_probka['y'], probki[-1]['y'])
+        self.assertGreaterEqual(widok.os_wysokosci.get_ylim()[1], probki[0]['y'])
+        widok.resetuj()
+        self.assertIsNone(widok.ostatnia_probka)
+
+    def test_dlugi_przebieg_redukowany_przyrostowo(self):
+        """Linie mają ograniczoną liczbę punktów, a start, koniec i skrajne wartości zostają."""
+        from matplotlib.figure import Figure
+
+        czas = np.arange(50000) * 0.01
+        vy = np.sin(czas)
+        probki = [{'czas': t, 'x': 0.0, 'y': 1000.0 - t, 'vx': 0.0, 'vy': v, 'masa_paliwa': 1.0,
+                   'cieg': 0.0, 'kat': 0.0} for t, v in zip(czas.tolist(), vy.tolist())]
+        widok = WidokTelemetrii(Figure())
+        for poczatek in range(0, len(probki), 700):
+            widok.dodaj(probki[poczatek:poczatek + 700])
+
+        czas_linii = widok.linia_predkosci.get_xdata()
+        self.assertLess(len(czas_linii), len(probki) // 10)
+        self.assertTrue(np.all(np.diff(czas_linii) > 0))
+        self.assertEqual(czas_linii[0], czas[0])
+        self.assertEqual(czas_linii[-1], czas[-1])
+        self.assertEqual(widok.linia_predkosci.get_ydata().max(), vy.max())
+        self.assertEqual(widok.linia_predkosci.get_ydata().min(), vy.min())
+        self.assertEqual(len(widok), len(probki))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Testy jednostkowe dla przebiegu w tempie zegara i asynchronicznego API kroków.
+"""
+
+import unittest
+import sys
+import os
+import time
+import asyncio
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.tempo import ZegarTempa
+
+
+class SztucznyZegar:
+    def __init__(self):
+        self.czas = 0.0
+
+    def __call__(self):
+        return self.czas
+
+
+class TestZegarTempa(unittest.TestCase):
+    """Testy wyznaczania czasu oczekiwania."""
+
+    def test_korekcja_dryfu(self):
+        """Spóźnione przebudzenie skraca następne oczekiwanie zamiast przesuwać harmonogram."""
+        zegar = SztucznyZegar()
+        tempo = ZegarTempa(przyspieszenie=10.0, maksymalne_opoznienie=1.0, zegar=zegar)
+
+        self.assertAlmostEqual(tempo.pozostalo(1.0), 0.1)
+        zegar.czas = 0.13
+        self.assertAlmostEqual(tempo.pozostalo(2.0), 0.07)
+        zegar.czas = 0.5
+        self.assertEqual(tempo.pozostalo(3.0), 0.0)
+        self.assertEqual(tempo.liczba_poslizgow, 0)
+
+    def test_poslizg_przy_duzym_opoznieniu(self):
+        zegar = SztucznyZegar()
+        tempo = ZegarTempa(przyspieszenie=1.0, maksymalne_opoznienie=0.25, zegar=zegar)
+        zegar.czas = 2.0
+
+        self.assertEqual(tempo.pozostalo(1.0), 0.0)
+        self.assertEqual(tempo.liczba_poslizgow, 1)
+        self.assertAlmostEqual(tempo.pozostalo(1.5), 0.5)
+
+    def test_niedodatnie_przyspieszenie(self):
+        with self.assertRaises(ValueError):
+            ZegarTempa(przyspieszenie=0.0)
+
+
+class TestPrzebiegWTempie(unittest.TestCase):
+    """Testy przebiegu symulacji w tempie zegara."""
+
+    def setUp(self):
+        self.oczekiwane = Symulacja(scenariusz=Scenariusz(), czy_przewijac_lot_swobodny=False).uruchom(
+            czy_wyswietlac_postep=False)
+
+    def test_czas_i_wyniki(self):
+        poczatek = time.perf_counter()
+        wyniki = Symulacja(scenariusz=Scenariusz()).uruchom(czy_wyswietlac_postep=False, przyspieszenie=100.0)
+        czas_trwania = time.perf_counter() - poczatek
+
+        self.assertGreaterEqual(czas_trwania, wyniki['czas_symulacji'] / 100.0 - 0.01)
+        self.assertLess(czas_trwania, wyniki['czas_symulacji'] / 100.0 + 0.5)
+        self.assertEqual(wyniki['stan_koncowy'], self.oczekiwane['stan_koncowy'])
+
+    def test_wspolna_petla_asyncio(self):
+        """Dwie symulacje w jednej pętli trwają tyle, co dłuższa z nich, a nie suma."""
+        async def oba_przebiegi():
+            return await asyncio.gather(Symulacja(scenariusz=Scenariusz()).uruchom_async(100.0),
+                                        Symulacja(scenariusz=Scenariusz()).uruchom_async(50.0))
+
+        poczatek = time.perf_counter()
+        wyniki = asyncio.run(oba_przebiegi())
+        czas_trwania = time.perf_counter() - poczatek
+
+        dluzszy = self.oczekiwane['czas_symulacji'] / 50.0
+        self.assertGreaterEqual(czas_trwania, dluzszy - 0.01)
+        self.assertLess(czas_trwania, dluzszy + self.oczekiwane['czas_symulacji'] / 100.0 * 0.5)
+        for wynik in wyniki:
+            self.assertEqual(wynik['stan_koncowy'], self.oczekiwane['stan_koncowy'])
+
+    def test_probki_przebiegu_async(self):
+        async def zbierz():
+            return [probka async for probka in Symulacja(scenariusz=Scenariusz()).przebieg_async(1000.0)]
+
+        probki = asyncio.run(zbierz())
+        self.assertEqual(probki[-1]['y'], self.oczekiwane['stan_koncowy']['y'])
+        self.assertTrue(all(a['czas'] < b['czas'] for a, b in zip(probki, probki[1:])))
+
+
+if __name__ == '__main__':
+    unittest.main()
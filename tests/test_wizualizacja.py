@@ -0,0 +1,137 @@
+"""
+Testy jednostkowe dla rysowania wykresów bez okna.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.eksport import zapisz_surowy
+from src.scenariusz import Scenariusz
+from src.symulacja import Symulacja
+from src.wizualizacja import RysownikWynikow, renderuj_wiele, klatki_animacji, animacja_ladowania, _zapisz_gif
+
+
+def wyniki_lotu(planeta):
+    symulacja = Symulacja(scenariusz=Scenariusz(planeta=planeta, krok_czasowy=0.1, czas_maksymalny=60))
+    return symulacja.uruchom(czy_wyswietlac_postep=False)
+
+
+class TestWizualizacja(unittest.TestCase):
+    """Testy leniwego importu i ponownego użycia figury."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wyniki = [wyniki_lotu(planeta) for planeta in ('ksiezyc', 'mars')]
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.katalog.cleanup()
+
+    def test_import_bez_matplotlib(self):
+        """Import modułu nie ładuje matplotlib."""
+        kod = "import sys, src.wizualizacja; print('matplotlib' in sys.modules)"
+        wynik = subprocess.run([sys.executable, '-c', kod], capture_output=True, text=True, check=True,
+                               cwd=os.path.join(os.path.dirname(__file__), '..'))
+        self.assertEqual(wynik.stdout.strip(), 'False')
+
+    def test_ponowne_uzycie_figury(self):
+        """Kolejne przebiegi podmieniają dane linii w tej samej figurze."""
+        with RysownikWynikow(dpi=40) as rysownik:
+            for numer, wyniki in enumerate(self.wyniki * 2):
+                rysownik.renderuj(wyniki, os.path.join(self.katalog.name, f'{numer}.png'))
+                self.assertIs(rysownik.figura.axes[0], rysownik.osie[0])
+                self.assertEqual(len(rysownik.figura.axes), 6)
+                self.assertEqual(sum(len(os_wykresu.lines) for os_wykresu in rysownik.osie),
+                                 sum(len(os_wykresu.lines) for os_wykresu in rysownik.figura.axes))
+                linia_wysokosci = rysownik.linie[1][0]
+                self.assertEqual(len(linia_wysokosci.get_ydata()), len(wyniki['historia']['y']))
+                self.assertIn(wyniki['komunikat'], rysownik.tytul.get_text())
+            liczba_linii = sum(len(os_wykresu.lines) for os_wykresu in rysownik.osie)
+            rysownik.renderuj(self.wyniki[0], os.path.join(self.katalog.name, 'ostatni.png'))
+            self.assertEqual(sum(len(os_wykresu.lines) for os_wykresu in rysownik.osie), liczba_linii)
+
+        self.assertEqual(len(os.listdir(self.katalog.name)), 5)
+
+    def test_renderuj_wiele_z_plikow(self):
+        """Równoległe rysowanie przebiegów zapisanych w plikach .traj."""
+        zadania = []
+        for numer, wyniki in enumerate(self.wyniki):
+            sciezka = zapisz_surowy(os.path.join(self.katalog.name, f'{numer}.traj'), wyniki)
+            zadania.append((sciezka, os.path.join(self.katalog.name, f'{numer}.png')))
+
+        sciezki = renderuj_wiele(zadania, liczba_procesow=2)
+
+        self.assertEqual(sciezki, [png for _, png in zadania])
+        self.assertTrue(all(os.path.getsize(png) > 0 for png in sciezki))
+
+
+class TestAnimacja(unittest.TestCase):
+    """Testy klatek animacji i eksportu bez okna."""
+
+    def setUp(self):
+        self.katalog = tempfile.TemporaryDirectory()
+        self.wyniki = wyniki_lotu('ksiezyc')
+
+    def tearDown(self):
+        self.katalog.cleanup()
+
+    def test_klatki_w_czasie_rzeczywistym(self):
+        """Liczba klatek zależy od czasu lotu i fps, a nie od kroku symulacji."""
+        historia = self.wyniki['historia']
+        klatki = klatki_animacji(historia, klatki_na_sekunde=10)
+        czas_lotu = historia['czas'][-1] - historia['czas'][0]
+
+        self.assertEqual(len(klatki['czas']), int(np.ceil(czas_lotu * 10 - 1e-9)) + 1)
+        np.testing.assert_allclose(np.diff(klatki['czas'])[:-1], 0.1)
+        self.assertAlmostEqual(klatki['y'][-1], historia['y'][-1])
+        self.assertEqual(len(klatki_animacji(historia, 10, predkosc_odtwarzania=2.0)['czas']),
+                         int(np.ceil(czas_lotu * 5 - 1e-9)) + 1)
+
+    def test_eksport_gif(self):
+        sciezka = animacja_ladowania(self.wyniki['historia'], os.path.join(self.katalog.name, 'lot.gif'),
+                                     klatki_na_sekunde=2)
+        with Image.open(sciezka) as animacja:
+            self.assertEqual(animacja.n_frames, len(klatki_animacji(self.wyniki['historia'], 2)['czas']))
+
+    def test_gif_zapisywany_strumieniowo(self):
+        """Klatki trafiają do pliku na bieżąco, a nie dopiero po wyrenderowaniu całości."""
+        sciezka = os.path.join(self.katalog.name, 'strumien.gif')
+        generator = np.random.default_rng(0)
+        rozmiary = []
+
+        def klatki(liczba):
+            for numer in range(liczba):
+                if numer:
+                    rozmiary.append(os.path.getsize(sciezka))
+                yield generator.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+        _zapisz_gif(klatki(12), sciezka, 10)
+
+        # Klatka szumu to ponad 8 KB danych LZW, więc każda opróżnia bufor pliku
+        self.assertTrue(all(nastepny > poprzedni for poprzedni, nastepny in zip(rozmiary[1:], rozmiary[2:])))
+        with Image.open(sciezka) as animacja:
+            self.assertEqual(animacja.n_frames, 12)
+            self.assertEqual(animacja.info['duration'], 100)
+            self.assertEqual(animacja.info['loop'], 0)
+
+    @unittest.skipIf(shutil.which('ffmpeg'), 'ffmpeg jest dostępny')
+    def test_wideo_bez_ffmpeg(self):
+        with self.assertRaises(RuntimeError):
+            animacja_ladowania(self.wyniki['historia'], os.path.join(self.katalog.name, 'lot.mp4'),
+                               klatki_na_sekunde=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
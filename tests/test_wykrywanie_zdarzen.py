@@ -0,0 +1,80 @@
+"""
+Testy wykrywania zdarzeń (przyziemienie, wyczerpanie paliwa) wewnątrz kroku.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Dodaj ścieżkę do modułu src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rakieta import Rakieta
+from src.symulacja import Symulacja
+from src.symulacja_wsadowa import SymulacjaWsadowa
+from src.scenariusz import Scenariusz
+
+
+class TestWykrywanieZdarzen(unittest.TestCase):
+    """Testy dokładnego wyznaczania chwili zdarzeń."""
+
+    def test_przyziemienie_w_kroku(self):
+        """Krok przecinający powierzchnię kończy się dokładnie na y=0."""
+        rakieta = Rakieta(pozycja_y=10.0, predkosc_y=-20.0, predkosc_x=0.0, grawitacja=1.62)
+        czas = rakieta.aktualizuj(1.0)
+
+        self.assertEqual(rakieta.pozycja_y, 0)
+        self.assertLess(czas, 1.0)
+        # Schemat półjawny: y0 + (v0 + a*t)*t = 0
+        oczekiwany_czas = (-20.0 + np.sqrt(400.0 + 4 * 1.62 * 10.0)) / (2 * 1.62)
+        self.assertAlmostEqual(czas, oczekiwany_czas, places=8)
+        self.assertAlmostEqual(rakieta.predkosc_y, -20.0 - 1.62 * oczekiwany_czas, places=7)
+
+    def test_wyczerpanie_paliwa_w_kroku(self):
+        """Po wyczerpaniu paliwa reszta kroku to lot bez ciągu."""
+        rakieta = Rakieta(pozycja_y=1000.0, predkosc_y=0.0, predkosc_x=0.0,
+                          masa_paliwa_aktualna=0.2, zuzycie_paliwa=0.5, grawitacja=1.62)
+        rakieta.ustaw_cieg(rakieta.cieg_maksymalny)
+        czas = rakieta.aktualizuj(1.0)
+
+        self.assertEqual(czas, 1.0)
+        self.assertEqual(rakieta.masa_paliwa_aktualna, 0.0)
+        self.assertEqual(rakieta.cieg_aktualny, 0.0)
+        # Ciąg działał tylko przez 0.4 s
+        przyspieszenie = rakieta.cieg_maksymalny / 1000.2 - 1.62
+        oczekiwana_predkosc = przyspieszenie * 0.4 - 1.62 * 0.6
+        self.assertAlmostEqual(rakieta.predkosc_y, oczekiwana_predkosc, places=9)
+
+    def test_gruby_krok_czasowy(self):
+        """Przy dt=1 s prędkość przyziemienia nie zawiera przestrzelenia kroku."""
+        scenariusz = Scenariusz(czy_autopilot_wlaczony=False, predkosc_pozioma_startowa=0.0)
+        dokladna = -np.sqrt(scenariusz.predkosc_pionowa_startowa**2
+                            + 2 * scenariusz.grawitacja * scenariusz.wysokosc_startowa)
+
+        wyniki = Symulacja(scenariusz=scenariusz.zmien(krok_czasowy=1.0)).uruchom(czy_wyswietlac_postep=False)
+        self.assertEqual(wyniki['stan_koncowy']['y'], 0)
+        self.assertLess(abs(wyniki['stan_koncowy']['vy'] - dokladna), 0.5)
+        self.assertNotAlmostEqual(wyniki['czas_symulacji'] % 1.0, 0.0)
+
+    def test_autopilot_przy_grubym_kroku(self):
+        """Autopilot ląduje przy dt=0.5 s niezależnie od integratora."""
+        for integrator in ('euler', 'rk4'):
+            for planeta in ('ksiezyc', 'europa', 'tytan'):
+                with self.subTest(integrator=integrator, planeta=planeta):
+                    scenariusz = Scenariusz(planeta=planeta, krok_czasowy=0.5, integrator=integrator)
+                    wyniki = Symulacja(scenariusz=scenariusz).uruchom(czy_wyswietlac_postep=False)
+
+                    self.assertTrue(wyniki['sukces'], wyniki['komunikat'])
+
+    def test_autopilot_wsadowy_przy_grubym_kroku(self):
+        scenariusze = [Scenariusz(planeta=planeta, krok_czasowy=0.5) for planeta in ('ksiezyc', 'europa', 'tytan')]
+        symulacja = SymulacjaWsadowa.ze_scenariuszy(scenariusze)
+        symulacja.uruchom()
+
+        self.assertTrue(symulacja.czy_sukces.all())
+
+
+if __name__ == '__main__':
+    unittest.main()